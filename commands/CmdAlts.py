@@ -4,6 +4,7 @@ from evennia.utils.utils import inherits_from
 from evennia.utils import logger
 from evennia.objects.models import ObjectDB
 from evennia.accounts.models import AccountDB
+from world.connections.history import backfill_from_attributes, find_shared, get_records, session_ip
 
 class CmdAlts(default_cmds.MuxCommand):
     """
@@ -21,6 +22,8 @@ class CmdAlts(default_cmds.MuxCommand):
       +alts/pending             - List all your pending alt requests
       +alts/staff <name>        - [Staff only] Show IP-based alts and public alts
       +alts/forcerem <c1>=<c2>  - [Staff only] Forcibly remove alt relationship
+      +alts/backfill            - [Admin only] Build connection history from
+                                  the old last_ip/creator_ip Attributes
     
     The +alts command allows you to manage which characters are publicly 
     linked to your character. This is useful for letting others know 
@@ -56,6 +59,15 @@ class CmdAlts(default_cmds.MuxCommand):
             self.show_staff_alts()
             return
             
+        # Check for /backfill switch (admin only)
+        if "backfill" in self.switches:
+            if not caller.check_permstring("Admin"):
+                caller.msg("You don't have permission to use this command.")
+                return
+            created = backfill_from_attributes()
+            caller.msg(f"Created {created} connection records from character Attributes.")
+            return
+            
         # Check for /forcerem switch (staff only)
         if "forcerem" in self.switches:
             if not caller.check_permstring("Builder") and not caller.check_permstring("Admin"):
@@ -819,8 +831,6 @@ This request will expire in 7 days.
     
     def show_staff_alts(self):
         """Show IP-based and public alts of a character (staff only)."""
-        from evennia.utils import logger
-        
         caller = self.caller
         args = self.args.strip()
         
@@ -844,9 +854,6 @@ This request will expire in 7 days.
             
         target = target[0]  # Get the first (and only) match
         
-        # Log to help debug issues
-        logger.log_info(f"+alts/staff: Checking alts for {target.name} (#{target.id})")
-        
         # Get the target's account
         account = target.account
         
@@ -859,21 +866,12 @@ This request will expire in 7 days.
         dash_count = (total_width - title_len) // 2
         msg = f"{'|b-|n' * dash_count}{title}{'|b-|n' * (total_width - dash_count - title_len)}\n"
         
-        # Get the IP information for the target
+        # Get the IPs the target has been played from, and is connected from now
+        records = list(get_records(target))
         current_ips = set()
-        creator_ip = target.attributes.get('creator_ip', None)
-        last_ip = target.attributes.get('last_ip', None)
-        
-        # Get current IP(s) from active sessions
         if account:
-            # Log account info for debugging
-            logger.log_info(f"+alts/staff: Target has account {account.name} (#{account.id})")
-            sessions = account.sessions.all()
-            logger.log_info(f"+alts/staff: Account has {len(sessions)} session(s)")
-            for session in sessions:
-                ip_addr = isinstance(session.address, tuple) and session.address[0] or session.address
-                current_ips.add(ip_addr)
-                logger.log_info(f"+alts/staff: Found session IP: {ip_addr}")
+            for session in account.sessions.all():
+                current_ips.add(session_ip(session))
         
         # Character IP Information Section
         ip_title = "|y Character IP Information |n"
@@ -882,46 +880,18 @@ This request will expire in 7 days.
         msg += f"{'|b-|n' * dash_count}{ip_title}{'|b-|n' * (total_width - dash_count - title_len)}\n"
         
         msg += f"Account: {account.name if account else 'None'}\n"
-        msg += f"Creator IP: {creator_ip or 'Unknown'}\n"
-        msg += f"Last IP: {last_ip or 'Unknown'}\n"
         if current_ips:
-            msg += f"Current IP(s): {', '.join(current_ips)}\n"
-        
-        # Check for IP discrepancies
-        if creator_ip and last_ip and creator_ip != last_ip:
-            msg += "|rNOTE: Creator IP and Last IP are different! Character may have been transferred.|n\n"
+            msg += f"Current IP(s): {', '.join(sorted(current_ips))}\n"
+        if records:
+            msg += f"{'IP':<20} {'First Seen':<17} {'Last Seen'}\n"
+            msg += f"{'-'*19} {'-'*16} {'-'*16}\n"
+            for record in records:
+                msg += f"{record.ip:<20} {record.first_seen:%Y-%m-%d %H:%M} {record.last_seen:%Y-%m-%d %H:%M}\n"
+        else:
+            msg += "No connection history recorded for this character.\n"
         
         # Collect all IPs to check against
-        all_target_ips = set()
-        if creator_ip:
-            all_target_ips.add(creator_ip)
-        if last_ip:
-            all_target_ips.add(last_ip)
-        all_target_ips.update(current_ips)
-        
-        logger.log_info(f"+alts/staff: All target IPs: {all_target_ips}")
-        
-        # Get all characters using different methods to ensure we find everyone
-        from evennia.objects.models import ObjectDB
-        from django.conf import settings
-        
-        # Get all characters directly from the database
-        character_typeclass = settings.BASE_CHARACTER_TYPECLASS
-        all_db_characters = list(ObjectDB.objects.filter(db_typeclass_path=character_typeclass))
-        logger.log_info(f"+alts/staff: Found {len(all_db_characters)} characters in database")
-        
-        # Also get all characters through search_object for redundancy
-        all_search_characters = search_object("", typeclass=character_typeclass)
-        logger.log_info(f"+alts/staff: Found {len(all_search_characters)} characters via search")
-        
-        # Merge the two lists to make sure we have everything
-        all_character_ids = set(char.id for char in all_db_characters)
-        for char in all_search_characters:
-            if char.id not in all_character_ids:
-                all_db_characters.append(char)
-                all_character_ids.add(char.id)
-        
-        logger.log_info(f"+alts/staff: Combined character count: {len(all_db_characters)}")
+        all_target_ips = {record.ip for record in records} | current_ips
         
         # Currently Online Characters Section
         online_title = "|y Currently Online Characters (Same IP) |n"
@@ -932,59 +902,18 @@ This request will expire in 7 days.
         if not all_target_ips:
             msg += "No IP information available for this character.\n"
         else:
-            # Direct check of all sessions in the system
             from evennia.server.sessionhandler import SESSIONS
             
             # Find online characters with matching IPs
             online_alts = []
-            
-            # First check all active sessions directly
             for session in SESSIONS.get_sessions():
                 session_obj = session.puppet
                 if not session_obj or session_obj == target:
                     continue
-                
-                # Get the session's IP
-                session_ip = isinstance(session.address, tuple) and session.address[0] or session.address
-                logger.log_info(f"+alts/staff: Checking session for {session_obj.name} with IP {session_ip}")
-                
-                # Check if it matches any of our target IPs
-                if session_ip in all_target_ips:
+                ip_addr = session_ip(session)
+                if ip_addr in all_target_ips:
                     account_name = session.account.name if session.account else "None"
-                    online_alts.append((session_obj.name, account_name, session_ip))
-                    logger.log_info(f"+alts/staff: Found match: {session_obj.name} - {account_name} - {session_ip}")
-            
-            # Then also check through the character objects as backup
-            for character in all_db_characters:
-                # Skip the target character
-                if character == target:
-                    continue
-                
-                # Skip characters we've already found via sessions
-                if any(alt[0] == character.name for alt in online_alts):
-                    continue
-                
-                # Skip characters without accounts
-                if not character.account:
-                    continue
-                
-                logger.log_info(f"+alts/staff: Checking character {character.name} (#{character.id})")
-                
-                # Check if any sessions match the target's IP
-                char_sessions = character.account.sessions.all()
-                if char_sessions:
-                    char_ips = set()
-                    for session in char_sessions:
-                        # Get the IP address
-                        char_ip = isinstance(session.address, tuple) and session.address[0] or session.address
-                        char_ips.add(char_ip)
-                        logger.log_info(f"+alts/staff: Found IP for {character.name}: {char_ip}")
-                    
-                    # Check for any matching IPs
-                    matching_ips = char_ips.intersection(all_target_ips)
-                    if matching_ips:
-                        online_alts.append((character.name, character.account.name, ', '.join(matching_ips)))
-                        logger.log_info(f"+alts/staff: Found match: {character.name} - {character.account.name} - {matching_ips}")
+                    online_alts.append((session_obj.name, account_name, ip_addr))
             
             if online_alts:
                 # Header row
@@ -996,130 +925,34 @@ This request will expire in 7 days.
                     msg += f"{alt_name:<20} {account_name:<15} {match_ips}\n"
             else:
                 msg += "No other characters currently online from the same IP(s).\n"
-                
-        # Characters with Same Creator IP Section
-        creator_title = "|y Characters with Same Creator IP |n"
-        title_len = len(creator_title)
-        dash_count = (total_width - title_len) // 2
-        msg += f"\n{'|b-|n' * dash_count}{creator_title}{'|b-|n' * (total_width - dash_count - title_len)}\n"
         
-        if not creator_ip:
-            msg += "No creator IP information available for this character.\n"
-        else:
-            # Find all characters with the same creator IP
-            creator_alts = []
-            
-            for character in all_db_characters:
-                if character == target:
-                    continue
-                
-                char_creator_ip = character.attributes.get('creator_ip', None)
-                if char_creator_ip == creator_ip:
-                    char_account = character.account
-                    account_name = char_account.name if char_account else "None"
-                    
-                    # Check if there's a mismatch in last IP
-                    char_last_ip = character.attributes.get('last_ip', None)
-                    ip_mismatch = char_last_ip and char_last_ip != creator_ip
-                    
-                    creator_alts.append((character.name, account_name, ip_mismatch))
-                    logger.log_info(f"+alts/staff: Found creator IP match: {character.name}")
-            
-            if creator_alts:
-                # Header row
-                msg += f"{'Character':<20} {'Account':<15} {'IP Changed'}\n"
-                msg += f"{'-'*19} {'-'*14} {'-'*9}\n"
-                
-                # List the alts with their information
-                for alt_name, account_name, ip_mismatch in sorted(creator_alts):
-                    mismatch_indicator = "|rYes|n" if ip_mismatch else "No"
-                    msg += f"{alt_name:<20} {account_name:<15} {mismatch_indicator}\n"
-            else:
-                msg += "No other characters have the same creator IP.\n"
-        
-        # Characters with Same Last IP Section
-        last_ip_title = "|y Characters with Same Last IP |n"
-        title_len = len(last_ip_title)
-        dash_count = (total_width - title_len) // 2
-        msg += f"\n{'|b-|n' * dash_count}{last_ip_title}{'|b-|n' * (total_width - dash_count - title_len)}\n"
-        
-        if not last_ip:
-            msg += "No last IP information available for this character.\n"
-        else:
-            # Find all characters with the same last IP
-            last_ip_alts = []
-            
-            for character in all_db_characters:
-                if character == target:
-                    continue
-                
-                char_last_ip = character.attributes.get('last_ip', None)
-                if char_last_ip == last_ip:
-                    char_account = character.account
-                    account_name = char_account.name if char_account else "None"
-                    
-                    # Check if there's a mismatch in creator IP
-                    char_creator_ip = character.attributes.get('creator_ip', None)
-                    ip_mismatch = char_creator_ip and char_creator_ip != last_ip
-                    
-                    # Calculate time since last disconnect
-                    last_disconnect = character.attributes.get('last_disconnect', None)
-                    time_ago = "Unknown"
-                    if last_disconnect:
-                        from time import time
-                        days_offline = int((time() - last_disconnect) / (24 * 60 * 60))
-                        if days_offline == 0:
-                            time_ago = "Today"
-                        else:
-                            time_ago = f"{days_offline} day{'s' if days_offline != 1 else ''} ago"
-                    
-                    last_ip_alts.append((character.name, account_name, ip_mismatch, time_ago))
-                    logger.log_info(f"+alts/staff: Found last IP match: {character.name}")
-            
-            if last_ip_alts:
-                # Header row
-                msg += f"{'Character':<20} {'Account':<15} {'Creator IP Diff':<15} {'Last Seen'}\n"
-                msg += f"{'-'*19} {'-'*14} {'-'*14} {'-'*9}\n"
-                
-                # List the alts with their information
-                for alt_name, account_name, ip_mismatch, time_ago in sorted(last_ip_alts, key=lambda x: x[0]):
-                    mismatch_indicator = "|rYes|n" if ip_mismatch else "No"
-                    msg += f"{alt_name:<20} {account_name:<15} {mismatch_indicator:<15} {time_ago}\n"
-            else:
-                msg += "No other characters have the same last IP.\n"
-        
-        # Potential Account Transfers Section
-        transfer_title = "|y Potential Account Transfers |n"
-        title_len = len(transfer_title)
+        # Characters Sharing Connection History Section
+        shared_title = "|y Characters Played From The Same IP(s) |n"
+        title_len = len(shared_title)
         dash_count = (total_width - title_len) // 2
-        msg += f"\n{'|b-|n' * dash_count}{transfer_title}{'|b-|n' * (total_width - dash_count - title_len)}\n"
-        
-        # Find characters with different creator and last IPs
-        transfers = []
-        
-        for character in all_db_characters:
-            char_creator_ip = character.attributes.get('creator_ip', None)
-            char_last_ip = character.attributes.get('last_ip', None)
-            
-            # Check if both IPs exist and are different
-            if char_creator_ip and char_last_ip and char_creator_ip != char_last_ip:
-                # Match if either IP matches any of the target's IPs
-                if char_creator_ip in all_target_ips or char_last_ip in all_target_ips:
-                    char_account = character.account
-                    account_name = char_account.name if char_account else "None"
-                    transfers.append((character.name, account_name, char_creator_ip, char_last_ip))
-                    logger.log_info(f"+alts/staff: Found potential transfer: {character.name}")
-        
-        if transfers:
-            # Header row
-            msg += f"{'Character':<16} {'Account':<10} {'Creator IP':<15} {'Last IP'}\n"
-            msg += f"{'-'*15} {'-'*9} {'-'*14} {'-'*15}\n"
-            
-            # List the transfers with their information
-            for alt_name, account_name, creator_ip, last_ip in sorted(transfers):
-                msg += f"{alt_name:<16} {account_name:<10} {creator_ip:<15} {last_ip}\n"
+        msg += f"\n{'|b-|n' * dash_count}{shared_title}{'|b-|n' * (total_width - dash_count - title_len)}\n"
+        
+        # One row per character: its account, the shared IPs and when it was last seen
+        shared = {}
+        for record in find_shared(target):
+            entry = shared.setdefault(record.character_id, {
+                "name": record.character.db_key,
+                "account": record.account.username if record.account else "None",
+                "other_account": bool(record.account_id and account and record.account_id != account.id),
+                "ips": [],
+                "last_seen": record.last_seen
+            })
+            entry["ips"].append(record.ip)
+        
+        if shared:
+            msg += f"{'Character':<20} {'Account':<15} {'Last Seen':<11} {'Shared IP(s)'}\n"
+            msg += f"{'-'*19} {'-'*14} {'-'*10} {'-'*20}\n"
+            for entry in shared.values():
+                account_name = f"|r{entry['account']:<15}|n" if entry["other_account"] else f"{entry['account']:<15}"
+                msg += f"{entry['name']:<20} {account_name} {entry['last_seen']:%Y-%m-%d}  {', '.join(entry['ips'])}\n"
+            msg += "Accounts in |rred|n differ from this character's account.\n"
         else:
-            msg += "No potential account transfers detected.\n"
+            msg += "No other characters have been played from the same IP(s).\n"
         
         # Public alts section
         pub_title = "|y Publicly Declared Alts |n"
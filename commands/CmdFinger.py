@@ -5,7 +5,6 @@ from world.utils.formatting import header, footer, divider
 from world.utils.time_utils import TIME_MANAGER
 from evennia.utils.search import search_object
 from time import time
-import datetime
 import re
 from typeclasses.characters import Character
 import pytz
@@ -177,21 +176,7 @@ class CmdFinger(MuxCommand):
         if timestamp is None:
             return "OFFLINE"
             
-        # Create datetime in UTC
-        utc_dt = datetime.datetime.fromtimestamp(timestamp, datetime.timezone.utc)
-        
-        # Get the caller's timezone
-        caller_tz_name = self.caller.attributes.get("timezone", "UTC")
-        try:
-            # Try to get the timezone from pytz
-            tz = pytz.timezone(TIME_MANAGER.normalize_timezone_name(caller_tz_name))
-            # Convert to the caller's timezone
-            local_dt = utc_dt.astimezone(tz)
-            # Format without timezone indicator
-            time_str = local_dt.strftime("%Y-%m-%d %H:%M")
-        except (pytz.exceptions.UnknownTimeZoneError, AttributeError, ValueError):
-            # Fallback to UTC if there's any error
-            time_str = utc_dt.strftime("%Y-%m-%d %H:%M")
+        time_str = TIME_MANAGER.format_times([timestamp], self.caller)[0]
             
         return f"OFFLINE (Last: {time_str})"
 
@@ -6,8 +6,10 @@ from evennia import Command, CmdSet
 from evennia.utils.evtable import EvTable
 from evennia.utils.utils import list_to_string
 from world.hangouts.models import HangoutDB, HANGOUT_CATEGORIES
+from world.hangouts import directory
 from evennia.commands.default.muxcommand import MuxCommand
 from evennia.utils import search
+from evennia.objects.models import ObjectDB
 
 class CmdHangout(MuxCommand):
     """
@@ -80,7 +82,7 @@ class CmdHangout(MuxCommand):
     def _has_splat_access(self, hangout):
         """Check if the caller has access to the splat-restricted hangout."""
         # If the hangout isn't hidden, everyone has access regardless of splat
-        if not hangout.db.hidden:
+        if not hangout.hidden:
             return True
             
         # Staff always have access
@@ -88,10 +90,20 @@ class CmdHangout(MuxCommand):
             return True
             
         # If hidden but no splat requirements, everyone has access
-        if not hangout.db.required_splats:
+        if not hangout.required_splats:
             return True
             
-        # Get character's splat from the stats structure
+        character_splat = self._get_character_splat()
+        if not character_splat:
+            return False
+            
+        # Check if the character's splat matches any required splat
+        return character_splat in hangout.required_splats
+
+    def _get_character_splat(self):
+        """Get the caller's splat from the stats structure, once per command."""
+        if hasattr(self, "_character_splat"):
+            return self._character_splat
         try:
             stats = self.caller.db.stats
             if stats and 'other' in stats:
@@ -106,24 +118,15 @@ class CmdHangout(MuxCommand):
                 character_splat = None
         except (AttributeError, KeyError, TypeError):
             character_splat = None
-            
-        if not character_splat:
-            return False
-            
-        # Check if the character's splat matches any required splat
-        return character_splat in hangout.db.required_splats
+        self._character_splat = character_splat
+        return character_splat
 
-    def _get_hangout_by_id(self, hangout_id):
-        """Get a hangout by ID, with staff override for visibility."""
-        try:
-            hangout_id = int(hangout_id)
-            if self._check_staff_perms():
-                return HangoutDB.get_by_hangout_id(hangout_id)
-            else:
-                hangouts = HangoutDB.get_visible_hangouts(self.caller)
-                return next((h for h in hangouts if h.db.hangout_id == hangout_id), None)
-        except (ValueError, TypeError):
-            return None
+    def _get_visible_hangout(self, hangout_id):
+        """Get the directory entry for a hangout the caller can see."""
+        entry = directory.get_entry(hangout_id)
+        if entry and directory.can_see(entry, self.caller):
+            return entry
+        return None
 
     def _format_header(self, text):
         """Format a header with custom borders."""
@@ -141,34 +144,31 @@ class CmdHangout(MuxCommand):
             return
             
         # Check splat access for viewing details only if hangout is hidden
-        if hangout.db.hidden and hangout.db.required_splats and not self._has_splat_access(hangout):
+        if hangout.hidden and hangout.required_splats and not self._has_splat_access(hangout):
             self.caller.msg("You do not have access to view this hangout.")
             return
 
         # Get access requirements
         access_tags = []
-        if hangout.db.required_splats:
-            access_tags.extend(hangout.db.required_splats)
-        if hangout.db.required_merits:
-            access_tags.extend(hangout.db.required_merits)
-        if hangout.db.required_factions:
-            access_tags.extend(hangout.db.required_factions)
+        access_tags.extend(sorted(hangout.required_splats))
+        access_tags.extend(sorted(hangout.required_merits))
+        access_tags.extend(sorted(hangout.required_factions))
         
         access_display = "All" if not access_tags else ", ".join(access_tags)
 
         # Header
-        self.caller.msg(self._format_header(f"Hangout {hangout.db.hangout_id}"))
+        self.caller.msg(self._format_header(f"Hangout {hangout.hangout_id}"))
         
         # Info section with custom formatting
         self.caller.msg("|wName:|n " + hangout.key)
-        self.caller.msg("|wDistrict:|n " + hangout.db.district)
-        self.caller.msg("|wCategory:|n " + hangout.db.category)
+        self.caller.msg("|wDistrict:|n " + hangout.district)
+        self.caller.msg("|wCategory:|n " + hangout.category)
         self.caller.msg("|wAccess Tags:|n " + access_display)
         
         # Description section
         self.caller.msg(self._format_separator())
         self.caller.msg("|yDescription|n")
-        self.caller.msg(hangout.db.description)
+        self.caller.msg(hangout.description)
         self.caller.msg(self._format_separator())
 
     def _display_hangout_list(self, hangouts, show_all=False):
@@ -181,19 +181,14 @@ class CmdHangout(MuxCommand):
         district_groups = {}
         for h in hangouts:
             # Skip if hangout is hidden and user doesn't have splat access
-            if h.db.hidden and h.db.required_splats and not self._has_splat_access(h):
+            if h.hidden and h.required_splats and not self._has_splat_access(h):
                 continue
-                
-            # Ensure hangout has an ID before displaying
-            if h.db.hangout_id is None:
-                h.attributes.add("hangout_id", HangoutDB._get_next_hangout_id())
             
             # Check if the hangout has players before adding to district group
-            room = h.db.room
-            player_count = len([obj for obj in room.contents if obj.has_account]) if room else 0
+            player_count = directory.occupancy(h)
             
             if show_all or player_count > 0:
-                district = h.db.district or "Uncategorized"
+                district = h.district
                 if district not in district_groups:
                     district_groups[district] = []
                 district_groups[district].append((h, player_count))
@@ -216,12 +211,12 @@ class CmdHangout(MuxCommand):
             self.caller.msg(f"|w{district}|n")
             
             # Display hangouts in this district, sorted by hangout_id
-            district_hangouts = sorted(district_groups[district], key=lambda x: x[0].db.hangout_id)
+            district_hangouts = sorted(district_groups[district], key=lambda x: x[0].hangout_id)
             for hangout, player_count in district_hangouts:
-                number, info_line, desc_line = hangout.get_display_entry(show_restricted=True)
+                number, info_line, desc_line = directory.display_entry(hangout, show_restricted=True)
                 
                 # Format the hangout ID to be right-aligned in 3 spaces
-                formatted_id = str(hangout.db.hangout_id).rjust(3)
+                formatted_id = str(number).rjust(3)
                 self.caller.msg(f"{formatted_id} | {info_line}")
                 self.caller.msg(desc_line)
 
@@ -278,19 +273,18 @@ class CmdHangout(MuxCommand):
                     return
                     
                 hangout_id = int(self.args)
-                hangouts = HangoutDB.get_visible_hangouts(self.caller)
-                hangout = next((h for h in hangouts if h.db.hangout_id == hangout_id), None)
+                hangout = self._get_visible_hangout(hangout_id)
                 
                 if not hangout:
                     self.caller.msg("That hangout was not found or is not accessible.")
                     return
                 
                 # Check splat requirements for teleporting only if hangout is hidden
-                if hangout.db.hidden and hangout.db.required_splats and not self._has_splat_access(hangout):
+                if hangout.hidden and hangout.required_splats and not self._has_splat_access(hangout):
                     self.caller.msg("You do not have the required splat type to access this location.")
                     return
                     
-                room = hangout.db.room
+                room = ObjectDB.objects.filter(id=hangout.room_id).first() if hangout.room_id else None
                 if not room:
                     self.caller.msg("That hangout's location is not properly set up.")
                     return
@@ -346,7 +340,7 @@ class CmdHangout(MuxCommand):
                 return
 
             hangout_id, value = self.args.split("=", 1)
-            hangout = self._get_hangout_by_id(hangout_id)
+            hangout = HangoutDB.get_by_hangout_id(hangout_id.strip())
             
             if not hangout:
                 self.caller.msg("Invalid hangout ID.")
@@ -409,8 +403,7 @@ class CmdHangout(MuxCommand):
         # Handle viewing a specific hangout (no switches)
         try:
             hangout_id = int(self.args)
-            hangouts = HangoutDB.get_visible_hangouts(self.caller)
-            hangout = next((h for h in hangouts if h.db.hangout_id == hangout_id), None)
+            hangout = self._get_visible_hangout(hangout_id)
             
             if not hangout:
                 self.caller.msg("That hangout was not found or is not accessible.")
@@ -3,7 +3,6 @@ from world.plots.models import Plot, Session, STATUS_CHOICES, RISK_LEVEL_CHOICES
 from evennia.utils.utils import crop, list_to_string
 from django.utils import timezone
 from datetime import datetime, timedelta
-import pytz
 from world.utils.time_utils import TIME_MANAGER
 
 class CmdPlots(MuxCommand):
@@ -70,21 +69,7 @@ class CmdPlots(MuxCommand):
 
     def format_datetime(self, dt, target_char=None):
         """Format datetime in the user's timezone."""
-        if not target_char:
-            target_char = self.caller
-            
-        # Get the caller's timezone
-        tz_name = target_char.attributes.get("timezone", "UTC")
-        try:
-            # Try to get the timezone from pytz
-            tz = pytz.timezone(TIME_MANAGER.normalize_timezone_name(tz_name))
-            # Convert to the caller's timezone
-            local_dt = dt.astimezone(tz)
-            # Format without timezone indicator
-            return local_dt.strftime("%Y-%m-%d %H:%M")
-        except (pytz.exceptions.UnknownTimeZoneError, AttributeError, ValueError):
-            # Fallback to UTC if there's any error
-            return dt.strftime("%Y-%m-%d %H:%M")
+        return TIME_MANAGER.format_times([dt], target_char or self.caller)[0]
 
     def list_plots(self):
         """Display all active plots"""
@@ -8,6 +8,7 @@ import time
 from evennia import SESSION_HANDLER as evennia
 from evennia.utils import utils
 from world.utils.formatting import header, footer, divider
+from world.utils.layout import columns, pad
 from evennia.utils.utils import class_from_module
 from evennia.utils.ansi import strip_ansi
 from django.conf import settings
@@ -170,53 +171,38 @@ class CmdWho(COMMAND_DEFAULT_CLASS):
 
 class CmdCensus(COMMAND_DEFAULT_CLASS):
     """
-    Show a census of the current population in the game.
-    +census will show a list of different splats and their counts.
-    +census/<splat> will show a list of clans, traditions, tribes, etc. from that splat.
-    +census/<stat_category> will show a list of how many players have a particular stat in a category.
+    Show a census of the approved characters in the game.
 
     Usage:
-      +census      - Shows a list of players by role.     
-      +census/gang - Shows a list of gangs and their player counts.
-      +census/zoner - Shows a list of zoners and their player counts.
-      +census/corporate - Shows a list of corporations and their player counts.
-      +census/street - Shows a list of street gangs and their player counts.
-      +census/nomad - Shows a list of nomads and their player counts.
+      +census         - Shows how many characters there are of each role.
+      +census/stats   - Shows how many characters have each stat in each range.
+      +census/groups  - Shows how many groups there are of each size.
+
+    Counts are kept up to date as characters are approved, change their
+    stats or join and leave groups.
     """
     key = "+census"
     aliases = ["census"]
     locks = "cmd:all()"
     help_category = "Game Info"
 
-    def get_faction_counts(self):
-        """Get counts of approved characters by splat type."""
-        from evennia.objects.models import ObjectDB
-        from collections import defaultdict
-        
-        VALID_FACTIONS = {
-            'gang': 'Gang',
-            'zoner': 'Zoner',
-            'corporate': 'Corporate',
-            'street': 'Street',
-            'nomad': 'Nomad',
-            'other': 'Other',
-        }
-        
-        faction_counts = defaultdict(int)
-        characters = ObjectDB.objects.filter(
-            db_typeclass_path__contains='typeclasses.characters.Character'
-        )
-        
-        for char in characters:
-            if not hasattr(char, 'db') or not char.db.stats or not char.db.approved:
-                continue
-                
-            splat = char.db.stats.get('other', {}).get('splat', {}).get('Splat', {}).get('perm', '')
-            if not splat or splat.lower() in ['none', 'unknown']:
-                continue
-                
-            normalized_faction = VALID_FACTIONS.get(faction.lower(), faction)
-            faction_counts[normalized_faction] += 1
-                
-        return dict(faction_counts)
+    def format_counts(self, counts, title):
+        """Format counts as a two-column table, largest first."""
+        if not counts:
+            return f"No {title.lower()} found."
+        rows = sorted(counts.items(), key=lambda item: (-item[1], item[0]))
+        cells = [pad(name, 30) + pad(count, 5, ">") for name, count in rows]
+        return header(title, width=78) + columns(cells, column_width=35, separator="  ") + footer(width=78)
 
+    def func(self):
+        from world import census
+
+        if "stats" in self.switches:
+            self.msg(self.format_counts(census.get_counts("stats"), "Stat Ranges"))
+        elif "groups" in self.switches:
+            self.msg(self.format_counts(census.get_counts("group sizes"), "Group Sizes"))
+        elif self.switches:
+            self.msg("Usage: +census, +census/stats or +census/groups")
+        else:
+            self.msg(self.format_counts(census.get_counts("role"), "Roles"))
+            self.msg(f"{census.get_total()} approved characters.")
@@ -7,9 +7,10 @@ from evennia.utils.evtable import EvTable
 from .character_commands import CmdSheet
 from evennia.utils.search import search_object
 from evennia.objects.models import ObjectDB
-from world.languages.language_dictionary import LANGUAGES
+from world.languages.language_dictionary import get_language, sync_languages
+from world.utils import logs
 from world.cyberpunk_sheets.models import CharacterSheet
-from world.languages.models import Language, CharacterLanguage
+from world.languages.models import CharacterLanguage
 from evennia.utils import logger
 from world.inventory.models import Gear
 from world.equipment_data import populate_weapons, populate_armor, populate_gear, populate_all_equipment
@@ -796,6 +797,23 @@ class CmdAssociateAllCharacterSheets(Command):
 
         self.caller.msg(f"Associated {associated_count} characters with their character sheets.")
 
+class CmdLinkInventories(Command):
+    """
+    Link inventories that are only attached to a character sheet directly
+    to the sheet's character, so they can be found without going through
+    the sheet. Only needs running once after upgrading.
+
+    Usage:
+      linkinventories
+    """
+    key = "linkinventories"
+    locks = "cmd:perm(Admin)"
+
+    def func(self):
+        from world.inventory.items import link_inventories
+        linked = link_inventories()
+        self.caller.msg(f"Linked {linked} inventories to their characters.")
+
 class CmdViewSheetAttributes(Command):
     """
     View all attributes of a specific character sheet.
@@ -904,7 +922,7 @@ class CmdVerifySheets(Command):
                 self.stdout.write(f"Created new character sheet for {char.key}")
             
             # Ensure Streetslang is added
-            streetslang, _ = Language.objects.get_or_create(name="Streetslang")
+            streetslang = get_language("Streetslang")
             CharacterLanguage.objects.get_or_create(
                 character_sheet=sheet,
                 language=streetslang,
@@ -930,28 +948,7 @@ class CmdSyncLanguages(Command):
 
     def func(self):
         try:
-            added = 0
-            updated = 0
-            removed = 0
-
-            for lang_data in LANGUAGES:
-                lang, created = Language.objects.update_or_create(
-                    name=lang_data['name'],
-                    defaults={
-                        'local': lang_data['local'],
-                        'corporate': lang_data['corporate']
-                    }
-                )
-                if created:
-                    added += 1
-                else:
-                    updated += 1
-
-            # Remove languages that are in the database but not in LANGUAGES
-            db_languages = set(Language.objects.values_list('name', flat=True))
-            list_languages = set(lang['name'] for lang in LANGUAGES)
-            languages_to_remove = db_languages - list_languages
-            removed = Language.objects.filter(name__in=languages_to_remove).delete()[0]
+            added, updated, removed = sync_languages(update_flags=True, prune=True)
 
             self.caller.msg(f"Languages synced successfully:")
             self.caller.msg(f"Added: {added}")
@@ -963,6 +960,45 @@ class CmdSyncLanguages(Command):
         except Exception as e:
             self.caller.msg(f"An error occurred: {str(e)}")
 
+class CmdLogLevel(Command):
+    """
+    View or change the log level of game subsystems
+
+    Usage:
+      loglevel
+      loglevel <subsystem>=<level>
+      loglevel <subsystem>=
+
+    Subsystems are the cyberpunk.* loggers, such as time, events, sheets or
+    cyberware. Levels are DEBUG, INFO, WARNING and ERROR; leave the level
+    empty to go back to the default. Changes last until the next reload.
+    DEBUG output is sampled and rate limited, so it is safe to turn on for
+    a busy subsystem.
+    """
+
+    key = "loglevel"
+    locks = "cmd:perm(Admin)"
+    help_category = "Admin"
+
+    def func(self):
+        if "=" not in self.args:
+            table = EvTable("Logger", "Level", border="cells")
+            for name, level in logs.get_levels().items():
+                table.add_row(name, level)
+            self.caller.msg(str(table))
+            return
+
+        subsystem, level = (part.strip() for part in self.args.split("=", 1))
+        subsystem = subsystem.lower()
+        if subsystem.startswith(logs.ROOT):
+            subsystem = subsystem[len(logs.ROOT):].lstrip(".")
+        if level.upper() not in ("", "DEBUG", "INFO", "WARNING", "ERROR"):
+            self.caller.msg("Level must be one of DEBUG, INFO, WARNING or ERROR.")
+            return
+        logs.set_level(subsystem, level)
+        name = f"{logs.ROOT}.{subsystem}" if subsystem else logs.ROOT
+        self.caller.msg(f"{name} is now logging at {logs.get_levels()[name]}.")
+
 class CmdSummon(AdminCommand):
     """
     Summon a player to your location.
@@ -1,11 +1,5 @@
 #commands/bbs/bbs_all_commands.py
 
-# Standard Library Imports
-from datetime import datetime
-
-# Django Imports
-from django.utils import timezone
-
 # Evennia Imports
 from evennia import default_cmds
 from evennia import create_object
@@ -15,8 +9,8 @@ from evennia.server.sessionhandler import SESSION_HANDLER
 from typeclasses.bbs_controller import BBSController
 from world.utils.bbs_utils import get_or_create_bbs_controller
 from world.factions.models import Roster
-import pytz
 from world.utils.time_utils import TIME_MANAGER
+from world.utils.layout import Table
 
 class CmdBBS(default_cmds.MuxCommand):
     """
@@ -154,55 +148,15 @@ class CmdBBS(default_cmds.MuxCommand):
 
     def format_datetime(self, dt_str, target_char=None):
         """Format datetime string in the user's timezone."""
-        if not target_char:
-            target_char = self.caller
-            
-        try:
-            # Parse the datetime string to a datetime object
-            dt = datetime.strptime(dt_str, "%Y-%m-%d %H:%M:%S")
-            dt = dt.replace(tzinfo=timezone.utc)
-            
-            # Get the caller's timezone
-            tz_name = target_char.attributes.get("timezone", "UTC")
-            try:
-                # Try to get the timezone from pytz
-                tz = pytz.timezone(TIME_MANAGER.normalize_timezone_name(tz_name))
-                # Convert to the caller's timezone
-                local_dt = dt.astimezone(tz)
-                # Format without timezone indicator
-                return local_dt.strftime("%Y-%m-%d %H:%M")
-            except (pytz.exceptions.UnknownTimeZoneError, AttributeError, ValueError):
-                # Fallback to UTC if there's any error
-                return dt.strftime("%Y-%m-%d %H:%M")
-        except ValueError:
-            # If we can't parse the datetime string, return it as is
-            return dt_str
+        return self.format_datetimes([dt_str], target_char)[0]
+
+    def format_datetimes(self, dt_strs, target_char=None):
+        """Format a listing's datetime strings in the user's timezone."""
+        return TIME_MANAGER.format_times(dt_strs, target_char or self.caller)
             
     def format_date(self, dt_str, target_char=None):
         """Format datetime string in the user's timezone, showing only the date."""
-        if not target_char:
-            target_char = self.caller
-            
-        try:
-            # Parse the datetime string to a datetime object
-            dt = datetime.strptime(dt_str, "%Y-%m-%d %H:%M:%S")
-            dt = dt.replace(tzinfo=timezone.utc)
-            
-            # Get the caller's timezone
-            tz_name = target_char.attributes.get("timezone", "UTC")
-            try:
-                # Try to get the timezone from pytz
-                tz = pytz.timezone(TIME_MANAGER.normalize_timezone_name(tz_name))
-                # Convert to the caller's timezone
-                local_dt = dt.astimezone(tz)
-                # Format without timezone indicator, only date
-                return local_dt.strftime("%Y-%m-%d")
-            except (pytz.exceptions.UnknownTimeZoneError, AttributeError, ValueError):
-                # Fallback to UTC if there's any error
-                return dt.strftime("%Y-%m-%d")
-        except ValueError:
-            # If we can't parse the datetime string, return it as is
-            return dt_str
+        return TIME_MANAGER.format_times([dt_str], target_char or self.caller, "%Y-%m-%d")[0]
 
     def func(self):
         # Check for --asPlayer option
@@ -791,6 +745,32 @@ class CmdBBS(default_cmds.MuxCommand):
             
         self.caller.msg(f"All posts in board '{board['name']}' have been marked as read.")
 
+    def board_table(self):
+        """Table layout for board listings."""
+        return Table(
+            ("ID", 3), ("Access", 6), ("", 1), ("Name", 29),
+            ("Last Post", 15), ("# msgs", 8), ("Unread", 6)
+        )
+
+    def post_table(self):
+        """Table layout for post listings."""
+        return Table(("ID", 7), ("", 1), ("Message", 39), ("Posted", 15), ("By", 12))
+
+    def add_post_rows(self, table, controller, board, posts, viewer):
+        """Add (post_id, post) pairs to a post listing as seen by `viewer`."""
+        posted = self.format_datetimes([post['created_at'] for _, post in posts], viewer)
+        for (post_id, post), formatted_time in zip(posts, posted):
+            self.add_post_row(table, controller, board, post_id, post, viewer, formatted_time)
+
+    def add_post_row(self, table, controller, board, post_id, post, viewer, formatted_time=None):
+        """Add a post to a post listing as seen by `viewer`."""
+        if formatted_time is None:
+            formatted_time = self.format_datetime(post['created_at'], viewer)
+        is_unread = controller.is_post_unread(board['id'], post_id - 1, viewer.key)
+        unread_flag = "|rU|n" if is_unread else " "
+        pinned = "[Pinned] " if post.get('pinned', False) else ""
+        table.add_row(f"{board['id']}/{post_id}", unread_flag, f"{pinned}|w{post['title']}|n", formatted_time, post['author'])
+
     def list_boards(self, controller):
         """List all available boards."""
         boards = controller.db.boards
@@ -804,7 +784,8 @@ class CmdBBS(default_cmds.MuxCommand):
         # Table Header
         output = []
         output.append(f"{'|b=|n'*78}")
-        output.append("|w{:<3} {:<8} {:<29} {:<15} {:<10} {:<7}|n".format("ID", "Access", "Name", "Last Post", "# msgs", "Unread"))
+        table = self.board_table()
+        output.append(table.header_line())
         output.append(f"{'|b-|n'*78}")
 
         # Sort boards by ID and convert to list of tuples
@@ -848,11 +829,10 @@ class CmdBBS(default_cmds.MuxCommand):
             unread_count = len(unread_posts)
             unread_display = str(unread_count) if unread_count > 0 else "-"
 
-            # Fix alignment by using format string with exact spacing
-            output.append("{:<3} {:<8} {:<1} |w{:<29}|n {:<15} {:<10} {:<7}".format(
-                board_id, access_type, read_only, board['name'], last_post, num_posts, unread_display))
+            table.add_row(board_id, access_type, read_only, f"|w{board['name']}|n", last_post, num_posts, unread_display)
 
         # Table Footer
+        output.extend(table.row_lines())
         output.append(f"{'|b-|n'*78}")
         output.append("* = read only")
         
@@ -876,9 +856,9 @@ class CmdBBS(default_cmds.MuxCommand):
             self.caller.msg(f"You do not have access to view posts on the board '{board['name']}'.")
             return
 
-        posts = board['posts']
-        pinned_posts = [post for post in posts if post.get('pinned', False)]
-        unpinned_posts = [post for post in posts if not post.get('pinned', False)]
+        posts = list(enumerate(board['posts'], start=1))
+        pinned_posts = [(post_id, post) for post_id, post in posts if post.get('pinned', False)]
+        unpinned_posts = [(post_id, post) for post_id, post in posts if not post.get('pinned', False)]
 
         # Table Header
         output = []
@@ -903,24 +883,13 @@ class CmdBBS(default_cmds.MuxCommand):
         elif roster_names:
             output.append("|yThis board is restricted to specific rosters|n")
 
-        output.append("|w{:<5} {:<1} {:<30} {:<15} {:<15}|n".format("ID", "", "Message", "Posted", "By"))
+        table = self.post_table()
+        output.append(table.header_line())
         output.append(f"{'|b-|n'*78}")
 
-        # List pinned posts first with correct IDs
-        for i, post in enumerate(pinned_posts):
-            post_id = posts.index(post) + 1
-            formatted_time = self.format_datetime(post['created_at'])
-            is_unread = controller.is_post_unread(board['id'], post_id - 1, self.caller.key)
-            unread_flag = "|rU|n" if is_unread else " "
-            output.append(f"{board['id']}/{post_id:<5} {unread_flag:<1} [Pinned] |w{post['title']:<30}|n {formatted_time:<15} {post['author']}")
-
-        # List unpinned posts with correct IDs
-        for post in unpinned_posts:
-            post_id = posts.index(post) + 1
-            formatted_time = self.format_datetime(post['created_at'])
-            is_unread = controller.is_post_unread(board['id'], post_id - 1, self.caller.key)
-            unread_flag = "|rU|n" if is_unread else " "
-            output.append(f"{board['id']}/{post_id:<5} {unread_flag:<1} |w{post['title']:<30}|n {formatted_time:<15} {post['author']}")
+        # List pinned posts first, keeping their board order IDs
+        self.add_post_rows(table, controller, board, pinned_posts + unpinned_posts, self.caller)
+        output.extend(table.row_lines())
 
         # Table Footer
         output.append(f"{'|b=|n'*78}")
@@ -1049,9 +1018,9 @@ class CmdBBS(default_cmds.MuxCommand):
         if not board:
             return
 
-        posts = board['posts']
-        pinned_posts = [post for post in posts if post.get('pinned', False)]
-        unpinned_posts = [post for post in posts if not post.get('pinned', False)]
+        posts = list(enumerate(board['posts'], start=1))
+        pinned_posts = [(post_id, post) for post_id, post in posts if post.get('pinned', False)]
+        unpinned_posts = [(post_id, post) for post_id, post in posts if not post.get('pinned', False)]
 
         # Table Header
         output = []
@@ -1064,24 +1033,13 @@ class CmdBBS(default_cmds.MuxCommand):
         elif board.get('roster_names'):
             output.append("|yThis board is restricted to specific rosters|n")
 
-        output.append("|w{:<5} {:<1} {:<30} {:<15} {:<15}|n".format("ID", "", "Message", "Posted", "By"))
+        table = self.post_table()
+        output.append(table.header_line())
         output.append(f"{'|b-|n'*78}")
 
-        # List pinned posts first with correct IDs
-        for i, post in enumerate(pinned_posts):
-            post_id = posts.index(post) + 1
-            formatted_time = self.format_datetime(post['created_at'], target_player)
-            is_unread = controller.is_post_unread(board['id'], post_id - 1, target_player.key)
-            unread_flag = "|rU|n" if is_unread else " "
-            output.append(f"{board['id']}/{post_id:<5} {unread_flag:<1} [Pinned] |w{post['title']:<30}|n {formatted_time:<15} {post['author']}")
-
-        # List unpinned posts with correct IDs
-        for post in unpinned_posts:
-            post_id = posts.index(post) + 1
-            formatted_time = self.format_datetime(post['created_at'], target_player)
-            is_unread = controller.is_post_unread(board['id'], post_id - 1, target_player.key)
-            unread_flag = "|rU|n" if is_unread else " "
-            output.append(f"{board['id']}/{post_id:<5} {unread_flag:<1} |w{post['title']:<30}|n {formatted_time:<15} {post['author']}")
+        # List pinned posts first, keeping their board order IDs
+        self.add_post_rows(table, controller, board, pinned_posts + unpinned_posts, target_player)
+        output.extend(table.row_lines())
 
         # Table Footer
         output.append(f"{'|b=|n'*78}")
@@ -1099,7 +1057,8 @@ class CmdBBS(default_cmds.MuxCommand):
         output = []
         output.append(f"{'|b=|n'*78}")
         output.append(f"|wBoards visible to {target_player.key}:|n")
-        output.append("|w{:<3} {:<8} {:<29} {:<15} {:<10} {:<7}|n".format("ID", "Access", "Name", "Last Post", "# msgs", "Unread"))
+        table = self.board_table()
+        output.append(table.header_line())
         output.append(f"{'|b-|n'*78}")
 
         # Sort boards by ID and convert to list of tuples
@@ -1137,11 +1096,10 @@ class CmdBBS(default_cmds.MuxCommand):
             unread_count = len(unread_posts)
             unread_display = str(unread_count) if unread_count > 0 else "-"
 
-            # Fix alignment by using format string with exact spacing
-            output.append("{:<3} {:<8} {:<1} |w{:<29}|n {:<15} {:<10} {:<7}".format(
-                board_id, access_type, read_only, board['name'], last_post, num_posts, unread_display))
+            table.add_row(board_id, access_type, read_only, f"|w{board['name']}|n", last_post, num_posts, unread_display)
 
         # Table Footer
+        output.extend(table.row_lines())
         output.append(f"{'|b-|n'*78}")
         output.append("* = read only")
         output.append(f"{'|b=|n'*78}")
@@ -15,11 +15,19 @@ class CmdRoom(MuxCommand):
       +room/res <room dbref or here>=<value>      - Set room resources
       +room/type <room dbref or here>=<type>      - Set room type
       +room/unfindable <room dbref or here>=<on/off> - Set room findability
+      +room/values <room dbref or here>=<order> <infrastructure> <resolve>
+                                                  - Set location values
+      +room/rollup                                - Rebuild all district and
+                                                    sector averages
 
     Examples:
       +room/res here=4                - Set current room's resources to 4
       +room/type #123=Beach Town     - Set room #123's type to Beach Town
       +room/unfindable here=on       - Make current room unfindable
+      +room/values here=3 4 2        - Set order 3, infrastructure 4, resolve 2
+
+    Changing a location's values updates the averages of its sector and
+    district straight away. /rollup recomputes them all from scratch.
     """
 
     key = "+room"
@@ -53,6 +61,12 @@ class CmdRoom(MuxCommand):
 
         switch = self.switches[0]
 
+        if switch == "rollup":
+            from typeclasses.rooms import rebuild_rollups
+            rebuilt = rebuild_rollups()
+            self.caller.msg(f"Rebuilt location averages for {rebuilt} districts and sectors.")
+            return
+
         # All other switches require a value
         if not self.rhs:
             self.caller.msg(f"Usage: +room/{switch} [<room>]=<value>")
@@ -85,6 +99,19 @@ class CmdRoom(MuxCommand):
             room.db.unfindable = (setting == "on")
             self.caller.msg(f"{room.get_display_name(self.caller)} is now {'unfindable' if setting == 'on' else 'findable'}.")
 
+        elif switch == "values":
+            try:
+                order, infrastructure, resolve = (int(value) for value in self.rhs.split())
+            except ValueError:
+                self.caller.msg("Usage: +room/values <room>=<order> <infrastructure> <resolve>")
+                return
+
+            room.set_values(order=order, infrastructure=infrastructure, resolve=resolve)
+            self.caller.msg(
+                f"Set order {order}, infrastructure {infrastructure} and resolve {resolve} "
+                f"for {room.get_display_name(self.caller)}."
+            )
+
     def access(self, srcobj, access_type="cmd", default=False):
         """
         Override the access check. Allow if:
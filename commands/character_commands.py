@@ -242,6 +242,12 @@ class CmdSheet(MuxCommand):
         for row in basic_info:
             output += f"|c{row[0]:<20}|n {row[1]:<20} |c{row[2]:<15}|n {row[3]:<20}\n"
 
+        # Points still to spend, until the character is approved
+        sheet = getattr(target, 'character_sheet', None)
+        if sheet and not target.tags.has("approved", category="approval"):
+            remaining_stat_points, remaining_skill_points = sheet.get_remaining_points()
+            output += f"|c{'Remaining Points:':<20}|n Stat Points: {remaining_stat_points}, Skill Points: {remaining_skill_points}\n"
+
         # Stats
         output += divider("STATS", width=80, fillchar="|m-|n") + "\n"
         stats = [
@@ -274,13 +280,14 @@ class CmdSheet(MuxCommand):
         # Equipment
         output += divider("Equipment", width=80, fillchar="|m-|n") + "\n"
         try:
-            from world.inventory.models import Inventory
-            inv, _ = Inventory.get_or_create_for_character(target)
+            from world.inventory.items import get_inventory, get_loadout
+            inv = get_inventory(target)
         except Exception as e:
             logger.log_err(f"Error retrieving inventory for {target}: {str(e)}")
             output += "Error retrieving inventory\n"
         else:
-            weapons = inv.weapons.all() if hasattr(inv, 'weapons') else []
+            loadout = get_loadout(inv)
+            weapons = [item.weapon for item in loadout.weapons]
             if weapons:
                 output += "|cWeapons:|n\n"
                 for weapon in weapons:
@@ -291,7 +298,7 @@ class CmdSheet(MuxCommand):
             else:
                 output += "Weapons: None\n"
 
-            armor = inv.armor.all() if hasattr(inv, 'armor') else []
+            armor = [item.armor for item in loadout.armor]
             if armor:
                 output += "|cArmor:|n\n"
                 for piece in armor:
@@ -299,10 +306,10 @@ class CmdSheet(MuxCommand):
             else:
                 output += "Armor: None\n"
 
-            gear = inv.gear.all() if hasattr(inv, 'gear') else []
+            gear = loadout.gear
             if gear:
                 output += "|cGear:|n\n"
-                gear_list = [f"- {item.name}" for item in gear]
+                gear_list = [f"- {item}" for item in gear]
                 max_items = max(4, ceil(len(gear_list) / 2))  # At least 4 items in first column
                 col1 = gear_list[:max_items]
                 col2 = gear_list[max_items:]
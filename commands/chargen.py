@@ -2,8 +2,7 @@ import traceback
 from django.conf import settings
 from evennia import Command, CmdSet
 from world.jobs.models import Job
-from world.languages.language_dictionary import LANGUAGES
-from world.languages.models import Language
+from world.languages.language_dictionary import get_language, get_language_info
 from world.utils.character_utils import ALL_ATTRIBUTES, SKILL_MAPPING, STAT_MAPPING, get_full_attribute_name
 from world.cyberpunk_sheets.models import CharacterSheet
 from evennia.utils import evmenu
@@ -740,19 +739,14 @@ class CmdSetLanguage(MuxCommand):
             self.caller.msg("Please provide a valid language name and level (1-10).")
             return
 
-        language_info = next((lang for lang in LANGUAGES if lang["name"].lower() == language_name.lower()), None)
+        # Catalogue languages first, then any others in the database
+        language = get_language_info(language_name) or get_language(language_name, create=False)
 
-        if language_info:
-            char.add_language(language_info["name"], level)
-            self.caller.msg(f"Added {language_info['name']} at level {level} to your languages.")
+        if language:
+            char.add_language(language.name, level)
+            self.caller.msg(f"Added {language.name} at level {level} to your languages.")
         else:
-            # If not found in LANGUAGES, try to get it from the database
-            try:
-                language_obj = Language.objects.get(name__iexact=language_name)
-                char.add_language(language_obj.name, level)
-                self.caller.msg(f"Added {language_obj.name} at level {level} to your languages.")
-            except Language.DoesNotExist:
-                self.caller.msg(f"Language '{language_name}' not found. Please check the spelling and try again.")
+            self.caller.msg(f"Language '{language_name}' not found. Please check the spelling and try again.")
 
 class CmdLifepath(Command):
     """
@@ -3,6 +3,7 @@ from evennia.commands.default.muxcommand import MuxCommand
 from evennia.utils.evtable import EvTable
 from world.cyberpunk_sheets.models import CharacterSheet
 from world.inventory.models import Weapon, Armor, Inventory, Ammunition, AmmoType
+from world.inventory.items import find_ammo, get_equipped, get_inventory
 from enum import Enum
 
 class WoundState(Enum):
@@ -212,19 +213,14 @@ def attack(character, combat_handler, target_name, *args):
     if not target:
         return f"No target named '{target_name}' found."
     
-    # Check if the character has an equipped weapon in inventory
-    weapon = None
-    if hasattr(character, 'inventory') and character.inventory:
-        weapon = character.db.equipped_weapon
-    
-    # Fallback to character sheet for backward compatibility
-    if not weapon and hasattr(character, 'character_sheet'):
-        weapon = character.character_sheet.eqweapon
-    
-    if not weapon:
+    # The character's own copy of their equipped weapon; its template is
+    # shared with everyone else who owns one, so only read stats from that
+    equipped = get_equipped(get_inventory(character, create=False), "weapon")
+    if not equipped:
         return f"{character.name} has no equipped weapon."
+    weapon = equipped.weapon
     
-    if weapon.current_ammo <= 0:
+    if equipped.current_ammo <= 0:
         return f"{character.name}'s {weapon.name} is out of ammo!"
     
     # Calculate distance and get the appropriate DV
@@ -265,13 +261,8 @@ def attack(character, combat_handler, target_name, *args):
         is_critical = check_critical(damage_rolls)
 
         # Get target's armor
-        target_armor = None
-        if hasattr(target, 'inventory') and target.inventory:
-            target_armor = target.db.equipped_armor
-        
-        # Fallback to character sheet for backward compatibility
-        if not target_armor and hasattr(target, 'character_sheet'):
-            target_armor = target.character_sheet.eqarmor
+        equipped_armor = get_equipped(get_inventory(target, create=False), "armor")
+        target_armor = equipped_armor.armor if equipped_armor else None
         
         armor_sp = target_armor.sp if target_armor else 0
 
@@ -292,8 +283,8 @@ def attack(character, combat_handler, target_name, *args):
             target.character_sheet.take_damage(damage_after_armor)
         
         # Reduce ammo
-        weapon.current_ammo -= 1
-        weapon.save()
+        equipped.current_ammo -= 1
+        equipped.save(update_fields=["current_ammo"])
 
         result = f"{character.name} attacks {target.name} with {weapon.name} at {distance}m for {damage_after_armor} damage!"
 
@@ -324,8 +315,8 @@ def attack(character, combat_handler, target_name, *args):
             combat_handler.remove_combatant(target)
     else:
         result = f"{character.name}'s attack on {target.name} at {distance}m missed! (Roll: {attack_roll}, needed: {range_dv})"
-        weapon.current_ammo -= 1
-        weapon.save()
+        equipped.current_ammo -= 1
+        equipped.save(update_fields=["current_ammo"])
 
     return result
 
@@ -591,38 +582,21 @@ class CmdCombat(MuxCommand):
     def reload_weapon(self):
         character = self.caller
         
-        # Get equipped weapon
-        weapon = None
-        if hasattr(character.db, 'equipped_weapon'):
-            weapon = character.db.equipped_weapon
-        
-        # Fallback to character sheet
-        if not weapon and hasattr(character, 'character_sheet'):
-            weapon = character.character_sheet.eqweapon
-
-        if not weapon:
+        inventory = get_inventory(character)
+        equipped = get_equipped(inventory, "weapon")
+        if not equipped:
             character.msg("You don't have a weapon equipped.")
             return
-
-        # Get inventory
-        inventory = None
-        if hasattr(character, 'inventory'):
-            inventory = character.inventory
-        elif hasattr(character, 'character_sheet'):
-            inventory = character.character_sheet.inventory
-            
-        if not inventory:
-            character.msg("You don't have an inventory to get ammunition from.")
-            return
+        weapon = equipped.weapon
 
         # Find appropriate ammunition
-        ammo = inventory.ammunition.filter(ammo_type=weapon.ammo_type).first()
+        ammo = find_ammo(inventory, weapon.ammo_type)
 
         if not ammo:
             character.msg(f"You don't have any {weapon.ammo_type} ammunition in your inventory.")
             return
 
-        reloaded = weapon.reload(ammo)
+        reloaded = equipped.reload(ammo)
         if reloaded:
             character.msg(f"You reload your {weapon.name} with {reloaded} rounds of {weapon.ammo_type} ammunition.")
         else:
@@ -2,8 +2,8 @@ from evennia import default_cmds
 from evennia.commands.default.muxcommand import MuxCommand
 from evennia.utils import ansi
 from commands.commonmux.CmdPose import PoseBreakMixin
+from world.utils.audience import fan_out
 from utils.text import process_special_characters
-import re
 
 class CmdEmit(PoseBreakMixin, MuxCommand):
     """
@@ -55,86 +55,26 @@ class CmdEmit(PoseBreakMixin, MuxCommand):
                 caller.msg("You need to set a speaking language first with +language <language>")
                 return
 
-        # Filter receivers based on reality layers
-        filtered_receivers = []
-        for obj in caller.location.contents:
-            if not obj.has_account:
-                continue
-            
-            # Check reality layer tags
-            caller_in_umbra = caller.tags.get("in_umbra", category="state")
-            caller_in_material = caller.tags.get("in_material", category="state")
-            caller_in_dreaming = caller.tags.get("in_dreaming", category="state")
-            
-            obj_in_umbra = obj.tags.get("in_umbra", category="state")
-            obj_in_material = obj.tags.get("in_material", category="state")
-            obj_in_dreaming = obj.tags.get("in_dreaming", category="state")
-            
-            # Check if they share the same reality layer
-            # If neither has any tags, assume they're both in normal reality
-            if (caller_in_umbra and obj_in_umbra) or \
-               (caller_in_material and obj_in_material) or \
-               (caller_in_dreaming and obj_in_dreaming) or \
-               (not any([caller_in_umbra, caller_in_material, caller_in_dreaming]) and 
-                not any([obj_in_umbra, obj_in_material, obj_in_dreaming])):
-                filtered_receivers.append(obj)
-
-        # Send pose break before the message
-        self.send_pose_break()
-
         if 'language' in self.switches:
             # The entire emit is in the set language
             speaking_language = caller.get_speaking_language()
-            _, msg_understand, msg_not_understand, _ = caller.prepare_say(processed_args, language_only=True, skip_english=True)
-
-            for receiver in filtered_receivers:
-                has_universal = any(
-                    merit.lower().replace(' ', '') == 'universallanguage'
-                    for category in receiver.db.stats.get('merits', {}).values()
-                    for merit in category.keys()
-                )
-                
-                if receiver == caller or has_universal or speaking_language in receiver.get_languages():
-                    receiver.msg(msg_understand)
-                else:
-                    receiver.msg(msg_not_understand)
-        else:
+            _, understood, not_understood, _ = caller.prepare_say(processed_args, language_only=True, skip_english=True)
+        elif "~" in processed_args:
             # Handle mixed language content
-            for receiver in filtered_receivers:
-                if "~" in processed_args:
-                    parts = []
-                    current_pos = 0
-                    for match in re.finditer(r'"~([^"]+)"', processed_args):
-                        # Add text before the speech
-                        parts.append(processed_args[current_pos:match.start()])
-                        
-                        # Process the speech
-                        speech = match.group(1)
-                        _, msg_understand, msg_not_understand, _ = caller.prepare_say(speech, language_only=True, skip_english=True)
-                        
-                        # Check for Universal Language merit
-                        has_universal = any(
-                            merit.lower().replace(' ', '') == 'universallanguage'
-                            for category in receiver.db.stats.get('merits', {}).values()
-                            for merit in category.keys()
-                        )
-                        
-                        speaking_language = caller.get_speaking_language()
-                        if receiver == caller or has_universal or (speaking_language and speaking_language in receiver.get_languages()):
-                            parts.append(f'"{msg_understand}"')
-                        else:
-                            parts.append(f'"{msg_not_understand}"')
-                        
-                        current_pos = match.end()
-                    
-                    # Add any remaining text
-                    parts.append(processed_args[current_pos:])
-                    
-                    # Send the final message
-                    receiver.msg(''.join(parts))
-                else:
-                    # No language-tagged content, send as is
-                    receiver.msg(processed_args)
+            speaking_language = caller.get_speaking_language()
+            understood, not_understood = self.render_language_variants(processed_args)
+        else:
+            # No language-tagged content, send as is
+            understood = not_understood = processed_args
+            speaking_language = None
+
+        def message(receiver):
+            if self.understands(receiver, speaking_language):
+                return understood
+            return not_understood
+
+        # Pose break and emit go to everyone in the caller's reality layer
+        fan_out(caller, message, pose_break=self.get_pose_break())
 
         # Record scene activity
         caller.record_scene_activity()
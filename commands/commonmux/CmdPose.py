@@ -2,52 +2,71 @@ from evennia import default_cmds
 from evennia.commands.default.muxcommand import MuxCommand
 import re
 from utils.text import process_special_characters
+from world.utils.audience import fan_out
 
 class PoseBreakMixin:
     """
     A mixin to add pose breaks before commands.
     """
     def send_pose_break(self, exclude=None):
+        pose_break = self.get_pose_break()
+        if pose_break:
+            # Only those in the caller's reality layer see it; the caller always does
+            fan_out(self.caller, None, pose_break=pose_break, exclude=exclude)
+
+    def get_pose_break(self):
+        """
+        Get the pose break line, or None in OOC Areas.
+        """
         caller = self.caller
         
         # Check if the room is an OOC Area (by tag or roomtype)
         if hasattr(caller.location, 'db'):
             room_tags = getattr(caller.location.db, 'tags', []) or []
             if 'ooc' in room_tags or caller.location.db.roomtype == 'OOC Area':
-                return  # Don't send pose breaks in OOC Areas
-            
-        pose_break = f"\n|y{'=' * 30}> |w{caller.name}|n |y<{'=' * 30}|n"
-        
-        # Filter receivers based on reality layers
-        filtered_receivers = []
-        for obj in caller.location.contents:
-            if not obj.has_account:
-                continue
-            
-            # Check reality layer tags
-            caller_in_umbra = caller.tags.get("in_umbra", category="state")
-            caller_in_material = caller.tags.get("in_material", category="state")
-            caller_in_dreaming = caller.tags.get("in_dreaming", category="state")
-            
-            obj_in_umbra = obj.tags.get("in_umbra", category="state")
-            obj_in_material = obj.tags.get("in_material", category="state")
-            obj_in_dreaming = obj.tags.get("in_dreaming", category="state")
-            
-            # Check if they share the same reality layer
-            # If neither has any tags, assume they're both in normal reality
-            if (caller_in_umbra and obj_in_umbra) or \
-               (caller_in_material and obj_in_material) or \
-               (caller_in_dreaming and obj_in_dreaming) or \
-               (not any([caller_in_umbra, caller_in_material, caller_in_dreaming]) and 
-                not any([obj_in_umbra, obj_in_material, obj_in_dreaming])):
-                filtered_receivers.append(obj)
-        
-        for receiver in filtered_receivers:
-            if receiver != caller and (not exclude or receiver not in exclude):
-                receiver.msg(pose_break)
-        
-        # Always send the pose break to the caller
-        caller.msg(pose_break)
+                return None  # Don't send pose breaks in OOC Areas
+
+        return f"\n|y{'=' * 30}> |w{caller.name}|n |y<{'=' * 30}|n"
+
+    def render_language_variants(self, text):
+        """
+        Render text with "~speech" in the caller's speaking language.
+
+        Returns:
+            tuple: (text as understood, text as heard by everyone else)
+        """
+        understood = []
+        not_understood = []
+        current_pos = 0
+        for match in re.finditer(r'"~([^"]+)"', text):
+            # Text before the speech is the same for everyone
+            before = text[current_pos:match.start()]
+            _, msg_understand, msg_not_understand, _ = self.caller.prepare_say(
+                match.group(1), language_only=True, skip_english=True
+            )
+            understood.append(f'{before}"{msg_understand}"')
+            not_understood.append(f'{before}"{msg_not_understand}"')
+            current_pos = match.end()
+
+        # Add any remaining text
+        understood.append(text[current_pos:])
+        not_understood.append(text[current_pos:])
+        return ''.join(understood), ''.join(not_understood)
+
+    def understands(self, receiver, language, universal_merit='universallanguage'):
+        """
+        Check whether a receiver understands speech in a language. The
+        speaker always does, as does anyone with the universal merit, and
+        speech with no language is understood by everyone.
+        """
+        if receiver == self.caller or not language:
+            return True
+        has_universal = any(
+            merit.lower().replace(' ', '') == universal_merit
+            for category in receiver.db.stats.get('merits', {}).values()
+            for merit in category.keys()
+        )
+        return has_universal or language in receiver.get_languages()
 
     def msg_contents(self, message, exclude=None, from_obj=None, **kwargs):
         """
@@ -120,79 +139,29 @@ class CmdPose(PoseBreakMixin, MuxCommand):
                 caller.msg("You need to set a speaking language first with +language <language>")
                 return
 
-        # Send pose break before processing the message
-        self.send_pose_break()
-
         # Process special characters in the message
         processed_args = process_special_characters(self.args)
 
         # Determine the name to use
         poser_name = caller.attributes.get('gradient_name', default=caller.key)
 
-        # Get the character's speaking language
-        speaking_language = caller.get_speaking_language()
+        if "~" in processed_args:
+            # Build the pose once for those who understand the speech and
+            # once for those who don't
+            understood, not_understood = self.render_language_variants(processed_args)
+            understood = f"{poser_name} {understood}"
+            not_understood = f"{poser_name} {not_understood}"
+            speaking_language = caller.get_speaking_language()
 
-        # Filter receivers based on reality layers
-        filtered_receivers = []
-        for obj in caller.location.contents:
-            if not obj.has_account:
-                continue
-            
-            # Check reality layer tags
-            caller_in_umbra = caller.tags.get("in_umbra", category="state")
-            caller_in_material = caller.tags.get("in_material", category="state")
-            caller_in_dreaming = caller.tags.get("in_dreaming", category="state")
-            
-            obj_in_umbra = obj.tags.get("in_umbra", category="state")
-            obj_in_material = obj.tags.get("in_material", category="state")
-            obj_in_dreaming = obj.tags.get("in_dreaming", category="state")
-            
-            # Check if they share the same reality layer
-            # If neither has any tags, assume they're both in normal reality
-            if (caller_in_umbra and obj_in_umbra) or \
-               (caller_in_material and obj_in_material) or \
-               (caller_in_dreaming and obj_in_dreaming) or \
-               (not any([caller_in_umbra, caller_in_material, caller_in_dreaming]) and 
-                not any([obj_in_umbra, obj_in_material, obj_in_dreaming])):
-                filtered_receivers.append(obj)
-
-        # Process the pose for each receiver
-        for receiver in filtered_receivers:
-            # If there's language-tagged speech in the pose, process it
-            if "~" in processed_args:
-                parts = []
-                current_pos = 0
-                for match in re.finditer(r'"~([^"]+)"', processed_args):
-                    # Add text before the speech
-                    parts.append(processed_args[current_pos:match.start()])
-                    
-                    # Process the speech
-                    speech = match.group(1)
-                    _, msg_understand, msg_not_understand, _ = caller.prepare_say(speech, language_only=True, skip_english=True)
-                    
-                    # Check for Universal Language merit
-                    has_universal = any(
-                        merit.lower().replace(' ', '') == 'universallinguist'
-                        for category in receiver.db.stats.get('merits', {}).values()
-                        for merit in category.keys()
-                    )
-                    
-                    if receiver == caller or has_universal or (speaking_language and speaking_language in receiver.get_languages()):
-                        parts.append(f'"{msg_understand}"')
-                    else:
-                        parts.append(f'"{msg_not_understand}"')
-                    
-                    current_pos = match.end()
-                
-                # Add any remaining text
-                parts.append(processed_args[current_pos:])
-                
-                # Construct final message
-                final_message = f"{poser_name} {''.join(parts)}"
-                receiver.msg(final_message)
-            else:
-                # No language-tagged speech, send normal pose
-                receiver.msg(f"{poser_name} {processed_args}")
+            def message(receiver):
+                if self.understands(receiver, speaking_language, 'universallinguist'):
+                    return understood
+                return not_understood
+        else:
+            message = f"{poser_name} {processed_args}"
+
+        # Pose break and pose go to everyone in the caller's reality layer
+        fan_out(caller, message, pose_break=self.get_pose_break())
 
         # Record scene activity
         caller.record_scene_activity()
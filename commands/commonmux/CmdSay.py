@@ -1,5 +1,6 @@
 from evennia.commands.default.muxcommand import MuxCommand
 from commands.commonmux.CmdPose import PoseBreakMixin
+from world.utils.audience import fan_out
 from utils.text import process_special_characters
 
 class CmdSay(PoseBreakMixin, MuxCommand):
@@ -51,60 +52,21 @@ class CmdSay(PoseBreakMixin, MuxCommand):
         # Process special characters in the speech
         speech = process_special_characters(speech)
 
-        # Send pose break before the message
-        self.send_pose_break()
+        # The speaker's own rendering also tells us which language is spoken
+        msg_self, _, _, language = caller.prepare_say(speech, viewer=caller, skip_english=True)
 
-        # Prepare the say messages
-        msg_self, msg_understand, msg_not_understand, language = caller.prepare_say(speech)
-
-        # Filter receivers based on reality layers
-        filtered_receivers = []
-        for obj in caller.location.contents:
-            if not obj.has_account:
-                continue
-            
-            # Check reality layer tags
-            caller_in_umbra = caller.tags.get("in_umbra", category="state")
-            caller_in_material = caller.tags.get("in_material", category="state")
-            caller_in_dreaming = caller.tags.get("in_dreaming", category="state")
-            
-            obj_in_umbra = obj.tags.get("in_umbra", category="state")
-            obj_in_material = obj.tags.get("in_material", category="state")
-            obj_in_dreaming = obj.tags.get("in_dreaming", category="state")
-            
-            # Check if they share the same reality layer
-            # If neither has any tags, assume they're both in normal reality
-            if (caller_in_umbra and obj_in_umbra) or \
-               (caller_in_material and obj_in_material) or \
-               (caller_in_dreaming and obj_in_dreaming) or \
-               (not any([caller_in_umbra, caller_in_material, caller_in_dreaming]) and 
-                not any([obj_in_umbra, obj_in_material, obj_in_dreaming])):
-                filtered_receivers.append(obj)
-
-        # Send messages to receivers
-        for receiver in filtered_receivers:
-            if receiver != caller:
-                # Check for Universal Language merit
-                has_universal = any(
-                    merit.lower().replace(' ', '') == 'universallanguage'
-                    for category in receiver.db.stats.get('merits', {}).values()
-                    for merit in category.keys()
-                )
-
-                # Get the languages the receiver knows
-                receiver_languages = receiver.get_languages()
-
-                # If they have Universal Language, know the language, or it's not a language-tagged message
-                if has_universal or not language or (language and language in receiver_languages):
-                    _, msg_understand, _, _ = caller.prepare_say(speech, viewer=receiver, skip_english=True)
-                    receiver.msg(msg_understand)
-                else:
-                    _, _, msg_not_understand, _ = caller.prepare_say(speech, viewer=receiver, skip_english=True)
-                    receiver.msg(msg_not_understand)
-            else:
+        def message(receiver):
+            if receiver == caller:
                 # The speaker always understands their own speech
-                msg_self, _, _, _ = caller.prepare_say(speech, viewer=receiver, skip_english=True)
-                receiver.msg(msg_self)
+                return msg_self
+            # Speech is rendered for each viewer, in the variant they can follow
+            _, msg_understand, msg_not_understand, _ = caller.prepare_say(speech, viewer=receiver, skip_english=True)
+            if self.understands(receiver, language):
+                return msg_understand
+            return msg_not_understand
+
+        # Pose break and speech go to everyone in the caller's reality layer
+        fan_out(caller, message, pose_break=self.get_pose_break())
 
         # Record scene activity
         caller.record_scene_activity()
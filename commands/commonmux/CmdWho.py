@@ -8,6 +8,7 @@ import time
 from evennia import SESSION_HANDLER as evennia
 from evennia.utils import utils
 from world.utils.formatting import header, footer, divider
+from world.utils.layout import columns, pad
 from evennia.utils.utils import class_from_module
 from evennia.utils.ansi import strip_ansi
 from django.conf import settings
@@ -208,47 +209,12 @@ class CmdCensus(COMMAND_DEFAULT_CLASS):
         use_two_columns = any(word.lower() in title.lower() for word in 
             ['vampire', 'mage', 'changeling', 'mortal+', 'hunter', 'demon', 'beast', 'deviant', 'promethean', 'werewolf', 'mortal']) or title.lower() == "mortal"
         
-        # Calculate total width for each column (name + count + spacing)
-        if use_two_columns:
-            col_width = name_width + count_width + 2
-        else:
-            col_width = name_width + count_width + 2
-        
-        # Create the table
-        table = [header(f"{title}", width=78)]
-        
-        # Split items into rows
-        rows = []
-        current_row = []
         max_cols = 2 if use_two_columns else 3
-        
-        for item in sorted_items:
-            current_row.append(item)
-            if len(current_row) == max_cols:
-                rows.append(current_row)
-                current_row = []
-        
-        # Add any remaining items
-        if current_row:
-            rows.append(current_row)
-        
-        # Format and add each row
-        for row in rows:
-            line = ""
-            for i, (name, count) in enumerate(row):
-                # Format each column with proper padding
-                column = f"{str(name):<{name_width}} {count:>{count_width}}"
-                # Add pipe after column unless it's the last column in the row
-                if i < len(row) - 1:
-                    line += f"{column} | "
-                else:
-                    # For last column in row, add pipe only if it's not a full row
-                    line += f"{column}{' ' * (3 if len(row) == max_cols else 2) + ('|' if len(row) < max_cols else '')}"
-            table.append(line.rstrip())
-            
-        # Add dividers
-        table.insert(1, divider(78))
-        table.append(divider(78))
+        cells = [f"{pad(str(name), name_width)} {pad(count, count_width, '>')}" for name, count in sorted_items]
+
+        table = [header(f"{title}", width=78), divider("", width=78)]
+        table.extend(columns(cells, column_width=name_width + count_width + 1, count=max_cols, separator=" | ").splitlines())
+        table.append(divider("", width=78))
         table.append(footer(width=78))
         
         return "\n".join(table)
@@ -3,7 +3,8 @@ Admin commands for cyberware management.
 """
 from evennia.commands.default.muxcommand import MuxCommand
 from world.cyberware.models import Cyberware
-from world.inventory.models import CyberwareInstance, Inventory
+from world.inventory.models import CyberwareInstance
+from world.inventory.items import get_inventory
 
 
 class CmdAddCyberware(MuxCommand):
@@ -60,7 +61,7 @@ class CmdAddCyberware(MuxCommand):
             return
 
         # Get or create inventory
-        inventory, _ = Inventory.get_or_create_for_character(character)
+        inventory = get_inventory(character)
 
         # Check if they already have this cyberware installed
         if inventory.cyberware.filter(
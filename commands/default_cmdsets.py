@@ -18,7 +18,7 @@ own cmdsets by inheriting from them or directly from `evennia.CmdSet`.
 from evennia import default_cmds, CmdSet
 from .character_commands import CmdSheet, CmdRoll, CmdLuck, CmdShortDesc, CmdOOC, CmdPlusOoc, CmdPlusIc, CmdMeet
 from .chargen import CmdChargen, CmdListCharacterSheets, CmdLifepath, CmdSelfStat, CmdSetLanguage
-from .admin_commands import CmdStat, CmdHeal, CmdApprove, CmdUnapprove, CmdSpawnRipperdoc, CmdGradientName, CmdClearAllStates, CmdClearRental, CmdCleanupDuplicates, CmdExamine, CmdAssociateAllCharacterSheets, CmdViewCharacterSheetID, CmdSetCharacterSheetID, CmdAllSheets, CmdViewSheetAttributes, CmdSyncLanguages, CmdJoin, CmdSummon
+from .admin_commands import CmdStat, CmdHeal, CmdApprove, CmdUnapprove, CmdSpawnRipperdoc, CmdGradientName, CmdClearAllStates, CmdClearRental, CmdCleanupDuplicates, CmdExamine, CmdAssociateAllCharacterSheets, CmdLinkInventories, CmdViewCharacterSheetID, CmdSetCharacterSheetID, CmdAllSheets, CmdViewSheetAttributes, CmdSyncLanguages, CmdLogLevel, CmdJoin, CmdSummon
 from .inventory_commands import CmdInventory
 from .equipment_commands import CmdAddWeapon, CmdAddArmor, CmdAddGear, CmdPopulateWeapons, CmdPopulateArmor, CmdPopulateGear, CmdViewEquipment, CmdPopulateAllEquipment, CmdRemoveEquipment, CmdPopulateCyberware, CmdDepopulateAllEquipment, CmdYes
 from .economy import CmdAdminMoney, CmdGiveMoney, CmdBalance, CmdRentRoom, CmdLeaveRental
@@ -51,7 +51,7 @@ from .CmdMultidesc import CmdMultidesc
 from .CmdFinger import CmdFinger
 from .CmdGradient import CmdGradientName
 from .where import CmdWhere
-from .CmdWho import CmdWho
+from .CmdWho import CmdWho, CmdCensus
 
 from commands.bbs.bbs_admin_commands import CmdResetBBS
 
@@ -97,6 +97,7 @@ class CharacterCmdSet(default_cmds.CharacterCmdSet):
         self.add(CmdSay())
         self.add(CmdHangout())
         self.add(CmdWho())
+        self.add(CmdCensus())
         self.add(CmdWhere())
         self.add(CmdPlots())
         self.add(CmdWatch())
@@ -206,11 +207,13 @@ class AccountCmdSet(default_cmds.AccountCmdSet):
         self.add(CmdCleanupDuplicates())
         self.add(CmdExamine())
         self.add(CmdAssociateAllCharacterSheets())
+        self.add(CmdLinkInventories())
         self.add(CmdAllSheets())
         self.add(CmdSetCharacterSheetID())
         self.add(CmdViewCharacterSheetID())
         self.add(CmdViewSheetAttributes())
         self.add(CmdSyncLanguages())
+        self.add(CmdLogLevel())
         self.add(CmdJoin())
         self.add(CmdSummon())
 
@@ -3,9 +3,9 @@ from evennia.commands.default.muxcommand import MuxCommand
 from django.utils import timezone
 from datetime import timedelta
 from world.inventory.models import Weapon, Armor, Gear, Ammunition, Cyberdeck, Inventory
+from world.inventory.items import add_item, find_item, get_inventory
 from world.cyberware.models import Cyberware
 from world.equipment_data import populate_weapons, populate_armor, populate_gear, populate_all_equipment
-from world.cyberpunk_sheets.models import CharacterSheet
 from world.utils.ansi_utils import wrap_ansi
 from world.utils.formatting import header, footer, divider, format_stat
 from world.cyberware.utils import populate_cyberware
@@ -43,14 +43,8 @@ class CmdAddWeapon(Command):
             self.caller.msg(f"Weapon '{weapon_name}' does not exist.")
             return
 
-        try:
-            character_sheet = CharacterSheet.objects.get(account=player.account)
-        except CharacterSheet.DoesNotExist:
-            self.caller.msg(f"{player.name} doesn't have a character sheet.")
-            return
-
-        inventory, created = Inventory.objects.get_or_create(character=character_sheet)
-        inventory.weapons.add(weapon)
+        inventory = get_inventory(player)
+        add_item(inventory, weapon)
         self.caller.msg(f"Added {weapon.name} to {player.name}'s inventory.")
         player.msg(f"A {weapon.name} has been added to your inventory.")
 
@@ -84,14 +78,8 @@ class CmdAddArmor(Command):
             self.caller.msg(f"Armor '{armor_name}' does not exist.")
             return
 
-        try:
-            character_sheet = CharacterSheet.objects.get(account=player.account)
-        except CharacterSheet.DoesNotExist:
-            self.caller.msg(f"{player.name} doesn't have a character sheet.")
-            return
-
-        inventory, created = Inventory.objects.get_or_create(character=character_sheet)
-        inventory.armor.add(armor)
+        inventory = get_inventory(player)
+        add_item(inventory, armor)
         self.caller.msg(f"Added {armor.name} to {player.name}'s inventory.")
         player.msg(f"A {armor.name} has been added to your inventory.")
 
@@ -125,14 +113,8 @@ class CmdAddGear(Command):
             self.caller.msg(f"Gear '{gear_name}' does not exist.")
             return
 
-        try:
-            character_sheet = CharacterSheet.objects.get(account=player.account)
-        except CharacterSheet.DoesNotExist:
-            self.caller.msg(f"{player.name} doesn't have a character sheet.")
-            return
-
-        inventory, created = Inventory.objects.get_or_create(character=character_sheet)
-        inventory.gear.add(gear)
+        inventory = get_inventory(player)
+        add_item(inventory, gear)
         self.caller.msg(f"Added {gear.name} to {player.name}'s inventory.")
         player.msg(f"A {gear.name} has been added to your inventory.")
 
@@ -423,44 +405,16 @@ class CmdRemoveEquipment(Command):
             self.caller.msg("Invalid equipment type. Use 'weapon', 'armor', or 'gear'.")
             return
 
-        try:
-            character_sheet = CharacterSheet.objects.get(account=player.account)
-        except CharacterSheet.DoesNotExist:
-            self.caller.msg(f"{player.name} doesn't have a character sheet.")
-            return
+        inventory = get_inventory(player)
 
-        inventory, created = Inventory.objects.get_or_create(character=character_sheet)
+        self.remove_item(inventory, equipment_type, equipment_name, player)
 
-        if equipment_type == 'weapon':
-            self.remove_weapon(inventory, equipment_name, player)
-        elif equipment_type == 'armor':
-            self.remove_armor(inventory, equipment_name, player)
-        elif equipment_type == 'gear':
-            self.remove_gear(inventory, equipment_name, player)
-
-    def remove_weapon(self, inventory, weapon_name, player):
-        try:
-            weapon = inventory.weapons.get(name__iexact=weapon_name.strip('"'))
-            inventory.weapons.remove(weapon)
-            self.caller.msg(f"Removed {weapon.name} from {player.name}'s inventory.")
-            player.msg(f"A {weapon.name} has been removed from your inventory.")
-        except Weapon.DoesNotExist:
-            self.caller.msg(f"Weapon '{weapon_name}' not found in {player.name}'s inventory.")
-
-    def remove_armor(self, inventory, armor_name, player):
-        try:
-            armor = inventory.armor.get(name__iexact=armor_name.strip('"'))
-            inventory.armor.remove(armor)
-            self.caller.msg(f"Removed {armor.name} from {player.name}'s inventory.")
-            player.msg(f"A {armor.name} has been removed from your inventory.")
-        except Armor.DoesNotExist:
-            self.caller.msg(f"Armor '{armor_name}' not found in {player.name}'s inventory.")
-
-    def remove_gear(self, inventory, gear_name, player):
-        try:
-            gear = inventory.gear.get(name__iexact=gear_name.strip('"'))
-            inventory.gear.remove(gear)
-            self.caller.msg(f"Removed {gear.name} from {player.name}'s inventory.")
-            player.msg(f"A {gear.name} has been removed from your inventory.")
-        except Gear.DoesNotExist:
-            self.caller.msg(f"Gear '{gear_name}' not found in {player.name}'s inventory.")
\ No newline at end of file
+    def remove_item(self, inventory, kind, name, player):
+        item = find_item(inventory, name.strip('"'), kind)
+        if not item:
+            self.caller.msg(f"{kind.title()} '{name}' not found in {player.name}'s inventory.")
+            return
+        item_name = item.name
+        item.delete()
+        self.caller.msg(f"Removed {item_name} from {player.name}'s inventory.")
+        player.msg(f"A {item_name} has been removed from your inventory.")
\ No newline at end of file
@@ -26,8 +26,13 @@ from evennia.utils.evtable import EvTable
 from evennia.utils.search import search_account
 from evennia.utils import logger, crop
 from django.core.exceptions import ObjectDoesNotExist
+from django.db.models import Q
 from world.factions.models import Group, Faction as FactionModel
-from world.factions.models import FactionReputation, GroupRole, GroupMembership, GroupJoinRequest, GroupInfo
+from world.factions.models import GroupRole, GroupMembership, GroupJoinRequest, GroupInfo
+from world.factions.reputation import adjust_reputation, get_leaderboard, get_reputation
+from world.factions.membership import (
+    get_memberships, get_online_members, groups_with_member_counts, has_group_permission, is_member
+)
 from world.factions.faction_types import FACTION_TYPES
 from world.factions.default_faction_dictionary import default_faction_dictionary
 from typeclasses.factions import Faction
@@ -48,6 +53,7 @@ class CmdFaction(MuxCommand):
       faction/info <n> - Display information about a faction
       faction/list - List all factions
       faction/rep <n> - Check your reputation with a faction
+      faction/top <n> - Show who the faction regards most highly
       faction/influence - Check the current influence of all factions
       faction/mission <n> - Attempt a mission for a faction
       
@@ -59,6 +65,8 @@ class CmdFaction(MuxCommand):
       faction/desc <n>=<description> - Set a description on a faction
       faction/desc/ic <n>=<description> - Set IC description on a faction
       faction/modify <character> <faction> <amount> - Modify reputation
+      faction/shift <faction> <amount>=<char1>, <char2>, ... - Modify reputation
+                    for several characters at once (e.g. plot fallout)
       faction/init - Initialize default factions
       
     Note: Factions can have multiple types (e.g., both 'nomad' and 'gang'),
@@ -83,7 +91,7 @@ class CmdFaction(MuxCommand):
         switch = self.switches[0]  # Use the first switch if multiple provided
         
         # Admin-only commands
-        admin_commands = ["create", "type", "desc", "modify", "init"]
+        admin_commands = ["create", "type", "desc", "modify", "shift", "init"]
         if switch in admin_commands and not self.caller.check_permstring("Admin"):
             self.caller.msg("This faction command is only available to administrators.")
             return
@@ -103,6 +111,8 @@ class CmdFaction(MuxCommand):
             self.caller.msg("You cannot directly leave major factions. Your reputation with them can change through your actions.")
         elif switch == "rep":
             self.cmd_rep()
+        elif switch == "top":
+            self.cmd_top()
         elif switch == "influence":
             self.cmd_influence()
         elif switch == "mission":
@@ -119,6 +129,8 @@ class CmdFaction(MuxCommand):
                 self.cmd_desc()
         elif switch == "modify":
             self.cmd_modify()
+        elif switch == "shift":
+            self.cmd_shift()
         elif switch == "init":
             self.cmd_init()
         else:
@@ -204,17 +216,9 @@ class CmdFaction(MuxCommand):
         
         self.caller.msg(ic_table)
         
-        # If player is a member or has reputation with this faction, show it
-        character_sheet = self.caller.character_sheet
-        if character_sheet:
-            try:
-                rep = FactionReputation.objects.get(
-                    character=character_sheet,
-                    faction=faction
-                )
-                self.caller.msg(f"Your reputation with {faction.name}: {rep.reputation}")
-            except FactionReputation.DoesNotExist:
-                pass
+        # If player has reputation with this faction, show it
+        if faction.name in self.caller.faction_rep:
+            self.caller.msg(f"Your reputation with {faction.name}: {get_reputation(self.caller, faction)}")
 
     def cmd_create(self):
         """Create a new faction (admin only)."""
@@ -325,12 +329,8 @@ class CmdFaction(MuxCommand):
             
             # Create reputation entry
             faction_model = faction_obj.model
-            if faction_model and self.caller.character_sheet:
-                FactionReputation.objects.get_or_create(
-                    character=self.caller.character_sheet,
-                    faction=faction_model,
-                    defaults={"reputation": 0}
-                )
+            if faction_model:
+                adjust_reputation([self.caller], faction_model, 0)
         else:
             self.caller.msg(f"Failed to join {faction_name}. Please contact an admin.")
 
@@ -376,12 +376,31 @@ class CmdFaction(MuxCommand):
             self.caller.msg(f"No faction named '{faction_name}' exists.")
             return
 
-        reputation, created = FactionReputation.objects.get_or_create(
-            character=character_sheet,
-            faction=faction
-        )
+        self.caller.msg(f"Your reputation with {faction.name}: {get_reputation(self.caller, faction)}")
+
+    def cmd_top(self):
+        """Show the characters with the best reputation with a faction."""
+        if not self.args:
+            self.caller.msg("Usage: faction/top <faction_name>")
+            return
+
+        faction_name = self.args.strip()
+        try:
+            faction = FactionModel.objects.get(name__iexact=faction_name)
+        except FactionModel.DoesNotExist:
+            self.caller.msg(f"No faction named '{faction_name}' exists.")
+            return
+
+        leaderboard = get_leaderboard(faction)
+        if not leaderboard:
+            self.caller.msg(f"Nobody has any standing with {faction.name} yet.")
+            return
 
-        self.caller.msg(f"Your reputation with {faction.name}: {reputation.reputation}")
+        table = EvTable("Character", "Reputation", border="cells")
+        for name, reputation in leaderboard:
+            table.add_row(name, reputation)
+        self.caller.msg(f"|wTop reputation with {faction.name}:|n")
+        self.caller.msg(table)
 
     def cmd_influence(self):
         """Check the influence of all factions."""
@@ -426,12 +445,7 @@ class CmdFaction(MuxCommand):
             reputation_gain = random.randint(1, 5)
             influence_gain = random.randint(1, 3)
 
-            reputation, created = FactionReputation.objects.get_or_create(
-                character=character_sheet,
-                faction=faction
-            )
-            reputation.reputation += reputation_gain
-            reputation.save()
+            adjust_reputation([self.caller], faction, reputation_gain)
 
             faction.influence += influence_gain
             faction.save()
@@ -595,7 +609,7 @@ class CmdFaction(MuxCommand):
         char_name, faction_name, amount = self.args.split()
 
         try:
-            character = CharacterSheet.objects.get(full_name__iexact=char_name)
+            character = CharacterSheet.objects.select_related('character').get(full_name__iexact=char_name)
             faction = FactionModel.objects.get(name__iexact=faction_name)
             amount = int(amount)
         except CharacterSheet.DoesNotExist:
@@ -608,15 +622,49 @@ class CmdFaction(MuxCommand):
             self.caller.msg("Amount must be a number.")
             return
 
-        reputation, created = FactionReputation.objects.get_or_create(
-            character=character,
-            faction=faction
-        )
+        if not character.character:
+            self.caller.msg(f"Character '{char_name}' has no character object.")
+            return
+
+        adjust_reputation([character.character], faction, amount)
+        new_reputation = get_reputation(character.character, faction)
+
+        self.caller.msg(f"Modified {character.full_name}'s reputation with {faction.name} by {amount}. New reputation: {new_reputation}")
+
+    def cmd_shift(self):
+        """Modify several characters' reputation with a faction at once (admin only)."""
+        if not self.lhs or not self.rhs or len(self.lhs.split()) != 2:
+            self.caller.msg("Usage: faction/shift <faction> <amount>=<char1>, <char2>, ...")
+            return
+
+        faction_name, amount = self.lhs.split()
+        try:
+            faction = FactionModel.objects.get(name__iexact=faction_name)
+            amount = int(amount)
+        except FactionModel.DoesNotExist:
+            self.caller.msg(f"Faction '{faction_name}' not found.")
+            return
+        except ValueError:
+            self.caller.msg("Amount must be a number.")
+            return
 
-        reputation.reputation += amount
-        reputation.save()
+        names = [name.strip().lower() for name in self.rhs.split(",") if name.strip()]
+        if not names:
+            self.caller.msg("Usage: faction/shift <faction> <amount>=<char1>, <char2>, ...")
+            return
 
-        self.caller.msg(f"Modified {character.full_name}'s reputation with {faction.name} by {amount}. New reputation: {reputation.reputation}")
+        name_query = Q()
+        for name in names:
+            name_query |= Q(full_name__iexact=name)
+        sheets = list(CharacterSheet.objects.filter(name_query, character__isnull=False).only('full_name', 'character'))
+        found = {sheet.full_name.lower() for sheet in sheets}
+        missing = [name for name in names if name not in found]
+
+        adjust_reputation([sheet.character_id for sheet in sheets], faction, amount)
+
+        self.caller.msg(f"Modified reputation with {faction.name} by {amount} for {len(sheets)} character(s).")
+        if missing:
+            self.caller.msg(f"Not found: {', '.join(missing)}")
 
     def cmd_init(self):
         """Initialize default factions (admin only)."""
@@ -786,6 +834,16 @@ class CmdGroup(MuxCommand):
         else:
             self.caller.msg(f"Unknown switch: /{switch}")
 
+    def find_character(self, character_name):
+        """Find a character object by its sheet's full name, messaging the caller if there is none."""
+        character_sheet = CharacterSheet.objects.filter(
+            full_name__iexact=character_name
+        ).select_related('character').first()
+        if not character_sheet or not character_sheet.character:
+            self.caller.msg(f"No character named '{character_name}' exists.")
+            return None
+        return character_sheet.character
+
     def cmd_group(self):
         """Show the details of your current group."""
         character_sheet = self.caller.character_sheet
@@ -794,23 +852,21 @@ class CmdGroup(MuxCommand):
             return
 
         # Find groups where this character is a member
-        memberships = GroupMembership.objects.filter(character=character_sheet)
+        memberships = list(get_memberships(self.caller).values())
         
-        if not memberships.exists():
+        if not memberships:
             self.caller.msg("You are not a member of any group.")
             return
 
-        if memberships.count() == 1:
+        if len(memberships) == 1:
             # If only in one group, show that group's details
-            group = memberships.first().group
-            self.cmd_info(group.name)
+            self.cmd_info(memberships[0].group_name)
         else:
             # If in multiple groups, list them
             self.caller.msg("You are a member of the following groups:")
             table = EvTable("Group Name", "Role", border="table")
             for membership in memberships:
-                role_name = membership.role.name if membership.role else "No Role"
-                table.add_row(membership.group.name, role_name)
+                table.add_row(membership.group_name, membership.role_name or "No Role")
             self.caller.msg(table)
 
     def cmd_create(self):
@@ -830,10 +886,7 @@ class CmdGroup(MuxCommand):
             self.caller.msg(f"A group named '{name}' already exists.")
             return
 
-        new_group = Group.objects.create(name=name, leader=character_sheet)
-        
-        # Create a GroupMembership for the leader
-        GroupMembership.objects.create(character=character_sheet, group=new_group)
+        new_group = Group.objects.create(name=name, leader=self.caller)
         
         # Create default leader role with all permissions
         leader_role = GroupRole.objects.create(
@@ -845,10 +898,8 @@ class CmdGroup(MuxCommand):
             can_edit_info=True
         )
         
-        # Assign leader role to the creator's membership
-        membership = GroupMembership.objects.get(character=character_sheet, group=new_group)
-        membership.role = leader_role
-        membership.save()
+        # Create a GroupMembership for the leader with the leader role
+        GroupMembership.objects.create(character=self.caller, group=new_group, role=leader_role)
         
         self.caller.msg(f"You have created the edgerunner group '{name}' and are now its leader.")
         self.caller.msg("Use group/desc to set a description for your group.")
@@ -872,19 +923,19 @@ class CmdGroup(MuxCommand):
             self.caller.msg(f"No group named '{name}' exists.")
             return
 
-        if GroupMembership.objects.filter(character=character_sheet, group=group).exists():
+        if is_member(self.caller, group):
             self.caller.msg(f"You are already a member of '{name}'.")
             return
 
-        if GroupJoinRequest.objects.filter(character=character_sheet, group=group).exists():
+        if GroupJoinRequest.objects.filter(character=self.caller, group=group).exists():
             self.caller.msg(f"You have already requested to join '{name}'. Please wait for approval.")
             return
 
-        GroupJoinRequest.objects.create(character=character_sheet, group=group)
+        GroupJoinRequest.objects.create(character=self.caller, group=group)
         self.caller.msg(f"You have requested to join the group '{name}'. Please wait for approval from the group leader.")
         
-        if group.leader and group.leader.db_object:
-            group.leader.db_object.msg(f"{self.caller.name} has requested to join your group '{name}'. Use 'group/approve {name} {self.caller.name}' to approve.")
+        if group.leader:
+            group.leader.msg(f"{self.caller.name} has requested to join your group '{name}'. Use 'group/approve {name} {self.caller.name}' to approve.")
 
     def cmd_leave(self):
         """Leave a group you're currently in."""
@@ -895,18 +946,18 @@ class CmdGroup(MuxCommand):
                 self.caller.msg("You do not have a character sheet.")
                 return
                 
-            memberships = GroupMembership.objects.filter(character=character_sheet)
-            if memberships.count() == 0:
+            memberships = list(get_memberships(self.caller).values())
+            if not memberships:
                 self.caller.msg("You are not a member of any group.")
                 return
-            elif memberships.count() == 1:
-                group = memberships.first().group
+            elif len(memberships) == 1:
+                group = Group.objects.get(id=memberships[0].group_id)
                 name = group.name
             else:
                 self.caller.msg("You are a member of multiple groups. Please specify which one to leave.")
                 table = EvTable("Group Name", border="table")
                 for membership in memberships:
-                    table.add_row(membership.group.name)
+                    table.add_row(membership.group_name)
                 self.caller.msg(table)
                 return
         else:
@@ -924,21 +975,20 @@ class CmdGroup(MuxCommand):
                 self.caller.msg(f"No group named '{name}' exists.")
                 return
 
-        membership = GroupMembership.objects.filter(character=character_sheet, group=group).first()
-        if not membership:
+        if not is_member(self.caller, group):
             self.caller.msg(f"You are not a member of '{name}'.")
             return
 
-        if group.leader == character_sheet:
+        if group.leader_id == self.caller.id:
             self.caller.msg(f"You are the leader of '{name}'. You must transfer leadership before leaving.")
             return
 
-        membership.delete()
+        GroupMembership.objects.filter(character=self.caller, group=group).delete()
         self.caller.msg(f"You have left the group '{name}'.")
         
         # Notify the leader
-        if group.leader and group.leader.db_object:
-            group.leader.db_object.msg(f"{self.caller.name} has left your group '{name}'.")
+        if group.leader:
+            group.leader.msg(f"{self.caller.name} has left your group '{name}'.")
 
     def cmd_info(self, group_name=None):
         """Display information about a group."""
@@ -952,17 +1002,17 @@ class CmdGroup(MuxCommand):
                 self.caller.msg("You do not have a character sheet.")
                 return
                 
-            memberships = GroupMembership.objects.filter(character=character_sheet)
-            if memberships.count() == 0:
+            memberships = list(get_memberships(self.caller).values())
+            if not memberships:
                 self.caller.msg("You are not a member of any group.")
                 return
-            elif memberships.count() == 1:
-                group_name = memberships.first().group.name
+            elif len(memberships) == 1:
+                group_name = memberships[0].group_name
             else:
                 self.caller.msg("You are a member of multiple groups. Please specify which one to view.")
                 table = EvTable("Group Name", border="table")
                 for membership in memberships:
-                    table.add_row(membership.group.name)
+                    table.add_row(membership.group_name)
                 self.caller.msg(table)
                 return
         
@@ -972,8 +1022,8 @@ class CmdGroup(MuxCommand):
             self.caller.msg(f"No group named '{group_name}' exists.")
             return
             
-        memberships = GroupMembership.objects.filter(group=group)
-        members = [membership.character.full_name for membership in memberships]
+        memberships = GroupMembership.objects.filter(group=group).select_related('character')
+        members = [membership._get_character_name() for membership in memberships]
         
         # Basic Group Info
         table = EvTable(border="table", width=78)
@@ -998,7 +1048,7 @@ class CmdGroup(MuxCommand):
 
     def cmd_list(self):
         """List all existing groups."""
-        groups = Group.objects.all()
+        groups = groups_with_member_counts()
 
         if not groups:
             self.caller.msg("There are no groups in the game yet.")
@@ -1006,9 +1056,8 @@ class CmdGroup(MuxCommand):
 
         table = EvTable("Name", "Leader", "Members", border="cells")
         for group in groups:
-            member_count = GroupMembership.objects.filter(group=group).count()
             leader_name = group.leader_display_name if group.leader else "None"
-            table.add_row(group.name, leader_name, member_count)
+            table.add_row(group.name, leader_name, group.member_count)
 
         self.caller.msg(table)
 
@@ -1029,15 +1078,7 @@ class CmdGroup(MuxCommand):
             return
 
         # Check if the caller is the group leader or has permission to edit info
-        character_sheet = self.caller.character_sheet
-        is_leader = group.leader == character_sheet if group.leader else False
-        has_edit_permission = GroupMembership.objects.filter(
-            character=character_sheet,
-            group=group,
-            role__can_edit_info=True
-        ).exists()
-
-        if is_leader or has_edit_permission or self.caller.check_permstring("Admin"):
+        if has_group_permission(self.caller, group, "edit_info") or self.caller.check_permstring("Admin"):
             # Update the description
             group.description = description
             group.save()
@@ -1063,15 +1104,7 @@ class CmdGroup(MuxCommand):
             return
 
         # Check if the caller is the group leader or has permission to edit info
-        character_sheet = self.caller.character_sheet
-        is_leader = group.leader == character_sheet if group.leader else False
-        has_edit_permission = GroupMembership.objects.filter(
-            character=character_sheet,
-            group=group,
-            role__can_edit_info=True
-        ).exists()
-
-        if is_leader or has_edit_permission or self.caller.check_permstring("Admin"):
+        if has_group_permission(self.caller, group, "edit_info") or self.caller.check_permstring("Admin"):
             # Update the IC description
             group.ic_description = description
             group.save()
@@ -1100,17 +1133,21 @@ class CmdGroup(MuxCommand):
             return
 
         try:
-            character_sheet = CharacterSheet.objects.get(full_name__iexact=character_name)
+            character_sheet = CharacterSheet.objects.select_related('character').get(full_name__iexact=character_name)
         except CharacterSheet.DoesNotExist:
             self.caller.msg(f"No character named '{character_name}' exists.")
             return
 
+        if not character_sheet.character:
+            self.caller.msg(f"{character_name} has no character object.")
+            return
+
         # Set the new leader
-        group.leader = character_sheet
+        group.leader = character_sheet.character
         group.save()
 
         # Ensure the leader is a member of the group and has edit permissions
-        membership, created = GroupMembership.objects.get_or_create(character=character_sheet, group=group)
+        membership, created = GroupMembership.objects.get_or_create(character=character_sheet.character, group=group)
 
         # Create or get a role for the leader with all permissions
         leader_role, role_created = GroupRole.objects.get_or_create(
@@ -1145,19 +1182,19 @@ class CmdGroup(MuxCommand):
             self.caller.msg(f"No group named '{group_name}' exists.")
             return
             
-        memberships = GroupMembership.objects.filter(group=group)
+        memberships = list(GroupMembership.objects.filter(group=group).select_related('character', 'role'))
         
-        if not memberships.exists():
+        if not memberships:
             self.caller.msg(f"The group '{group_name}' has no members.")
             return
             
         table = EvTable("Member", "Role", border="table")
         for membership in memberships:
-            member_name = membership.character.full_name
+            member_name = membership._get_character_name()
             role_name = membership.role.name if membership.role else "None"
             
             # Mark the leader
-            if group.leader and group.leader.id == membership.character.id:
+            if group.leader_id == membership.character_id:
                 member_name = f"{member_name} (Leader)"
                 
             table.add_row(member_name, role_name)
@@ -1185,39 +1222,28 @@ class CmdGroup(MuxCommand):
             return
             
         # Check if the caller is the group leader or has permission to kick
-        is_leader = group.leader == character_sheet if group.leader else False
-        has_kick_permission = GroupMembership.objects.filter(
-            character=character_sheet,
-            group=group,
-            role__can_kick=True
-        ).exists()
-        
-        if not (is_leader or has_kick_permission or self.caller.check_permstring("Admin")):
+        if not (has_group_permission(self.caller, group, "kick") or self.caller.check_permstring("Admin")):
             self.caller.msg("You don't have permission to kick members from this group.")
             return
             
-        try:
-            target_character = CharacterSheet.objects.get(full_name__iexact=character_name)
-        except CharacterSheet.DoesNotExist:
-            self.caller.msg(f"No character named '{character_name}' exists.")
+        target_character = self.find_character(character_name)
+        if not target_character:
             return
             
         # Make sure we're not trying to kick the leader
-        if group.leader and group.leader.id == target_character.id:
+        if group.leader_id == target_character.id:
             self.caller.msg("You cannot kick the group leader.")
             return
             
-        membership = GroupMembership.objects.filter(character=target_character, group=group).first()
-        if not membership:
+        if not is_member(target_character, group):
             self.caller.msg(f"{character_name} is not a member of '{group_name}'.")
             return
             
-        membership.delete()
+        GroupMembership.objects.filter(character=target_character, group=group).delete()
         self.caller.msg(f"You have kicked {character_name} from the group '{group_name}'.")
         
         # Notify the kicked member
-        if target_character.db_object:
-            target_character.db_object.msg(f"You have been kicked from the group '{group_name}' by {self.caller.name}.")
+        target_character.msg(f"You have been kicked from the group '{group_name}' by {self.caller.name}.")
 
     def cmd_promote(self):
         """Assign a role to a group member."""
@@ -1242,26 +1268,20 @@ class CmdGroup(MuxCommand):
             
         try:
             group = Group.objects.get(name__iexact=group_name)
-            target_character = CharacterSheet.objects.get(full_name__iexact=character_name)
             role = GroupRole.objects.get(group=group, name__iexact=role_name)
         except Group.DoesNotExist:
             self.caller.msg(f"No group named '{group_name}' exists.")
             return
-        except CharacterSheet.DoesNotExist:
-            self.caller.msg(f"No character named '{character_name}' exists.")
-            return
         except GroupRole.DoesNotExist:
             self.caller.msg(f"No role named '{role_name}' exists in this group.")
             return
 
+        target_character = self.find_character(character_name)
+        if not target_character:
+            return
+
         # Check if the caller can promote members
-        if not (group.leader == character_sheet or 
-                GroupMembership.objects.filter(
-                    character=character_sheet, 
-                    group=group, 
-                    role__can_promote=True
-                ).exists() or
-                self.caller.check_permstring("Admin")):
+        if not (has_group_permission(self.caller, group, "promote") or self.caller.check_permstring("Admin")):
             self.caller.msg("You don't have permission to assign roles in this group.")
             return
 
@@ -1272,8 +1292,7 @@ class CmdGroup(MuxCommand):
         self.caller.msg(f"Assigned role '{role_name}' to {character_name} in group '{group_name}'.")
         
         # Notify the promoted member
-        if target_character.db_object:
-            target_character.db_object.msg(f"You have been assigned the role '{role_name}' in the group '{group_name}' by {self.caller.name}.")
+        target_character.msg(f"You have been assigned the role '{role_name}' in the group '{group_name}' by {self.caller.name}.")
 
     def cmd_demote(self):
         """Remove a role from a group member."""
@@ -1290,22 +1309,16 @@ class CmdGroup(MuxCommand):
             
         try:
             group = Group.objects.get(name__iexact=group_name)
-            target_character = CharacterSheet.objects.get(full_name__iexact=character_name)
         except Group.DoesNotExist:
             self.caller.msg(f"No group named '{group_name}' exists.")
             return
-        except CharacterSheet.DoesNotExist:
-            self.caller.msg(f"No character named '{character_name}' exists.")
+
+        target_character = self.find_character(character_name)
+        if not target_character:
             return
 
         # Check if the caller can promote/demote members
-        if not (group.leader == character_sheet or 
-                GroupMembership.objects.filter(
-                    character=character_sheet, 
-                    group=group, 
-                    role__can_promote=True
-                ).exists() or
-                self.caller.check_permstring("Admin")):
+        if not (has_group_permission(self.caller, group, "promote") or self.caller.check_permstring("Admin")):
             self.caller.msg("You don't have permission to modify roles in this group.")
             return
             
@@ -1315,7 +1328,7 @@ class CmdGroup(MuxCommand):
             return
             
         # Make sure we're not trying to demote the leader
-        if group.leader and group.leader.id == target_character.id:
+        if group.leader_id == target_character.id:
             self.caller.msg("You cannot remove the role from the group leader.")
             return
             
@@ -1326,8 +1339,7 @@ class CmdGroup(MuxCommand):
         self.caller.msg(f"Removed role '{old_role}' from {character_name} in group '{group_name}'.")
         
         # Notify the demoted member
-        if target_character.db_object:
-            target_character.db_object.msg(f"Your role '{old_role}' in the group '{group_name}' has been removed by {self.caller.name}.")
+        target_character.msg(f"Your role '{old_role}' in the group '{group_name}' has been removed by {self.caller.name}.")
 
     def cmd_role(self):
         """Create a new role for a group."""
@@ -1355,7 +1367,7 @@ class CmdGroup(MuxCommand):
             return
 
         # Check if the caller is the group leader or an admin
-        if not (group.leader == character_sheet or self.caller.check_permstring("Admin")):
+        if not (group.leader_id == self.caller.id or self.caller.check_permstring("Admin")):
             self.caller.msg("Only the group leader can create new roles.")
             return
             
@@ -1395,7 +1407,7 @@ class CmdGroup(MuxCommand):
             return
 
         # Check if the character is a member of the group
-        if not GroupMembership.objects.filter(character=character_sheet, group=group).exists():
+        if not is_member(self.caller, group):
             self.caller.msg(f"You are not a member of '{group_name}'.")
             return
 
@@ -1404,13 +1416,9 @@ class CmdGroup(MuxCommand):
 
         # Send message to all online group members, including the sender
         members_notified = 0
-        for membership in GroupMembership.objects.filter(group=group):
-            member = membership.character
-            # Find the online account associated with this character
-            account = search_account(member.full_name)
-            if account and account[0].sessions.count() > 0:
-                account[0].msg(formatted_message)
-                members_notified += 1
+        for member in get_online_members(group):
+            member.msg(formatted_message)
+            members_notified += 1
 
         # Always show the message to the sender, even if they're the only one online
         if members_notified == 0:
@@ -1439,37 +1447,27 @@ class CmdGroup(MuxCommand):
             return
             
         # Check if the caller can approve join requests
-        is_leader = group.leader == leader_sheet if group.leader else False
-        has_invite_permission = GroupMembership.objects.filter(
-            character=leader_sheet,
-            group=group,
-            role__can_invite=True
-        ).exists()
-        
-        if not (is_leader or has_invite_permission or self.caller.check_permstring("Admin")):
+        if not (has_group_permission(self.caller, group, "invite") or self.caller.check_permstring("Admin")):
             self.caller.msg("You don't have permission to approve join requests for this group.")
             return
 
-        try:
-            character_sheet = CharacterSheet.objects.get(full_name__iexact=character_name)
-        except CharacterSheet.DoesNotExist:
-            self.caller.msg(f"No character named '{character_name}' found.")
+        character = self.find_character(character_name)
+        if not character:
             return
 
         try:
-            join_request = GroupJoinRequest.objects.get(character=character_sheet, group=group)
+            join_request = GroupJoinRequest.objects.get(character=character, group=group)
         except GroupJoinRequest.DoesNotExist:
             self.caller.msg(f"{character_name} has not requested to join '{group_name}'.")
             return
 
-        GroupMembership.objects.create(character=character_sheet, group=group)
+        GroupMembership.objects.create(character=character, group=group)
         join_request.delete()
 
         self.caller.msg(f"You have approved {character_name}'s request to join '{group_name}'.")
         
         # Notify the approved member
-        if character_sheet.db_object:
-            character_sheet.db_object.msg(f"Your request to join '{group_name}' has been approved by {self.caller.name}.")
+        character.msg(f"Your request to join '{group_name}' has been approved by {self.caller.name}.")
 
     def cmd_type(self):
         """Set the type of a group (admin only)."""
@@ -1,6 +1,9 @@
 from evennia import Command
 from evennia.utils.evmenu import EvMenu
-from world.hustle_system import get_or_create_hustle_system
+from world.hustle_system import (
+    get_or_create_hustle_system, get_attempt, get_stats, clear_attempt,
+    is_auto_hustling, set_auto_hustle
+)
 from evennia.utils import logger
 import traceback
 
@@ -29,9 +32,9 @@ def hustle_menu(caller):
             caller.msg("No hustle available for your role.")
             return "exit_menu"
 
-        text = f"Available Hustle: {hustle['name']}\n"
-        text += f"Difficulty: {hustle['difficulty']}\n"
-        text += f"Potential Payout: {hustle['payout']} eb\n\n"
+        text = f"Available Hustle: {hustle.name}\n"
+        text += f"Difficulty: {hustle.difficulty}\n"
+        text += f"Potential Payout: {hustle.payout} eb\n\n"
         text += "Do you want to attempt this hustle?"
 
         options = (
@@ -61,16 +64,16 @@ def attempt_hustle(caller):
         hustle = hustle_system.get_available_hustle(caller)
         
         if not hustle:
-            logger.log_err(f"No hustle available for {caller.name} with role {caller.character_sheet.role} during attempt")
+            logger.log_err(f"No hustle available for {caller.name} during attempt")
             caller.msg("Error: No hustle available. Please contact an admin.")
             return None
         
-        logger.log_info(f"Attempting hustle for {caller.name}: {hustle['name']}")
+        logger.log_info(f"Attempting hustle for {caller.name}: {hustle.name}")
         success, message, total_roll, cool_value, role_ability_value = hustle_system.attempt_hustle(caller, hustle)
         
         dice_roll = total_roll - cool_value - role_ability_value
         
-        result_text = f"Hustle: {hustle['name']} (Difficulty: {hustle['difficulty']})\n"
+        result_text = f"Hustle: {hustle.name} (Difficulty: {hustle.difficulty})\n"
         result_text += f"Roll: Cool ({cool_value}) + Role Ability ({role_ability_value}) + 1d10 ({dice_roll}) = {total_roll}\n"
         result_text += message
         
@@ -95,15 +98,31 @@ class CmdHustle(Command):
 
     Usage:
       hustle
+      hustle auto on|off
 
     This command opens the hustle menu, where you can view and attempt
     your character's weekly side job based on their role.
+
+    With auto-hustling on, your hustle is attempted for you at the start
+    of each week unless you have already attempted it yourself.
     """
     key = "hustle"
     locks = "cmd:all()"
     help_category = "Economy"
 
     def func(self):
+        args = self.args.strip().lower().split()
+        if args and args[0] == "auto":
+            if len(args) == 1:
+                state = "on" if is_auto_hustling(self.caller) else "off"
+                self.caller.msg(f"Auto-hustling is {state}.")
+            elif args[1] in ("on", "off"):
+                set_auto_hustle(self.caller, args[1] == "on")
+                self.caller.msg(f"Auto-hustling is now {args[1]}.")
+            else:
+                self.caller.msg("Usage: hustle auto on|off")
+            return
+
         logger.log_info(f"{self.caller.name} is accessing the hustle menu")
         EvMenu(self.caller, "commands.hustle_commands", startnode="hustle_menu", cmd_on_exit=None)
 
@@ -135,8 +154,7 @@ class CmdClearHustleAttempt(Command):
             self.caller.msg("Error: Unable to initialize the hustle system.")
             return
 
-        if target.id in hustle_system.db.last_attempt:
-            del hustle_system.db.last_attempt[target.id]
+        if clear_attempt(target):
             self.caller.msg(f"Cleared hustle attempt for {target.name}.")
             logger.log_info(f"Admin {self.caller.name} cleared hustle attempt for {target.name}")
         else:
@@ -192,35 +210,39 @@ class CmdDebugHustle(Command):
             self.caller.msg("Error: Unable to initialize the hustle system.")
             return
 
-        debug_info = [
-            f"Debug information for {target.name}:",
-            f"Has character sheet: {hasattr(target, 'character_sheet')}",
-        ]
+        stats = get_stats(target)
+        attempt = get_attempt(target)
+        debug_info = [f"Debug information for {target.name}:"]
 
-        if hasattr(target, 'character_sheet'):
-            cs = target.character_sheet
+        if stats:
             debug_info.extend([
-                f"Role: {cs.role}",
-                f"Cool: {getattr(cs, 'cool', 'N/A')}",
-                f"Role Ability: {getattr(cs, cs.role_ability, 'N/A') if hasattr(cs, 'role_ability') else 'N/A'}",
+                f"Role: {stats.role}",
+                f"Cool: {stats.cool}",
+                f"Role Ability: {stats.ability}",
             ])
+        else:
+            debug_info.append("Role: None")
 
         debug_info.extend([
-            f"Last hustle attempt: {hustle_system.db.last_attempt.get(target.id, 'Never')}",
-            f"Can attempt hustle: {hustle_system.can_attempt_hustle(target)}",
+            f"Hustle week: {hustle_system.db.week}",
+            f"This week's attempt: {f'{attempt.hustle} (rolled {attempt.total}, paid {attempt.payout} eb)' if attempt else 'None'}",
+            f"Can attempt hustle: {attempt is None}",
+            f"Auto-hustling: {is_auto_hustling(target)}",
         ])
 
-        hustle = hustle_system.get_available_hustle(target)
+        hustle = hustle_system.get_available_hustle(target, stats)
         if hustle:
             debug_info.extend([
                 "Available Hustle:",
-                f"  Name: {hustle['name']}",
-                f"  Difficulty: {hustle['difficulty']}",
-                f"  Payout: {hustle['payout']} eb",
+                f"  Name: {hustle.name}",
+                f"  Difficulty: {hustle.difficulty}",
+                f"  Payout: {hustle.payout} eb",
             ])
         else:
             debug_info.append("No available hustle found.")
 
-        debug_info.append(f"All available hustles: {hustle_system.db.available_hustles}")
+        debug_info.append("All available hustles: " + ", ".join(
+            f"{role}: {hustle.name}" for role, hustle in hustle_system.get_available_hustles().items()
+        ))
 
         self.caller.msg("\n".join(debug_info))
@@ -1,8 +1,8 @@
 from evennia import Command
 from evennia.utils.ansi import ANSIString
 from evennia.commands.default.muxcommand import MuxCommand
-from world.cyberpunk_sheets.models import CharacterSheet
 from world.inventory.models import Weapon, Armor, Gear, Inventory, Ammunition, CyberwareInstance
+from world.inventory.items import add_item, equip, find_item, get_inventory, get_loadout, remove_item, unequip
 from world.cyberpunk_sheets.services import CharacterSheetMoneyService
 from world.utils.formatting import header, footer, divider
 from world.utils.character_utils import get_character_sheet
@@ -17,8 +17,8 @@ class CmdInventory(MuxCommand):
     Usage:
       <inv>entory - shows your inventory
       inv <character> - shows another character's inventory (staff/GM only)
-      inv/equip - equips an item
-      inv/unequip - unequips an item
+      inv/equip <item> - equips a weapon or armor
+      inv/unequip [weapon|armor] - unequips your weapon (or armor)
       inv/balance - shows your Eurodollars and Night City Reputation
 
     This command displays your character's inventory, including weapons, armor, and gear.
@@ -44,7 +44,8 @@ class CmdInventory(MuxCommand):
             self.unequip_item()
             return
 
-        inv = character_sheet.inventory
+        inv = get_inventory(self.caller)
+        loadout = get_loadout(inv)
 
         output = header(f"Inventory for {self.caller.name}", width=78, fillchar="|m-|n") + "\n"
 
@@ -58,10 +59,11 @@ class CmdInventory(MuxCommand):
         # Weapons
         output += divider("Weapons", width=78, fillchar="|m-|n") + "\n"
         output += f"|c{'Weapon':<25}{'Damage':<20}{'ROF':<20}|n\n"
-        weapons = inv.weapons.all()
-        if weapons:
-            for weapon in weapons:
-                output += f"{weapon.name:<25}{weapon.damage or 'N/A':<20}{weapon.rof or 'N/A':<20}\n"
+        if loadout.weapons:
+            for item in loadout.weapons:
+                weapon = item.weapon
+                name = f"{weapon.name}{' (E)' if item.is_equipped else ''}"
+                output += f"{name:<25}{weapon.damage or 'N/A':<20}{weapon.rof or 'N/A':<20}\n"
         else:
             output += "No weapons in inventory.\n"
         output += "\n"
@@ -69,10 +71,11 @@ class CmdInventory(MuxCommand):
         # Armor
         output += divider("Armor", width=78, fillchar="|m-|n") + "\n"
         output += f"|c{'Armor':<20}{'SP':<15}{'EV':<15}{'Locations':<20}|n\n"
-        armors = inv.armor.all()
-        if armors:
-            for armor in armors:
-                output += f"{armor.name:<20}{armor.sp or 'N/A':<15}{armor.ev or 'N/A':<15}{armor.locations or 'N/A':<20}\n"
+        if loadout.armor:
+            for item in loadout.armor:
+                armor = item.armor
+                name = f"{armor.name}{' (E)' if item.is_equipped else ''}"
+                output += f"{name:<20}{armor.sp or 'N/A':<15}{armor.ev or 'N/A':<15}{armor.locations or 'N/A':<20}\n"
         else:
             output += "No armor in inventory.\n"
         output += "\n"
@@ -80,11 +83,11 @@ class CmdInventory(MuxCommand):
         # Gear
         output += divider("Gear", width=78, fillchar="|m-|n") + "\n"
         output += f"|c{'Gear':<25}{'Category':<20}{'Description':<30}|n\n"
-        gears = inv.gear.all()
-        if gears:
-            for gear in gears:
+        if loadout.gear:
+            for item in loadout.gear:
+                gear = item.gear
                 description = gear.description[:27] + "..." if len(gear.description) > 30 else gear.description
-                output += f"{gear.name:<25}{gear.category:<20}{description:<30}\n"
+                output += f"{str(item):<25}{gear.category:<20}{description:<30}\n"
         else:
             output += "No gear in inventory.\n"
         output += "\n"
@@ -92,10 +95,10 @@ class CmdInventory(MuxCommand):
         # Ammunition
         output += divider("Ammunition", width=78, fillchar="|m-|n") + "\n"
         output += f"|c{'Ammunition':<25}{'Weapon Type':<25}{'Quantity':<20}|n\n"
-        ammo = inv.ammunition.all()
-        if ammo:
-            for a in ammo:
-                output += f"{a.name:<25}{a.weapon_type:<25}{a.quantity:<20}\n"
+        if loadout.ammunition:
+            for item in loadout.ammunition:
+                a = item.ammunition
+                output += f"{a.name:<25}{a.weapon_type:<25}{item.quantity:<20}\n"
         else:
             output += "No ammunition in inventory.\n"
         output += "\n"
@@ -117,53 +120,32 @@ class CmdInventory(MuxCommand):
         
     def equip_item(self):
         if not self.args:
-            self.caller.msg("Usage: equip <weapon name>")
+            self.caller.msg("Usage: inv/equip <weapon or armor name>")
             return
 
-        weapon_name = self.args.strip().lower()
+        item_name = self.args.strip()
 
-        if not hasattr(self.caller, 'character_sheet'):
-            self.caller.msg("You don't have a character sheet.")
-            return
-
-        sheet = self.caller.character_sheet
-        
-        if not hasattr(sheet, 'inventory'):
-            self.caller.msg("You don't have an inventory.")
-            return
-
-        inventory = sheet.inventory
-
-        try:
-            weapon = inventory.weapons.get(name__iexact=weapon_name)
-        except Weapon.DoesNotExist:
-            self.caller.msg(f"You don't have a weapon named '{weapon_name}' in your inventory.")
-            return
-        except Weapon.MultipleObjectsReturned:
-            self.caller.msg(f"You have multiple weapons named '{weapon_name}'. Please be more specific.")
+        inventory = get_inventory(self.caller)
+        item = find_item(inventory, item_name, "weapon") or find_item(inventory, item_name, "armor")
+        if not item:
+            self.caller.msg(f"You don't have a weapon or armor named '{item_name}' in your inventory.")
             return
 
-        sheet.eqweapon = weapon
-        sheet.save()
-
-        self.caller.msg(f"You have equipped {weapon.name}.")
+        equip(item)
+        self.caller.msg(f"You have equipped {item.name}.")
 
     def unequip_item(self):
-        if not hasattr(self.caller, 'character_sheet'):
-            self.caller.msg("You don't have a character sheet.")
+        slot = self.args.strip().lower() or "weapon"
+        if slot not in ("weapon", "armor"):
+            self.caller.msg("Usage: inv/unequip [weapon|armor]")
             return
 
-        sheet = self.caller.character_sheet
-        
-        if not sheet.eqweapon:
-            self.caller.msg("You don't have any weapon equipped.")
+        item = unequip(get_inventory(self.caller), slot)
+        if not item:
+            self.caller.msg(f"You don't have any {slot} equipped.")
             return
 
-        weapon_name = sheet.eqweapon.name
-        sheet.eqweapon = None
-        sheet.save()
-
-        self.caller.msg(f"You have unequipped your {weapon_name}.")
+        self.caller.msg(f"You have unequipped your {item.name}.")
 
 class CmdEquip(Command):
     """
@@ -215,14 +197,8 @@ class CmdEquip(Command):
             self.caller.msg(f"Item '{item_name}' is not a valid weapon, armor, or gear.")
             return
 
-        try:
-            character_sheet = CharacterSheet.objects.get(account=player.account)
-        except CharacterSheet.DoesNotExist:
-            self.caller.msg(f"{player.name} doesn't have a character sheet.")
-            return
-        
-        inventory, created = Inventory.objects.get_or_create(character=character_sheet)
-        inventory.weapons.add(item)
+        inventory = get_inventory(player)
+        add_item(inventory, item)
         self.caller.msg(f"Added {item.name} to {player.name}'s inventory.")
         player.msg(f"A {item.name} has been added to your inventory.")
 
@@ -242,14 +218,8 @@ class CmdEquip(Command):
             self.caller.msg(f"Weapon '{item_name}' does not exist.")
             return
         
-        try:
-            character_sheet = CharacterSheet.objects.get(account=player.account)
-        except CharacterSheet.DoesNotExist:
-            self.caller.msg(f"{player.name} doesn't have a character sheet.")
-            return
-        
-        inventory, created = Inventory.objects.get_or_create(character=character_sheet)
-        inventory.weapons.remove(item)
+        inventory = get_inventory(player)
+        remove_item(inventory, item)
         self.caller.msg(f"Removed {item.name} from {player.name}'s inventory.")
         player.msg(f"A {item.name} has been removed from your inventory.")
 
@@ -269,14 +239,8 @@ class CmdEquip(Command):
             self.caller.msg(f"Weapon '{weapon_name}' does not exist.")
             return
 
-        try:
-            character_sheet = CharacterSheet.objects.get(account=player.account)
-        except CharacterSheet.DoesNotExist:
-            self.caller.msg(f"{player.name} doesn't have a character sheet.")
-            return
-
-        inventory, created = Inventory.objects.get_or_create(character=character_sheet)
-        inventory.weapons.add(weapon)
+        inventory = get_inventory(player)
+        add_item(inventory, weapon)
         self.caller.msg(f"Added {weapon.name} to {player.name}'s inventory.")
         player.msg(f"A {weapon.name} has been added to your inventory.")
 
@@ -296,14 +260,8 @@ class CmdEquip(Command):
             self.caller.msg(f"Armor '{armor_name}' does not exist.")
             return
 
-        try:
-            character_sheet = CharacterSheet.objects.get(account=player.account)
-        except CharacterSheet.DoesNotExist:
-            self.caller.msg(f"{player.name} doesn't have a character sheet.")
-            return
-
-        inventory, created = Inventory.objects.get_or_create(character=character_sheet)
-        inventory.armor.add(armor)
+        inventory = get_inventory(player)
+        add_item(inventory, armor)
         self.caller.msg(f"Added {armor.name} to {player.name}'s inventory.")
         player.msg(f"A {armor.name} has been added to your inventory.")
 
@@ -323,13 +281,7 @@ class CmdEquip(Command):
             self.caller.msg(f"Gear '{gear_name}' does not exist.")
             return
 
-        try:
-            character_sheet = CharacterSheet.objects.get(account=player.account)
-        except CharacterSheet.DoesNotExist:
-            self.caller.msg(f"{player.name} doesn't have a character sheet.")
-            return
-
-        inventory, created = Inventory.objects.get_or_create(character=character_sheet)
-        inventory.gear.add(gear)
+        inventory = get_inventory(player)
+        add_item(inventory, gear)
         self.caller.msg(f"Added {gear.name} to {player.name}'s inventory.")
         player.msg(f"A {gear.name} has been added to your inventory.")
\ No newline at end of file
@@ -10,6 +10,7 @@ from evennia.utils.utils import crop
 from evennia.utils.ansi import ANSIString
 from world.utils.ansi_utils import wrap_ansi
 from world.utils.formatting import header, footer, divider, format_stat
+from world.utils.layout import Table
 from textwrap import fill
 from django.utils import timezone
 from django.db.models import Max, F
@@ -158,56 +159,32 @@ class CmdJobs(MuxCommand):
                 models.Q(participants=self.caller.account),
                 status__in=['open', 'claimed']
             ).distinct().order_by('-created_at')
+        jobs = jobs.select_related('queue', 'requester', 'assignee')
 
         if not jobs:
             self.caller.msg("You have no open jobs.")
             return
 
-        # Define column widths
-        col_widths = {
-            'job_id': 6,    # "Job # "
-            'queue': 10,    # "Queue     "
-            'title': 25,    # "Job Title                "
-            'originator': 12, # "Originator   "
-            'assignee': 12,   # "Assignee     "
-            'status': 8      # "Status   "
-        }
-
         output = header("Night CityMUX Jobs", width=78, fillchar="|b-|n") + "\n"
-        
-        # Create the header row with fixed column widths
-        header_row = (
-            f"|cJob #".ljust(col_widths['job_id']) +
-            f"Queue".ljust(col_widths['queue']) +
-            f"Job Title".ljust(col_widths['title']) +
-            f"Originator".ljust(col_widths['originator']) +
-            f"Assignee".ljust(col_widths['assignee']) +
-            f"Status|n"
-        )
-        output += header_row + "\n"
-        output += ANSIString("|b" + "-" * 78 + "|n") + "\n"
 
-        # Add each job as a row with proper column spacing
+        table = Table(
+            ("Job #", 5), ("Queue", 9), ("Job Title", 24),
+            ("Originator", 11), ("Assignee", 11), ("Status", 8),
+            header_color="|c"
+        )
         for job in jobs:
             assignee = job.assignee.username if job.assignee else "-----"
             originator = job.requester.username if job.requester else "-----"
-            
+
             # Check if job has been viewed by this user
             unread = job.is_updated_since_last_view(self.caller.account)
             title_marker = "|r*|n " if unread else "  "
-            
-            # Format each field with proper width
-            job_id = str(job.id).ljust(col_widths['job_id'])
-            queue = crop(job.queue.name, width=col_widths['queue']-2).ljust(col_widths['queue'])  # -2 for spacing
-            title = title_marker + crop(job.title, width=col_widths['title']-2)  # -2 for marker
-            title = title.ljust(col_widths['title'])
-            originator = crop(originator, width=col_widths['originator']-2).ljust(col_widths['originator'])
-            assignee = crop(assignee, width=col_widths['assignee']-2).ljust(col_widths['assignee'])
-            status = crop(job.status, width=col_widths['status'])
-            
-            # Combine all fields with proper spacing
-            row = f"{job_id}{queue}{title}{originator}{assignee}{status}"
-            output += row + "\n"
+
+            table.add_row(job.id, job.queue.name, title_marker + job.title, originator, assignee, job.status)
+
+        output += table.header_line() + "\n"
+        output += "|b" + "-" * 78 + "|n\n"
+        output += "\n".join(table.row_lines()) + "\n"
 
         output += footer(width=78, fillchar="|b-|n")
         self.caller.msg(output)
@@ -1,10 +1,8 @@
-from django.core.exceptions import ObjectDoesNotExist
 from evennia import Command
 from world.languages.models import Language, CharacterLanguage
-from world.languages.language_dictionary import LANGUAGES
+from world.languages.comprehension import comprehension_matrix, known_languages_for_sheet, knows_language
 from evennia.commands.default.muxcommand import MuxCommand
 import re
-from world.cyberpunk_sheets.models import CharacterSheet
 from evennia.utils import logger
 
 def parse_language_segments(message, known_languages):
@@ -130,29 +128,7 @@ class LanguageMixin:
     def understands_language(self, player, language):
         if player == self.caller:
             return True
-        try:
-            return player.knows_language(language)
-        except AttributeError:
-            character_sheet_id = player.db.character_sheet_id
-            
-            if not character_sheet_id:
-                return False
-            
-            character_sheet = CharacterSheet.objects.get(id=character_sheet_id)
-            
-            character_language = CharacterLanguage.objects.filter(
-                character_sheet=character_sheet, 
-                language__name__iexact=language
-            ).first()
-            
-            if character_language:
-                return character_language.level > 0
-            return False
-        except ObjectDoesNotExist:
-            return False
-        except Exception as e:
-            logger.log_err(f"Error in understands_language for {player.name}: {str(e)}")
-            return False
+        return knows_language(player, language)
 
     def process_message(self, message, language=None):
         language = language or "English"
@@ -161,9 +137,11 @@ class LanguageMixin:
             full_message = f"(in {language}) {message}"
             masked_full_message = f"(in {language}) {masked_message}"
 
-            for player in self.caller.location.contents:
+            location = self.caller.location
+            understood_by = comprehension_matrix(location, [language])[language.casefold()]
+            for player in location.contents:
                 if player.has_account:
-                    if self.understands_language(player, language):
+                    if player == self.caller or player.id in understood_by:
                         player.msg(full_message)
                     else:
                         player.msg(masked_full_message)
@@ -176,60 +154,76 @@ class LanguageMixin:
             if not character_sheet_id:
                 return
 
-            character_sheet = CharacterSheet.objects.filter(id=character_sheet_id).first()
-            if not character_sheet:
-                return
-
-            known_languages = [cl.language.name.lower() for cl in character_sheet.character_languages.all()]
-            known_languages.append("english")  # Always include English
+            known_languages = known_languages_for_sheet(character_sheet_id) | {"english"}  # Always include English
             default_language = self.caller.attributes.get("selected_language", "English").lower()
             
             segments = parse_language_segments(message, known_languages)
-            
-            for player in self.caller.location.contents:
-                if player.has_account:
-                    player_message = self.process_player_message(player, segments, default_language)
-                    player.msg(player_message.strip())
+
+            # Every language a receiver might need to understand in this line
+            languages = {default_language}
+            for lang, text in segments:
+                if lang == "language_change":
+                    languages.add(text)
+                elif lang != "default":
+                    languages.add(lang)
+            location = self.caller.location
+            matrix = comprehension_matrix(location, languages)
+
+            # Render the line once per distinct set of understood languages
+            renderings = {}
+            for player in location.contents:
+                if not player.has_account:
+                    continue
+                if not player.db.character_sheet_id:
+                    understood = None
+                elif player == self.caller:
+                    understood = frozenset(matrix)
+                else:
+                    understood = frozenset(lang for lang, ids in matrix.items() if player.id in ids)
+                if understood not in renderings:
+                    renderings[understood] = self.render_segments(segments, default_language, understood).strip()
+                player.msg(renderings[understood])
         except AttributeError:
             self.caller.msg("Error: Character sheet not found.")
         except Exception as e:
             logger.log_err(f"Error in process_multi_language_message for {self.caller.name}: {str(e)}")
 
-    def process_player_message(self, player, segments, default_language):
+    def render_segments(self, segments, default_language, understood):
+        """
+        Render parsed segments for a receiver who understands the languages
+        in `understood`. Receivers without a character sheet (None) get
+        nothing.
+        """
         player_message = ""
-        try:
-            sheet_id = player.db.character_sheet_id
-            if not sheet_id:
-                return player_message
-
-            current_lang = default_language
-            for i, (lang, text) in enumerate(segments):
-                if lang == "default":
-                    lang = current_lang
-                elif lang == "language_change":
-                    current_lang = text
-                    player_message += f"|y[{text.capitalize()}] |n"
-                    continue
-                
-                understands = self.understands_language(player, lang)
-                
-                if lang != current_lang:
-                    if understands:
-                        player_message += f"|g[{lang.capitalize()}] |n"
-                    else:
-                        player_message += f"|r[{lang.capitalize()}] |n"
-                    current_lang = lang
-                
+        if understood is None:
+            return player_message
+
+        current_lang = default_language
+        for i, (lang, text) in enumerate(segments):
+            if lang == "default":
+                lang = current_lang
+            elif lang == "language_change":
+                current_lang = text
+                player_message += f"|y[{text.capitalize()}] |n"
+                continue
+            
+            understands = lang.casefold() in understood
+            
+            if lang != current_lang:
                 if understands:
-                    player_message += text
+                    player_message += f"|g[{lang.capitalize()}] |n"
                 else:
-                    masked_text = self.mask_text(text)
-                    player_message += masked_text
-                
-                if text and text[-1] not in ",.;:!?" and (i == len(segments) - 1 or not segments[i+1][1].startswith((".", ",", ";", ":", "!", "?"))):
-                    player_message += " "
-        except Exception as e:
-            logger.log_err(f"Error processing message for {player.name}: {str(e)}")
+                    player_message += f"|r[{lang.capitalize()}] |n"
+                current_lang = lang
+            
+            if understands:
+                player_message += text
+            else:
+                masked_text = self.mask_text(text)
+                player_message += masked_text
+            
+            if text and text[-1] not in ",.;:!?" and (i == len(segments) - 1 or not segments[i+1][1].startswith((".", ",", ";", ":", "!", "?"))):
+                player_message += " "
         
         return player_message
 
@@ -246,33 +240,9 @@ class LanguagePoseBreakMixin(LanguageMixin, PoseBreakMixin):
     A mixin that combines language processing and pose breaks.
     """
     def process_multi_language_message(self, message):
-        try:
-            # Send pose break before processing the message
-            self.send_pose_break()
-
-            character_sheet_id = self.caller.db.character_sheet_id
-            if not character_sheet_id:
-                return
-
-            character_sheet = CharacterSheet.objects.filter(id=character_sheet_id).first()
-            if not character_sheet:
-                return
-
-            known_languages = [cl.language.name.lower() for cl in character_sheet.character_languages.all()]
-            known_languages.append("english")  # Always include English
-            default_language = self.caller.attributes.get("selected_language", "English").lower()
-            
-            segments = parse_language_segments(message, known_languages)
-            
-            for player in self.caller.location.contents:
-                if player.has_account:
-                    player_message = self.process_player_message(player, segments, default_language)
-                    player.msg(player_message.strip())
-            
-        except AttributeError:
-            self.caller.msg("Error: Character sheet not found.")
-        except Exception as e:
-            logger.log_err(f"Error in process_multi_language_message for {self.caller.name}: {str(e)}")
+        # Send pose break before processing the message
+        self.send_pose_break()
+        super().process_multi_language_message(message)
 
 class CmdMaskedSay(Command, LanguagePoseBreakMixin):
     """
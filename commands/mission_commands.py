@@ -2,10 +2,14 @@ from evennia import Command
 from evennia.commands.default.muxcommand import MuxCommand
 from evennia.utils.evtable import EvTable
 from world.missions import get_or_create_mission_board
+from world.mission_board.models import Mission as MissionModel
 from world.events import get_or_create_event_scheduler
 from evennia.utils import gametime, logger
 from datetime import datetime
 
+def format_deadline(deadline):
+    return deadline.strftime("%Y-%m-%d %H:%M:%S") if deadline else "None"
+
 class CmdMission(MuxCommand):
     """
     Base command for missions and events.
@@ -71,7 +75,7 @@ class CmdListMissions(Command):
             self.caller.msg("Error: Unable to access the mission board. Please contact an admin.")
             return
 
-        available_missions = mission_board.get_available_missions(self.caller)
+        available_missions = list(mission_board.get_available_missions(self.caller))
 
         if not available_missions:
             self.caller.msg("There are no missions available for you at the moment.")
@@ -81,11 +85,11 @@ class CmdListMissions(Command):
         for mission in available_missions:
             table.add_row(
                 mission.id,
-                mission.db.title,
-                mission.db.difficulty,
-                f"{mission.db.reward} eb",
-                f"{len(mission.db.assigned_to)}/{mission.db.max_players}",
-                mission.db.deadline.strftime("%Y-%m-%d %H:%M:%S")
+                mission.title,
+                mission.difficulty,
+                f"{mission.reward} eb",
+                f"{mission.players}/{mission.max_players}",
+                format_deadline(mission.deadline)
             )
 
         self.caller.msg(table)
@@ -125,11 +129,11 @@ class CmdAcceptMission(Command):
             self.caller.msg("Mission not found.")
             return
 
-        if mission.db.status != "available":
+        if mission.status != MissionModel.AVAILABLE:
             self.caller.msg("This mission is not available.")
             return
 
-        if mission.db.reputation_requirement > self.caller.character_sheet.rep:
+        if mission.reputation_requirement > mission_board.get_character_reputation(self.caller):
             self.caller.msg("You don't have enough reputation to accept this mission.")
             return
 
@@ -159,7 +163,7 @@ class CmdCompleteMission(Command):
             self.caller.msg("Invalid mission ID. Please use a number.")
             return
 
-        mission_board = self.caller.search("MissionBoard", global_search=True)
+        mission_board = get_or_create_mission_board()
         if not mission_board:
             self.caller.msg("The mission board is not available.")
             return
@@ -170,18 +174,14 @@ class CmdCompleteMission(Command):
             self.caller.msg("Mission not found.")
             return
 
-        if self.caller not in mission.db.assigned_to:
+        if not mission.assigned_to.filter(id=self.caller.id).exists():
             self.caller.msg("This mission is not assigned to you.")
             return
 
-        if mission.db.status != "in_progress":
+        if mission.status != MissionModel.IN_PROGRESS:
             self.caller.msg("This mission is not in progress.")
             return
 
-        if mission.db.associated_event and mission.db.associated_event.db.status != "completed":
-            self.caller.msg("The associated event for this mission has not been completed yet.")
-            return
-
         mission.complete_mission()
 
 class CmdMissionStatus(Command):
@@ -198,12 +198,12 @@ class CmdMissionStatus(Command):
     help_category = "Missions and Events"
 
     def func(self):
-        mission_board = self.caller.search("MissionBoard", global_search=True)
+        mission_board = get_or_create_mission_board()
         if not mission_board:
             self.caller.msg("The mission board is not available.")
             return
 
-        current_missions = [m for m in mission_board.db.missions if self.caller in m.db.assigned_to]
+        current_missions = list(mission_board.get_character_missions(self.caller))
 
         if not current_missions:
             self.caller.msg("You have no active missions.")
@@ -213,10 +213,10 @@ class CmdMissionStatus(Command):
         for mission in current_missions:
             table.add_row(
                 mission.id,
-                mission.db.title,
-                mission.db.status,
-                f"{len(mission.db.assigned_to)}/{mission.db.max_players}",
-                mission.db.deadline.strftime("%Y-%m-%d %H:%M:%S")
+                mission.title,
+                mission.get_status_display(),
+                f"{mission.players}/{mission.max_players}",
+                format_deadline(mission.deadline)
             )
 
         self.caller.msg(table)
@@ -259,18 +259,16 @@ class CmdCreateMission(Command):
             self.caller.msg("Invalid input. Make sure all numeric values are correct.")
             return
 
-        mission_board = self.caller.search("MissionBoard", global_search=True)
+        mission_board = get_or_create_mission_board()
         if not mission_board:
-            mission_board = get_or_create_mission_board()
-
-        new_mission = mission_board.create_mission(
-            title, description, difficulty, reward, max_players, deadline, reputation_requirement, self)
+            self.caller.msg("The mission board is not available.")
+            return
 
         new_mission = mission_board.create_mission(
             title, description, difficulty, reward, max_players, deadline, reputation_requirement, self.caller
         )
 
-        self.caller.msg(f"Created new mission: {new_mission.db.title}")
+        self.caller.msg(f"Created new mission: {new_mission.title}")
 
 class CmdListEvents(Command):
     """
@@ -420,8 +418,9 @@ class CmdEventInfo(Command):
         info += f"Date/Time: {event.db.date_time.strftime('%Y-%m-%d %H:%M:%S')}\n"
         info += f"Status: {event.db.status}\n"
         info += f"Description: {event.db.description}\n"
-        if event.db.associated_mission:
-            info += f"Associated Mission: {event.db.associated_mission.db.title} (ID: {event.db.associated_mission.id})\n"
+        mission = event.associated_mission
+        if mission:
+            info += f"Associated Mission: {mission.title} (ID: {mission.id})\n"
         info += f"Participants: {', '.join([str(p) for p in event.db.participants])}\n"
 
         self.caller.msg(info)
@@ -3,7 +3,8 @@ from evennia.commands.default.muxcommand import MuxCommand
 from evennia import Command, CmdSet, DefaultScript
 from evennia.utils import create
 from world.netrunning.models import NetArchitecture, Node, ICE, BlackICE, Program
-import random
+from world.netrunning.generator import DIFFICULTIES
+from world.netrunning.pool import pool_levels, save_architecture, take_architecture
 
 class CmdArchitecture(MuxCommand):
     """
@@ -23,6 +24,7 @@ class CmdArchitecture(MuxCommand):
       arch[itecture]/cancel         - Cancel architecture creation
       arch[itecture]/generate <diff> <name> <location> - Generate random architecture
                                        <diff> can be basic, standard, uncommon, advanced
+      arch[itecture]/pool           - Show pre-generated architectures ready per difficulty
     """
     key = "architecture"
     aliases = ["arch"]
@@ -62,6 +64,8 @@ class CmdArchitecture(MuxCommand):
             self.cmd_cancel()
         elif switch == "generate":
             self.cmd_generate()
+        elif switch == "pool":
+            self.cmd_pool()
         else:
             self.caller.msg(f"Unknown switch '{switch}'. See 'help architecture' for usage.")
     
@@ -306,15 +310,15 @@ class CmdArchitecture(MuxCommand):
             difficulty, name, location = args_list
             
             # Validate difficulty
-            if difficulty.lower() not in ["basic", "standard", "uncommon", "advanced"]:
+            if difficulty.lower() not in DIFFICULTIES:
                 self.caller.msg("Invalid difficulty. Must be basic, standard, uncommon, or advanced.")
                 return
                 
-            # Generate the architecture
-            architecture_data = self.generate_random_architecture(difficulty.lower(), name, location)
+            # Take a pre-generated architecture from the pool
+            architecture_data = take_architecture(difficulty.lower(), name, location)
             
             # Create the architecture in the database
-            architecture = self.create_architecture_from_data(architecture_data)
+            architecture = save_architecture(architecture_data)
             
             # Display summary
             self.display_generated_architecture(architecture_data)
@@ -324,370 +328,12 @@ class CmdArchitecture(MuxCommand):
         except Exception as e:
             self.caller.msg(f"Error generating architecture: {e}")
     
-    def generate_random_architecture(self, difficulty, name, location):
-        """Generate a random NET architecture based on Cyberpunk Red rules."""
-        # Step 1: Shape the architecture
-        floor_count = sum([random.randint(1, 6) for _ in range(3)])  # 3d6 for total floors
-        
-        # Determine if there are branches
-        branches = []
-        if random.randint(1, 10) >= 7:  # 40% chance of a branch
-            branch_count = 1
-            while branch_count < 3 and random.randint(1, 10) >= 7:  # Up to 3 branches
-                branch_count += 1
-                
-            # Distribute floors between main branch and side branches
-            if branch_count > 0:
-                main_branch_floors = floor_count // 2
-                remaining_floors = floor_count - main_branch_floors
-                
-                for i in range(branch_count):
-                    if i < branch_count - 1:
-                        branch_floors = remaining_floors // (branch_count - i)
-                        remaining_floors -= branch_floors
-                    else:
-                        branch_floors = remaining_floors
-                    
-                    if branch_floors > 0:
-                        branches.append({
-                            "name": f"Branch {i+1}",
-                            "floors": branch_floors
-                        })
-        
-        # Set difficulty value based on selected difficulty
-        dv_map = {
-            "basic": 6,
-            "standard": 8,
-            "uncommon": 10,
-            "advanced": 12
-        }
-        
-        base_dv = dv_map[difficulty]
-        
-        # Create architecture data
-        architecture_data = {
-            "name": name,
-            "description": f"NET Architecture at {location} - {difficulty.capitalize()} Difficulty",
-            "difficulty": difficulty,
-            "difficulty_value": base_dv,
-            "location": location,
-            "floor_count": floor_count,
-            "branches": branches,
-            "nodes": []
-        }
-        
-        # Step 2: Fill in the architecture
-        
-        # Helper function to determine node content based on difficulty and floor
-        def get_node_content(floor_num, difficulty):
-            if floor_num <= 2:
-                # First two floors use the Lobby table
-                result = random.randint(1, 6)
-                if result == 1:
-                    return {"type": "File", "dv": 6, "description": f"Generic data file (DV{6})"}
-                elif result == 2:
-                    return {"type": "Password", "dv": 6, "description": f"Basic security password (DV{6})"}
-                elif result == 3:
-                    return {"type": "Password", "dv": 8, "description": f"Enhanced security password (DV{8})"}
-                elif result == 4:
-                    return {"type": "BlackICE", "name": "Skunk", "description": "Anti-personnel program that does 3d6 damage directly to a Netrunner's brain"}
-                elif result == 5:
-                    return {"type": "BlackICE", "name": "Wisp", "description": "Tracer program that follows the datastream back to a runner's location"}
-                elif result == 6:
-                    return {"type": "BlackICE", "name": "Killer", "description": "Dangerous program that does 3d6 damage to a Netrunner's Cyberdeck"}
-            else:
-                # Other floors use difficulty-specific tables
-                result = sum([random.randint(1, 6) for _ in range(3)])  # 3d6 roll
-                
-                # Basic difficulty table
-                if difficulty == "basic":
-                    if result == 3:
-                        return {"type": "BlackICE", "name": "Hellhound", "description": "Vicious Black ICE that attacks for 4d6 damage"}
-                    elif result == 4:
-                        return {"type": "BlackICE", "name": "Sabertooth", "description": "Dangerous Black ICE that does 4d6 damage and reduces REZ by 1d6"}
-                    elif result == 5:
-                        return {"type": "BlackICE", "name": "Raven", "count": 2, "description": "Two Raven programs that work together, each dealing 2d6 damage"}
-                    elif result == 6:
-                        return {"type": "BlackICE", "name": "Hellhound", "description": "Vicious Black ICE that attacks for 4d6 damage"}
-                    elif result == 7:
-                        return {"type": "BlackICE", "name": "Wisp", "description": "Tracer program that follows the datastream back to a runner's location"}
-                    elif result == 8:
-                        return {"type": "BlackICE", "name": "Raven", "description": "Black ICE that does 2d6 damage to a Netrunner's Cyberdeck"}
-                    elif result == 9:
-                        return {"type": "Password", "dv": 6, "description": f"Basic security password (DV{6})"}
-                    elif result == 10:
-                        return {"type": "File", "dv": 6, "description": f"Important data file (DV{6})"}
-                    elif result == 11:
-                        return {"type": "Control Node", "dv": 6, "description": f"System control node (DV{6})"}
-                    elif result == 12:
-                        return {"type": "Password", "dv": 6, "description": f"Basic security password (DV{6})"}
-                    elif result == 13:
-                        return {"type": "BlackICE", "name": "Skunk", "description": "Anti-personnel program that does 3d6 damage directly to a Netrunner's brain"}
-                    elif result == 14:
-                        return {"type": "BlackICE", "name": "Asp", "description": "Deadly Black ICE that does 3d6 damage and reduces REZ by 1d6"}
-                    elif result == 15:
-                        return {"type": "BlackICE", "name": "Scorpion", "description": "Powerful Black ICE that does 3d6 damage"}
-                    elif result == 16:
-                        return {"type": "BlackICE", "name": "Killer", "count": 1, "additional": "Skunk", "description": "Dangerous ICE combo: Killer and Skunk working together"}
-                    elif result == 17:
-                        return {"type": "BlackICE", "name": "Wisp", "count": 3, "description": "Three Wisp programs working together"}
-                    elif result == 18:
-                        return {"type": "BlackICE", "name": "Liche", "description": "Extremely dangerous Black ICE that does 5d6 damage"}
-                
-                # Standard difficulty table
-                elif difficulty == "standard":
-                    if result == 3:
-                        return {"type": "BlackICE", "name": "Hellhound", "count": 2, "description": "Two vicious Hellhound programs working together"}
-                    elif result == 4:
-                        return {"type": "BlackICE", "name": "Hellhound", "additional": "Killer", "description": "Dangerous ICE combo: Hellhound and Killer working together"}
-                    elif result == 5:
-                        return {"type": "BlackICE", "name": "Skunk", "count": 2, "description": "Two Skunk programs working together"}
-                    elif result == 6:
-                        return {"type": "BlackICE", "name": "Sabertooth", "description": "Dangerous Black ICE that does 4d6 damage and reduces REZ by 1d6"}
-                    elif result == 7:
-                        return {"type": "BlackICE", "name": "Scorpion", "description": "Powerful Black ICE that does 3d6 damage"}
-                    elif result == 8:
-                        return {"type": "BlackICE", "name": "Hellhound", "description": "Vicious Black ICE that attacks for 4d6 damage"}
-                    elif result == 9:
-                        return {"type": "Password", "dv": 8, "description": f"Enhanced security password (DV{8})"}
-                    elif result == 10:
-                        return {"type": "File", "dv": 8, "description": f"Valuable data file (DV{8})"}
-                    elif result == 11:
-                        return {"type": "Control Node", "dv": 8, "description": f"Important system control node (DV{8})"}
-                    elif result == 12:
-                        return {"type": "Password", "dv": 8, "description": f"Enhanced security password (DV{8})"}
-                    elif result == 13:
-                        return {"type": "BlackICE", "name": "Asp", "description": "Deadly Black ICE that does 3d6 damage and reduces REZ by 1d6"}
-                    elif result == 14:
-                        return {"type": "BlackICE", "name": "Killer", "description": "Dangerous program that does 3d6 damage to a Netrunner's Cyberdeck"}
-                    elif result == 15:
-                        return {"type": "BlackICE", "name": "Liche", "description": "Extremely dangerous Black ICE that does 5d6 damage"}
-                    elif result == 16:
-                        return {"type": "BlackICE", "name": "Asp", "description": "Deadly Black ICE that does 3d6 damage and reduces REZ by 1d6"}
-                    elif result == 17:
-                        return {"type": "BlackICE", "name": "Raven", "count": 3, "description": "Three Raven programs working together"}
-                    elif result == 18:
-                        return {"type": "BlackICE", "name": "Liche", "additional": "Raven", "description": "Extremely dangerous ICE combo: Liche and Raven working together"}
-                
-                # Uncommon difficulty table
-                elif difficulty == "uncommon":
-                    if result == 3:
-                        return {"type": "BlackICE", "name": "Kraken", "description": "Extremely powerful Black ICE that does 6d6 damage"}
-                    elif result == 4:
-                        return {"type": "BlackICE", "name": "Hellhound", "additional": "Scorpion", "description": "Dangerous ICE combo: Hellhound and Scorpion working together"}
-                    elif result == 5:
-                        return {"type": "BlackICE", "name": "Hellhound", "additional": "Killer", "description": "Dangerous ICE combo: Hellhound and Killer working together"}
-                    elif result == 6:
-                        return {"type": "BlackICE", "name": "Raven", "count": 2, "description": "Two Raven programs working together"}
-                    elif result == 7:
-                        return {"type": "BlackICE", "name": "Sabertooth", "description": "Dangerous Black ICE that does 4d6 damage and reduces REZ by 1d6"}
-                    elif result == 8:
-                        return {"type": "BlackICE", "name": "Hellhound", "description": "Vicious Black ICE that attacks for 4d6 damage"}
-                    elif result == 9:
-                        return {"type": "Password", "dv": 10, "description": f"Advanced security password (DV{10})"}
-                    elif result == 10:
-                        return {"type": "File", "dv": 10, "description": f"High-value data file (DV{10})"}
-                    elif result == 11:
-                        return {"type": "Control Node", "dv": 10, "description": f"Critical system control node (DV{10})"}
-                    elif result == 12:
-                        return {"type": "Password", "dv": 10, "description": f"Advanced security password (DV{10})"}
-                    elif result == 13:
-                        return {"type": "BlackICE", "name": "Killer", "description": "Dangerous program that does 3d6 damage to a Netrunner's Cyberdeck"}
-                    elif result == 14:
-                        return {"type": "BlackICE", "name": "Liche", "description": "Extremely dangerous Black ICE that does 5d6 damage"}
-                    elif result == 15:
-                        return {"type": "BlackICE", "name": "Dragon", "description": "The most dangerous Black ICE, dealing 8d6 damage"}
-                    elif result == 16:
-                        return {"type": "BlackICE", "name": "Asp", "additional": "Raven", "description": "Dangerous ICE combo: Asp and Raven working together"}
-                    elif result == 17:
-                        return {"type": "BlackICE", "name": "Dragon", "additional": "Wisp", "description": "Lethal ICE combo: Dragon and Wisp working together"}
-                    elif result == 18:
-                        return {"type": "BlackICE", "name": "Giant", "description": "Powerful Black ICE that does 6d6 damage"}
-                
-                # Advanced difficulty table
-                elif difficulty == "advanced":
-                    if result == 3:
-                        return {"type": "BlackICE", "name": "Hellhound", "count": 3, "description": "Three vicious Hellhounds working together"}
-                    elif result == 4:
-                        return {"type": "BlackICE", "name": "Asp", "count": 2, "description": "Two deadly Asp programs working together"}
-                    elif result == 5:
-                        return {"type": "BlackICE", "name": "Hellhound", "additional": "Liche", "description": "Lethal ICE combo: Hellhound and Liche working together"}
-                    elif result == 6:
-                        return {"type": "BlackICE", "name": "Wisp", "count": 3, "description": "Three Wisp programs working together"}
-                    elif result == 7:
-                        return {"type": "BlackICE", "name": "Hellhound", "additional": "Sabertooth", "description": "Dangerous ICE combo: Hellhound and Sabertooth working together"}
-                    elif result == 8:
-                        return {"type": "BlackICE", "name": "Kraken", "description": "Extremely powerful Black ICE that does 6d6 damage"}
-                    elif result == 9:
-                        return {"type": "Password", "dv": 12, "description": f"Military-grade security password (DV{12})"}
-                    elif result == 10:
-                        return {"type": "File", "dv": 12, "description": f"Critical data file (DV{12})"}
-                    elif result == 11:
-                        return {"type": "Control Node", "dv": 12, "description": f"Top-tier system control node (DV{12})"}
-                    elif result == 12:
-                        return {"type": "Password", "dv": 12, "description": f"Military-grade security password (DV{12})"}
-                    elif result == 13:
-                        return {"type": "BlackICE", "name": "Giant", "description": "Powerful Black ICE that does 6d6 damage"}
-                    elif result == 14:
-                        return {"type": "BlackICE", "name": "Dragon", "description": "The most dangerous Black ICE, dealing 8d6 damage"}
-                    elif result == 15:
-                        return {"type": "BlackICE", "name": "Killer", "additional": "Scorpion", "description": "Dangerous ICE combo: Killer and Scorpion working together"}
-                    elif result == 16:
-                        return {"type": "BlackICE", "name": "Kraken", "description": "Extremely powerful Black ICE that does 6d6 damage"}
-                    elif result == 17:
-                        return {"type": "BlackICE", "name": "Raven", "additional": "Wisp", "count": 1, "count2": 1, "count3": 1, "description": "Multi-ICE combo: Raven, Wisp, and Hellhound"}
-                    elif result == 18:
-                        return {"type": "BlackICE", "name": "Dragon", "count": 2, "description": "Two Dragon programs - a lethal combination"}
-            
-            # Default fallback - shouldn't reach here
-            return {"type": "Password", "dv": base_dv, "description": f"Fallback security password (DV{base_dv})"}
-        
-        # Generate all floors
-        current_floor = 1
-        
-        # Create main branch first (always exists)
-        main_branch_floors = floor_count
-        if branches:
-            main_branch_floors = floor_count - sum(branch["floors"] for branch in branches)
-        
-        # Generate main branch nodes
-        for floor in range(1, main_branch_floors + 1):
-            node_content = get_node_content(floor, difficulty)
-            
-            # Add strength for ICE
-            if node_content["type"] == "BlackICE":
-                # Set strength based on difficulty
-                strength_map = {
-                    "basic": random.randint(3, 6),
-                    "standard": random.randint(4, 7),
-                    "uncommon": random.randint(5, 8),
-                    "advanced": random.randint(6, 10)
-                }
-                strength = strength_map[difficulty]
-                node_content["strength"] = strength
-            
-            # Create node
-            node = {
-                "name": f"Floor {floor}",
-                "level": floor,
-                "branch": "Main",
-                "content": node_content
-            }
-            
-            architecture_data["nodes"].append(node)
-            current_floor += 1
-        
-        # Generate branch nodes
-        branch_floor_offset = 2  # Branches can only start after floor 2
-        for branch in branches:
-            branch_name = branch["name"]
-            branch_floors = branch["floors"]
-            
-            for floor in range(1, branch_floors + 1):
-                # Adjust level to make branches come off main branch
-                branched_level = branch_floor_offset + floor
-                
-                node_content = get_node_content(branched_level, difficulty)
-                
-                # Add strength for ICE
-                if node_content["type"] == "BlackICE":
-                    # Set strength based on difficulty
-                    strength_map = {
-                        "basic": random.randint(3, 6),
-                        "standard": random.randint(4, 7),
-                        "uncommon": random.randint(5, 8),
-                        "advanced": random.randint(6, 10)
-                    }
-                    strength = strength_map[difficulty]
-                    node_content["strength"] = strength
-                
-                # Create node
-                node = {
-                    "name": f"{branch_name} Floor {floor}",
-                    "level": branched_level,
-                    "branch": branch_name,
-                    "content": node_content
-                }
-                
-                architecture_data["nodes"].append(node)
-            
-            # Increment branch offset for next branch
-            branch_floor_offset += 1
-        
-        # Step 3: Add a demon if needed (1 demon per 6 floors)
-        if floor_count >= 6:
-            demon_count = floor_count // 6
-            for i in range(demon_count):
-                # Determine demon type based on difficulty
-                demon_type = "Imp"  # Default
-                if difficulty == "standard":
-                    if random.random() > 0.7:
-                        demon_type = "Efreet"
-                elif difficulty == "uncommon":
-                    roll = random.random()
-                    if roll > 0.8:
-                        demon_type = "Balron"
-                    elif roll > 0.4:
-                        demon_type = "Efreet"
-                elif difficulty == "advanced":
-                    roll = random.random()
-                    if roll > 0.6:
-                        demon_type = "Balron"
-                    elif roll > 0.2:
-                        demon_type = "Efreet"
-                
-                architecture_data["demon"] = {
-                    "type": demon_type,
-                    "description": f"{demon_type} demon that monitors and defends the architecture"
-                }
-        
-        return architecture_data
-    
-    def create_architecture_from_data(self, data):
-        """Create an architecture in the database from the generated data."""
-        # Create the main architecture object
-        architecture = NetArchitecture.objects.create(
-            name=data["name"],
-            description=data["description"],
-            difficulty={"basic": 1, "standard": 2, "uncommon": 3, "advanced": 4}[data["difficulty"]]
-        )
-        
-        # Create nodes
-        for node_data in data["nodes"]:
-            content = node_data["content"]
-            is_ice = content["type"] in ["BlackICE"]
-            
-            # Create the node
-            node = Node.objects.create(
-                architecture=architecture,
-                name=node_data["name"],
-                description=content["description"],
-                level=node_data["level"],
-                is_ice=is_ice
-            )
-            
-            # If it's ICE, create the ICE object
-            if is_ice:
-                ice_name = content["name"]
-                ice_strength = content.get("strength", 5)  # Default to 5 if not specified
-                
-                # Determine ICE type
-                ice_type = "Black"  # Default
-                
-                ice = ICE.objects.create(
-                    name=f"{ice_name} ({node_data['name']})",
-                    node=node,
-                    strength=ice_strength,
-                    type=ice_type
-                )
-                
-                # Set the ICE on the node
-                node.ice = ice
-                node.save()
-        
-        # Return the created architecture
-        return architecture
-    
+    def cmd_pool(self):
+        """Show how many pre-generated architectures are ready."""
+        self.caller.msg("|wPre-generated NET Architectures:|n")
+        for difficulty, count in pool_levels().items():
+            self.caller.msg(f"  {difficulty.capitalize()}: {count}")
+
     def display_generated_architecture(self, data):
         """Display a summary of the generated architecture."""
         self.caller.msg("|wGenerated NET Architecture:|n")
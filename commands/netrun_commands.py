@@ -2,9 +2,10 @@
 
 from evennia.commands.default.muxcommand import MuxCommand
 from evennia.utils.evmenu import EvMenu
-from world.netrunning.models import Cyberdeck, NetArchitecture, NetrunSession, Node, Program, ICE, BlackICE
+from world.netrunning.models import NetArchitecture as NetArchitectureModel, Program
+from world.netrunning.session import ActiveNetrun, get_active_run, get_cyberdeck
 from world.cyberpunk_sheets.models import CharacterSheet
-from world.inventory.models import Gear, CyberwareInstance, Inventory
+from world.inventory.items import get_inventory
 from world.netrunning.interface import NetrunnerActions, NetCombat
 from evennia import DefaultCharacter
 from typeclasses.net_architecture import NetArchitecture  # Adjust import path as needed
@@ -47,42 +48,41 @@ class CmdNet(MuxCommand):
         else:
             self.caller.msg(f"Unknown switch. Use one of: {', '.join(self.switch_options)}")
 
-    def cmd_run(self):
-        """Initiate a netrun against an architecture."""
-        if not self.args:
-            self.caller.msg("Usage: net/run <architecture>")
-            return
+    def get_sheet_and_cyberdeck(self):
+        """
+        Return the caller's (CharacterSheet, Cyberdeck). While jacked in the
+        deck loaded at jack-in is reused; otherwise it is looked up once.
+        """
+        run = get_active_run(self.caller)
+        if run:
+            return run.sheet, run.deck
 
-        # Check if the character is a Netrunner
         try:
             char_sheet = CharacterSheet.objects.get(character=self.caller)
-            if char_sheet.role != "Netrunner":
-                self.caller.msg("Only Netrunners can perform netruns.")
-                return
         except CharacterSheet.DoesNotExist:
             self.caller.msg("You don't have a character sheet.")
+            return None, None
+
+        return char_sheet, get_cyberdeck(char_sheet, get_inventory(self.caller))
+
+    def cmd_run(self):
+        """Initiate a netrun against an architecture."""
+        if not self.args:
+            self.caller.msg("Usage: net/run <architecture>")
             return
 
-        # Check if the character has a Cyberdeck (either as gear or cyberware)
-        cyberdeck = None
-        try:
-            inventory = Inventory.objects.get(character=char_sheet)
-            gear_cyberdeck = next((gear for gear in inventory.gear.all() if gear.is_cyberdeck), None)
-        except Inventory.DoesNotExist:
-            gear_cyberdeck = None
+        if get_active_run(self.caller):
+            self.caller.msg("You are already jacked in.")
+            return
 
-        cyberware_cyberdeck = next((cw for cw in char_sheet.cyberware_instances.filter(installed=True) if cw.is_cyberdeck), None)
+        char_sheet, cyberdeck = self.get_sheet_and_cyberdeck()
+        if not char_sheet:
+            return
 
-        if gear_cyberdeck:
-            cyberdeck, created = Cyberdeck.objects.get_or_create(
-                gear=gear_cyberdeck,
-                defaults={'name': gear_cyberdeck.name, 'owner': char_sheet}
-            )
-        elif cyberware_cyberdeck:
-            cyberdeck, created = Cyberdeck.objects.get_or_create(
-                cyberware=cyberware_cyberdeck,
-                defaults={'name': cyberware_cyberdeck.cyberware.name, 'owner': char_sheet}
-            )
+        # Check if the character is a Netrunner
+        if char_sheet.role != "Netrunner":
+            self.caller.msg("Only Netrunners can perform netruns.")
+            return
 
         if not cyberdeck:
             self.caller.msg("You need a Cyberdeck to perform a netrun.")
@@ -91,65 +91,79 @@ class CmdNet(MuxCommand):
         # Find the target architecture
         arch_name = self.args.strip()
         try:
-            architecture = NetArchitecture.objects.get(name__iexact=arch_name)
-        except NetArchitecture.DoesNotExist:
+            architecture = NetArchitectureModel.objects.get(name__iexact=arch_name)
+        except NetArchitectureModel.DoesNotExist:
             self.caller.msg(f"Architecture '{arch_name}' not found.")
             return
 
-        # Start the netrun session
-        netrun_session = NetrunSession.objects.create(
-            netrunner=char_sheet,
-            architecture=architecture,
-            current_node=architecture.nodes.first(),
-            is_active=True
-        )
+        # Load the deck, programs and architecture once for the whole run
+        ActiveNetrun.jack_in(self.caller, char_sheet, cyberdeck, architecture)
 
         self.caller.msg(f"Initiating netrun against {architecture.name}...")
-        
+
+        # Menu option key -> (action, whether it targets the current node)
+        actions = {
+            "backdoor": (NetrunnerActions.backdoor, True),
+            "cloak": (NetrunnerActions.cloak, False),
+            "control": (NetrunnerActions.control, True),
+            "eye_dee": (NetrunnerActions.eye_dee, True),
+            "pathfinder": (NetrunnerActions.pathfinder, False),
+            "scanner": (NetrunnerActions.scanner, False),
+            "slide": (NetrunnerActions.slide, False),
+            "virus": (NetrunnerActions.virus, True),
+        }
+
         # Define the menu nodes
         def netrun_node(caller, raw_string, **kwargs):
-            netrun_session = caller.ndb.netrun_session
-            if not netrun_session or not netrun_session.is_active:
+            netrun_session = get_active_run(caller)
+            if not netrun_session:
                 caller.msg("Your netrun session has ended.")
                 return None
 
             node = netrun_session.current_node
+            ice = netrun_session.current_ice
             text = f"You are at node: {node.name}\n{node.description}"
-            text += f"\nICE: {node.ice.name if node.ice else 'None'}"
-            text += f"\nPrograms: {', '.join(p.name for p in cyberdeck.installed_programs.all())}"
+            text += f"\nICE: {f'{ice.name} (REZ {ice.rez})' if ice else 'None'}"
+            text += f"\nHP: {netrun_session.hp}"
+            text += f"\nPrograms: {', '.join(p.name for p in netrun_session.programs)}"
+            if netrun_session.active_program:
+                text += f"\nActive program: {netrun_session.active_program.name}"
 
             options = [
-                {"key": "1", "desc": "Backdoor", "goto": "perform_action", "exec": NetrunnerActions.backdoor},
-                {"key": "2", "desc": "Cloak", "goto": "perform_action", "exec": NetrunnerActions.cloak},
-                {"key": "3", "desc": "Control", "goto": "perform_action", "exec": NetrunnerActions.control},
-                {"key": "4", "desc": "Eye-Dee", "goto": "perform_action", "exec": NetrunnerActions.eye_dee},
-                {"key": "5", "desc": "Pathfinder", "goto": "perform_action", "exec": NetrunnerActions.pathfinder},
-                {"key": "6", "desc": "Scanner", "goto": "perform_action", "exec": NetrunnerActions.scanner},
-                {"key": "7", "desc": "Slide", "goto": "perform_action", "exec": NetrunnerActions.slide},
-                {"key": "8", "desc": "Virus", "goto": "perform_action", "exec": NetrunnerActions.virus},
+                {"key": "1", "desc": "Backdoor", "goto": ("perform_action", {"action": "backdoor"})},
+                {"key": "2", "desc": "Cloak", "goto": ("perform_action", {"action": "cloak"})},
+                {"key": "3", "desc": "Control", "goto": ("perform_action", {"action": "control"})},
+                {"key": "4", "desc": "Eye-Dee", "goto": ("perform_action", {"action": "eye_dee"})},
+                {"key": "5", "desc": "Pathfinder", "goto": ("perform_action", {"action": "pathfinder"})},
+                {"key": "6", "desc": "Scanner", "goto": ("perform_action", {"action": "scanner"})},
+                {"key": "7", "desc": "Slide", "goto": ("perform_action", {"action": "slide"})},
+                {"key": "8", "desc": "Virus", "goto": ("perform_action", {"action": "virus"})},
             ]
 
-            if node.ice:
-                options.append({"key": "C", "desc": f"Attempt to crack {node.ice.name} ICE", "goto": "crack_ice"})
+            if ice:
+                options.append({"key": "C", "desc": f"Attempt to crack {ice.name} ICE", "goto": "crack_ice"})
 
-            next_nodes = Node.objects.filter(architecture=netrun_session.architecture, level=node.level+1)
+            next_nodes = netrun_session.nodes_on_level(node.level + 1)
             for i, next_node in enumerate(next_nodes, start=9):
                 options.append({"key": str(i), "desc": f"Move to {next_node.name}", "goto": ("move_to_node", {"node_id": next_node.id})})
-                options.append({"key": "A", "desc": "Activate a program", "goto": "activate_program"})
-                options.append({"key": "J", "desc": "Jack out", "goto": "jack_out"})
+            options.append({"key": "A", "desc": "Activate a program", "goto": "activate_program"})
+            options.append({"key": "J", "desc": "Jack out", "goto": "jack_out"})
 
             return text, options
 
         def perform_action(caller, raw_string, **kwargs):
-            action = kwargs.get("exec")
-            if action:
-                action(caller, caller.ndb.netrun_session.current_node)
+            netrun_session = get_active_run(caller)
+            action, targeted = actions.get(kwargs.get("action"), (None, False))
+            if netrun_session and action:
+                if targeted:
+                    action(caller, netrun_session.current_node)
+                else:
+                    action(caller)
             return "netrun_node"
 
         def crack_ice(caller, raw_string, **kwargs):
-            netrun_session = caller.ndb.netrun_session
-            current_node = netrun_session.current_node
-            ice = current_node.ice
+            netrun_session = get_active_run(caller)
+            ice = netrun_session.current_ice
 
             if not ice:
                 caller.msg("There's no ICE to crack on this node.")
@@ -160,23 +174,21 @@ class CmdNet(MuxCommand):
             success, damage = NetCombat.attack(caller, ice)
 
             if success:
-                ice.rez -= damage
+                netrun_session.damage_ice(damage)
                 caller.msg(f"You successfully attack the ICE, dealing {damage} damage!")
                 if ice.rez <= 0:
                     caller.msg(f"You've cracked the {ice.name} ICE!")
-                    current_node.ice = None
-                    current_node.save()
                 else:
                     caller.msg(f"The ICE is damaged but still active. It has {ice.rez} REZ remaining.")
             else:
                 caller.msg("Your attack failed to penetrate the ICE's defenses.")
                 
                 # ICE counterattack
-                ice_success, ice_damage = NetCombat.attack(ice, caller)
-                if ice_success:
-                    caller.db.hp -= ice_damage
+                ice_damage = ice.react(netrun_session)
+                if ice_damage:
+                    netrun_session.take_damage(ice_damage)
                     caller.msg(f"The ICE counterattacks, dealing {ice_damage} damage to you!")
-                    if caller.db.hp <= 0:
+                    if netrun_session.hp <= 0:
                         caller.msg("You've taken too much damage. Emergency jack-out initiated.")
                         return "jack_out"
                 else:
@@ -184,36 +196,58 @@ class CmdNet(MuxCommand):
 
             return "netrun_node"
 
+        def select_program(caller, raw_string, **kwargs):
+            netrun_session = get_active_run(caller)
+            program = netrun_session and next(
+                (p for p in netrun_session.programs if p.id == kwargs.get('program_id')), None)
+            if program:
+                netrun_session.activate(program)
+                caller.msg(f"You activate {program.name}.")
+            return "netrun_node"
+
+        def activate_program(caller, raw_string, **kwargs):
+            netrun_session = get_active_run(caller)
+            if not netrun_session:
+                return "Your netrun session has ended.", None
+
+            if not netrun_session.programs:
+                text = "You have no programs installed on your Cyberdeck."
+            else:
+                text = "Choose a program to activate:"
+            options = [
+                {"key": str(i), "desc": f"{program.name}: {program.effect}",
+                 "goto": (select_program, {"program_id": program.id})}
+                for i, program in enumerate(netrun_session.programs, start=1)
+            ]
+            options.append({"key": "B", "desc": "Back", "goto": "netrun_node"})
+            return text, options
+
         def move_to_node(caller, raw_string, **kwargs):
-            netrun_session = caller.ndb.netrun_session
-            node_id = kwargs.get('node_id')
-            
-            try:
-                new_node = Node.objects.get(id=node_id)
-                netrun_session.current_node = new_node
-                netrun_session.save()
+            netrun_session = get_active_run(caller)
+            new_node = netrun_session.get_node(kwargs.get('node_id'))
+
+            if new_node:
+                netrun_session.move_to(new_node)
                 caller.msg(f"Moving to node: {new_node.name}")
-            except Node.DoesNotExist:
+            else:
                 caller.msg("Invalid node.")
             
             return "netrun_node"
 
         def jack_out(caller, raw_string, **kwargs):
             netrun_session = caller.ndb.netrun_session
-            netrun_session.is_active = False
-            netrun_session.save()
+            if netrun_session:
+                netrun_session.jack_out()
             caller.msg("You've jacked out of the system.")
             return None
 
-        # Store the netrun_session in the caller's ndb attribute
-        self.caller.ndb.netrun_session = netrun_session
-
         # Create the EvMenu
         EvMenu(self.caller,
                {
                    "netrun_node": netrun_node,
                    "perform_action": perform_action,
                    "crack_ice": crack_ice,
+                   "activate_program": activate_program,
                    "move_to_node": move_to_node,
                    "jack_out": jack_out
                },
@@ -239,85 +273,45 @@ class CmdNet(MuxCommand):
             self.caller.msg(f"Program '{program_name}' not found.")
             return
 
-        # Check if the character has a Cyberdeck
-        try:
-            char_sheet = CharacterSheet.objects.get(character=self.caller)
-        except CharacterSheet.DoesNotExist:
-            self.caller.msg("You don't have a character sheet.")
+        char_sheet, cyberdeck = self.get_sheet_and_cyberdeck()
+        if not char_sheet:
             return
 
-        # Try to get cyberdeck (from gear or cyberware)
-        cyberdeck = None
-        try:
-            inventory = Inventory.objects.get(character=char_sheet)
-            gear_cyberdeck = next((gear for gear in inventory.gear.all() if gear.is_cyberdeck), None)
-        except Inventory.DoesNotExist:
-            gear_cyberdeck = None
-
-        cyberware_cyberdeck = next((cw for cw in char_sheet.cyberware_instances.filter(installed=True) if cw.is_cyberdeck), None)
-
-        if gear_cyberdeck:
-            cyberdeck, created = Cyberdeck.objects.get_or_create(
-                gear=gear_cyberdeck,
-                defaults={'name': gear_cyberdeck.name, 'owner': char_sheet}
-            )
-        elif cyberware_cyberdeck:
-            cyberdeck, created = Cyberdeck.objects.get_or_create(
-                cyberware=cyberware_cyberdeck,
-                defaults={'name': cyberware_cyberdeck.cyberware.name, 'owner': char_sheet}
-            )
-
         if not cyberdeck:
             self.caller.msg("You don't have a Cyberdeck installed.")
             return
 
         if cyberdeck.available_slots > 0:
             cyberdeck.install_program(program)
+            run = get_active_run(self.caller)
+            if run:
+                run.programs.append(program)
             self.caller.msg(f"Successfully installed {program.name} on your Cyberdeck.")
         else:
             self.caller.msg("Your Cyberdeck has no available slots for new programs.")
 
     def cmd_programs(self):
         """List all programs installed on your cyberdeck."""
-        # Check if the character has a Cyberdeck
-        try:
-            char_sheet = CharacterSheet.objects.get(character=self.caller)
-        except CharacterSheet.DoesNotExist:
-            self.caller.msg("You don't have a character sheet.")
-            return
-
-        # Try to get cyberdeck (from gear or cyberware)
-        cyberdeck = None
-        try:
-            inventory = Inventory.objects.get(character=char_sheet)
-            gear_cyberdeck = next((gear for gear in inventory.gear.all() if gear.is_cyberdeck), None)
-        except Inventory.DoesNotExist:
-            gear_cyberdeck = None
-
-        cyberware_cyberdeck = next((cw for cw in char_sheet.cyberware_instances.filter(installed=True) if cw.is_cyberdeck), None)
+        run = get_active_run(self.caller)
+        if run:
+            installed_programs = run.programs
+        else:
+            char_sheet, cyberdeck = self.get_sheet_and_cyberdeck()
+            if not char_sheet:
+                return
 
-        if gear_cyberdeck:
-            cyberdeck, created = Cyberdeck.objects.get_or_create(
-                gear=gear_cyberdeck,
-                defaults={'name': gear_cyberdeck.name, 'owner': char_sheet}
-            )
-        elif cyberware_cyberdeck:
-            cyberdeck, created = Cyberdeck.objects.get_or_create(
-                cyberware=cyberware_cyberdeck,
-                defaults={'name': cyberware_cyberdeck.cyberware.name, 'owner': char_sheet}
-            )
+            if not cyberdeck:
+                self.caller.msg("You don't have a Cyberdeck installed.")
+                return
 
-        if not cyberdeck:
-            self.caller.msg("You don't have a Cyberdeck installed.")
-            return
+            installed_programs = cyberdeck.installed_programs.all()
 
-        installed_programs = cyberdeck.installed_programs.all()
         if not installed_programs:
             self.caller.msg("You have no programs installed on your Cyberdeck.")
         else:
             self.caller.msg("Installed programs:")
             for program in installed_programs:
-                self.caller.msg(f"- {program.name}: {program.description}")
+                self.caller.msg(f"- {program.name}: {program.effect}")
 
     def cmd_list(self):
         """List all available Net Architectures."""
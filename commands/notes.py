@@ -9,6 +9,7 @@ from world.utils.formatting import header, footer, divider, format_stat
 from collections import defaultdict
 from django.utils import timezone
 from evennia import logger
+from world.notes.storage import find_note, pending_notes
 
 class CmdNotes(MuxCommand):
     """
@@ -30,6 +31,8 @@ class CmdNotes(MuxCommand):
       +note/prove <note>=<target(s)> - show any note to a list of targets
       +note/approve[/<category>] <target>/<note> - approve a note (staff only)
       +note/unapprove[/<category>] <target>/<note> - unapprove a note (staff only)
+      +note/search <text>         - search your notes' names and text
+      +note/pending               - list notes awaiting approval (staff only)
     """
 
     key = "+note"
@@ -61,6 +64,10 @@ class CmdNotes(MuxCommand):
                 self.approve_unapprove_note(False)
             elif switch == "decompile":
                 self.decompile_note()
+            elif switch == "search":
+                self.search_notes()
+            elif switch == "pending":
+                self.list_pending()
             else:
                 self.caller.msg(f"Unknown switch: {switch}")
         else:
@@ -87,7 +94,7 @@ class CmdNotes(MuxCommand):
                 truncated_text = note.text[:60] + "..." if len(note.text) > 60 else note.text
                 wrapped_text = wrap_ansi(truncated_text, width=width-4)  # -4 for left padding
                 
-                note_header = f"|y* |w#{note.id} |n{note.name}"
+                note_header = f"|y* |w#{note.number} |n{note.name}"
                 output += note_header + "\n"
                 output += "    " + wrapped_text.replace("\n", "\n    ") + "\n\n"
 
@@ -265,24 +272,49 @@ class CmdNotes(MuxCommand):
         self.display_note(note)
 
     def get_note(self, target, identifier, category=None):
-        notes = target.get_all_notes()
-        if category:
-            notes = [note for note in notes if note.category.lower() == category.lower()]
+        return find_note(target, identifier, category)
 
-        try:
-            note_id = int(identifier)
-            note = next((note for note in notes if note.id == note_id), None)
-        except ValueError:
-            note = next((note for note in notes if note.name.lower() == identifier.lower()), None)
+    def search_notes(self):
+        if not self.args:
+            self.caller.msg("Usage: +note/search <text>")
+            return
+
+        notes = self.caller.search_notes(self.args.strip())
+        if not notes:
+            self.caller.msg(f"No notes match '{self.args.strip()}'.")
+            return
+
+        width = 78
+        output = header(f"Notes matching '{self.args.strip()}'", width=width, fillchar="=")
+        for note in notes:
+            output += f"|y* |w#{note.number} |n{note.name} |c({note.category})|n\n"
+        output += footer(width=width, fillchar="=")
+        self.caller.msg(output)
 
-        return note
+    def list_pending(self):
+        if not self.caller.check_permstring("Builders"):
+            self.caller.msg("You don't have permission to review notes.")
+            return
+
+        notes = pending_notes()
+        if not notes:
+            self.caller.msg("No notes are waiting for approval.")
+            return
+
+        width = 78
+        output = header("Notes Awaiting Approval", width=width, fillchar="=")
+        for note in notes:
+            created = note.created_at.strftime('%Y-%m-%d')
+            output += f"|w{note.character.key}/{note.number}|n {crop(note.name, width=40)} |c({note.category})|n {created}\n"
+        output += footer(width=width, fillchar="=")
+        self.caller.msg(output)
 
     def display_note(self, note, target=None):
         viewer = target or self.caller
         width = 78
 
         # Header
-        output = header(f"Note #{note.id}", width=width, color="|c", fillchar="|b=|n")
+        output = header(f"Note #{note.number}", width=width, color="|c", fillchar="|b=|n")
 
         # Note details
         output += format_stat("Note Title:", note.name, width=width) + "\n"
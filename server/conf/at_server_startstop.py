@@ -7,7 +7,7 @@ customization of these hooks.
 
 """
 
-from evennia import AccountDB, create_script
+from evennia import AccountDB, create_object, create_script
 from evennia.utils import logger
 from evennia.server.sessionhandler import SESSIONS
 from world.world_scripts import WorldScript
@@ -16,16 +16,22 @@ from typeclasses.rental import RentableRoom
 from world.equipment_data import initialize_weapons, initialize_armor, initialize_gear, initialize_ammunition
 from world.cyberware.cyberware_data import initialize_cyberware
 from typeclasses.factions import Faction
-
+from world.netrunning.pool import ArchitecturePoolScript
+from world.factions.reputation import ReputationDecayScript
+from world.census import CensusScript
+from world.notes.storage import migrate_note_attributes
+from world.inventory.items import backfill_from_links
+from world.missions import migrate_mission_scripts
+from world.netrunning.session import close_stale_sessions
+from world.languages.language_dictionary import sync_languages
+from world.utils.startup import BACKGROUND, LAZY, run_startup, startup_step
+from world.utils import logs
 
 import traceback
 
-def at_server_start():
-    """
-    This is called every time the server starts up, regardless of
-    how it was shut down.
-    """
-    # Initialize the faction system
+@startup_step("factions")
+def init_factions():
+    """Make sure the faction storage, FactionMaster and default factions exist."""
     logger.log_info("Initializing the faction system...")
     
     storage = Faction.get_faction_storage()
@@ -36,7 +42,6 @@ def at_server_start():
     # Check if we have a master faction object
     master = Faction.objects.filter(db_key="FactionMaster").first()
     if not master:
-        from evennia import create_object
         master = create_object(
             "typeclasses.factions.Faction",
             key="FactionMaster",
@@ -47,9 +52,10 @@ def at_server_start():
     # Ensure default factions exist
     from typeclasses.factions import DEFAULT_FACTIONS, FactionModel
     created_count = 0
+    existing = set(FactionModel.objects.filter(name__in=DEFAULT_FACTIONS).values_list("name", flat=True))
     
     for name, data in DEFAULT_FACTIONS.items():
-        if not FactionModel.objects.filter(name=name).exists():
+        if name not in existing:
             try:
                 faction_model = FactionModel.objects.create(
                     name=name,
@@ -75,21 +81,89 @@ def at_server_start():
         logger.log_info(f"Created {created_count} default factions")
     logger.log_info("Faction system initialization complete")
 
+
+@startup_step("global scripts")
+def init_global_scripts():
     # Start the WorldScript
     if not WorldScript.objects.filter(db_key="WorldScript").exists():
         create_script(WorldScript)
-    
+
+    # Keep a pool of ready-made NET Architectures
+    if not ArchitecturePoolScript.objects.filter(db_key="ArchitecturePool").exists():
+        create_script(ArchitecturePoolScript)
+
+    # Drift faction reputation back toward neutral
+    if not ReputationDecayScript.objects.filter(db_key="ReputationDecay").exists():
+        create_script(ReputationDecayScript)
+
+    # Reconcile the incremental census counters
+    if not CensusScript.objects.filter(db_key="CensusReconcile").exists():
+        create_script(CensusScript)
+
+
+@startup_step("rent scripts", BACKGROUND)
+def init_rent_scripts():
     # Start RentCollectionScripts for all rentable rooms
     for room in RentableRoom.objects.all():
         if not room.scripts.get("rent_collection_" + str(room.id)):
             create_script(RentCollectionScript, obj=room)
 
+
+@startup_step("catalogues", BACKGROUND)
+def seed_catalogues():
     initialize_weapons()
     initialize_armor()
     initialize_gear()
     initialize_ammunition()
     initialize_cyberware()
 
+
+@startup_step("notes", BACKGROUND)
+def migrate_notes():
+    # Move any notes still kept in character Attributes into the Note table
+    migrated = migrate_note_attributes()
+    if migrated:
+        logger.log_info(f"Migrated {migrated} notes from character Attributes.")
+
+
+@startup_step("item instances", BACKGROUND)
+def backfill_item_instances():
+    # Give inventories their own copies of items they only link to
+    created = backfill_from_links()
+    if created:
+        logger.log_info(f"Created {created} item instances from inventory links.")
+
+
+@startup_step("netrun sessions", BACKGROUND)
+def close_netrun_sessions():
+    # Runs only live in memory, so any still marked active were cut off
+    closed = close_stale_sessions()
+    if closed:
+        logger.log_info(f"Closed {closed} netrun sessions left open by a restart.")
+
+
+@startup_step("missions", BACKGROUND)
+def migrate_missions():
+    # Move missions still kept as one script each into the Mission table
+    migrated = migrate_mission_scripts()
+    if migrated:
+        logger.log_info(f"Migrated {migrated} mission scripts into the Mission table.")
+
+
+# Add any catalogue languages missing from the database; get_language()
+# requires this, so it runs on the first lookup if that comes first
+startup_step("languages", LAZY)(sync_languages)
+
+
+def at_server_start():
+    """
+    This is called every time the server starts up, regardless of
+    how it was shut down.
+
+    Startup work is declared above as eager, background or lazy steps;
+    see world/utils/startup.py.
+    """
+    run_startup()
     logger.log_info("Server startup scripts have been initialized.")
 
 
@@ -112,6 +186,7 @@ def at_server_stop():
     # Remove the SESSIONS.disconnect_all_sessions call
 
     logger.log_info("Custom server shutdown complete")
+    logs.flush()
 
 def at_server_reload_start(account_sessions=None):
     """
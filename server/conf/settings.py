@@ -72,7 +72,11 @@ INSTALLED_APPS += [  # type: ignore
     'world.plots',
     'world.hangouts',
     'world.languages',
-    'world.netrunning'
+    'world.netrunning',
+    'world.connections',
+    'world.notes',
+    'world.hustles',
+    'world.mission_board'
 ]
 CMDSET_CHARACTER = "commands.default_cmdsets.CharacterCmdSet"
 BASE_ROOM_TYPECLASS = "typeclasses.rooms.Room"
@@ -274,7 +278,9 @@ LOGGING = {
     },
     'handlers': {
         'server_file': {
-            'level': 'INFO',
+            # Levels are set per logger; DEBUG here lets a subsystem switched
+            # to DEBUG actually reach the file
+            'level': 'DEBUG',
             'class': 'logging.handlers.RotatingFileHandler',
             'filename': SERVER_LOG_FILE,
             'maxBytes': SERVER_LOG_MAX_SIZE,
@@ -302,6 +308,13 @@ LOGGING = {
             'handlers': ['portal_file'],
             'level': 'INFO',
             'propagate': False
+        },
+        # Game subsystems (world/utils/logs.py). Give one its own level with
+        # e.g. 'cyberpunk.time': {'level': 'DEBUG'}, or use the loglevel command.
+        'cyberpunk': {
+            'handlers': ['server_file'],
+            'level': 'WARNING',
+            'propagate': False
         }
     },
     'root': {
@@ -310,6 +323,12 @@ LOGGING = {
     }
 }
 
+# Subsystem log throttling (world/utils/logs.py)
+LOG_RATE_LIMIT = 20  # DEBUG records per call site per window
+LOG_RATE_WINDOW = 60  # seconds
+LOG_QUEUE_SIZE = 10000  # records waiting to be written before dropping
+LOG_SAMPLE_RATES = {}  # e.g. {'cyberpunk.time': 10} keeps one in ten
+
 # Configure log rotation
 PORTAL_LOG_ROTATE_SIZE = 1000000  # Rotate at 1 MB
 PORTAL_LOG_FILES = 10  # Keep 10 backup files
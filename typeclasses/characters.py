@@ -10,14 +10,17 @@ from evennia import DefaultCharacter
 from django.apps import apps
 from world.cyberpunk_constants import LANGUAGES
 from world.languages.models import CharacterLanguage, Language
+from world.languages import comprehension
+from world.connections.history import record_connection
+from world.notes.models import Note
+from world.notes.storage import find_note, next_number
 from world.cyberpunk_sheets.models import CharacterSheet
+from world.utils.calculation_utils import calculate_character_points_spent, remaining_points
 from evennia.utils.ansi import ANSIString
 from world.utils.ansi_utils import wrap_ansi
 from world.utils.formatting import header, footer, divider
 import logging, re
-from datetime import datetime
 logger = logging.getLogger('cyberpunk.character')
-from evennia.utils.utils import lazy_property
 
 class Character(DefaultCharacter):
     def at_object_creation(self):
@@ -37,7 +40,7 @@ class Character(DefaultCharacter):
         
         # Faction-related attributes
         self.db.faction = None  # Name of the character's faction
-        self.db.faction_rep = {}  # Dictionary of faction name : reputation value
+        # Faction reputation lives in FactionReputation; see the faction_rep property
         
         # Core attributes
         self.db.intelligence = 1
@@ -209,10 +212,6 @@ class Character(DefaultCharacter):
             "whisper": True,
             "new_page": True,
         }
-        
-        # Initialize notes storage
-        self.db.notes = {}
-        self.db.notes_public = {}  # For public notes that others can view
 
     @classmethod
     def create_character_sheet(cls, account=None):
@@ -285,10 +284,9 @@ class Character(DefaultCharacter):
             from time import time
             self.attributes.add("last_disconnect", time())
             
-            # Store the last IP address used
-            if session and hasattr(session, 'address'):
-                ip_addr = isinstance(session.address, tuple) and session.address[0] or session.address
-                self.attributes.add("last_ip", ip_addr)
+            # Note when this IP was last used
+            if session:
+                record_connection(self, session)
 
             # Notification now handled by signal system
             # from commands.CmdWatch import notify_watchers
@@ -303,6 +301,9 @@ class Character(DefaultCharacter):
         logger.log_info(f"at_post_puppet called for {self.key}")
 
         super().at_post_puppet(**kwargs)
+
+        for session in self.sessions.all():
+            record_connection(self, session)
         
         # Automatically migrate character sheet data to typeclass if needed
         if not self.attributes.has("db_migrated_character_sheet"):
@@ -469,6 +470,12 @@ class Character(DefaultCharacter):
                 logger.warning(f"Character sheet with ID {sheet_id} not found for {self.name}")
         return None
 
+    @property
+    def faction_rep(self):
+        """Dictionary of faction name : reputation value, read through from FactionReputation."""
+        from world.factions.reputation import get_reputations
+        return get_reputations(self)
+
     @property
     def humanity(self):
         """Calculate and return the character's humanity."""
@@ -625,20 +632,6 @@ class Character(DefaultCharacter):
         role_skill = role_ability_mapping.get(self.db.role)
         return self.db.skills.get(role_skill, 0) if role_skill else 0
 
-    @property
-    def language_list(self):
-        if not self.character_sheet:
-            return []
-        return [f"{cl.language.name} (Level {cl.level})" 
-                for cl in self.character_sheet.character_languages.all()]
-
-    def knows_language(self, language_name):
-        if not self.character_sheet:
-            return False
-        return self.character_sheet.character_languages.filter(
-            language__name__iexact=language_name
-        ).exists()
-
     def at_post_move(self, source_location, **kwargs):
         super().at_post_move(source_location, **kwargs)
         if self.character_sheet:
@@ -826,12 +819,8 @@ class Character(DefaultCharacter):
     # Language-related methods
     def add_language(self, language_name, level):
         """Add a language to the character."""
-        # Initialize languages dict if not exists
-        if not hasattr(self.db, 'languages'):
-            self.db.languages = {}
-        
         # Add the language with its level
-        languages = self.db.languages
+        languages = self.db.languages or {}
         languages[language_name] = level
         self.db.languages = languages
         
@@ -841,11 +830,8 @@ class Character(DefaultCharacter):
     
     def remove_language(self, language_name):
         """Remove a language from the character."""
-        if not hasattr(self.db, 'languages'):
-            return
-        
         # Remove the language if it exists
-        languages = self.db.languages
+        languages = self.db.languages or {}
         if language_name in languages:
             del languages[language_name]
             self.db.languages = languages
@@ -893,8 +879,8 @@ class Character(DefaultCharacter):
         return [f"{name} (Level {level})" for name, level in self.languages.items()]
     
     def knows_language(self, language_name):
-        """Check if the character knows a specific language."""
-        return language_name in self.languages
+        """Check if the character knows a specific language (case-insensitive)."""
+        return comprehension.knows_language(self, language_name)
 
     def set_default_language(self, language_name="English", level=4):
         """Set a default language for the character."""
@@ -928,39 +914,6 @@ class Character(DefaultCharacter):
         else:
             return 1
 
-    # Language-related methods
-    def add_language(self, language_name, level):
-        """Add a language to the character."""
-        # Initialize languages dict if not exists
-        if not hasattr(self.db, 'languages'):
-            self.db.languages = {}
-        
-        # Add the language with its level
-        languages = self.db.languages
-        languages[language_name] = level
-        self.db.languages = languages
-        
-        # For backward compatibility, also update CharacterSheet if it exists
-        if self.character_sheet:
-            self.character_sheet.add_language(language_name, level)
-
-    def remove_language(self, language_name):
-        try:
-            language = Language.objects.get(name__iexact=language_name)
-            CharacterLanguage.objects.filter(character_sheet=self, language=language).delete()
-            logger.log_info(f"Removed language {language_name} from character sheet")
-        except Language.DoesNotExist:
-            logger.log_warn(f"Language {language_name} not found, nothing to remove")
-
-    def update_language_level(self, language_name, new_level):
-        try:
-            language = Language.objects.get(name=language_name)
-            char_lang = CharacterLanguage.objects.get(character_sheet=self, language=language)
-            char_lang.level = new_level
-            char_lang.save()
-        except (Language.DoesNotExist, CharacterLanguage.DoesNotExist):
-            pass  # Language or character-language relationship not found
-
     def get_skill_instance(self, skill_name, instance):
         """Get a skill instance value by name and instance."""
         if not self.db.skill_instances:
@@ -983,36 +936,7 @@ class Character(DefaultCharacter):
     
     def calculate_spent_points(self):
         """Calculate spent character points"""
-        # Stats
-        stat_points = sum([
-            self.db.intelligence, self.db.reflexes, self.db.dexterity, 
-            self.db.technology, self.db.cool, self.db.willpower,
-            self.db.luck, self.db.move, self.db.body, self.db.empathy
-        ])
-        
-        # Skills - get from skills dictionary
-        skills = self.db.skills
-        double_cost_skills = ['autofire', 'martial_arts', 'pilot_air', 
-                            'heavy_weapons', 'demolitions', 'electronics', 'paramedic']
-        skill_points = 0
-        for skill, value in skills.items():
-            multiplier = 2 if skill in double_cost_skills else 1
-            skill_points += value * multiplier
-        
-        # Skill instances - get from skill_instances dictionary
-        if self.db.skill_instances:
-            for skill_instance, value in self.db.skill_instances.items():
-                # Extract base skill name from instance key (format: "skill(instance)")
-                if "(" in skill_instance:
-                    base_skill = skill_instance.split("(")[0]
-                    multiplier = 2 if base_skill in double_cost_skills else 1
-                    skill_points += value * multiplier
-        
-        # Languages
-        language_points = sum(level for _, level in self.languages.items())
-        
-        total_skill_points = skill_points + language_points
-        return stat_points, total_skill_points
+        return calculate_character_points_spent(self)
         
     @property
     def active_skills_with_instances(self):
@@ -1313,334 +1237,94 @@ class Character(DefaultCharacter):
         
         return True
 
-@classmethod
-def create_sheet(cls, account, character, **kwargs):
-    """Create a sheet for the character"""
-    # Get the CharacterSheet model
-    CharacterSheet = apps.get_model('cyberpunk_sheets', 'CharacterSheet')
-    sheet = CharacterSheet.objects.create(account=account, character=character, **kwargs)
-    if character:
-        character.db.character_sheet_id = sheet.id
-    return sheet
-
-def get_remaining_points(self):
-    """Get remaining character points"""
-    stat_points_spent, skill_points_spent = self.calculate_spent_points()
-    remaining_stat_points = max(0, 62 - stat_points_spent)
-    remaining_skill_points = max(0, 86 - skill_points_spent)
-    return remaining_stat_points, remaining_skill_points
-
-class Note:
-    def __init__(self, name, text, category="General", is_public=False, is_approved=False, 
-                 approved_by=None, approved_at=None, created_at=None, updated_at=None, note_id=None):
-        self.name = name
-        self.text = text
-        self.category = category
-        self.is_public = is_public
-        self.is_approved = is_approved
-        self.approved_by = approved_by
-        self.approved_at = approved_at
-        self.created_at = created_at if isinstance(created_at, datetime) else datetime.now()
-        self.updated_at = updated_at if isinstance(updated_at, datetime) else datetime.now()
-        self.note_id = note_id
-
-    @property
-    def id(self):
-        """For backwards compatibility"""
-        return self.note_id
-
-    def to_dict(self):
-        return {
-            'name': self.name,
-            'text': self.text,
-            'category': self.category,
-            'is_public': self.is_public,
-            'is_approved': self.is_approved,
-            'approved_by': self.approved_by,
-            'approved_at': self.approved_at.isoformat() if self.approved_at else None,
-            'created_at': self.created_at.isoformat() if self.created_at else None,
-            'updated_at': self.updated_at.isoformat() if self.updated_at else None,
-            'note_id': self.note_id
-        }
-
-    @classmethod
-    def from_dict(cls, data):
-        # Handle SaverDict by creating a new dict with its items
-        note_data = {k: v for k, v in data.items()}
-        
-        # Convert datetime strings back to datetime objects
-        for field in ['created_at', 'updated_at', 'approved_at']:
-            if note_data.get(field):
-                try:
-                    if isinstance(note_data[field], str):
-                        note_data[field] = datetime.fromisoformat(note_data[field])
-                except (ValueError, TypeError):
-                    note_data[field] = None
-            else:
-                note_data[field] = None
-                
-        return cls(**note_data)
-    
-    @lazy_property
-    def notes(self):
-        return Note.objects.filter(character=self)
+    # Notes
 
     def add_note(self, name, text, category="General"):
-        """Add a new note to the character."""
-        notes = self.attributes.get('notes', {})
-        
-        # Find the first available ID by checking for gaps
-        used_ids = set(int(id_) for id_ in notes.keys())
-        note_id = 1
-        while note_id in used_ids:
-            note_id += 1
-        
-        # Create the new note
-        note_data = {
-            'name': name,
-            'text': text,
-            'category': category,
-            'is_public': False,
-            'is_approved': False,
-            'created_at': datetime.now(),
-            'updated_at': datetime.now()
-        }
-        
-        notes[str(note_id)] = note_data
-        self.attributes.add('notes', notes)
-        
-        return Note(
+        """Add a new note, numbered with the lowest free number."""
+        return Note.objects.create(
+            character=self,
+            number=next_number(self),
             name=name,
             text=text,
-            category=category,
-            is_public=False,
-            is_approved=False,
-            created_at=note_data['created_at'],
-            updated_at=note_data['updated_at'],
-            note_id=str(note_id)
+            category=category
         )
 
-    def get_note(self, note_id):
-        """Get a specific note by ID."""
-        notes = self.attributes.get('notes', default={})
-        note_data = notes.get(str(note_id))
-        return Note.from_dict(note_data) if note_data else None
+    def get_note(self, identifier, category=None):
+        """Get one of this character's notes by number or name."""
+        return find_note(self, identifier, category)
 
     def get_all_notes(self):
         """Get all notes for this character."""
-        notes = self.attributes.get('notes', default={})
-        return [Note.from_dict(note_data) for note_data in notes.values()]
+        return list(self.notes.all())
 
-    def update_note(self, note_id, text=None, category=None, **kwargs):
-        """Update an existing note."""
-        notes = self.attributes.get('notes', default={})
-        if str(note_id) in notes:
-            note_data = notes[str(note_id)]
-            if text is not None:
-                note_data['text'] = text
-            if category is not None:
-                note_data['category'] = category
-            note_data.update(kwargs)
-            note_data['updated_at'] = datetime.now().isoformat()
-            notes[str(note_id)] = note_data
-            self.attributes.add('notes', notes)
-            return True
-        return False
+    def update_note(self, identifier, text=None, category=None, **kwargs):
+        """
+        Update an existing note. Changing its text removes its approval.
 
-    def change_note_status(self, note_name, is_public):
-        """Change the visibility status of a note."""
-        try:
-            note = self.get_note(note_name)
-            if note:
-                note.is_public = is_public
-                note.save()
-                return True
+        Returns:
+            bool: Whether the note was found.
+        """
+        note = self.get_note(identifier)
+        if not note:
             return False
-        except Exception as e:
+        if text is not None and text != note.text:
+            note.text = text
+            note.is_approved = False
+            note.approved_by = None
+            note.approved_at = None
+        if category is not None:
+            note.category = category
+        for field, value in kwargs.items():
+            setattr(note, field, value)
+        note.save()
+        return True
+
+    def change_note_status(self, identifier, is_public):
+        """Change the visibility of a note."""
+        note = self.get_note(identifier)
+        if not note:
             return False
+        note.is_public = is_public
+        note.save(update_fields=["is_public", "updated_at"])
+        return True
 
-    def delete_note(self, note_id):
+    def delete_note(self, identifier):
         """Delete a note."""
-        notes = self.attributes.get('notes', default={})
-        if str(note_id) in notes:
-            del notes[str(note_id)]
-            self.attributes.add('notes', notes)
-            return True
-        return False
+        note = self.get_note(identifier)
+        if not note:
+            return False
+        note.delete()
+        return True
 
     def get_notes_by_category(self, category):
         """Get all notes in a specific category."""
-        return [note for note in self.get_all_notes() 
-                if note.category.lower() == category.lower()]
+        return list(self.notes.in_category(category))
 
     def get_public_notes(self):
         """Get all public notes."""
-        return [note for note in self.get_all_notes() if note.is_public]
+        return list(self.notes.public())
 
     def get_approved_notes(self):
         """Get all approved notes."""
-        return [note for note in self.get_all_notes() if note.is_approved]
+        return list(self.notes.approved())
 
     def search_notes(self, search_term):
         """Search notes by name or content."""
-        search_term = search_term.lower()
-        return [
-            note for note in self.get_all_notes()
-            if search_term in note.name.lower() or search_term in note.text.lower()
-        ]
-    def initialize_humanity(self):
-        self.humanity = self.empathy * 10
-        self.total_cyberware_humanity_loss = 0
-
-    def calculate_humanity_loss(self):
-        logger.info("Starting calculate_humanity_loss in CharacterSheet")
-        # Use lazy loading
-        CyberwareInstance = apps.get_model('inventory', 'CyberwareInstance')
-        installed_cyberware = CyberwareInstance.objects.filter(character=self, installed=True)
-        total_cyberware_hl = sum(cw.cyberware.humanity_loss for cw in installed_cyberware)
-        
-        logger.info(f"Total cyberware humanity loss: {total_cyberware_hl}")
-        
-        # Calculate new humanity
-        new_humanity = max(0, self.empathy * 10 - total_cyberware_hl)
-        
-        logger.info(f"New calculated humanity: {new_humanity}")
-        
-        # Update humanity
-        self.humanity = new_humanity
-        
-        # Only update empathy if it's been reduced to 0
-        if self.empathy * 10 <= total_cyberware_hl:
-            self.empathy = max(1, new_humanity // 10)
-        
-        self.total_cyberware_humanity_loss = total_cyberware_hl
-        logger.info("About to recalculate derived stats")
-        self.recalculate_derived_stats()
-        logger.info("Derived stats recalculated")
-        self.save()
-        logger.info("CharacterSheet saved")
-
-    def recalculate_derived_stats(self):
-        self._max_hp = 10 + (5 * ((self.body + self.willpower) // 2))
-        self.death_save = self.body
-        self.serious_wounds = self.body
-        
-        total_cyberware_hl = self.calculate_total_cyberware_hl()
-        
-        # Calculate current humanity
-        self.humanity = max(0, self.empathy * 10 - total_cyberware_hl)
-        
-        # Ensure _current_hp doesn't exceed _max_hp
-        if self._current_hp > self._max_hp:
-            self._current_hp = self._max_hp
-        # If _current_hp is 0, set it to _max_hp
-        if self._current_hp == 0:
-            self._current_hp = self._max_hp
-        # Ensure _current_hp is never negative   
-        self._current_hp = max(0, self._current_hp)
-
-        # Save without triggering another recalculation
-        self.save(skip_recalculation=True)
+        return list(self.notes.search(search_term))
 
-    def calculate_total_cyberware_hl(self):
-        # Use lazy loading
-        CyberwareInstance = apps.get_model('inventory', 'CyberwareInstance')
-        installed_cyberware = CyberwareInstance.objects.filter(character=self, installed=True)
-        return sum(cw.cyberware.humanity_loss for cw in installed_cyberware)
-
-    def save(self, *args, **kwargs):
-        # Add a flag to prevent recursive calls
-        if not kwargs.get('skip_recalculation'):
-            self.recalculate_derived_stats()
-        super().save(*args, **kwargs)
-
-    def clean(self):
-                if self._current_hp < 0:
-                 self._current_hp = 0
-                elif self._current_hp > self._max_hp:
-                                  self._current_hp = self._max_hp
-
-    def take_damage(self, amount):
-                """
-                Inflict damage on the character.
-                """
-                self._current_hp = max(0, self._current_hp - amount)
-                self.save()
-
-    def heal(self, amount):
-                """
-                Heal the character by the specified amount.
-                """
-                self._current_hp = min(self._current_hp + amount, self._max_hp)
-                self.save()
-    def spend_luck(self):
-                if self.current_luck > 0:
-                 self.current_luck -= 1
-                self.save()
-                return True
-
-    def gain_luck(self, amount):
-                self.current_luck = min(self.current_luck + amount, self.luck)
-                self.save()
-                return self.current_luck
-
-    def add_reputation(self, amount):
-                """
-                Add reputation points and update rep level if necessary.
-                """
-                self.reputation_points += amount
-                self.update_rep()
-                self.save()
-
-    def update_rep(self):
-                """
-                Update the rep level based on reputation points.
-                """
-                new_rep = min(self.reputation_points // 100, 10)
-                if new_rep != self.rep:
-                 self.rep = new_rep
-                 self.save()
-
-    def refresh_from_db(self, using=None, fields=None):
-        """
-        Reload field values from the database.
-        """
-        super().refresh_from_db(using=using, fields=fields)
-
-    def save(self, *args, **kwargs):
-        skip_recalculation = kwargs.pop('skip_recalculation', False)
-        if not skip_recalculation:
-            self.recalculate_derived_stats()
-        if self.character:
-            # Check if this character is already associated with another sheet
-            existing_sheet = CharacterSheet.objects.filter(character=self.character).exclude(id=self.id).first()
-            if existing_sheet:
-                # If so, remove the association from the old sheet
-                existing_sheet.character = None
-                existing_sheet.save(skip_recalculation=True)
-        super().save(*args, **kwargs)
-
-    def recalculate_derived_stats(self):
-        self._max_hp = 10 + (5 * ((self.body + self.willpower) // 2))
-        self.death_save = self.body
-        self.serious_wounds = self.body
-        
-        total_cyberware_hl = self.calculate_total_cyberware_hl()
-        
-        # Calculate current humanity
-        self.humanity = max(0, self.empathy * 10 - total_cyberware_hl)
-        
-        # Ensure _current_hp doesn't exceed _max_hp
-        if self._current_hp > self._max_hp:
-            self._current_hp = self._max_hp
-        # If _current_hp is 0, set it to _max_hp
-        if self._current_hp == 0:
-            self._current_hp = self._max_hp
-        # Ensure _current_hp is never negative   
-        self._current_hp = max(0, self._current_hp)
+@classmethod
+def create_sheet(cls, account, character, **kwargs):
+    """Create a sheet for the character"""
+    # Get the CharacterSheet model
+    CharacterSheet = apps.get_model('cyberpunk_sheets', 'CharacterSheet')
+    sheet = CharacterSheet.objects.create(account=account, character=character, **kwargs)
+    if character:
+        character.db.character_sheet_id = sheet.id
+    return sheet
 
-        # Save without triggering another recalculation
-        self.save(skip_recalculation=True)
+def get_remaining_points(self):
+    """Get remaining character points"""
+    return remaining_points(*self.calculate_spent_points())
 
 @property
 def max_hp(self):
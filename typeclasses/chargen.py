@@ -1,7 +1,6 @@
 from evennia import DefaultRoom
 from evennia.utils import delay
 from evennia.utils.ansi import ANSIString
-from world.utils.calculation_utils import get_remaining_points
 from world.utils.ansi_utils import wrap_ansi
 from world.utils.formatting import header, footer, divider
 from world.cyberpunk_constants import STATS, ROLE_SKILLS
@@ -89,10 +88,6 @@ class ChargenRoom(DefaultRoom):
         
         # Add remaining points information for the looker
         if inherits_from(looker, "typeclasses.characters.Character"):
-            # Force a refresh of the character sheet
-            if hasattr(looker, 'character_sheet'):
-                looker.character_sheet.refresh_from_db()
-            
             remaining_stat_points, remaining_skill_points = self.get_remaining_points(looker)
             if remaining_stat_points is not None and remaining_skill_points is not None:
                 points_info = f"|wRemaining Points:|n Stat Points: |g{remaining_stat_points}|n, Skill Points: |g{remaining_skill_points}|n\n"
@@ -0,0 +1,19 @@
+"""
+Hangout
+
+Listing objects for the +hangout directory. Each one stands for a room and
+holds its directory data as Attributes (see world/hangouts/models.py).
+"""
+
+from evennia.objects.objects import DefaultObject
+from .objects import ObjectParent
+
+
+class Hangout(ObjectParent, DefaultObject):
+    """
+    A +hangout directory listing. Hangouts have no location of their own;
+    the room they advertise is stored in db.room.
+    """
+
+    def at_object_creation(self):
+        self.locks.add("get:false();control:perm(Builder);delete:perm(Builder);edit:perm(Builder)")
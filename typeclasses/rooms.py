@@ -9,11 +9,61 @@ from evennia.utils.ansi import ANSIString
 from evennia.utils import ansi
 from world.utils.ansi_utils import wrap_ansi
 from world.utils.formatting import header, footer, divider
+from world.utils.layout import columns
 from datetime import datetime
 import random
 from evennia.utils.search import search_channel
+from world.hangouts.directory import note_arrival, note_departure
+from contextlib import contextmanager
 import re
 
+# Location values that Districts and Sectors average over their sub-locations
+ROLLUP_STATS = ("order", "infrastructure", "resolve")
+ROLLUP_TYPES = ("District", "Sector")
+
+# room id -> room waiting to be recomputed at the end of deferred_rollups()
+_DEFERRED_ROLLUPS = None
+
+
+@contextmanager
+def deferred_rollups():
+    """
+    Hold back rollups while editing many locations at once. Each District
+    or Sector that would have been updated is recomputed once when the
+    outermost block exits.
+
+        with deferred_rollups():
+            for site in sites:
+                site.set_values(order=3)
+    """
+    global _DEFERRED_ROLLUPS
+    outermost = _DEFERRED_ROLLUPS is None
+    if outermost:
+        _DEFERRED_ROLLUPS = {}
+    try:
+        yield
+    finally:
+        if outermost:
+            pending, _DEFERRED_ROLLUPS = _DEFERRED_ROLLUPS, None
+            # Sectors first, so their districts see the final sector values
+            for room in sorted(pending.values(), key=lambda room: room.db.location_type != "Sector"):
+                room.update_values()
+
+
+def rebuild_rollups():
+    """
+    Recompute the running totals of every Sector and then every District
+    from their sub-locations. Returns the number of rooms rebuilt.
+    """
+    from evennia.objects.models import ObjectDB
+    rebuilt = 0
+    for location_type in ("Sector", "District"):
+        for room in ObjectDB.objects.get_by_attribute(key="location_type", value=location_type):
+            room.update_values()
+            rebuilt += 1
+    return rebuilt
+
+
 class Room(DefaultRoom):
     """
     This is a custom room typeclass for Evennia that displays information
@@ -30,52 +80,36 @@ class Room(DefaultRoom):
         
         if self.db.gradient_name:
             name = ANSIString(self.db.gradient_name)
-            if looker.check_permstring("builders"):
+            if self.shows_dbref(looker):
                 name += f"({self.dbref})"
             return name
         
         # If the looker is builder+ show the dbref
-        if looker.check_permstring("builders"):
+        if self.shows_dbref(looker):
             name += f"({self.dbref})"
 
         return name
 
+    def shows_dbref(self, looker):
+        """Whether the looker sees the room's dbref after its name."""
+        return looker.check_permstring("builders")
+
     def return_appearance(self, looker, **kwargs):
         if not looker:
             return ""
 
-        name = self.get_display_name(looker, **kwargs)
-        desc = self.db.desc
+        is_builder = self.shows_dbref(looker)
+        exits = [ex for ex in self.contents if ex.destination]
+        static = self.get_static_appearance(looker, is_builder, exits)
 
-        # Header with room name
-        string = header(name, width=78, bcolor="|m", fillchar=ANSIString("|m-|n")) + "\n"
-        
-        # Process room description
-        if desc:
-            paragraphs = desc.split('%r')
-            formatted_paragraphs = []
-            for i, p in enumerate(paragraphs):
-                if not p.strip():
-                    if i > 0 and not paragraphs[i-1].strip():
-                        formatted_paragraphs.append('')  # Add blank line for double %r
-                    continue
-                
-                lines = p.split('%t')
-                formatted_lines = []
-                for j, line in enumerate(lines):
-                    if j == 0 and line.strip():
-                        formatted_lines.append(wrap_ansi(line.strip(), width=76))
-                    elif line.strip():
-                        formatted_lines.append(wrap_ansi('    ' + line.strip(), width=76))
-                
-                formatted_paragraphs.append('\n'.join(formatted_lines))
-            
-            string += '\n'.join(formatted_paragraphs) + "\n\n"
+        # Header with room name and description. Pieces are joined as plain
+        # strings at the end; adding to an ANSIString re-parses all of it.
+        parts = [static["head"]]
 
         # List all characters in the room
         characters = [obj for obj in self.contents if obj.has_account]
         if characters:
-            string += divider("Characters", width=78, fillchar=ANSIString("|m-|n")) + "\n"
+            parts.append(static["characters"])
             for character in characters:
                 idle_time = self.idle_time_display(character.idle_time)
                 if character == looker:
@@ -93,12 +127,12 @@ class Room(DefaultRoom):
                 else:
                     shortdesc_str = ANSIString(shortdesc_str).ljust(43, ' ')
                 
-                string += ANSIString(f" {character.get_display_name(looker).ljust(25)} {ANSIString(idle_time).rjust(7)}|n {shortdesc_str}\n")
+                parts.append(ANSIString(f" {character.get_display_name(looker).ljust(25)} {ANSIString(idle_time).rjust(7)}|n {shortdesc_str}\n"))
 
         # List all objects in the room
         objects = [obj for obj in self.contents if not obj.has_account and not obj.destination]
         if objects:
-            string += divider("Objects", width=78, fillchar=ANSIString("|m-|n")) + "\n"
+            parts.append(static["objects"])
             
             # get shordesc or dhoe s blsnk string
             for obj in objects:
@@ -110,46 +144,120 @@ class Room(DefaultRoom):
 
             # if looker builder+ show dbref.
 
-                string +=" "+  ANSIString(f"{obj.get_display_name(looker)}").ljust(25) + ANSIString(f"{shortdesc}") .ljust(53, ' ') + "\n"
+                parts.append(" "+  ANSIString(f"{obj.get_display_name(looker)}").ljust(25) + ANSIString(f"{shortdesc}") .ljust(53, ' ') + "\n")
 
-        # Separate exits into directions and building exits
-        exits = [ex for ex in self.contents if ex.destination]
+        # Exits, directions and footer
+        parts.append(static["exits"])
+
+        return "".join(str(part) for part in parts)
+
+    def get_static_appearance(self, looker, is_builder, exits):
+        """
+        Get the parts of the room's appearance that only change when the room
+        itself does: the header and formatted description, the section
+        dividers, and the exit and direction columns with the footer.
+
+        These are cached per room version and per whether the looker sees
+        the room's dbref. A cached render is also thrown away if the name,
+        description or exits (keys and aliases) no longer match what it was
+        rendered from, so changes that don't go through a hook (like @desc,
+        @open or @alias) are picked up too.
+
+        Returns:
+            dict: Rendered segments keyed "head", "characters", "objects"
+                and "exits".
+        """
+        version = self.ndb.appearance_version or 0
+        cache = self.ndb.appearance_cache
+        if cache is None:
+            cache = self.ndb.appearance_cache = {}
+
+        signature = (
+            self.key, self.db.gradient_name, self.db.desc,
+            tuple((ex.id, ex.key, tuple(ex.aliases.all())) for ex in exits)
+        )
+        cached = cache.get((version, is_builder))
+        if cached and cached[0] == signature:
+            return cached[1]
+
+        name = self.get_display_name(looker)
+        fillchar = ANSIString("|m-|n")
+        static = {
+            "head": header(name, width=78, bcolor="|m", fillchar=fillchar) + "\n" + self.format_description(self.db.desc),
+            "characters": divider("Characters", width=78, fillchar=fillchar) + "\n",
+            "objects": divider("Objects", width=78, fillchar=fillchar) + "\n",
+            "exits": self.format_exits(looker, exits) + footer(width=78, fillchar=fillchar),
+        }
+        # Parse the markup once here rather than on every look
+        static = {segment: str(ANSIString(text)) for segment, text in static.items()}
+
+        cache[(version, is_builder)] = (signature, static)
+        return static
+
+    def invalidate_appearance(self):
+        """Drop the cached static parts of the room's appearance."""
+        self.ndb.appearance_version = (self.ndb.appearance_version or 0) + 1
+        self.ndb.appearance_cache = None
+
+    def format_description(self, desc):
+        """
+        Format a room description, expanding %r into paragraph breaks and %t
+        into indents.
+        """
+        if not desc:
+            return ""
+
+        paragraphs = desc.split('%r')
+        formatted_paragraphs = []
+        for i, p in enumerate(paragraphs):
+            if not p.strip():
+                if i > 0 and not paragraphs[i-1].strip():
+                    formatted_paragraphs.append('')  # Add blank line for double %r
+                continue
+            
+            lines = p.split('%t')
+            formatted_lines = []
+            for j, line in enumerate(lines):
+                if j == 0 and line.strip():
+                    formatted_lines.append(wrap_ansi(line.strip(), width=76))
+                elif line.strip():
+                    formatted_lines.append(wrap_ansi('    ' + line.strip(), width=76))
+            
+            formatted_paragraphs.append('\n'.join(formatted_lines))
+        
+        return '\n'.join(formatted_paragraphs) + "\n\n"
+
+    def format_exits(self, looker, exits):
+        """
+        Format the Exits and Directions sections. Exits with a compass
+        alias are listed as directions, everything else as building exits.
+        """
+        string = ""
         directions = []
         building_exits = []
 
-        direction_aliases = ['n', 's', 'e', 'w', 'ne', 'se', 'nw', 'sw', 'u', 'd', 'o']
+        direction_aliases = {'n', 's', 'e', 'w', 'ne', 'se', 'nw', 'sw', 'u', 'd', 'o'}
         
         for ex in exits:
-            if any(alias in ex.aliases.all() for alias in direction_aliases):
-                directions.append(ex)
+            aliases = ex.aliases.all() or []
+            short = min(aliases, key=len) if aliases else ""
+            exit_string = ANSIString(f" <|y{short.upper()}|n> {ex.get_display_name(looker)}")
+            if direction_aliases.intersection(aliases):
+                directions.append(exit_string)
             else:
-                building_exits.append(ex)
+                building_exits.append(exit_string)
 
         # Building Exits section
         if building_exits:
             string += divider("Exits", width=78, fillchar=ANSIString("|m-|n")) + "\n"
-            exit_strings = []
-            for ex in building_exits:
-                aliases = ex.aliases.all() or []
-                short = min(aliases, key=len) if aliases else ""
-                exit_strings.append(ANSIString(f" <|y{short.upper()}|n> {ex.get_display_name(looker)}"))
-            
             # Split into two columns
-            string += self.format_two_columns(exit_strings)
+            string += self.format_two_columns(building_exits)
 
         # Directions section
         if directions:
             string += divider("Directions", width=78, fillchar=ANSIString("|m-|n")) + "\n"
-            direction_strings = []
-            for ex in directions:
-                aliases = ex.aliases.all() or []
-                short = min(aliases, key=len) if aliases else ""
-                direction_strings.append(ANSIString(f" <|y{short.upper()}|n> {ex.get_display_name(looker)}"))
-            
             # Split into two columns
-            string += self.format_two_columns(direction_strings)
-
-        string += footer(width=78, fillchar=ANSIString("|m-|n"))
+            string += self.format_two_columns(directions)
 
         return string
 
@@ -157,12 +265,7 @@ class Room(DefaultRoom):
         """
         Format a list of items into two columns.
         """
-        output = ""
-        for i in range(0, len(items), 2):
-            left = items[i].ljust(38)
-            right = items[i+1] if i+1 < len(items) else ""
-            output += f"{left} {right}\n"
-        return output
+        return columns(items, column_width=38)
 
     def idle_time_display(self, idle_time):
         """
@@ -310,6 +413,7 @@ class Room(DefaultRoom):
         self.db.sub_locations.append(sub_location)
         sub_location.db.parent_location = self
         self.save()  # Ensure changes are saved
+        self.receive_rollup(sub_location.get_values(), count_delta=1)
 
     def remove_sub_location(self, sub_location):
         """
@@ -321,33 +425,78 @@ class Room(DefaultRoom):
             self.db.sub_locations.remove(sub_location)
             sub_location.db.parent_location = None
             self.save()  # Ensure changes are saved
+            values = sub_location.get_values()
+            self.receive_rollup({stat: -value for stat, value in values.items()}, count_delta=-1)
 
     def get_sub_locations(self):
         self.initialize()
         return self.db.sub_locations
 
+    def get_values(self):
+        """Get this location's order, infrastructure and resolve."""
+        return {stat: self.attributes.get(stat) or 0 for stat in ROLLUP_STATS}
+
+    def set_values(self, **values):
+        """
+        Set any of this location's order, infrastructure and resolve, and
+        roll the change up to its parent.
+        """
+        deltas = {}
+        for stat, value in values.items():
+            if stat not in ROLLUP_STATS:
+                raise ValueError(f"Unknown location value: {stat}")
+            deltas[stat] = value - (self.attributes.get(stat) or 0)
+            self.attributes.add(stat, value)
+
+        parent = self.db.parent_location
+        if parent and any(deltas.values()):
+            parent.receive_rollup(deltas)
+
+    def receive_rollup(self, deltas, count_delta=0):
+        """
+        Apply a change in a sub-location's values to this location's running
+        totals. Only Districts and Sectors keep totals; inside a
+        deferred_rollups() block the update is held until the block ends.
+
+        Args:
+            deltas (dict): Change to each of ROLLUP_STATS.
+            count_delta (int): 1 if a sub-location was added, -1 if removed.
+        """
+        if self.db.location_type not in ROLLUP_TYPES:
+            return
+        if _DEFERRED_ROLLUPS is not None:
+            _DEFERRED_ROLLUPS[self.id] = self
+            return
+
+        rollup = self.db.rollup
+        if rollup is None:
+            # No running totals yet, so work them out from scratch
+            self.update_values()
+            return
+        rollup = dict(rollup)
+        rollup["count"] += count_delta
+        for stat in ROLLUP_STATS:
+            rollup[stat] += deltas.get(stat, 0)
+        self.db.rollup = rollup
+        self._set_averages(rollup)
+
+    def _set_averages(self, rollup):
+        count = rollup["count"]
+        self.set_values(**{stat: rollup[stat] / count if count else 0 for stat in ROLLUP_STATS})
+
     def update_values(self):
         """
-        Update the Order, Infrastructure, and Resolve values based on the averages of sub-locations.
+        Recompute the Order, Infrastructure, and Resolve totals and averages from all sub-locations.
         Only applies if this room is a District or Sector.
         """
         self.initialize()
-        if self.db.location_type in ["District", "Sector"]:
+        if self.db.location_type in ROLLUP_TYPES:
             sub_locations = self.get_sub_locations()
-            if sub_locations:
-                averages = {
-                    "avg_order": sum(loc.db.order for loc in sub_locations) / len(sub_locations),
-                    "avg_infrastructure": sum(loc.db.infrastructure for loc in sub_locations) / len(sub_locations),
-                    "avg_resolve": sum(loc.db.resolve for loc in sub_locations) / len(sub_locations),
-                }
-                self.db.order = averages['avg_order']
-                self.db.infrastructure = averages['avg_infrastructure']
-                self.db.resolve = averages['avg_resolve']
-            else:
-                self.db.order = 0
-                self.db.infrastructure = 0
-                self.db.resolve = 0
-            self.save()
+            rollup = {"count": len(sub_locations)}
+            for stat in ROLLUP_STATS:
+                rollup[stat] = sum(loc.attributes.get(stat) or 0 for loc in sub_locations)
+            self.db.rollup = rollup
+            self._set_averages(rollup)
 
     def save(self, *args, **kwargs):
         """
@@ -355,8 +504,6 @@ class Room(DefaultRoom):
         """
         super().save(*args, **kwargs)
         self.initialize()
-        if self.db.location_type in ["Sector", "Neighborhood"] and hasattr(self.db, "parent_location"):
-            self.db.parent_location.update_values()
 
     def add_owner(self, owner):
         self.initialize()
@@ -524,6 +671,9 @@ class Room(DefaultRoom):
     def at_object_receive(self, moved_obj, source_location, **kwargs):
         """Called when an object enters the room."""
         super().at_object_receive(moved_obj, source_location, **kwargs)
+        note_arrival(self, moved_obj)
+        if moved_obj.destination:
+            self.invalidate_appearance()
         
         # If this is a freezer room, notify the character
         if self.db.roomtype == "freezer" and moved_obj.has_account:
@@ -540,6 +690,9 @@ class Room(DefaultRoom):
         if self.db.roomtype == "Quiet Room" and moved_obj.has_account:
             moved_obj.msg("|gYou have left the Quiet Room. Communication commands are now available.|n")
             
+        note_departure(self, moved_obj)
+        if moved_obj.destination:
+            self.invalidate_appearance()
         super().at_object_leave(moved_obj, target_location, **kwargs)
 
     def is_command_restricted_in_quiet_room(self, cmdname, switches=None):
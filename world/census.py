@@ -0,0 +1,267 @@
+"""
+Population census.
+
++census reads from counters kept here instead of walking every character.
+Each approved character contributes a set of (dimension, key) pairs -- its
+role and a bucket for each of its stats -- and group sizes are counted from
+GroupMembership, so answering a census is a dictionary copy.
+
+The counters are built with a few bulk queries the first time they are
+needed and then kept current by signals: approval is a tag change, role and
+stats are Attribute saves, and group sizes follow GroupMembership rows.
+CensusScript rebuilds everything periodically in case something changed
+behind the signals' back (TagHandler.clear(), raw SQL, ...).
+"""
+
+from collections import Counter
+from django.db.models import Count, F
+from django.db.models.signals import m2m_changed, post_delete, post_save
+from django.dispatch import receiver
+from evennia.objects.models import ObjectDB
+from evennia.scripts.scripts import DefaultScript
+from evennia.typeclasses.attributes import Attribute
+from evennia.typeclasses.tags import Tag
+from evennia.utils import logger
+from typeclasses.characters import Character
+from world.cyberpunk_constants import STATS
+from world.factions.models import GroupMembership
+from world.utils.attribute_signals import watch_attributes
+
+APPROVED_TAG = ("approved", "approval")
+CHARACTER_TYPECLASS = "typeclasses.characters.Character"
+TRACKED_ATTRIBUTES = ("role",) + tuple(STATS)
+RECONCILE_INTERVAL = 60 * 60 * 6
+
+# (lowest value, label), checked from the top
+STAT_BUCKETS = ((8, "8+"), (6, "6-7"), (4, "4-5"), (1, "1-3"))
+# (largest size, label), checked from the bottom
+GROUP_SIZE_BUCKETS = ((1, "1 member"), (3, "2-3 members"), (5, "4-5 members"), (10, "6-10 members"))
+
+# dimension -> Counter of key -> characters; None until first built
+_COUNTS = None
+# character id -> frozenset of (dimension, key) it is counted under
+_CONTRIBUTIONS = {}
+# character id -> {tracked attribute: value}, for counted characters
+_VALUES = {}
+# ids of the approval Tag rows, looked up when first needed
+_APPROVAL_TAGS = set()
+# group id -> number of members
+_GROUP_SIZES = {}
+# size label -> number of groups
+_GROUP_BUCKETS = Counter()
+
+
+def stat_bucket(value):
+    for lowest, label in STAT_BUCKETS:
+        if value >= lowest:
+            return label
+    return None
+
+
+def group_size_bucket(size):
+    for largest, label in GROUP_SIZE_BUCKETS:
+        if size <= largest:
+            return label
+    return f"{GROUP_SIZE_BUCKETS[-1][0] + 1}+ members"
+
+
+def contributions(role, stats):
+    """
+    Get the (dimension, key) pairs a character is counted under.
+
+    Args:
+        role (str): The character's role.
+        stats (dict): {stat name: value}
+
+    Returns:
+        frozenset
+    """
+    pairs = {("role", role or "Unknown")}
+    for stat, value in stats.items():
+        bucket = stat_bucket(value) if isinstance(value, int) else None
+        if bucket:
+            pairs.add(("stats", f"{stat.title()} {bucket}"))
+    return frozenset(pairs)
+
+
+def _apply(pairs, delta):
+    for dimension, key in pairs:
+        counter = _COUNTS.setdefault(dimension, Counter())
+        counter[key] += delta
+        if counter[key] <= 0:
+            del counter[key]
+
+
+def _load_values(obj_ids):
+    """{character id: {tracked attribute: value}} for the given characters, in one query."""
+    values = {obj_id: {} for obj_id in obj_ids}
+    attributes = Attribute.objects.filter(
+        objectdb__id__in=values,
+        db_key__in=TRACKED_ATTRIBUTES,
+        db_category__isnull=True
+    ).annotate(owner_id=F("objectdb__id"))
+    for attribute in attributes:
+        values[attribute.owner_id][attribute.db_key] = attribute.value
+    return values
+
+
+def _count(obj_id, values):
+    """Count a character under its current values, or stop counting it if values is None."""
+    new = frozenset() if values is None else contributions(
+        values.get("role"), {stat: values.get(stat) for stat in STATS}
+    )
+    old = _CONTRIBUTIONS.get(obj_id, frozenset())
+    _apply(old - new, -1)
+    _apply(new - old, 1)
+    if values is None:
+        _CONTRIBUTIONS.pop(obj_id, None)
+        _VALUES.pop(obj_id, None)
+    else:
+        _CONTRIBUTIONS[obj_id] = new
+        _VALUES[obj_id] = values
+
+
+def _approved_characters():
+    return ObjectDB.objects.get_by_tag(
+        key=APPROVED_TAG[0], category=APPROVED_TAG[1]
+    ).filter(db_typeclass_path=CHARACTER_TYPECLASS)
+
+
+def refresh(obj_id):
+    """Recount one character after its approval may have changed."""
+    if _COUNTS is None:
+        return
+    if _approved_characters().filter(id=obj_id).exists():
+        _count(obj_id, _load_values([obj_id])[obj_id])
+    else:
+        _count(obj_id, None)
+
+
+def _set_attribute(obj_id, key, value):
+    values = dict(_VALUES[obj_id])
+    values[key] = value
+    _count(obj_id, values)
+
+
+def _set_group_size(group_id, size):
+    old = _GROUP_SIZES.get(group_id, 0)
+    if old == size:
+        return
+    if old:
+        _GROUP_BUCKETS[group_size_bucket(old)] -= 1
+        if _GROUP_BUCKETS[group_size_bucket(old)] <= 0:
+            del _GROUP_BUCKETS[group_size_bucket(old)]
+    if size:
+        _GROUP_BUCKETS[group_size_bucket(size)] += 1
+        _GROUP_SIZES[group_id] = size
+    else:
+        _GROUP_SIZES.pop(group_id, None)
+
+
+def rebuild():
+    """
+    Recount everything from the database.
+
+    Returns:
+        int: The number of characters counted.
+    """
+    global _COUNTS
+    values = _load_values(_approved_characters().values_list("id", flat=True))
+
+    _CONTRIBUTIONS.clear()
+    _VALUES.clear()
+    _COUNTS = {}
+    for obj_id, attrs in values.items():
+        _count(obj_id, attrs)
+
+    _GROUP_SIZES.clear()
+    _GROUP_BUCKETS.clear()
+    sizes = GroupMembership.objects.values("group_id").annotate(size=Count("id"))
+    for row in sizes:
+        _set_group_size(row["group_id"], row["size"])
+
+    return len(_CONTRIBUTIONS)
+
+
+def get_counts(dimension):
+    """
+    Get the census for a dimension: "role", "stats" or "group sizes".
+
+    Returns:
+        dict: {key: count}
+    """
+    if _COUNTS is None:
+        rebuild()
+    if dimension == "group sizes":
+        return dict(_GROUP_BUCKETS)
+    return dict(_COUNTS.get(dimension, {}))
+
+
+def get_total():
+    """Get the number of approved characters."""
+    if _COUNTS is None:
+        rebuild()
+    return len(_CONTRIBUTIONS)
+
+
+class CensusScript(DefaultScript):
+    """
+    Periodically rebuilds the census counters from the database.
+    """
+    def at_script_creation(self):
+        self.key = "CensusReconcile"
+        self.desc = "Reconciles the population census"
+        self.interval = RECONCILE_INTERVAL
+        self.start_delay = True
+        self.persistent = True
+
+    def at_repeat(self):
+        try:
+            counted = rebuild()
+            logger.log_info(f"Census reconciled: {counted} approved characters.")
+        except Exception as e:
+            logger.log_err(f"Error reconciling the census: {e}")
+
+
+def _is_approval_change(pk_set):
+    if not _APPROVAL_TAGS:
+        _APPROVAL_TAGS.update(Tag.objects.filter(
+            db_key=APPROVED_TAG[0], db_category=APPROVED_TAG[1], db_tagtype__isnull=True
+        ).values_list("id", flat=True))
+    return pk_set is None or not _APPROVAL_TAGS.isdisjoint(pk_set)
+
+
+@receiver(m2m_changed, sender=ObjectDB.db_tags.through, dispatch_uid="census_tags_changed")
+def _tags_changed(sender, instance, action, reverse, pk_set, **kwargs):
+    if _COUNTS is None or action not in ("post_add", "post_remove", "post_clear"):
+        return
+    if not reverse:
+        if _is_approval_change(pk_set):
+            refresh(instance.id)
+    elif instance.id in _APPROVAL_TAGS or _is_approval_change({instance.id}):
+        if pk_set is None:
+            rebuild()
+        else:
+            for obj_id in pk_set:
+                refresh(obj_id)
+
+
+@watch_attributes(TRACKED_ATTRIBUTES, "census", tracked=_VALUES)
+def _attribute_changed(obj_id, key, value):
+    _set_attribute(obj_id, key, value)
+
+
+# Typeclassed objects send their signals as their proxy class, not ObjectDB
+@receiver(post_delete, sender=Character, dispatch_uid="census_object_deleted")
+def _object_deleted(sender, instance, **kwargs):
+    if _COUNTS is not None and instance.id in _CONTRIBUTIONS:
+        _count(instance.id, None)
+
+
+@receiver(post_save, sender=GroupMembership, dispatch_uid="census_membership_saved")
+@receiver(post_delete, sender=GroupMembership, dispatch_uid="census_membership_deleted")
+def _membership_changed(sender, instance, created=False, **kwargs):
+    if _COUNTS is None or (kwargs["signal"] is post_save and not created):
+        return
+    delta = 1 if created else -1
+    _set_group_size(instance.group_id, _GROUP_SIZES.get(instance.group_id, 0) + delta)
@@ -0,0 +1,118 @@
+"""
+Connection history.
+
+Every time a character is puppeted or unpuppeted, the (character, IP) pair
+it was played from is upserted into ConnectionRecord with the account that
+used it. Staff alt detection is then one indexed query for the records
+sharing an IP with the target, instead of reading IP Attributes off every
+character in the game.
+"""
+
+from datetime import datetime, timezone as dt_timezone
+from django.db import transaction
+from django.db.models import F
+from django.utils import timezone
+from evennia.objects.models import ObjectDB
+from evennia.typeclasses.attributes import Attribute
+from world.connections.models import ConnectionRecord
+
+# Attributes the old IP tracking kept on characters
+IP_ATTRIBUTES = ("creator_ip", "last_ip")
+
+
+def session_ip(session):
+    """Get the IP address a session is connected from."""
+    address = getattr(session, "address", None)
+    if isinstance(address, tuple):
+        address = address[0]
+    return str(address) if address else None
+
+
+def record_connection(character, session):
+    """
+    Note that a character is being played from a session's IP.
+
+    Args:
+        character (Object): The puppeted character.
+        session (Session): The session puppeting it.
+    """
+    ip = session_ip(session)
+    if not ip:
+        return
+    account_id = getattr(session, "uid", None) or character.db_account_id
+    now = timezone.now()
+    updated = ConnectionRecord.objects.filter(character_id=character.id, ip=ip).update(
+        last_seen=now, account_id=account_id
+    )
+    if not updated:
+        ConnectionRecord.objects.get_or_create(
+            character_id=character.id,
+            ip=ip,
+            defaults={"account_id": account_id, "first_seen": now, "last_seen": now}
+        )
+
+
+def get_records(character):
+    """Get a character's connection records, most recent first."""
+    return ConnectionRecord.objects.filter(character_id=character.id).order_by("-last_seen")
+
+
+def find_shared(character):
+    """
+    Get the connection records of other characters that have been played
+    from any IP this character has, in one query.
+
+    Returns:
+        QuerySet: ConnectionRecords with character and account loaded,
+            ordered by character name and most recent first.
+    """
+    ips = ConnectionRecord.objects.filter(character_id=character.id).values("ip")
+    return ConnectionRecord.objects.filter(ip__in=ips).exclude(
+        character_id=character.id
+    ).select_related("character", "account").order_by("character__db_key", "-last_seen")
+
+
+def backfill_from_attributes():
+    """
+    Create connection records from the creator_ip/last_ip Attributes kept
+    on characters before connection history existed. Existing records are
+    left alone, so this is safe to run more than once.
+
+    Returns:
+        int: The number of records created.
+    """
+    attributes = Attribute.objects.filter(
+        db_key__in=IP_ATTRIBUTES + ("last_disconnect",),
+        db_category__isnull=True,
+        objectdb__isnull=False
+    ).annotate(owner_id=F("objectdb__id"))
+
+    ips = {}
+    seen = {}
+    for attribute in attributes:
+        value = attribute.value
+        if attribute.db_key == "last_disconnect":
+            if isinstance(value, (int, float)):
+                seen[attribute.owner_id] = datetime.fromtimestamp(value, dt_timezone.utc)
+        elif value:
+            ips.setdefault(attribute.owner_id, set()).add(str(value))
+
+    accounts = dict(
+        ObjectDB.objects.filter(id__in=ips).values_list("id", "db_account_id")
+    )
+    now = timezone.now()
+    records = [
+        ConnectionRecord(
+            character_id=character_id,
+            account_id=accounts.get(character_id),
+            ip=ip,
+            first_seen=seen.get(character_id, now),
+            last_seen=seen.get(character_id, now)
+        )
+        for character_id, character_ips in ips.items()
+        for ip in character_ips
+    ]
+    with transaction.atomic():
+        before = ConnectionRecord.objects.count()
+        ConnectionRecord.objects.bulk_create(records, ignore_conflicts=True)
+        return ConnectionRecord.objects.count() - before
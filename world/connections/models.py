@@ -0,0 +1,24 @@
+from django.db import models
+from evennia.accounts.models import AccountDB
+from evennia.objects.models import ObjectDB
+
+
+class ConnectionRecord(models.Model):
+    """
+    One row per character and IP address it has been played from, with the
+    account that last used it and when it was first and last seen.
+    """
+    character = models.ForeignKey(ObjectDB, on_delete=models.CASCADE, related_name='connection_records')
+    account = models.ForeignKey(AccountDB, on_delete=models.SET_NULL, null=True, blank=True, related_name='connection_records')
+    ip = models.CharField(max_length=64)
+    first_seen = models.DateTimeField()
+    last_seen = models.DateTimeField()
+
+    class Meta:
+        unique_together = ('character', 'ip')
+        indexes = [
+            models.Index(fields=['ip', 'character'], name='connection_ip_idx'),
+        ]
+
+    def __str__(self):
+        return f"{self.character_id} @ {self.ip}"
@@ -0,0 +1,200 @@
+"""
+Merchant catalogues.
+
+What each kind of merchant sells is fixed by equipment_data, so it is built
+once at import: per merchant type, a read-only mapping of lowercase item
+name to item, and a price table giving every item's buy price, sell price
+and cost category. Merchants keep the names of what they stock and resolve
+them here, so listing and buying never rebuild a catalogue.
+
+Haggling needs a character's COOL and Trading, which may live on the
+typeclass or only on the character sheet. The resolved modifier is cached
+per character and dropped by signals when the Attributes or sheet it came
+from change.
+"""
+
+from collections import namedtuple
+from types import MappingProxyType
+from django.db.models.signals import post_delete, post_save
+from django.dispatch import receiver
+from evennia.typeclasses.attributes import Attribute
+from world.cyberpunk_sheets.models import CharacterSheet
+from world.equipment_data import weapons, armors, gears
+from world.utils.attribute_signals import watch_attributes
+
+SELL_RATE = 0.5
+
+# (lowest value, label), checked from the top
+COST_CATEGORIES = (
+    (10000, "Super Luxury"),
+    (5000, "Luxury"),
+    (1000, "Very Expensive"),
+    (500, "Expensive"),
+    (100, "Premium"),
+    (50, "Costly"),
+    (20, "Everyday"),
+    (10, "Cheap"),
+)
+
+# Attributes the haggle modifier is read from
+HAGGLE_ATTRIBUTES = ("cool", "skills", "trading")
+
+Price = namedtuple("Price", "buy sell category")
+
+
+def cost_category(value):
+    for lowest, label in COST_CATEGORIES:
+        if value >= lowest:
+            return label
+    return COST_CATEGORIES[-1][1]
+
+
+def price_of(value):
+    """Get the Price of an item worth value eb."""
+    value = value or 0
+    return Price(value, int(value * SELL_RATE), cost_category(value))
+
+
+def _freeze(item):
+    return item if isinstance(item, MappingProxyType) else MappingProxyType(dict(item))
+
+
+def _index(rows):
+    return MappingProxyType({row["name"].lower(): _freeze(row) for row in rows})
+
+
+CATALOGUES = MappingProxyType({
+    "arms_dealer": _index(weapons),
+    "clothier": _index(armors),
+    "gear_merchant": _index(gears),
+})
+MERCHANT_TYPES = tuple(CATALOGUES)
+
+# lowercase name -> item, across every catalogue
+ITEMS = MappingProxyType({
+    name: item for catalogue in CATALOGUES.values() for name, item in catalogue.items()
+})
+# lowercase name -> Price
+PRICES = MappingProxyType({
+    name: price_of(item.get("value", 0)) for name, item in ITEMS.items()
+})
+# cost category -> Price at the category's list value
+CATEGORY_PRICES = MappingProxyType({
+    label: price_of(lowest) for lowest, label in COST_CATEGORIES
+})
+
+
+def get_catalogue(merchant_type):
+    """Get the read-only {lowercase name: item} a merchant type stocks by default."""
+    return CATALOGUES.get(merchant_type, MappingProxyType({}))
+
+
+def find_item(name):
+    """Get an item from any catalogue by name, case-insensitive."""
+    return ITEMS.get(name.lower())
+
+
+def get_price(item):
+    """
+    Get the Price of an item.
+
+    Args:
+        item (str, dict or template): An item name, catalogue row or
+            anything with name and value attributes.
+
+    Returns:
+        Price
+    """
+    if isinstance(item, str):
+        name, value = item, None
+    elif hasattr(item, "get"):
+        name, value = item.get("name", ""), item.get("value", 0)
+    else:
+        name, value = getattr(item, "name", ""), getattr(item, "value", 0)
+    price = PRICES.get(name.lower())
+    if price is None or (value is not None and value != price.buy):
+        price = price_of(value)
+    return price
+
+
+def build_stock(entries):
+    """
+    Resolve what a merchant stocks into a read-only {lowercase name: item}.
+
+    Args:
+        entries (list): Item names, or item dicts for things that are not
+            in a catalogue (and for merchants set up before catalogues).
+    """
+    stock = {}
+    for entry in entries or ():
+        if isinstance(entry, str):
+            item = ITEMS.get(entry.lower())
+        else:
+            item = ITEMS.get(entry.get("name", "").lower()) or _freeze(entry)
+        if item is not None:
+            stock[item["name"].lower()] = item
+    return MappingProxyType(stock)
+
+
+# character id -> (cool, trading)
+_HAGGLE = {}
+
+
+def _typeclass_value(value):
+    return value if isinstance(value, int) else None
+
+
+def _load_haggle_stats(character):
+    values = dict(
+        (attribute.db_key, attribute.value)
+        for attribute in Attribute.objects.filter(
+            objectdb__id=character.id, db_key__in=HAGGLE_ATTRIBUTES, db_category__isnull=True
+        )
+    )
+    cool = _typeclass_value(values.get("cool"))
+    skills = values.get("skills")
+    if skills:
+        trading = _typeclass_value(skills.get("trading", 0))
+    else:
+        trading = _typeclass_value(values.get("trading"))
+
+    if cool is None or trading is None:
+        sheet = getattr(character, "character_sheet", None)
+        if cool is None:
+            cool = getattr(sheet, "cool", 0) if sheet else 0
+        if trading is None:
+            trading = getattr(sheet, "trading", 0) if sheet else 0
+    return cool, trading
+
+
+def haggle_stats(character):
+    """
+    Get the (COOL, Trading) a character haggles with, typeclass values
+    first and then the character sheet's.
+    """
+    stats = _HAGGLE.get(character.id)
+    if stats is None:
+        stats = _HAGGLE[character.id] = _load_haggle_stats(character)
+    return stats
+
+
+def haggle_modifier(character):
+    """Get the COOL + Trading a character adds to haggle rolls."""
+    return sum(haggle_stats(character))
+
+
+def forget(character_id):
+    """Drop a character's cached haggle stats."""
+    _HAGGLE.pop(character_id, None)
+
+
+@watch_attributes(HAGGLE_ATTRIBUTES, "catalogue", tracked=_HAGGLE)
+def _attribute_changed(obj_id, key, value):
+    forget(obj_id)
+
+
+@receiver(post_save, sender=CharacterSheet, dispatch_uid="catalogue_sheet_saved")
+@receiver(post_delete, sender=CharacterSheet, dispatch_uid="catalogue_sheet_deleted")
+def _sheet_changed(sender, instance, **kwargs):
+    if instance.character_id:
+        forget(instance.character_id)
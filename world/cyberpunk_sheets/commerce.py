@@ -4,31 +4,11 @@ from evennia.utils.search import search_object
 from evennia.utils import gametime
 from world.cyberpunk_sheets.services import CharacterMoneyService
 from world.inventory.models import Weapon, Armor, Gear
-from world.equipment_data import weapons, armors, gears
+from world.inventory.items import add_item, find_item, get_inventory, has_item, remove_item
+from world.cyberpunk_sheets import catalogue
 from evennia.utils.evmenu import get_input, EvMenu
 from world.cyberpunk_sheets.merchants import Merchant
 
-class Merchant:
-    def __init__(self, merchant_type):
-        self.merchant_type = merchant_type
-        self.inventory = self._load_inventory()
-
-    def _load_inventory(self):
-        if self.merchant_type == "arms_dealer":
-            return {item['name']: item for item in weapons}
-        elif self.merchant_type == "clothier":
-            return {item['name']: item for item in armors}
-        elif self.merchant_type == "gear_merchant":
-            return {item['name']: item for item in gears}
-        else:
-            return {}
-
-    def get_item(self, item_name):
-        return self.inventory.get(item_name)
-
-    def list_items(self):
-        return [f"{name} - {item['value']} eb" for name, item in self.inventory.items()]
-
 class CmdBuy(Command):
     """
     Buy an item from a merchant.
@@ -78,7 +58,7 @@ class CmdBuy(Command):
             self.caller.msg(f"You already own {item['name']}.")
             return
 
-        price = item['value']
+        price = merchant.get_buy_price(item)
 
         # Try to spend money
         if CharacterMoneyService.spend_money(self.caller, price):
@@ -88,38 +68,12 @@ class CmdBuy(Command):
             self.caller.msg(f"You don't have enough Eurodollars to buy {item['name']}. It costs {price} eb.")
 
     def get_character_inventory(self, character):
-        """Get a character's inventory, checking typeclass first, then character sheet"""
-        # Try to get inventory via typeclass attribute
-        if hasattr(character, 'db') and hasattr(character.db, 'inventory'):
-            return character.db.inventory
-            
-        # Try to get inventory via inventory_object relation
-        if hasattr(character, 'inventory_object'):
-            return character.inventory_object
-            
-        # Fall back to character sheet
-        if hasattr(character, 'character_sheet') and character.character_sheet:
-            return character.character_sheet.inventory
-            
-        return None
+        """Get a character's inventory."""
+        return get_inventory(character)
 
     def _item_exists_in_inventory(self, inventory, item):
         """Check if the item already exists in the character's inventory."""
-        item_name = item['name'].lower()
-        
-        # Check weapons
-        if inventory.weapons.filter(name__iexact=item_name).exists():
-            return True
-        
-        # Check armor
-        if inventory.armor.filter(name__iexact=item_name).exists():
-            return True
-        
-        # Check gear
-        if inventory.gear.filter(name__iexact=item_name).exists():
-            return True
-        
-        return False
+        return has_item(inventory, item['name'])
 
     def _add_item_to_inventory(self, character, item, merchant_type):
         # Get character's inventory (checking typeclass first)
@@ -140,7 +94,7 @@ class CmdBuy(Command):
                     'value': item['value']
                 }
             )
-            inventory.weapons.add(weapon)
+            add_item(inventory, weapon)
         elif merchant_type == "clothier":
             armor, created = Armor.objects.get_or_create(
                 name=item['name'],
@@ -152,7 +106,7 @@ class CmdBuy(Command):
                     'value': item['value']
                 }
             )
-            inventory.armor.add(armor)
+            add_item(inventory, armor)
         elif merchant_type == "gear_merchant":
             gear, created = Gear.objects.get_or_create(
                 name=item['name'],
@@ -163,7 +117,7 @@ class CmdBuy(Command):
                     'value': item['value']
                 }
             )
-            inventory.gear.add(gear)
+            add_item(inventory, gear)
 
 class CmdListItems(Command):
     """
@@ -256,9 +210,7 @@ def execute_sale(caller, raw_string, **kwargs):
     price = context['price']
 
     # Remove the item from the character's inventory
-    inventory = get_character_inventory(caller)
-    category = 'weapons' if hasattr(item, 'damage') else 'armor' if hasattr(item, 'sp') else 'gear'
-    getattr(inventory, category).remove(item)
+    sell_item(item)
 
     # Add money to the character
     CharacterMoneyService.add_money(caller, price)
@@ -282,20 +234,12 @@ def cancel_sale(caller, raw_string, **kwargs):
     caller.ndb._evmenu.close_menu()
 
 def get_character_inventory(character):
-    """Get a character's inventory, checking typeclass first, then character sheet"""
-    # Try to get inventory via typeclass attribute
-    if hasattr(character, 'db') and hasattr(character.db, 'inventory'):
-        return character.db.inventory
-        
-    # Try to get inventory via inventory_object relation
-    if hasattr(character, 'inventory_object'):
-        return character.inventory_object
-        
-    # Fall back to character sheet
-    if hasattr(character, 'character_sheet') and character.character_sheet:
-        return character.character_sheet.inventory
-        
-    return None
+    """Get a character's inventory."""
+    return get_inventory(character)
+
+def sell_item(item):
+    """Take one of an owned item (an ItemInstance) out of its inventory."""
+    remove_item(item.inventory, item.template, 1)
 
 class CmdSellItem(Command):
     """
@@ -336,20 +280,14 @@ class CmdSellItem(Command):
             self.caller.msg("You don't have an inventory!")
             return
             
-        item = None
-
-        for category in ['weapons', 'armor', 'gear']:
-            items = getattr(inventory, category).filter(name__iexact=item_name)
-            if items.exists():
-                item = items.first()
-                break
+        item = find_item(inventory, item_name)
 
         if not item:
             self.caller.msg(f"You don't have an item named '{item_name}' in your inventory.")
             return
 
         # Calculate the sell price
-        sell_price = merchant.get_sell_price(item.__dict__)
+        sell_price = merchant.get_sell_price(item.template)
 
         # Set up the context and start the menu
         self.caller.ndb._sell_item_context = {
@@ -404,28 +342,18 @@ class CmdHaggle(Command):
             self.caller.msg("You don't have an inventory!")
             return
             
-        item = None
-
-        for category in ['weapons', 'armor', 'gear']:
-            items = getattr(inventory, category).filter(name__iexact=item_name)
-            if items.exists():
-                item = items.first()
-                break
+        item = find_item(inventory, item_name)
 
         if not item:
             self.caller.msg(f"You don't have an item named '{item_name}' in your inventory.")
             return
 
-        # Get character's cool and trading skill values
-        cool = merchant.get_character_cool(self.caller)
-        trading = merchant.get_character_trading_skill(self.caller)
-        
-        # Perform the haggle check
+        # Perform the haggle check with the character's COOL + Trading
         roll = random.randint(1, 10)
-        total = cool + trading + roll
+        total = catalogue.haggle_modifier(self.caller) + roll
 
         # Determine the result
-        base_price = merchant.get_sell_price(item.__dict__)
+        base_price = merchant.get_sell_price(item.template)
         if roll == 1:  # Critical failure
             price_multiplier = 0.50
             self.caller.msg("Critical failure! The merchant is offended by your low offer.")
@@ -465,9 +393,7 @@ def handle_sell_confirmation(character, response):
         price = context['price']
 
         # Remove the item from the character's inventory
-        inventory = get_character_inventory(character)
-        category = 'weapons' if hasattr(item, 'damage') else 'armor' if hasattr(item, 'sp') else 'gear'
-        getattr(inventory, category).remove(item)
+        sell_item(item)
 
         # Add money to the character
         CharacterMoneyService.add_money(character, price)
@@ -522,19 +448,14 @@ class CmdAddItem(Command):
             return
 
         # Find the item in the equipment data
-        all_items = weapons + armors + gears
-        item = next((item for item in all_items if item['name'].lower() == item_name.lower()), None)
+        item = catalogue.find_item(item_name)
 
         if not item:
             self.caller.msg(f"No item named '{item_name}' found in the equipment data.")
             return
 
         # Add the item to the merchant's inventory
-        if not hasattr(merchant.db, 'inventory'):
-            merchant.db.inventory = []
-        
-        if item not in merchant.db.inventory:
-            merchant.db.inventory.append(item)
+        if merchant.stock_item(item):
             self.caller.msg(f"Added {item_name} to {merchant_name}'s inventory.")
         else:
             self.caller.msg(f"{item_name} is already in {merchant_name}'s inventory.")
@@ -574,13 +495,7 @@ class CmdRemItem(Command):
             return
 
         # Remove the item from the merchant's inventory
-        if not hasattr(merchant.db, 'inventory'):
-            self.caller.msg(f"{merchant_name} has no inventory.")
-            return
-
-        item = next((item for item in merchant.db.inventory if item['name'].lower() == item_name.lower()), None)
-        if item:
-            merchant.db.inventory.remove(item)
+        if merchant.unstock_item(item_name):
             self.caller.msg(f"Removed {item_name} from {merchant_name}'s inventory.")
         else:
             self.caller.msg(f"No item named '{item_name}' found in {merchant_name}'s inventory.")
\ No newline at end of file
@@ -3,6 +3,7 @@ import traceback
 from world.cyberpunk_constants import ROLES, STATS, ROLE_SKILLS, ROLE_SKILL_NAME_MAP, EQUIPMENT, ROLE_STAT_TABLES, ROLE_CYBERWARE
 from world.cyberpunk_constants import LANGUAGES as CYBERPUNK_LANGUAGES
 from world.inventory.models import Inventory, Weapon, Armor, Gear, CyberwareInstance, Ammunition, AmmoType
+from world.inventory.items import add_item, clear_items, get_inventory, get_loadout
 from world.equipment_data import weapons, armors, gears, ammunition
 from world.equipment_data import weapons as weapon_data, armors as armor_data, gears as gear_data
 from world.cyberware.cyberware_data import CYBERWARE_DATA
@@ -11,6 +12,7 @@ from world.cyberware.utils import calculate_humanity_loss
 from evennia.utils import logger
 from django.core.exceptions import MultipleObjectsReturned
 from world.cyberpunk_sheets.services import CharacterMoneyService
+from world.utils.calculation_utils import calculate_character_points_spent, remaining_points
 
 logger = logging.getLogger('cyberpunk.chargen')
 
@@ -185,31 +187,20 @@ class EdgerunnerChargen:
     @classmethod
     def calculate_remaining_stat_points_typeclass(cls, character):
         """Calculate remaining stat points for a typeclass character"""
-        total_stats = sum([getattr(character.db, stat.lower(), 0) for stat in STATS 
-                           if isinstance(stat, str) or 
-                           (isinstance(stat, dict) and isinstance(stat.get('name'), str))])
-        return max(0, 62 - total_stats)
+        return remaining_points(*calculate_character_points_spent(character))[0]
 
     @classmethod
     def calculate_remaining_skill_points_typeclass(cls, character, role):
         """Calculate remaining skill points for a typeclass character"""
-        role_skills = ROLE_SKILLS.get(role, {})
-        if hasattr(character.db, 'skills'):
-            total_skills = sum([character.db.skills.get(skill, 0) for skill in role_skills])
-        else:
-            total_skills = 0
-        return max(0, 86 - total_skills)
+        return remaining_points(*calculate_character_points_spent(character))[1]
 
     @classmethod
     def calculate_remaining_stat_points(cls, sheet):
-        total_stats = sum([getattr(sheet, stat.lower()) for stat in STATS])
-        return max(0, 62 - total_stats)  # Assuming 62 is the total stat points available
+        return sheet.get_remaining_points()[0]
 
     @classmethod
     def calculate_remaining_skill_points(cls, sheet, role):
-        role_skills = ROLE_SKILLS.get(role, [])
-        total_skills = sum([getattr(sheet, skill.lower()) for skill in role_skills])
-        return max(0, 86 - total_skills)  # Assuming 86 is the total skill points available
+        return sheet.get_remaining_points()[1]
 
     @classmethod
     def edgerunner_chargen_for_typeclass(cls, character, role, full_name):
@@ -316,21 +307,15 @@ class EdgerunnerChargen:
         from world.inventory.models import Inventory, Weapon, Armor, Gear, Ammunition, AmmoType
         
         # Get or create the inventory for this character
-        inventory, created = Inventory.objects.get_or_create(
-            character_object=character,
-            defaults={}
-        )
+        inventory = get_inventory(character)
         
         # If we also have a character sheet, link it
-        if hasattr(character, 'character_sheet') and character.character_sheet:
+        if not inventory.character_id and hasattr(character, 'character_sheet') and character.character_sheet:
             inventory.character = character.character_sheet
             inventory.save()
         
         # Clear existing inventory
-        inventory.weapons.clear()
-        inventory.armor.clear()
-        inventory.gear.clear()
-        inventory.ammunition.clear()
+        clear_items(inventory)
         
         role_equipment = EQUIPMENT.get(role, {})
         
@@ -349,7 +334,7 @@ class EdgerunnerChargen:
                         'value': weapon_stats['value']
                     }
                 )
-                inventory.weapons.add(weapon)
+                add_item(inventory, weapon)
                 logger.info(f"Added weapon: {weapon_name}")
         
         # Assign armor
@@ -364,7 +349,7 @@ class EdgerunnerChargen:
                         'locations': armor_stats['locations']
                     }
                 )
-                inventory.armor.add(armor)
+                add_item(inventory, armor)
                 logger.info(f"Added armor: {armor_name}")
         
         # Assign gear
@@ -380,11 +365,12 @@ class EdgerunnerChargen:
                         'value': gear_stats['value']
                     }
                 )
-                inventory.gear.add(gear)
+                add_item(inventory, gear)
                 logger.info(f"Added gear: {gear_name}")
         
         # Assign ammunition
-        for weapon in inventory.weapons.all():
+        for item in get_loadout(inventory).weapons:
+            weapon = item.weapon
             weapon_type = weapon.name.split()[-1]  # Get the last word of the weapon name
             ammo = next((a for a in ammunition if a['weapon_type'] == weapon_type), None)
             if ammo:
@@ -396,15 +382,11 @@ class EdgerunnerChargen:
                         'damage_modifier': ammo['damage_modifier'],
                         'armor_piercing': ammo['armor_piercing'],
                         'description': ammo['description'],
-                        'cost': ammo['cost'],
-                        'quantity': 50  # Give 50 rounds of ammo
+                        'cost': ammo['cost']
                     }
                 )
-                if not created:
-                    # If the ammo already exists, update its quantity
-                    ammo_obj.quantity += 50
-                    ammo_obj.save()
-                inventory.ammunition.add(ammo_obj)
+                # Give 50 rounds of ammo
+                add_item(inventory, ammo_obj, 50)
                 logger.info(f"Added ammunition: {ammo_obj.name}")
         
         logger.info("Gear assignment for typeclass completed")
@@ -669,10 +651,7 @@ class EdgerunnerChargen:
         inventory, created = Inventory.objects.get_or_create(character=sheet)
         
         # Clear existing inventory
-        inventory.weapons.clear()
-        inventory.armor.clear()
-        inventory.gear.clear()
-        inventory.ammunition.clear()
+        clear_items(inventory)
         
         role_equipment = EQUIPMENT.get(role, {})
         
@@ -691,7 +670,7 @@ class EdgerunnerChargen:
                         'value': weapon_stats['value']
                     }
                 )
-                inventory.weapons.add(weapon)
+                add_item(inventory, weapon)
                 logger.info(f"Added weapon: {weapon_name}")
         
         # Assign armor
@@ -706,7 +685,7 @@ class EdgerunnerChargen:
                         'locations': armor_stats['locations']
                     }
                 )
-                inventory.armor.add(armor)
+                add_item(inventory, armor)
                 logger.info(f"Added armor: {armor_name}")
         
         # Assign gear
@@ -722,11 +701,12 @@ class EdgerunnerChargen:
                         'value': gear_stats['value']
                     }
                 )
-                inventory.gear.add(gear)
+                add_item(inventory, gear)
                 logger.info(f"Added gear: {gear_name}")
         
         # Assign ammunition
-        for weapon in inventory.weapons.all():
+        for item in get_loadout(inventory).weapons:
+            weapon = item.weapon
             weapon_type = weapon.name.split()[-1]  # Get the last word of the weapon name
             ammo = next((a for a in ammunition if a['weapon_type'] == weapon_type), None)
             if ammo:
@@ -738,15 +718,11 @@ class EdgerunnerChargen:
                         'damage_modifier': ammo['damage_modifier'],
                         'armor_piercing': ammo['armor_piercing'],
                         'description': ammo['description'],
-                        'cost': ammo['cost'],
-                        'quantity': 50  # Give 50 rounds of ammo
+                        'cost': ammo['cost']
                     }
                 )
-                if not created:
-                    # If the ammo already exists, update its quantity
-                    ammo_obj.quantity += 50
-                    ammo_obj.save()
-                inventory.ammunition.add(ammo_obj)
+                # Give 50 rounds of ammo
+                add_item(inventory, ammo_obj, 50)
                 logger.info(f"Added ammunition: {ammo_obj.name}")
         
         logger.info("Gear assignment completed")
@@ -827,9 +803,7 @@ class EdgerunnerChargen:
         
         # Clear inventory
         if hasattr(sheet, 'inventory'):
-            sheet.inventory.weapons.all().delete()
-            sheet.inventory.armor.all().delete()
-            sheet.inventory.gear.all().delete()
+            clear_items(sheet.inventory)
         
         # Clear cyberware
         CyberwareInstance.objects.filter(character_sheet=sheet).delete()
@@ -855,17 +829,14 @@ class EdgerunnerChargen:
     @classmethod
     def clean_duplicate_gear(cls):
         from django.db.models import Count
-        from world.inventory.models import Inventory
+        from world.inventory.models import ItemInstance
 
         duplicate_gear = Gear.objects.values('name').annotate(name_count=Count('name')).filter(name_count__gt=1)
         for item in duplicate_gear:
             gear_items = Gear.objects.filter(name=item['name']).order_by('id')
             primary_item = gear_items.first()
             for duplicate_item in gear_items[1:]:
-                # Update all inventories that use the duplicate item
-                inventories = Inventory.objects.filter(gear=duplicate_item)
-                for inventory in inventories:
-                    inventory.gear.remove(duplicate_item)
-                    inventory.gear.add(primary_item)
+                # Point every copy of the duplicate at the primary item
+                ItemInstance.objects.filter(gear=duplicate_item).update(gear=primary_item)
                 duplicate_item.delete()
         logger.info("Cleaned up duplicate gear entries")
\ No newline at end of file
@@ -1,6 +1,6 @@
 from evennia import DefaultObject
 from evennia.utils import gametime
-from world.equipment_data import weapons, armors, gears
+from world.cyberpunk_sheets import catalogue
 
 class Merchant(DefaultObject):
     """
@@ -24,20 +24,55 @@ class Merchant(DefaultObject):
         Set up the merchant with a specific type and initialize inventory.
         """
         merchant_type = str(merchant_type).lower()  # Ensure merchant_type is a lowercase string
-        valid_types = ["arms_dealer", "clothier", "gear_merchant"]
-        if merchant_type not in valid_types:
-            raise ValueError(f"Invalid merchant type. Choose from: {', '.join(valid_types)}")
+        if merchant_type not in catalogue.MERCHANT_TYPES:
+            raise ValueError(f"Invalid merchant type. Choose from: {', '.join(catalogue.MERCHANT_TYPES)}")
         
         self.db.merchant_type = merchant_type
         self.db.description = f"A {merchant_type.replace('_', ' ')} ready to trade goods."
         
-        # Initialize inventory based on merchant type
-        if merchant_type == "arms_dealer":
-            self.db.inventory = weapons.copy()
-        elif merchant_type == "clothier":
-            self.db.inventory = armors.copy()
-        elif merchant_type == "gear_merchant":
-            self.db.inventory = gears.copy()
+        # Stock the merchant type's catalogue, kept by name
+        self.db.inventory = [item['name'] for item in catalogue.get_catalogue(merchant_type).values()]
+        del self.ndb.stock
+
+    @property
+    def stock(self):
+        """The read-only {lowercase name: item} this merchant sells."""
+        stock = self.ndb.stock
+        if stock is None:
+            stock = self.ndb.stock = catalogue.build_stock(self.db.inventory)
+        return stock
+
+    def stock_item(self, item):
+        """
+        Start selling an item.
+
+        Returns:
+            bool: False if the merchant already sells it.
+        """
+        if item['name'].lower() in self.stock:
+            return False
+        inventory = list(self.db.inventory or [])
+        inventory.append(item['name'] if catalogue.find_item(item['name']) else dict(item))
+        self.db.inventory = inventory
+        del self.ndb.stock
+        return True
+
+    def unstock_item(self, item_name):
+        """
+        Stop selling an item.
+
+        Returns:
+            bool: False if the merchant didn't sell it.
+        """
+        name = item_name.lower()
+        if name not in self.stock:
+            return False
+        self.db.inventory = [
+            entry for entry in self.db.inventory or []
+            if (entry if isinstance(entry, str) else entry.get('name', '')).lower() != name
+        ]
+        del self.ndb.stock
+        return True
 
     def can_haggle(self, character):
         """Check if a character can haggle with this merchant."""
@@ -54,18 +89,20 @@ class Merchant(DefaultObject):
         self.db.haggle_attempts[character.id] = gametime.gametime(absolute=True)
 
     def get_sell_price(self, item):
-        """Get the sell price for an item."""
-        return int(item.get('value', 0) * 0.5)  # 50% of original value
+        """Get the sell price for an item, by name, catalogue row or template."""
+        return catalogue.get_price(item).sell
+
+    def get_buy_price(self, item):
+        """Get what this merchant charges for an item."""
+        return catalogue.get_price(item).buy
 
     def list_items(self):
         """List all items available from this merchant."""
-        if not self.db.inventory:
-            return []
-        return [f"{item['name']} - {item['value']} eb" for item in self.db.inventory]
+        return [f"{item['name']} - {self.get_buy_price(item)} eb" for item in self.stock.values()]
 
     def get_item(self, item_name):
         """Get a specific item from the merchant's inventory."""
-        return next((item for item in self.db.inventory if item['name'].lower() == item_name.lower()), None)
+        return self.stock.get(item_name.lower())
     
     def at_post_puppet(self):
         """
@@ -97,21 +134,7 @@ class Merchant(DefaultObject):
         Returns:
             int: The trading skill level
         """
-        # First check typeclass attributes
-        if hasattr(character, 'db'):
-            # Check skills dictionary if it exists
-            if hasattr(character.db, 'skills') and character.db.skills:
-                return character.db.skills.get('trading', 0)
-            # Check for direct attribute
-            if hasattr(character.db, 'trading'):
-                return character.db.trading
-                
-        # Fall back to character sheet
-        if hasattr(character, 'character_sheet') and character.character_sheet:
-            return getattr(character.character_sheet, 'trading', 0)
-            
-        # Default value if not found
-        return 0
+        return catalogue.haggle_stats(character)[1]
     
     def get_character_cool(self, character):
         """
@@ -123,16 +146,7 @@ class Merchant(DefaultObject):
         Returns:
             int: The cool stat value
         """
-        # First check typeclass attributes
-        if hasattr(character, 'db') and hasattr(character.db, 'cool'):
-            return character.db.cool
-                
-        # Fall back to character sheet
-        if hasattr(character, 'character_sheet') and character.character_sheet:
-            return getattr(character.character_sheet, 'cool', 0)
-            
-        # Default value if not found
-        return 0
+        return catalogue.haggle_stats(character)[0]
 
 def create_cyberware_merchant(location):
     """
@@ -5,9 +5,12 @@ from evennia.objects.models import ObjectDB
 from evennia.utils.idmapper.models import SharedMemoryModel
 from django.apps import apps
 from evennia.utils import logger
-from world.languages.models import Language, CharacterLanguage
-from world.languages.language_dictionary import LANGUAGES
-from world.utils.calculation_utils import calculate_points_spent
+from world.languages.models import CharacterLanguage
+from world.languages.language_dictionary import get_language
+from world.utils.calculation_utils import calculate_points_spent, remaining_points
+from world.utils.logs import get_logger
+
+log = get_logger("sheets")
 
 class CharacterSheet(SharedMemoryModel):
     account = models.OneToOneField(AccountDB, related_name='character_sheet', on_delete=models.CASCADE, null=True)
@@ -34,68 +37,12 @@ class CharacterSheet(SharedMemoryModel):
             for lang in self.character_languages.all()
         ]
 
-    def add_language(self, language_name, level):
-        from world.languages.models import Language, CharacterLanguage
-        language, _ = Language.objects.get_or_create(name=language_name)
-        char_lang, _ = CharacterLanguage.objects.get_or_create(
-            character_sheet=self,
-            language=language,
-            defaults={'level': level}
-        )
-        char_lang.level = level
-        char_lang.save()
-
-    def remove_language(self, language_name):
-        from world.languages.models import Language, CharacterLanguage
-        try:
-            language = Language.objects.get(name__iexact=language_name)
-            CharacterLanguage.objects.filter(character_sheet=self, language=language).delete()
-        except Language.DoesNotExist:
-            pass  # Language not found, nothing to remove
-
     def calculate_spent_points(self):
-        try:
-            stat_points = sum([
-                self.intelligence, self.reflexes, self.dexterity, self.technology,
-                self.cool, self.willpower, self.luck, self.move, self.body, self.empathy
-            ])
-            logger.log_info(f"Stat points: {stat_points}")
-
-            double_cost_skills = ['autofire', 'martial_arts', 'pilot_air', 'heavy_weapons', 'demolitions', 'electronics', 'paramedic'], 
-            skill_points = sum([
-                getattr(self, skill) * (2 if skill in double_cost_skills else 1)
-                for skill in [
-                    'concentration', 'conceal_object', 'lip_reading', 'perception', 'tracking', 'athletics', 
-                    'contortionist', 'dance', 'endurance', 'resist_torture_drugs', 'stealth', 'drive_land', 
-                    'pilot_air', 'pilot_sea', 'riding', 'accounting', 'animal_handling', 'bureaucracy', 'business', 
-                    'composition', 'criminology', 'cryptography', 'deduction', 'education', 'gamble', 'languages', 
-                    'library_search', 'local_expert', 'tactics', 'wilderness_survival', 'brawling', 'evasion', 'martial_arts', 
-                    'melee', 'acting', 'archery', 'autofire', 'handgun', 'heavy_weapons', 'shoulder_arms', 'bribery', 'conversation', 
-                    'human_perception', 'interrogation', 'persuasion', 'streetwise', 'trading', 'style', 'air_vehicle_tech', 
-                    'basic_tech', 'cybertech', 'demolitions', 'electronics', 'first_aid', 'forgery', 'land_vehicle_tech', 'artistry', 
-                    'paramedic', 'photography', 'pick_lock', 'pick_pocket', 'sea_vehicle_tech', 'weaponstech', 'charismatic_impact', 
-                    'combat_awareness', 'interface', 'maker', 'medicine', 'credibility', 'teamwork', 'backup', 'operator', 'moto',
-                    'zoology', 'stock_market', 'physics', 'biology', 'chemistry', 'neuroscience', 'data_science', 'economics', 'sociology',
-                    'political_science', 'genetics', 'anatomy', 'robotics', 'nanotechnology'
-                ]
-            ])
-
-            # Add points from languages
-            language_points = sum(lang.level for lang in self.character_languages.all())
-            
-            total_skill_points = skill_points + language_points
-            logger.log_info(f"Total skill points (including languages): {total_skill_points}")
-
-            return stat_points, total_skill_points
-        except Exception as e:
-            logger.log_err(f"Error in calculate_spent_points: {str(e)}")
-            return 0, 0  # Return default values in case of error
+        """Get the (stat points, skill points) this sheet has spent, languages included."""
+        return calculate_points_spent(self)
 
     def get_remaining_points(self):
-        stat_points_spent, skill_points_spent = calculate_points_spent(self)
-        remaining_stat_points = max(0, 62 - stat_points_spent)
-        remaining_skill_points = max(0, 86 - skill_points_spent)
-        return remaining_stat_points, remaining_skill_points
+        return remaining_points(*calculate_points_spent(self))
 
     @classmethod
     def create_character_sheet(cls, account):
@@ -106,7 +53,7 @@ class CharacterSheet(SharedMemoryModel):
         return character_sheet
 
     def set_default_language(self):
-        english = Language.objects.get(name="English")
+        english = get_language("English")
         CharacterLanguage.objects.get_or_create(
             character=self,
             language=english,
@@ -318,14 +265,7 @@ class CharacterSheet(SharedMemoryModel):
         logger.log_info(f"Adding language: {language_name}, level: {level}")
 
         # Get or create the Language object
-        language, created = Language.objects.get_or_create(
-            name__iexact=language_name,
-            defaults={
-                'name': language_name,
-                'local': getattr(next((lang for lang in LANGUAGES if lang.name.lower() == language_name.lower()), None), 'local', False),
-                'corporate': getattr(next((lang for lang in LANGUAGES if lang.name.lower() == language_name.lower()), None), 'corporate', False)
-            }
-        )
+        language = get_language(language_name)
 
         # Get or create the CharacterLanguage object
         char_lang, created = CharacterLanguage.objects.get_or_create(
@@ -341,20 +281,20 @@ class CharacterSheet(SharedMemoryModel):
         logger.log_info(f"Added language {language_name} at level {level}")
 
     def remove_language(self, language_name):
-        try:
-            language = Language.objects.get(name__iexact=language_name)
-            CharacterLanguage.objects.filter(character_sheet=self, language=language).delete()
-            logger.log_info(f"Removed language {language_name} from character sheet")
-        except Language.DoesNotExist:
+        language = get_language(language_name, create=False)
+        if language is None:
             logger.log_warn(f"Language {language_name} not found, nothing to remove")
+            return
+        CharacterLanguage.objects.filter(character_sheet=self, language=language).delete()
+        logger.log_info(f"Removed language {language_name} from character sheet")
 
     def update_language_level(self, language_name, new_level):
+        language = get_language(language_name, create=False)
         try:
-            language = Language.objects.get(name=language_name)
             char_lang = CharacterLanguage.objects.get(character_sheet=self, language=language)
             char_lang.level = new_level
             char_lang.save()
-        except (Language.DoesNotExist, CharacterLanguage.DoesNotExist):
+        except CharacterLanguage.DoesNotExist:
             pass  # Language or character-language relationship not found
 
     @property
@@ -499,18 +439,15 @@ class CharacterSheet(SharedMemoryModel):
         self.total_cyberware_humanity_loss = 0
 
     def calculate_humanity_loss(self):
-        logger.info("Starting calculate_humanity_loss in CharacterSheet")
         # Use lazy import to avoid circular dependency
         CyberwareInstance = apps.get_model('inventory', 'CyberwareInstance')
         installed_cyberware = CyberwareInstance.objects.filter(character=self, installed=True)
         total_cyberware_hl = sum(cw.cyberware.humanity_loss for cw in installed_cyberware)
         
-        logger.info(f"Total cyberware humanity loss: {total_cyberware_hl}")
-        
         # Calculate new humanity
         new_humanity = max(0, self.empathy * 10 - total_cyberware_hl)
         
-        logger.info(f"New calculated humanity: {new_humanity}")
+        log.debug("humanity loss cyberware=%d humanity=%d", total_cyberware_hl, new_humanity)
         
         # Update humanity
         self.humanity = new_humanity
@@ -520,11 +457,8 @@ class CharacterSheet(SharedMemoryModel):
             self.empathy = max(1, new_humanity // 10)
         
         self.total_cyberware_humanity_loss = total_cyberware_hl
-        logger.info("About to recalculate derived stats")
         self.recalculate_derived_stats()
-        logger.info("Derived stats recalculated")
         self.save()
-        logger.info("CharacterSheet saved")
         
     def recalculate_derived_stats(self):
         self._max_hp = 10 + (5 * ((self.body + self.willpower) // 2))
@@ -636,9 +570,8 @@ class CharacterSheet(SharedMemoryModel):
         
         # Clear inventory
         if hasattr(self, 'inventory'):
-            self.inventory.weapons.clear()
-            self.inventory.armor.clear()
-            self.inventory.gear.clear()
+            from world.inventory.items import clear_items
+            clear_items(self.inventory, 'weapon', 'armor', 'gear')
         else:
             # Use lazy import to avoid circular dependency
             Inventory = apps.get_model('inventory', 'Inventory')
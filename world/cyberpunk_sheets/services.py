@@ -1,7 +1,9 @@
 # world/cyberpunk_sheets/services.py
 
 import logging
+from django.db.models import F
 from evennia.objects.models import ObjectDB
+from evennia.typeclasses.attributes import Attribute
 from evennia.utils import logger
 
 logger = logging.getLogger('cyberpunk.economy')
@@ -56,6 +58,49 @@ class CharacterMoneyService:
         # Fall back to old character sheet method
         return CharacterSheetMoneyService.spend_money(character, amount)
 
+    @staticmethod
+    def add_money_bulk(payouts):
+        """
+        Add money to many characters at once: one query to read their
+        balances, one to write them and one to sync their character sheets.
+
+        Args:
+            payouts (dict): {character: amount}
+
+        Returns:
+            dict: {character id: new balance}
+        """
+        from world.cyberpunk_sheets.models import CharacterSheet
+
+        amounts = {character.id: amount for character, amount in payouts.items() if amount}
+        if not amounts:
+            return {}
+        characters = {character.id: character for character in payouts}
+
+        balances = {}
+        attributes = list(Attribute.objects.filter(
+            objectdb__id__in=amounts, db_key="eurodollars", db_category__isnull=True
+        ).annotate(owner_id=F("objectdb__id")))
+        for attribute in attributes:
+            attribute.db_value = (attribute.value or 0) + amounts[attribute.owner_id]
+            balances[attribute.owner_id] = attribute.db_value
+        Attribute.objects.bulk_update(attributes, ["db_value"])
+
+        # Characters that have never had money get the Attribute created
+        for character_id, amount in amounts.items():
+            if character_id not in balances:
+                characters[character_id].db.eurodollars = amount
+                balances[character_id] = amount
+
+        # Keep character sheets in step (for backward compatibility)
+        sheets = list(CharacterSheet.objects.filter(character_id__in=balances))
+        for sheet in sheets:
+            sheet.eurodollars = balances[sheet.character_id]
+        CharacterSheet.objects.bulk_update(sheets, ["eurodollars"])
+
+        logger.info(f"Added money to {len(balances)} characters in bulk")
+        return balances
+
     @staticmethod
     def get_balance(character):
         """Get a character's money balance (works with typeclass or character sheet)"""
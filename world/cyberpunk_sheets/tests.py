@@ -1,3 +1,75 @@
-from django.test import TestCase
+from types import SimpleNamespace
+from unittest.mock import Mock
+from django.test import SimpleTestCase
+from typeclasses.characters import Character
+from world.cyberpunk_sheets.models import CharacterSheet
+from world.utils.calculation_utils import (
+    DOUBLE_COST_SKILLS,
+    SKILL_POINTS,
+    SLOTS,
+    STAT_POINTS,
+    STAT_SLOTS,
+    calculate_character_points_spent,
+    calculate_points_spent,
+    points_for,
+    remaining_points
+)
 
-# Create your tests here.
+STATS = {'intelligence': 6, 'reflexes': 7, 'cool': 5}
+SKILLS = {'handgun': 4, 'autofire': 3, 'martial_arts': 2, 'stealth': 1}
+LANGUAGES = {'English': 4, 'Spanish': 2}
+
+
+def make_sheet(values, language_levels=()):
+    """An unsaved stand-in for a CharacterSheet with the given values."""
+    sheet = SimpleNamespace(id=None, **dict.fromkeys(SLOTS, 0))
+    for field, value in values.items():
+        setattr(sheet, field, value)
+    sheet.character_languages = Mock()
+    sheet.character_languages.values_list.return_value = list(language_levels)
+    return sheet
+
+
+def make_character(stats, skills, languages):
+    """A stand-in typeclass character keeping its values in Attributes."""
+    character = Mock()
+    character.db = SimpleNamespace(
+        **{**dict.fromkeys(STAT_SLOTS), **stats},
+        skills=dict(skills), skill_instances={}, languages=dict(languages)
+    )
+    return character
+
+
+class TestPointCalculation(SimpleTestCase):
+
+    def test_points_for_single_and_double_cost(self):
+        sheet = make_sheet({'handgun': 4, 'stealth': 1})
+        values = tuple(getattr(sheet, slot) for slot in SLOTS)
+        self.assertEqual(points_for(values), (0, 5))
+
+        for skill in DOUBLE_COST_SKILLS:
+            sheet = make_sheet({skill: 3})
+            values = tuple(getattr(sheet, slot) for slot in SLOTS)
+            self.assertEqual(points_for(values), (0, 6), skill)
+
+    def test_stats_cost_one_point(self):
+        self.assertEqual(calculate_points_spent(make_sheet(STATS)), (18, 0))
+
+    def test_languages_are_counted(self):
+        sheet = make_sheet(SKILLS, LANGUAGES.values())
+        self.assertEqual(calculate_points_spent(sheet), (0, 4 + 6 + 4 + 1 + 6))
+
+    def test_sheet_and_typeclass_agree(self):
+        sheet = make_sheet({**STATS, **SKILLS}, LANGUAGES.values())
+        character = make_character(STATS, SKILLS, LANGUAGES)
+        self.assertEqual(CharacterSheet.calculate_spent_points(sheet), Character.calculate_spent_points(character))
+        self.assertEqual(Character.calculate_spent_points(character), (18, 21))
+
+    def test_skill_instances_use_the_base_skill_cost(self):
+        character = make_character({}, {}, {})
+        character.db.skill_instances = {'martial_arts(Karate)': 2, 'local_expert(Watson)': 3}
+        self.assertEqual(calculate_character_points_spent(character), (0, 7))
+
+    def test_remaining_points(self):
+        self.assertEqual(remaining_points(18, 21), (STAT_POINTS - 18, SKILL_POINTS - 21))
+        self.assertEqual(remaining_points(STAT_POINTS + 5, SKILL_POINTS + 5), (0, 0))
@@ -1,6 +1,7 @@
 # world/cyberware/cyberware_data.py
 
 from .models import Cyberware
+from world.utils.seeding import seed_catalogue
 """
 The dictionary data utilizes the following pattern for an entry:
 
@@ -968,4 +969,30 @@ CYBERWARE_DATA_LIST = [
     }
 ]
 
-CYBERWARE_DATA = {item['name']: item for item in CYBERWARE_DATA_LIST}
\ No newline at end of file
+CYBERWARE_DATA = {item['name']: item for item in CYBERWARE_DATA_LIST}
+
+
+def cyberware_rows():
+    """The catalogue as Cyberware field values; weapon stats only for cyberweapons."""
+    rows = []
+    for cw_data in CYBERWARE_DATA_LIST:
+        row = {
+            'name': cw_data['name'],
+            'type': cw_data['type'],
+            'slots': cw_data['slots'],
+            'humanity_loss': cw_data['humanity_loss'],
+            'cost': cw_data['cost'],
+            'is_weapon': cw_data.get('is_weapon', False),
+            'description': cw_data['description']
+        }
+        if row['is_weapon']:
+            row['rate_of_fire'] = cw_data.get('rate_of_fire', 1)
+            row['damage_dice'] = cw_data.get('damage_dice', 0)
+            row['damage_die_type'] = cw_data.get('damage_die_type', 6)
+        rows.append(row)
+    return rows
+
+
+def initialize_cyberware(force=False):
+    """Seed the Cyberware table, skipping it if the catalogue is unchanged."""
+    return seed_catalogue("cyberware", Cyberware, cyberware_rows(), force=force)
@@ -2,8 +2,8 @@ from world.inventory.models import Weapon, Armor, Gear, Ammunition, AmmoType, Cy
 from world.cyberware.models import Cyberware
 from world.cyberware.utils import populate_cyberware
 from enum import Enum
-from django.db import transaction
 from evennia.utils import logger
+from world.utils.seeding import seed_catalogue
 
 class AmmoType(Enum):
     BASIC = "Basic"
@@ -905,151 +905,37 @@ cyberdecks = [
     }
 ]
 
-@transaction.atomic
-def initialize_weapons():
-    from world.inventory.models import Weapon
-    
-    for weapon_data in weapons:
-        if not all(weapon_data.values()):
-            logger.warn(f"Incomplete weapon data found: {weapon_data}")
+def _catalogue_rows(data, model, label):
+    """Keep the complete rows of a catalogue, limited to the model's fields."""
+    fields = {field.name for field in model._meta.concrete_fields}
+    rows = []
+    for row in data:
+        if any(value is None for value in row.values()):
+            logger.warn(f"Incomplete {label} data found: {row}")
             continue
-        
-        weapon, created = Weapon.objects.get_or_create(
-            name=weapon_data['name'],
-            defaults={
-                'damage': weapon_data['damage'],
-                'rof': weapon_data['rof'],
-                'hands': weapon_data['hands'],
-                'concealable': weapon_data['concealable'],
-                'weight': weapon_data['weight'],
-                'value': weapon_data['value']
-            }
-        )
-        if created:
-            logger.info(f"Created weapon: {weapon.name}")
-        else:
-            # Update existing weapon if data has changed
-            updated = False
-            for key, value in weapon_data.items():
-                if getattr(weapon, key) != value:
-                    setattr(weapon, key, value)
-                    updated = True
-            if updated:
-                weapon.save()
-                logger.info(f"Updated weapon: {weapon.name}")
+        rows.append({key: value for key, value in row.items() if key in fields})
+    return rows
+
+def initialize_weapons():
+    return seed_catalogue("weapons", Weapon, _catalogue_rows(weapons, Weapon, "weapon"))
 
-@transaction.atomic
 def initialize_armor():
-    from world.inventory.models import Armor
-    
-    for armor_data in armors:
-        if not all(armor_data.values()):
-            logger.warn(f"Incomplete armor data found: {armor_data}")
-            continue
-        
-        armor, created = Armor.objects.get_or_create(
-            name=armor_data['name'],
-            defaults={
-                'sp': armor_data['sp'],
-                'ev': armor_data['ev'],
-                'locations': armor_data['locations']
-            }
-        )
-        if created:
-            logger.info(f"Created armor: {armor.name}")
-        else:
-            # Update existing armor if data has changed
-            updated = False
-            for key, value in armor_data.items():
-                if getattr(armor, key) != value:
-                    setattr(armor, key, value)
-                    updated = True
-            if updated:
-                armor.save()
-                logger.info(f"Updated armor: {armor.name}")
+    return seed_catalogue("armor", Armor, _catalogue_rows(armors, Armor, "armor"))
 
-@transaction.atomic
 def initialize_gear():
-    from world.inventory.models import Gear
-    
-    for gear_data in gears:
-        if not all(gear_data.values()):
-            logger.warn(f"Incomplete gear data found: {gear_data}")
-            continue
-        
-        gear, created = Gear.objects.get_or_create(
-            name=gear_data['name'],
-            defaults={
-                'category': gear_data['category'],
-                'description': gear_data['description'],
-                'weight': gear_data['weight'],
-                'value': gear_data['value']
-            }
-        )
-        if created:
-            logger.info(f"Created gear: {gear.name}")
-        else:
-            # Update existing gear if data has changed
-            updated = False
-            for key, value in gear_data.items():
-                if getattr(gear, key) != value:
-                    setattr(gear, key, value)
-                    updated = True
-            if updated:
-                gear.save()
-                logger.info(f"Updated gear: {gear.name}")
+    return seed_catalogue("gear", Gear, _catalogue_rows(gears, Gear, "gear"))
 
-@transaction.atomic
 def initialize_cyberdecks():
-    from world.inventory.models import Cyberdeck
-    
-    for cyberdeck_data in cyberdecks:
-        if not all(cyberdeck_data.values()):
-            logger.warn(f"Incomplete gear data found: {cyberdeck_data}")
-            continue
-        
-        cyberdeck, created = Cyberdeck.objects.get_or_create(
-            name=cyberdeck_data['name'],
-            defaults={
-                'description': cyberdeck_data['description'],
-                'hardware_slots': cyberdeck_data['hardware_slots'],
-                'program_slots': cyberdeck_data['program_slots'],
-                'any_slots': cyberdeck_data['any_slots'],
-                'value': cyberdeck_data['value']
-            }
-        )
-        if created:
-            logger.info(f"Created gear: {cyberdeck.name}")
-        else:
-            # Update existing cyberdeck if data has changed
-            updated = False
-            for key, value in cyberdeck_data.items():
-                if getattr(cyberdeck, key) != value:
-                    setattr(cyberdeck, key, value)
-                    updated = True
-            if updated:
-                cyberdeck.save()
-                logger.info(f"Updated gear: {cyberdeck.name}")
-        print(f"Initilized {len(cyberdeck)} cyberdeck types.")
-
+    return seed_catalogue("cyberdecks", Cyberdeck, _catalogue_rows(cyberdecks, Cyberdeck, "cyberdeck"))
 
-@transaction.atomic
 def initialize_ammunition():
-    from world.inventory.models import Ammunition, AmmoType
-    for ammo_data in ammunition:
-        Ammunition.objects.get_or_create(
-            name=ammo_data['name'],
-            defaults={
-                'ammo_type': getattr(AmmoType, ammo_data['ammo_type']),
-                'weapon_type': ammo_data['weapon_type'],
-                'damage_modifier': ammo_data['damage_modifier'],
-                'armor_piercing': ammo_data['armor_piercing'],
-                'description': ammo_data['description'],
-                'cost': ammo_data['cost'],
-                'quantity': 0
-            }
-        )
-    print(f"Initialized {len(ammunition)} ammunition types.")
+    from world.inventory.models import AmmoType
+    rows = _catalogue_rows(ammunition, Ammunition, "ammunition")
+    for row in rows:
+        # Catalogue entries name the ammo type by its enum member; stock starts empty
+        row['ammo_type'] = getattr(AmmoType, row['ammo_type']).value
+        row['quantity'] = 0
+    return seed_catalogue("ammunition", Ammunition, rows)
 
 def populate_weapons():
     for weapon_data in weapons:
@@ -4,6 +4,9 @@ from evennia.scripts.models import ScriptDB
 from evennia.utils import logger
 from evennia import create_script
 from datetime import datetime
+from world.utils.logs import get_logger
+
+log = get_logger("events")
 
 class Event(DefaultScript):
     """
@@ -27,7 +30,15 @@ class Event(DefaultScript):
         self.db.participants = []
         self.db.date_time = date_time
         self.db.status = "scheduled"
-        self.db.associated_mission = associated_mission
+        self.db.associated_mission_id = associated_mission.id if associated_mission else None
+
+    @property
+    def associated_mission(self):
+        """The Mission this event completes, if any."""
+        if not self.db.associated_mission_id:
+            return None
+        from world.mission_board.models import Mission
+        return Mission.objects.filter(id=self.db.associated_mission_id).first()
 
 
     def at_repeat(self):
@@ -54,8 +65,9 @@ class Event(DefaultScript):
         for participant in self.db.participants:
             participant.msg(f"The event '{self.db.title}' has been completed!")
         
-        if self.db.associated_mission:
-            self.db.associated_mission.complete_mission()
+        mission = self.associated_mission
+        if mission:
+            mission.complete_mission()
 
     def cancel_event(self):
         """
@@ -103,17 +115,16 @@ class EventScheduler(DefaultScript):
         Get all upcoming events.
         """
         current_time = datetime.fromtimestamp(gametime.gametime(absolute=True))
-        logger.log_info(f"Current time: {current_time}")
+        log.debug("upcoming events now=%s", current_time)
         
         upcoming = []
         for e in self.db.events:
-            logger.log_info(f"Event: {e.db.title}, Status: {e.db.status}, Date: {e.db.date_time}")
             if e.db.status == "scheduled" and e.db.date_time > current_time:
                 upcoming.append(e)
             else:
-                logger.log_info(f"Event not included: {e.db.title}, Reason: {'Status not scheduled' if e.db.status != 'scheduled' else 'Date not in future'}")
+                log.debug("event skipped title=%s status=%s date=%s", e.db.title, e.db.status, e.db.date_time)
         
-        logger.log_info(f"Retrieved {len(upcoming)} upcoming events out of {len(self.db.events)} total events")
+        log.debug("upcoming events found=%d total=%d", len(upcoming), len(self.db.events))
         return upcoming
     
     def get_event_by_id(self, event_id):
@@ -0,0 +1,130 @@
+"""
+Group membership index.
+
+Keeps an in-memory view of who belongs to which group, with which role and
+permissions, so that permission checks and online-member lookups don't have
+to query GroupMembership every time. The caches are filled lazily and
+invalidated from the model and puppet signals in world/factions/signals.py.
+"""
+
+from collections import namedtuple
+from django.db.models import Count
+from evennia.objects.models import ObjectDB
+from world.factions.models import Group, GroupMembership
+
+PERMISSIONS = ("invite", "kick", "promote", "edit_info")
+
+MembershipEntry = namedtuple("MembershipEntry", ["group_id", "group_name", "role_name", "permissions"])
+
+# character id -> {group id: MembershipEntry}
+_CHARACTER_MEMBERSHIPS = {}
+# group id -> set of member character ids
+_GROUP_MEMBERS = {}
+# ids of currently puppeted characters, seeded from the session handler on first use
+_ONLINE = None
+
+
+def _entry_for(membership):
+    role = membership.role
+    permissions = frozenset(
+        perm for perm in PERMISSIONS if role and getattr(role, f"can_{perm}")
+    )
+    return MembershipEntry(
+        membership.group_id,
+        membership.group.name,
+        role.name if role else None,
+        permissions
+    )
+
+
+def get_memberships(character):
+    """
+    Return {group id: MembershipEntry} for a character, loading it with a
+    single query the first time.
+    """
+    entries = _CHARACTER_MEMBERSHIPS.get(character.id)
+    if entries is None:
+        memberships = GroupMembership.objects.filter(character_id=character.id).select_related('group', 'role')
+        entries = {membership.group_id: _entry_for(membership) for membership in memberships}
+        _CHARACTER_MEMBERSHIPS[character.id] = entries
+    return entries
+
+
+def is_member(character, group):
+    return group.id in get_memberships(character)
+
+
+def has_group_permission(character, group, permission):
+    """
+    Check whether a character leads a group or holds a role in it granting
+    `permission` (one of PERMISSIONS).
+    """
+    if group.leader_id == character.id:
+        return True
+    entry = get_memberships(character).get(group.id)
+    return bool(entry and permission in entry.permissions)
+
+
+def get_member_ids(group):
+    """Return the set of character ids belonging to a group."""
+    member_ids = _GROUP_MEMBERS.get(group.id)
+    if member_ids is None:
+        member_ids = set(GroupMembership.objects.filter(group=group).values_list('character_id', flat=True))
+        _GROUP_MEMBERS[group.id] = member_ids
+    return member_ids
+
+
+def groups_with_member_counts():
+    """All groups with a `member_count` annotation, fetched in one query."""
+    return Group.objects.select_related('leader').annotate(member_count=Count('groupmembership')).order_by('name')
+
+
+def online_character_ids():
+    global _ONLINE
+    if _ONLINE is None:
+        from evennia.server.sessionhandler import SESSIONS
+        _ONLINE = {session.puppet.id for session in SESSIONS.get_sessions() if session.puppet}
+    return _ONLINE
+
+
+def get_online_members(group):
+    """Return the puppeted character objects belonging to a group."""
+    online_ids = get_member_ids(group) & online_character_ids()
+    members = []
+    for character_id in online_ids:
+        character = ObjectDB.get_cached_instance(character_id)
+        if character is None:
+            character = ObjectDB.objects.filter(id=character_id).first()
+        if character:
+            members.append(character)
+    return members
+
+
+def set_online(character, online):
+    ids = online_character_ids()
+    if online:
+        ids.add(character.id)
+    elif not character.sessions.count():
+        # Only drop off once the last session puppeting the character is gone.
+        ids.discard(character.id)
+
+
+def invalidate_membership(character_id, group_id):
+    _CHARACTER_MEMBERSHIPS.pop(character_id, None)
+    _GROUP_MEMBERS.pop(group_id, None)
+
+
+def invalidate_group(group_id):
+    _GROUP_MEMBERS.pop(group_id, None)
+    # Role changes affect every member, so drop any cached entry for the group
+    for character_id, entries in list(_CHARACTER_MEMBERSHIPS.items()):
+        if group_id in entries:
+            del _CHARACTER_MEMBERSHIPS[character_id]
+
+
+def rename_group(group_id, name):
+    """Bring the group name in cached entries up to date after a save."""
+    for entries in _CHARACTER_MEMBERSHIPS.values():
+        entry = entries.get(group_id)
+        if entry and entry.group_name != name:
+            entries[group_id] = entry._replace(group_name=name)
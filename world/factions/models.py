@@ -211,9 +211,11 @@ class Roster(models.Model):
 
     def get_online_members(self):
         """Get all online approved members of this roster."""
+        # Online characters are tracked from puppet signals by the membership index
+        from world.factions.membership import online_character_ids
         return self.members.filter(
             approved=True,
-            character__db_account__db_is_connected=True
+            character_id__in=online_character_ids()
         )
 
     def can_manage(self, account):
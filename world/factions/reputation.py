@@ -0,0 +1,135 @@
+"""
+Faction reputation engine.
+
+FactionReputation rows are the only record of a character's standing with a
+faction. Character.faction_rep reads through the per-character cache kept
+here, adjustments for any number of characters are done with one UPDATE and
+one bulk_create, and ReputationDecayScript drifts everyone back toward
+neutral with a single UPDATE.
+"""
+
+from django.db import transaction
+from django.db.models import Case, F, Value, When
+from evennia.scripts.scripts import DefaultScript
+from evennia.utils import logger
+from world.factions.models import FactionReputation
+
+DECAY_STEP = 1
+DECAY_INTERVAL = 60 * 60 * 24 * 7  # weekly
+LEADERBOARD_SIZE = 10
+
+# character id -> {faction name: reputation}
+_REPUTATION_CACHE = {}
+# faction id -> [(character name, reputation), ...]
+_LEADERBOARD_CACHE = {}
+
+
+def _character_id(character):
+    return character if isinstance(character, int) else character.id
+
+
+def get_reputations(character):
+    """Return {faction name: reputation} for a character, cached after one query."""
+    character_id = _character_id(character)
+    reputations = _REPUTATION_CACHE.get(character_id)
+    if reputations is None:
+        reputations = dict(
+            FactionReputation.objects.filter(character_id=character_id).values_list('faction__name', 'reputation')
+        )
+        _REPUTATION_CACHE[character_id] = reputations
+    return reputations
+
+
+def get_reputation(character, faction):
+    return get_reputations(character).get(faction.name, 0)
+
+
+def adjust_reputation(characters, faction, amount):
+    """
+    Shift the standing of any number of characters with a faction.
+
+    Existing rows are updated in one UPDATE and missing rows are added with
+    one bulk_create, so plot fallout for a whole scene is a couple of queries.
+
+    Args:
+        characters (iterable): Character objects or ids.
+        faction (Faction model): The faction whose standing changes.
+        amount (int): Reputation to add (negative to remove).
+    """
+    character_ids = {_character_id(character) for character in characters}
+    if not character_ids:
+        return
+
+    with transaction.atomic():
+        existing = set(
+            FactionReputation.objects.filter(
+                faction=faction, character_id__in=character_ids
+            ).values_list('character_id', flat=True)
+        )
+        if existing and amount:
+            FactionReputation.objects.filter(
+                faction=faction, character_id__in=existing
+            ).update(reputation=F('reputation') + amount)
+        FactionReputation.objects.bulk_create(
+            [FactionReputation(character_id=character_id, faction=faction, reputation=amount)
+             for character_id in character_ids - existing],
+            ignore_conflicts=True
+        )
+
+    for character_id in character_ids:
+        _REPUTATION_CACHE.pop(character_id, None)
+    _LEADERBOARD_CACHE.pop(faction.id, None)
+
+
+def decay_reputations(step=DECAY_STEP):
+    """Move every non-neutral reputation `step` points toward zero in a single UPDATE."""
+    updated = FactionReputation.objects.exclude(reputation=0).update(
+        reputation=Case(
+            When(reputation__gt=step, then=F('reputation') - step),
+            When(reputation__lt=-step, then=F('reputation') + step),
+            default=Value(0)
+        )
+    )
+    _REPUTATION_CACHE.clear()
+    _LEADERBOARD_CACHE.clear()
+    return updated
+
+
+def get_leaderboard(faction, limit=LEADERBOARD_SIZE):
+    """
+    Return the best-regarded characters with a faction as [(name, reputation)].
+    The top LEADERBOARD_SIZE are cached; longer lists are queried directly.
+    """
+    if limit > LEADERBOARD_SIZE:
+        return _query_leaderboard(faction, limit)
+    leaderboard = _LEADERBOARD_CACHE.get(faction.id)
+    if leaderboard is None:
+        leaderboard = _LEADERBOARD_CACHE[faction.id] = _query_leaderboard(faction, LEADERBOARD_SIZE)
+    return leaderboard[:limit]
+
+
+def _query_leaderboard(faction, limit):
+    return list(
+        FactionReputation.objects.filter(faction=faction)
+        .order_by('-reputation')
+        .values_list('character__db_key', 'reputation')[:limit]
+    )
+
+
+class ReputationDecayScript(DefaultScript):
+    """
+    Periodically drifts all faction reputation back toward neutral.
+    """
+    def at_script_creation(self):
+        self.key = "ReputationDecay"
+        self.desc = "Decays faction reputation toward neutral"
+        self.interval = DECAY_INTERVAL
+        self.start_delay = True
+        self.persistent = True
+
+    def at_repeat(self):
+        try:
+            updated = decay_reputations()
+            logger.log_info(f"Faction reputation decay applied to {updated} rows.")
+        except Exception as e:
+            logger.log_err(f"Error decaying faction reputation: {e}")
@@ -1,3 +1,42 @@
-from django.db.models.signals import post_save
+from django.db.models.signals import post_save, post_delete
 from django.dispatch import receiver
-from .models import Group, Faction
\ No newline at end of file
+from evennia.server.signals import SIGNAL_OBJECT_POST_PUPPET, SIGNAL_OBJECT_POST_UNPUPPET
+from .models import Group, Faction, FactionReputation, GroupMembership, GroupRole
+from . import membership, reputation
+
+
+@receiver([post_save, post_delete], sender=GroupMembership)
+def update_membership_index(sender, instance, **kwargs):
+    membership.invalidate_membership(instance.character_id, instance.group_id)
+
+
+@receiver([post_save, post_delete], sender=GroupRole)
+def update_role_index(sender, instance, **kwargs):
+    membership.invalidate_group(instance.group_id)
+
+
+@receiver(post_delete, sender=Group)
+def update_group_index(sender, instance, **kwargs):
+    membership.invalidate_group(instance.id)
+
+
+@receiver(post_save, sender=Group)
+def update_group_name(sender, instance, created, **kwargs):
+    if not created:
+        membership.rename_group(instance.id, instance.name)
+
+
+@receiver(SIGNAL_OBJECT_POST_PUPPET)
+def _on_puppet(sender, **kwargs):
+    membership.set_online(sender, True)
+
+
+@receiver(SIGNAL_OBJECT_POST_UNPUPPET)
+def _on_unpuppet(sender, **kwargs):
+    membership.set_online(sender, False)
+
+
+@receiver([post_save, post_delete], sender=FactionReputation)
+def update_reputation_cache(sender, instance, **kwargs):
+    reputation._REPUTATION_CACHE.pop(instance.character_id, None)
+    reputation._LEADERBOARD_CACHE.pop(instance.faction_id, None)
@@ -10,3 +10,6 @@ class HangoutsConfig(AppConfig):
     """
     name = "world.hangouts"
     verbose_name = "Hangouts"
+
+    def ready(self):
+        import world.hangouts.signals
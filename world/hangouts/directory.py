@@ -0,0 +1,257 @@
+"""
+Hangout directory.
+
+An in-memory copy of every hangout's listing data, indexed by hangout_id,
+category and district, so that +hangouts can be rendered without touching
+the Attribute table. The directory is loaded with two queries the first time
+it is needed and dropped whenever a hangout or one of its Attributes changes
+(see world/hangouts/signals.py).
+
+Occupancy is tracked per hangout room from Room.at_object_receive and
+Room.at_object_leave; only puppeted characters count toward it.
+"""
+
+from collections import defaultdict, namedtuple
+from django.db.models import F
+from evennia.typeclasses.attributes import Attribute
+from evennia.objects.models import ObjectDB
+from world.factions.membership import online_character_ids
+
+HANGOUT_TYPECLASS = "typeclasses.hangouts.Hangout"
+
+# Attributes copied into the directory
+HANGOUT_FIELDS = (
+    "hangout_id", "category", "district", "description", "restricted", "hidden",
+    "required_splats", "required_merits", "required_factions", "room", "active",
+)
+
+HangoutEntry = namedtuple("HangoutEntry", [
+    "dbid", "hangout_id", "key", "category", "district", "description",
+    "restricted", "hidden", "active", "room_id",
+    "required_splats", "required_merits", "required_factions",
+])
+
+# hangout_id -> HangoutEntry, or None until loaded
+_BY_ID = None
+# object id -> hangout_id
+_BY_DBID = {}
+# category -> [hangout_id, ...]
+_BY_CATEGORY = {}
+# district -> [hangout_id, ...]
+_BY_DISTRICT = {}
+# ids of the Attributes the directory was built from
+_ATTRIBUTE_IDS = set()
+# room id -> ids of objects currently in the room
+_OCCUPANTS = {}
+
+
+def _entry_from(dbid, key, values):
+    room = values.get("room")
+    return HangoutEntry(
+        dbid=dbid,
+        hangout_id=values.get("hangout_id"),
+        key=key,
+        category=values.get("category") or "Uncategorized",
+        district=values.get("district") or "Uncategorized",
+        description=values.get("description") or "",
+        restricted=bool(values.get("restricted")),
+        hidden=bool(values.get("hidden")),
+        active=bool(values.get("active")),
+        room_id=room.id if room else None,
+        required_splats=frozenset(values.get("required_splats") or ()),
+        required_merits=frozenset(values.get("required_merits") or ()),
+        required_factions=frozenset(values.get("required_factions") or ()),
+    )
+
+
+def load_directory():
+    """Build the directory from the database."""
+    global _BY_ID
+
+    keys = dict(
+        ObjectDB.objects.filter(db_typeclass_path=HANGOUT_TYPECLASS).values_list("id", "db_key")
+    )
+    values = defaultdict(dict)
+    attribute_ids = set()
+    attributes = Attribute.objects.filter(
+        objectdb__db_typeclass_path=HANGOUT_TYPECLASS,
+        db_key__in=HANGOUT_FIELDS,
+        db_category__isnull=True
+    ).annotate(owner_id=F("objectdb__id"))
+    for attribute in attributes:
+        values[attribute.owner_id][attribute.db_key] = attribute.value
+        attribute_ids.add(attribute.id)
+
+    by_id = {}
+    by_dbid = {}
+    by_category = defaultdict(list)
+    by_district = defaultdict(list)
+    unnumbered = []
+    for dbid, key in keys.items():
+        entry = _entry_from(dbid, key, values[dbid])
+        if entry.hangout_id is None:
+            unnumbered.append(entry)
+            continue
+        by_id[entry.hangout_id] = entry
+        by_dbid[dbid] = entry.hangout_id
+
+    # Hangouts created before hangout_ids existed get the next free numbers
+    for entry in unnumbered:
+        hangout_id = max(by_id, default=0) + 1
+        ObjectDB.objects.get(id=entry.dbid).attributes.add("hangout_id", hangout_id)
+        by_id[hangout_id] = entry._replace(hangout_id=hangout_id)
+        by_dbid[entry.dbid] = hangout_id
+    for hangout_id in sorted(by_id):
+        entry = by_id[hangout_id]
+        by_category[entry.category].append(hangout_id)
+        by_district[entry.district].append(hangout_id)
+
+    _BY_DBID.clear()
+    _BY_DBID.update(by_dbid)
+    _BY_CATEGORY.clear()
+    _BY_CATEGORY.update(by_category)
+    _BY_DISTRICT.clear()
+    _BY_DISTRICT.update(by_district)
+    _ATTRIBUTE_IDS.clear()
+    _ATTRIBUTE_IDS.update(attribute_ids)
+    _BY_ID = by_id
+
+    _sync_occupancy({entry.room_id for entry in by_id.values() if entry.room_id})
+    return by_id
+
+
+def _sync_occupancy(room_ids):
+    """Start tracking newly listed rooms and stop tracking delisted ones."""
+    for room_id in list(_OCCUPANTS):
+        if room_id not in room_ids:
+            del _OCCUPANTS[room_id]
+    for room_id in room_ids - set(_OCCUPANTS):
+        room = ObjectDB.get_cached_instance(room_id) or ObjectDB.objects.filter(id=room_id).first()
+        _OCCUPANTS[room_id] = {obj.id for obj in room.contents} if room else set()
+
+
+def invalidate():
+    """Drop the directory; it is rebuilt on next use."""
+    global _BY_ID
+    _BY_ID = None
+
+
+def is_hangout_attribute(attribute_id):
+    return attribute_id in _ATTRIBUTE_IDS
+
+
+def _directory():
+    return _BY_ID if _BY_ID is not None else load_directory()
+
+
+def get_entry(hangout_id):
+    try:
+        return _directory().get(int(hangout_id))
+    except (ValueError, TypeError):
+        return None
+
+
+def get_entry_for_object(hangout):
+    directory = _directory()
+    hangout_id = _BY_DBID.get(hangout.id)
+    return directory.get(hangout_id) if hangout_id is not None else None
+
+
+def all_entries():
+    """All hangouts, sorted by hangout_id."""
+    directory = _directory()
+    return [directory[hangout_id] for hangout_id in sorted(directory)]
+
+
+def entries_in_category(category):
+    directory = _directory()
+    return [directory[hangout_id] for hangout_id in _BY_CATEGORY.get(category, ())]
+
+
+def entries_in_district(district):
+    directory = _directory()
+    return [directory[hangout_id] for hangout_id in _BY_DISTRICT.get(district, ())]
+
+
+def next_hangout_id():
+    return max(_directory(), default=0) + 1
+
+
+def can_see(entry, character, is_staff=None, splat=None, merits=None, faction=None):
+    """
+    Check whether a character may see a hangout listing. The character's
+    splat, merits and faction can be passed in when checking many entries.
+    """
+    if not entry.active:
+        return False
+    if not character:
+        return not entry.restricted
+    if is_staff is None:
+        is_staff = character.check_permstring("builders") or character.check_permstring("wizards")
+    if is_staff or not entry.restricted:
+        return True
+
+    if entry.required_splats:
+        splat = splat if splat is not None else character.db.splat
+        if not splat or splat not in entry.required_splats:
+            return False
+    if entry.required_merits:
+        merits = merits if merits is not None else (character.db.merits or [])
+        if entry.required_merits.isdisjoint(merits):
+            return False
+    if entry.required_factions:
+        faction = faction if faction is not None else character.db.faction
+        if not faction or faction not in entry.required_factions:
+            return False
+    return True
+
+
+def visible_entries(character=None, entries=None):
+    """Return the entries a character can see, sorted by hangout_id."""
+    entries = all_entries() if entries is None else entries
+    if not character:
+        return [entry for entry in entries if can_see(entry, None)]
+
+    is_staff = character.check_permstring("builders") or character.check_permstring("wizards")
+    splat = merits = faction = None
+    if not is_staff and any(entry.restricted for entry in entries):
+        splat = character.db.splat or ""
+        merits = character.db.merits or []
+        faction = character.db.faction or ""
+    return [
+        entry for entry in entries
+        if can_see(entry, character, is_staff=is_staff, splat=splat, merits=merits, faction=faction)
+    ]
+
+
+def occupancy(entry):
+    """Number of puppeted characters in a hangout's room."""
+    occupants = _OCCUPANTS.get(entry.room_id)
+    if not occupants:
+        return 0
+    return len(occupants & online_character_ids())
+
+
+def note_arrival(room, obj):
+    occupants = _OCCUPANTS.get(room.id)
+    if occupants is not None:
+        occupants.add(obj.id)
+
+
+def note_departure(room, obj):
+    occupants = _OCCUPANTS.get(room.id)
+    if occupants is not None:
+        occupants.discard(obj.id)
+
+
+def display_entry(entry, show_restricted=False):
+    """
+    Get the listing lines for a hangout.
+
+    Returns:
+        tuple: (number, info_line, description_line)
+    """
+    restricted_marker = "*" if entry.restricted and show_restricted else " "
+    info_line = f"{restricted_marker}{entry.key}".ljust(55) + str(occupancy(entry))
+    desc_line = f"    {entry.description}"
+    return (entry.hangout_id, info_line, desc_line)
@@ -4,6 +4,7 @@ Provides utility functions for managing and querying hangouts.
 """
 
 from evennia.objects.models import ObjectDB
+from world.hangouts import directory
 
 # Categories for hangout locations
 HANGOUT_CATEGORIES = [
@@ -25,18 +26,7 @@ class HangoutDB(ObjectDB):
         """
         Get the next available hangout ID.
         """
-        hangouts = cls.get_all_hangouts()
-        if not hangouts:
-            return 1
-        
-        # Get all hangout_ids, including None values
-        existing_ids = [h.db.hangout_id for h in hangouts]
-        # Filter out None values and get max
-        valid_ids = [id for id in existing_ids if id is not None]
-        if not valid_ids:
-            return 1
-            
-        return max(valid_ids) + 1
+        return directory.next_hangout_id()
 
     @classmethod
     def create(cls, key, room, category, district, description, restricted=False, 
@@ -92,27 +82,7 @@ class HangoutDB(ObjectDB):
         Returns:
             tuple: (number, info_line, description_line)
         """
-        # Ensure we have a hangout_id
-        if self.db.hangout_id is None:
-            self._migrate_to_hangout_id()
-        
-        # Get the hangout_id (this should never be None now)
-        hangout_id = self.db.hangout_id
-        
-        restricted_marker = "*" if self.db.restricted and show_restricted else " "
-        name = self.key
-        
-        # Count players in location
-        location = self.db.room
-        if location:
-            player_count = len([obj for obj in location.contents if obj.has_account])
-        else:
-            player_count = 0
-            
-        info_line = f"{restricted_marker}{name}".ljust(55) + str(player_count)
-        desc_line = f"    {self.db.description}"
-        
-        return (hangout_id, info_line, desc_line)
+        return directory.display_entry(directory.get_entry_for_object(self), show_restricted)
 
     @classmethod
     def get_all_hangouts(cls):
@@ -122,7 +92,7 @@ class HangoutDB(ObjectDB):
         Returns:
             QuerySet: QuerySet of all Hangout objects
         """
-        return cls.objects.filter(db_typeclass_path="typeclasses.hangouts.Hangout")
+        return cls.objects.filter(db_typeclass_path=directory.HANGOUT_TYPECLASS)
 
     def _migrate_to_hangout_id(self):
         """
@@ -150,7 +120,8 @@ class HangoutDB(ObjectDB):
         for hangout in all_hangouts:
             hangout.attributes.add("hangout_id", current_id)
             current_id += 1
-        
+
+        directory.invalidate()
         return len(all_hangouts)  # Return total number of hangouts processed
 
     @classmethod
@@ -164,12 +135,10 @@ class HangoutDB(ObjectDB):
         Returns:
             HangoutDB: The hangout object or None if not found
         """
-        try:
-            hangout_id = int(hangout_id)
-            hangouts = cls.get_all_hangouts()
-            return next((h for h in hangouts if h.db.hangout_id == hangout_id), None)
-        except (ValueError, TypeError):
+        entry = directory.get_entry(hangout_id)
+        if not entry:
             return None
+        return cls.objects.filter(id=entry.dbid).first()
 
     @classmethod
     def get_visible_hangouts(cls, character=None):
@@ -180,54 +149,9 @@ class HangoutDB(ObjectDB):
             character: The character to check visibility for
             
         Returns:
-            list: List of Hangout objects visible to the character
+            list: HangoutEntry listings visible to the character, sorted by hangout_id
         """
-        all_hangouts = cls.get_all_hangouts()
-        
-        # Filter hangouts based on visibility
-        visible_hangouts = []
-        for hangout in all_hangouts:
-            # Skip inactive hangouts
-            if not hangout.db.active:
-                continue
-                
-            # If no character is checking, only show unrestricted hangouts
-            if not character and not hangout.db.restricted:
-                visible_hangouts.append(hangout)
-                continue
-                
-            # If character is checking, check their permissions
-            if character:
-                # Staff can see all hangouts
-                if character.check_permstring("builders") or character.check_permstring("wizards"):
-                    visible_hangouts.append(hangout)
-                    continue
-                    
-                # For restricted hangouts, check if character meets requirements
-                if hangout.db.restricted:
-                    # Check splat requirements
-                    if hangout.db.required_splats:
-                        char_splat = character.db.splat if hasattr(character.db, 'splat') else None
-                        if not char_splat or char_splat not in hangout.db.required_splats:
-                            continue
-                            
-                    # Check merit requirements
-                    if hangout.db.required_merits:
-                        char_merits = character.db.merits if hasattr(character.db, 'merits') else []
-                        if not any(merit in char_merits for merit in hangout.db.required_merits):
-                            continue
-                            
-                    # Check faction requirements
-                    if hangout.db.required_factions:
-                        char_faction = character.db.faction if hasattr(character.db, 'faction') else None
-                        if not char_faction or char_faction not in hangout.db.required_factions:
-                            continue
-                
-                # If we got here, the character can see this hangout
-                visible_hangouts.append(hangout)
-                
-        # Sort by hangout_id
-        return sorted(visible_hangouts, key=lambda x: x.db.hangout_id or 0)
+        return directory.visible_entries(character)
 
     @classmethod
     def get_hangouts_by_category(cls, category, character=None):
@@ -239,10 +163,9 @@ class HangoutDB(ObjectDB):
             character: The character to check visibility for
             
         Returns:
-            list: List of Hangout objects in the category visible to the character
+            list: HangoutEntry listings in the category visible to the character
         """
         if category not in HANGOUT_CATEGORIES:
             raise ValueError(f"Invalid category: {category}")
             
-        visible_hangouts = cls.get_visible_hangouts(character)
-        return [h for h in visible_hangouts if h.db.category == category] 
\ No newline at end of file
+        return directory.visible_entries(character, directory.entries_in_category(category))
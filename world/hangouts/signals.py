@@ -0,0 +1,28 @@
+from django.db.models.signals import post_save, post_delete, m2m_changed
+from django.dispatch import receiver
+from evennia.objects.models import ObjectDB
+from evennia.typeclasses.attributes import Attribute
+from typeclasses.hangouts import Hangout
+from . import directory
+
+
+def _is_hangout(obj):
+    return getattr(obj, "db_typeclass_path", None) == directory.HANGOUT_TYPECLASS
+
+
+# Typeclassed objects send their signals as their proxy class, not ObjectDB
+@receiver([post_save, post_delete], sender=Hangout)
+def update_hangout_directory(sender, instance, **kwargs):
+    directory.invalidate()
+
+
+@receiver([post_save, post_delete], sender=Attribute)
+def update_hangout_attribute(sender, instance, **kwargs):
+    if directory.is_hangout_attribute(instance.id):
+        directory.invalidate()
+
+
+@receiver(m2m_changed, sender=ObjectDB.db_attributes.through)
+def add_hangout_attribute(sender, instance, action, **kwargs):
+    if action == "post_add" and _is_hangout(instance):
+        directory.invalidate()
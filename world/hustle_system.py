@@ -1,10 +1,185 @@
+"""
+Weekly hustles.
+
+Each role has a table of hustles that is rolled on with a d6 once per hustle
+week. The tables are immutable module data, and the script only remembers
+which row each role got. Attempts are HustleAttempt rows keyed by
+(character, week), so checking whether someone has hustled is one indexed
+query, a new week needs no reset, and clearing one attempt is a delete.
+
+Characters can opt into auto-hustling. When the week rolls over, everyone
+opted in who hasn't hustled yet is resolved in one batch. Their stats are
+read in two queries, their attempts are bulk created, and payouts go
+through CharacterMoneyService.add_money_bulk.
+"""
+
+import random
+from collections import namedtuple
+from types import MappingProxyType
+from django.db import IntegrityError, transaction
+from django.db.models import F
 from evennia import DefaultScript
-from evennia.utils import gametime, create
+from evennia.objects.models import ObjectDB
 from evennia.scripts.models import ScriptDB
-from evennia.utils import logger
-from world.cyberpunk_sheets.services import CharacterMoneyService, CharacterSheetMoneyService
-import random
+from evennia.typeclasses.attributes import Attribute
+from evennia.utils import create, gametime, logger
+from evennia.utils.utils import delay
+from world.cyberpunk_constants import ROLES
+from world.cyberpunk_sheets.models import CharacterSheet
+from world.cyberpunk_sheets.services import CharacterMoneyService
+from world.hustles.models import HustleAttempt
+
+WEEK = 7 * 24 * 60 * 60
+ROLLOVER_CHECK = 60 * 60  # how often the script checks for a new week
+AUTO_HUSTLE_DELAY = 5  # seconds after a rollover before auto-hustles run
+AUTO_HUSTLE_TAG = ("auto_hustle", "hustle")
+
+Hustle = namedtuple("Hustle", "name difficulty payout")
+HustleStats = namedtuple("HustleStats", "role cool ability")
+
+# (highest d6 roll, hustle), checked in order
+GENERIC_HUSTLES = ((6, Hustle("Generic Hustle", 15, 200)),)
+_ROLE_HUSTLES = {
+    "Rockerboy": (
+        (3, Hustle("Street Performance", 13, 100)),
+        (5, Hustle("Club Gig", 15, 200)),
+        (6, Hustle("Corporate Event", 17, 500)),
+    ),
+    "Solo": (
+        (3, Hustle("Bodyguard Duty", 13, 100)),
+        (5, Hustle("Security Consultant", 15, 200)),
+        (6, Hustle("High-Risk Escort", 17, 500)),
+    ),
+}
+HUSTLE_TABLES = MappingProxyType({
+    role: _ROLE_HUSTLES.get(role, GENERIC_HUSTLES) for role in ROLES
+})
+
+# role -> the role ability rolled with COOL
+ROLE_ABILITIES = MappingProxyType({
+    "Rockerboy": "charismatic_impact",
+    "Solo": "combat_awareness",
+    "Netrunner": "interface",
+    "Tech": "maker",
+    "Medtech": "medicine",
+    "Media": "credibility",
+    "Exec": "teamwork",
+    "Lawman": "backup",
+    "Fixer": "operator",
+    "Nomad": "moto",
+})
+
 
+def current_week():
+    """Get the number of the hustle week it is in game time."""
+    return int(gametime.gametime(absolute=True) // WEEK)
+
+
+def roll_hustle(role):
+    """Roll a d6 on a role's hustle table and get the row index it lands on."""
+    d6 = random.randint(1, 6)
+    table = HUSTLE_TABLES[role]
+    return next(
+        (index for index, (highest, _) in enumerate(table) if d6 <= highest),
+        len(table) - 1
+    )
+
+
+def _ability_value(role, cool, values):
+    ability = ROLE_ABILITIES.get(role, "cool")
+    return cool if ability == "cool" else values.get(ability) or 0
+
+
+def load_stats(characters):
+    """
+    Get the role, COOL and role ability characters hustle with, from their
+    typeclass Attributes or, for characters without a role there, their
+    character sheets. Takes at most two queries.
+
+    Returns:
+        dict: {character id: HustleStats}, without characters with no role.
+    """
+    values = {character.id: {} for character in characters}
+    attributes = Attribute.objects.filter(
+        objectdb__id__in=values,
+        db_key__in=("role", "cool", "skills"),
+        db_category__isnull=True
+    ).annotate(owner_id=F("objectdb__id"))
+    for attribute in attributes:
+        values[attribute.owner_id][attribute.db_key] = attribute.value
+
+    stats = {}
+    for obj_id, attrs in values.items():
+        role = attrs.get("role")
+        if role:
+            cool = attrs.get("cool") or 0
+            stats[obj_id] = HustleStats(role, cool, _ability_value(role, cool, attrs.get("skills") or {}))
+
+    missing = [obj_id for obj_id in values if obj_id not in stats]
+    if missing:
+        sheets = CharacterSheet.objects.filter(character_id__in=missing).exclude(role="").values(
+            "character_id", "role", "cool", *set(ROLE_ABILITIES.values())
+        )
+        for sheet in sheets:
+            stats[sheet["character_id"]] = HustleStats(
+                sheet["role"], sheet["cool"], _ability_value(sheet["role"], sheet["cool"], sheet)
+            )
+    return stats
+
+
+def get_stats(character):
+    """Get a character's HustleStats, or None if they have no role."""
+    return load_stats([character]).get(character.id)
+
+
+def resolve(character_id, stats, hustle, week, automatic=False):
+    """Roll a hustle and get the (unsaved) HustleAttempt recording it."""
+    roll = random.randint(1, 10)
+    total = stats.cool + stats.ability + roll
+    success = total >= hustle.difficulty
+    return HustleAttempt(
+        character_id=character_id,
+        week=week,
+        role=stats.role,
+        hustle=hustle.name,
+        difficulty=hustle.difficulty,
+        roll=roll,
+        total=total,
+        success=success,
+        payout=hustle.payout if success else 0,
+        automatic=automatic
+    )
+
+
+def get_attempt(character, week=None):
+    """Get a character's HustleAttempt for a week (this week by default), or None."""
+    week = current_week() if week is None else week
+    return HustleAttempt.objects.filter(character_id=character.id, week=week).first()
+
+
+def clear_attempt(character, week=None):
+    """
+    Forget a character's hustle for a week (this week by default), so they
+    can hustle again.
+
+    Returns:
+        bool: False if they hadn't hustled.
+    """
+    week = current_week() if week is None else week
+    deleted, _ = HustleAttempt.objects.filter(character_id=character.id, week=week).delete()
+    return bool(deleted)
+
+
+def is_auto_hustling(character):
+    return character.tags.has(AUTO_HUSTLE_TAG[0], category=AUTO_HUSTLE_TAG[1])
+
+
+def set_auto_hustle(character, enabled):
+    """Opt a character into or out of auto-hustling."""
+    if enabled:
+        character.tags.add(AUTO_HUSTLE_TAG[0], category=AUTO_HUSTLE_TAG[1])
+    else:
+        character.tags.remove(AUTO_HUSTLE_TAG[0], category=AUTO_HUSTLE_TAG[1])
 
 
 class HustleSystem(DefaultScript):
@@ -14,181 +189,158 @@ class HustleSystem(DefaultScript):
     def at_script_creation(self):
         self.key = "HustleSystem"
         self.desc = "Manages hustle side missions"
-        self.interval = 604800  # 1 week in seconds
+        self.interval = ROLLOVER_CHECK
         self.persistent = True
         self.db.available_hustles = {}
-        self.db.last_attempt = {}  # Track last attempt for each character
-        self.generate_hustles()  # Generate initial hustles
+        self.db.week = None
 
     def at_start(self):
         """
         Called when the script is started.
         """
-        self.generate_hustles()
+        if self.interval != ROLLOVER_CHECK:
+            # Scripts created when the check was weekly. Stop first so the
+            # restart marks the script active again; it calls at_start anew.
+            self.stop()
+            self.start(interval=ROLLOVER_CHECK)
+            return
+        self.roll_over()
 
     def at_repeat(self):
         """
-        Called every week to generate new hustles and reset attempt tracking.
+        Called regularly to start a new hustle week when one begins.
+        """
+        self.roll_over()
+
+    def roll_over(self):
+        """
+        If a new hustle week has begun, generate its hustles and queue the
+        auto-hustle batch.
+
+        Returns:
+            bool: True if a new week was started.
         """
+        week = current_week()
+        if self.db.week == week:
+            return False
         self.generate_hustles()
-        self.db.last_attempt = {}  # Reset attempt tracking
-        logger.log_info("HustleSystem: Weekly reset completed. New hustles generated.")
+        self.db.week = week
+        logger.log_info(f"HustleSystem: Started hustle week {week}. New hustles generated.")
+        delay(AUTO_HUSTLE_DELAY, self.run_auto_hustles)
+        return True
 
     def generate_hustles(self):
         """
         Generate new hustles for each role.
         """
-        roles = ["Rockerboy", "Solo", "Netrunner", "Tech", "Medtech", "Media", "Exec", "Lawman", "Fixer", "Nomad"]
-        self.db.available_hustles = {}
-        
-        for role in roles:
-            hustle = self.generate_hustle_for_role(role)
-            self.db.available_hustles[role] = hustle
-        
-        logger.log_info(f"HustleSystem: Generated hustles for roles: {', '.join(roles)}")
-
-    def generate_hustle_for_role(self, role):
-        """
-        Generate a hustle for a specific role.
-        """
-        d6 = random.randint(1, 6)
-        
-        if role == "Rockerboy":
-            if d6 <= 3:
-                return {"name": "Street Performance", "difficulty": 13, "payout": 100}
-            elif d6 <= 5:
-                return {"name": "Club Gig", "difficulty": 15, "payout": 200}
-            else:
-                return {"name": "Corporate Event", "difficulty": 17, "payout": 500}
-        elif role == "Solo":
-            if d6 <= 3:
-                return {"name": "Bodyguard Duty", "difficulty": 13, "payout": 100}
-            elif d6 <= 5:
-                return {"name": "Security Consultant", "difficulty": 15, "payout": 200}
-            else:
-                return {"name": "High-Risk Escort", "difficulty": 17, "payout": 500}
-        # Add similar logic for other roles
-        else:
-            return {"name": "Generic Hustle", "difficulty": 15, "payout": 200}
+        self.db.available_hustles = {role: roll_hustle(role) for role in HUSTLE_TABLES}
 
-    def get_available_hustle(self, character):
+    def get_hustle(self, role):
+        """Get this week's Hustle for a role, or None for an unknown role."""
+        table = HUSTLE_TABLES.get(role)
+        if not table:
+            return None
+        index = (self.db.available_hustles or {}).get(role)
+        if not isinstance(index, int) or not 0 <= index < len(table):
+            self.generate_hustles()
+            index = self.db.available_hustles[role]
+        return table[index][1]
+
+    def get_available_hustles(self):
+        """{role: Hustle} for this week."""
+        return {role: self.get_hustle(role) for role in HUSTLE_TABLES}
+
+    def get_available_hustle(self, character, stats=None):
         """
         Get the available hustle for a character based on their role.
         """
-        # Get character role - first check typeclass attributes, then fall back to character sheet
-        role = None
-        
-        # Check if character has a db attribute
-        if hasattr(character, 'db') and hasattr(character.db, 'role') and character.db.role:
-            role = character.db.role
-            logger.log_info(f"HustleSystem: Found role {role} in character typeclass attributes")
-        # Fall back to character sheet
-        elif hasattr(character, 'character_sheet') and character.character_sheet and character.character_sheet.role:
-            role = character.character_sheet.role
-            logger.log_info(f"HustleSystem: Found role {role} in character sheet")
-        else:
-            logger.log_warn(f"HustleSystem: Character {character.name} has no role.")
-            return None
-            
-        hustle = self.db.available_hustles.get(role)
-        if not hustle:
-            logger.log_warn(f"HustleSystem: No hustle found for role {role}. Available hustles: {self.db.available_hustles}")
-        return hustle
+        self.roll_over()
+        stats = stats or get_stats(character)
+        return self.get_hustle(stats.role) if stats else None
 
     def can_attempt_hustle(self, character):
         """
         Check if the character can attempt a hustle this week.
         """
-        last_attempt = self.db.last_attempt.get(character.id, 0)
-        current_time = gametime.gametime(absolute=True)
-        return (current_time - last_attempt) >= self.interval
+        return not HustleAttempt.objects.filter(
+            character_id=character.id, week=current_week()
+        ).exists()
 
     def attempt_hustle(self, character, hustle):
         """
         Attempt a hustle for a character.
+
+        Returns:
+            tuple: (success, message, total roll, COOL, role ability)
         """
-        logger.log_info(f"Attempting hustle for {character.name}")
         try:
-            if not self.can_attempt_hustle(character):
-                logger.log_info(f"{character.name} has already attempted a hustle this week.")
+            stats = get_stats(character)
+            if stats is None:
+                return False, "You need to have a defined role to attempt a hustle.", 0, 0, 0
+
+            attempt = resolve(character.id, stats, hustle, current_week())
+            try:
+                with transaction.atomic():
+                    attempt.save()
+            except IntegrityError:
                 return False, "You have already attempted your hustle this week.", 0, 0, 0
 
-            # Define a mapping of roles to their corresponding abilities
-            role_abilities = {
-                "Rockerboy": "charismatic_impact",
-                "Solo": "combat_awareness",
-                "Netrunner": "interface",
-                "Tech": "maker",
-                "Medtech": "medicine",
-                "Media": "credibility",
-                "Exec": "teamwork",
-                "Lawman": "backup",
-                "Fixer": "operator",
-                "Nomad": "moto"
-            }
-            
-            # Get character role and abilities from character or character sheet
-            role = None
-            role_ability_value = 0
-            cool_value = 0
-            
-            # First try to get from character typeclass
-            if hasattr(character, 'db'):
-                if hasattr(character.db, 'role'):
-                    role = character.db.role
-                
-                # Get the role-specific ability or default to cool
-                role_ability = role_abilities.get(role, 'cool') if role else 'cool'
-                
-                # Check if ability is in character's skills dictionary
-                if hasattr(character.db, 'skills') and character.db.skills:
-                    role_ability_value = character.db.skills.get(role_ability, 0)
-                    cool_value = character.db.skills.get('cool', 0)
-                # Otherwise, check direct attributes
-                else:
-                    role_ability_value = getattr(character.db, role_ability, 0)
-                    cool_value = getattr(character.db, 'cool', 0)
-            
-            # Fall back to character sheet if values weren't found
-            if role is None and hasattr(character, 'character_sheet') and character.character_sheet:
-                cs = character.character_sheet
-                role = cs.role
-                
-                # Get the role-specific ability or default to cool
-                role_ability = role_abilities.get(role, 'cool') if role else 'cool'
-                role_ability_value = getattr(cs, role_ability, 0)
-                cool_value = getattr(cs, 'cool', 0)
-            
-            if role is None:
-                logger.log_warn(f"HustleSystem: Couldn't determine role for {character.name}")
-                return False, "You need to have a defined role to attempt a hustle.", 0, 0, 0
-            
-            logger.log_info(f"{character.name} - Role: {role}, Role Ability: {role_ability}, Value: {role_ability_value}, Cool: {cool_value}")
-
-            dice_roll = random.randint(1, 10)
-            total_roll = cool_value + role_ability_value + dice_roll
-            
-            logger.log_info(f"{character.name} - Dice Roll: {dice_roll}, Total Roll: {total_roll}, Difficulty: {hustle['difficulty']}")
-
-            # Record the attempt
-            self.db.last_attempt[character.id] = gametime.gametime(absolute=True)
-            
-            if total_roll >= hustle['difficulty']:
-                logger.log_info(f"{character.name} succeeded in the hustle.")
-                CharacterMoneyService.add_money(character, hustle['payout'])
-                return True, f"Success! You earned {hustle['payout']} eb from your {hustle['name']} hustle.", total_roll, cool_value, role_ability_value
-            else:
-                logger.log_info(f"{character.name} failed the hustle.")
-                return False, f"You failed your {hustle['name']} hustle. Better luck next time!", total_roll, cool_value, role_ability_value
+            if attempt.success:
+                CharacterMoneyService.add_money(character, attempt.payout)
+                return True, f"Success! You earned {attempt.payout} eb from your {hustle.name} hustle.", attempt.total, stats.cool, stats.ability
+            return False, f"You failed your {hustle.name} hustle. Better luck next time!", attempt.total, stats.cool, stats.ability
         except Exception as e:
             logger.log_trace(f"Error in attempt_hustle for {character.name}: {str(e)}")
             return False, f"An error occurred: {str(e)}", 0, 0, 0
 
-# Function to get or create the hustle system
-def get_or_create_hustle_system():
+    def run_auto_hustles(self):
+        """
+        Resolve this week's hustle for every character opted into
+        auto-hustling who hasn't hustled yet.
+
+        Returns:
+            int: The number of hustles resolved.
+        """
+        week = current_week()
+        characters = list(ObjectDB.objects.get_by_tag(
+            key=AUTO_HUSTLE_TAG[0], category=AUTO_HUSTLE_TAG[1]
+        ).exclude(hustle_attempts__week=week))
+        if not characters:
+            return 0
+
+        stats = load_stats(characters)
+        attempts = []
+        for character in characters:
+            character_stats = stats.get(character.id)
+            hustle = self.get_hustle(character_stats.role) if character_stats else None
+            if hustle:
+                attempts.append(resolve(character.id, character_stats, hustle, week, automatic=True))
+        HustleAttempt.objects.bulk_create(attempts, ignore_conflicts=True)
+
+        # Pay out only the attempts that were stored, in case someone
+        # hustled by hand while the batch was being rolled
+        by_id = {character.id: character for character in characters}
+        stored = HustleAttempt.objects.filter(
+            week=week, automatic=True, character_id__in=by_id
+        ).values_list("character_id", "hustle", "payout")
+        payouts = {}
+        for character_id, hustle, payout in stored:
+            character = by_id[character_id]
+            payouts[character] = payout
+            if payout:
+                character.msg(f"Your {hustle} hustle paid out {payout} eb this week.")
+            else:
+                character.msg(f"Your {hustle} hustle didn't pay out this week.")
+        CharacterMoneyService.add_money_bulk(payouts)
+
+        logger.log_info(f"HustleSystem: Resolved {len(payouts)} auto-hustles for week {week}.")
+        return len(payouts)
+
+
+# Function to initialize the hustle system
+def init_hustle_system():
     try:
         script = ScriptDB.objects.get(db_key="HustleSystem")
-        logger.log_info("Retrieved existing HustleSystem.")
     except ScriptDB.DoesNotExist:
         script = create.create_script(HustleSystem, key="HustleSystem")
         if isinstance(script, bool):
@@ -207,12 +359,19 @@ def get_or_create_hustle_system():
         for extra in scripts[1:]:
             extra.delete()
         logger.log_info(f"Multiple HustleSystems found. Kept one and deleted {len(scripts) - 1} extra(s).")
-    
+
     if script and hasattr(script, 'is_active') and callable(script.is_active):
         if not script.is_active():
             script.start()
             logger.log_info("Started inactive HustleSystem.")
     else:
         logger.log_warn("Retrieved script is not a proper HustleSystem instance.")
-    
-    return script
\ No newline at end of file
+
+    return script
+
+# Function to get or create the hustle system
+def get_or_create_hustle_system():
+    script = init_hustle_system()
+    if not script:
+        logger.log_err("Failed to initialize or retrieve HustleSystem.")
+    return script
@@ -0,0 +1,30 @@
+from django.db import models
+from evennia.objects.models import ObjectDB
+
+
+class HustleAttempt(models.Model):
+    """
+    A character's hustle for one hustle week. There is at most one per
+    character and week, so whether a character has hustled this week is an
+    indexed lookup, and past weeks stay on record.
+    """
+    character = models.ForeignKey(ObjectDB, on_delete=models.CASCADE, related_name='hustle_attempts')
+    week = models.PositiveIntegerField()
+    role = models.CharField(max_length=50)
+    hustle = models.CharField(max_length=100)
+    difficulty = models.PositiveSmallIntegerField()
+    roll = models.PositiveSmallIntegerField()
+    total = models.PositiveSmallIntegerField()
+    success = models.BooleanField()
+    payout = models.PositiveIntegerField(default=0)
+    automatic = models.BooleanField(default=False)
+    created_at = models.DateTimeField(auto_now_add=True)
+
+    class Meta:
+        unique_together = ('character', 'week')
+        indexes = [
+            models.Index(fields=['week', 'success'], name='hustle_week_idx'),
+        ]
+
+    def __str__(self):
+        return f"{self.character_id} week {self.week}: {self.hustle}"
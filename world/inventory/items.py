@@ -0,0 +1,425 @@
+"""
+Inventory items.
+
+Each item a character owns is an ItemInstance row pointing at its catalogue
+template (Weapon, Armor, Gear or Ammunition). Gear and ammunition stack:
+adding more of something already carried raises the quantity of the
+existing stack. Weapons and armor don't, since each copy has its own state
+(loaded rounds, mods, equipped slot).
+
+get_inventory() resolves a character's inventory, usually without touching
+the database. get_loadout() fetches everything an inventory holds, templates included,
+in one query; showing an inventory, equipping and reloading are each a
+fixed handful of queries however much is carried.
+"""
+
+from django.db import transaction
+from django.db.models import F, OuterRef, Q, Subquery
+from world.cyberpunk_sheets.models import CharacterSheet
+from world.inventory.models import Ammunition, Armor, Gear, Inventory, ItemInstance, Weapon
+
+TEMPLATE_KINDS = {Weapon: "weapon", Armor: "armor", Gear: "gear", Ammunition: "ammunition"}
+STACKABLE = ("gear", "ammunition")
+# Slot an item of each kind is equipped in
+SLOTS = {"weapon": "weapon", "armor": "armor"}
+
+
+def kind_of(template):
+    """Get the item kind ("weapon", "armor", ...) of a catalogue row."""
+    return TEMPLATE_KINDS[type(template)]
+
+
+class Loadout:
+    """Everything in an inventory, grouped by kind."""
+
+    def __init__(self, items):
+        self.items = items
+        self.weapons = [item for item in items if item.weapon_id]
+        self.armor = [item for item in items if item.armor_id]
+        self.gear = [item for item in items if item.gear_id]
+        self.ammunition = [item for item in items if item.ammunition_id]
+        self.equipped = {item.slot: item for item in items if item.slot}
+
+    def __iter__(self):
+        return iter(self.items)
+
+
+def get_inventory(character, create=True):
+    """
+    Resolve a character's inventory.
+
+    The inventory id is cached on character.ndb and Inventory rows stay in
+    the idmapper cache, so once resolved this costs no queries; resolving
+    costs one. An inventory only linked through the character's sheet gets
+    its character_object link filled in on the way.
+
+    Args:
+        character (Object): The character.
+        create (bool): Create an inventory if the character has none.
+
+    Returns:
+        Inventory or None: None only if create is False and there is none.
+    """
+    inventory_id = character.ndb.inventory_id
+    if inventory_id:
+        inventory = Inventory.get_cached_instance(inventory_id) or \
+            Inventory.objects.filter(id=inventory_id).first()
+        if inventory is not None:
+            return inventory
+
+    inventory = Inventory.objects.filter(
+        Q(character_object_id=character.id) | Q(character__character_id=character.id)
+    ).order_by(F("character_object_id").asc(nulls_last=True)).first()
+
+    if inventory is None:
+        if not create:
+            return None
+        sheet_id = CharacterSheet.objects.filter(character_id=character.id).values_list(
+            "id", flat=True
+        ).first()
+        inventory = Inventory.objects.create(character_object_id=character.id, character_id=sheet_id)
+    elif inventory.character_object_id is None:
+        inventory.character_object_id = character.id
+        inventory.save(update_fields=["character_object"])
+
+    character.ndb.inventory_id = inventory.id
+    return inventory
+
+
+def link_inventories():
+    """
+    Fill in character_object on inventories only linked through a character
+    sheet, with one UPDATE. Inventories whose character already has another
+    inventory linked directly are left alone.
+
+    Returns:
+        int: The number of inventories linked.
+    """
+    linked = Inventory.objects.filter(character_object__isnull=False).values("character_object_id")
+    sheet_character = CharacterSheet.objects.filter(id=OuterRef("character_id")).values("character_id")[:1]
+    ids = list(Inventory.objects.filter(
+        character_object__isnull=True, character__character__isnull=False
+    ).exclude(
+        character__character_id__in=linked
+    ).values_list("id", flat=True))
+    updated = Inventory.objects.filter(id__in=ids).update(character_object_id=Subquery(sheet_character))
+
+    # Drop copies the idmapper still holds from before the update
+    for inventory_id in ids:
+        cached = Inventory.get_cached_instance(inventory_id)
+        if cached:
+            Inventory.flush_cached_instance(cached)
+    return updated
+
+
+def get_loadout(inventory):
+    """
+    Get everything an inventory holds, with templates, in one query.
+
+    Returns:
+        Loadout
+    """
+    items = ItemInstance.objects.filter(inventory_id=inventory.id).select_related(
+        *ItemInstance.KINDS
+    ).order_by("id")
+    return Loadout(list(items))
+
+
+def add_item(inventory, template, quantity=1, **state):
+    """
+    Give an inventory an item, stacking it if it stacks.
+
+    Args:
+        inventory (Inventory): Where the item goes.
+        template (Weapon, Armor, Gear or Ammunition): The catalogue row.
+        quantity (int): How many.
+        **state: Per-instance fields for new copies, such as current_ammo.
+
+    Returns:
+        ItemInstance: The stack, or the last copy made.
+    """
+    kind = kind_of(template)
+    if kind in STACKABLE:
+        stack = ItemInstance.objects.filter(
+            inventory_id=inventory.id, slot="", **{kind: template}
+        ).first()
+        if stack:
+            stack.quantity += quantity
+            stack.save(update_fields=["quantity"])
+            return stack
+        return ItemInstance.objects.create(
+            inventory=inventory, quantity=quantity, **{kind: template}, **state
+        )
+
+    if kind == "weapon":
+        state.setdefault("current_ammo", template.current_ammo)
+    copies = [
+        ItemInstance(inventory=inventory, **{kind: template}, **state)
+        for _ in range(quantity)
+    ]
+    if len(copies) == 1:
+        copies[0].save()
+    else:
+        ItemInstance.objects.bulk_create(copies)
+    return copies[-1]
+
+
+def find_item(inventory, name, kind=None):
+    """
+    Find an item in an inventory by template name, equipped copies first.
+
+    Args:
+        inventory (Inventory): Where to look.
+        name (str): The item's name, case-insensitive.
+        kind (str, optional): Only look at this kind of item.
+
+    Returns:
+        ItemInstance or None
+    """
+    kinds = (kind,) if kind else ItemInstance.KINDS
+    for kind in kinds:
+        item = ItemInstance.objects.filter(
+            inventory_id=inventory.id, **{f"{kind}__name__iexact": name}
+        ).select_related(kind).order_by("-slot", "id").first()
+        if item:
+            return item
+    return None
+
+
+def has_item(inventory, name):
+    """Check whether an inventory holds a weapon, armor or gear by name."""
+    return ItemInstance.objects.filter(
+        Q(weapon__name__iexact=name) | Q(armor__name__iexact=name) | Q(gear__name__iexact=name),
+        inventory_id=inventory.id
+    ).exists()
+
+
+def remove_item(inventory, template, quantity=None):
+    """
+    Take an item out of an inventory.
+
+    Args:
+        inventory (Inventory): Where the item is.
+        template: The catalogue row.
+        quantity (int, optional): How many; all of them if not given.
+
+    Returns:
+        int: How many were removed.
+    """
+    kind = kind_of(template)
+    items = ItemInstance.objects.filter(inventory_id=inventory.id, **{kind: template})
+    if quantity is None:
+        removed = sum(items.values_list("quantity", flat=True))
+        items.delete()
+        return removed
+
+    removed = 0
+    with transaction.atomic():
+        for item in items.order_by("slot", "id"):
+            take = min(item.quantity, quantity - removed)
+            if take == item.quantity:
+                item.delete()
+            else:
+                item.quantity -= take
+                item.save(update_fields=["quantity"])
+            removed += take
+            if removed >= quantity:
+                break
+    return removed
+
+
+def clear_items(inventory, *kinds):
+    """Remove every item of the given kinds (or of every kind) from an inventory."""
+    items = ItemInstance.objects.filter(inventory_id=inventory.id)
+    if kinds:
+        matches = Q()
+        for kind in kinds:
+            matches |= Q(**{f"{kind}__isnull": False})
+        items = items.filter(matches)
+    items.delete()
+
+
+def equip(item, slot=None):
+    """
+    Equip an item, unequipping whatever was in its slot.
+
+    Returns:
+        str: The slot it was equipped in.
+    """
+    slot = slot or SLOTS.get(item.kind, item.kind)
+    with transaction.atomic():
+        ItemInstance.objects.filter(inventory_id=item.inventory_id, slot=slot).exclude(
+            id=item.id
+        ).update(slot="")
+        item.slot = slot
+        item.save(update_fields=["slot"])
+    return slot
+
+
+def unequip(inventory, slot):
+    """
+    Empty a slot.
+
+    Returns:
+        ItemInstance or None: What was unequipped.
+    """
+    item = get_equipped(inventory, slot)
+    if item:
+        item.slot = ""
+        item.save(update_fields=["slot"])
+    return item
+
+
+def get_equipped(inventory, slot):
+    """Get the item equipped in a slot, with its template, or None."""
+    if inventory is None:
+        return None
+    return ItemInstance.objects.filter(inventory_id=inventory.id, slot=slot).select_related(
+        *ItemInstance.KINDS
+    ).first()
+
+
+def find_ammo(inventory, ammo_type):
+    """Get the first stack of an ammunition type in an inventory."""
+    return ItemInstance.objects.filter(
+        inventory_id=inventory.id, ammunition__ammo_type=ammo_type
+    ).select_related("ammunition").order_by("id").first()
+
+
+def backfill_from_links():
+    """
+    Move items linked to inventories through the old Inventory M2M fields
+    into item instances, for inventories that don't already hold an
+    instance of them. The migrated links are removed in the same
+    transaction, so items sold, removed or used up since are not recreated
+    on the next start. Weapons and armor equipped through the old
+    CharacterSheet.eqweapon/eqarmor fields are then equipped in their
+    slots; see _backfill_equipped(). Safe to run more than once.
+
+    Returns:
+        int: The number of instances created.
+    """
+    throughs = {
+        "weapon": Inventory.weapons.through,
+        "armor": Inventory.armor.through,
+        "gear": Inventory.gear.through,
+        "ammunition": Inventory.ammunition.through,
+    }
+
+    with transaction.atomic():
+        links = {
+            kind: list(through.objects.values_list("id", "inventory_id", f"{kind}_id"))
+            for kind, through in throughs.items()
+        }
+        instances = []
+        if any(links.values()):
+            existing = {
+                (kind, row["inventory_id"], row[f"{kind}_id"])
+                for row in ItemInstance.objects.values("inventory_id", *(f"{kind}_id" for kind in ItemInstance.KINDS))
+                for kind in ItemInstance.KINDS if row[f"{kind}_id"]
+            }
+
+            # Shared ammunition rows carried a quantity for everyone; give each
+            # owner a stack of that size as the best available guess.
+            ammo_quantities = dict(Ammunition.objects.values_list("id", "quantity"))
+            weapon_rounds = dict(Weapon.objects.values_list("id", "current_ammo"))
+
+            for kind, rows in links.items():
+                for _, inventory_id, template_id in rows:
+                    if (kind, inventory_id, template_id) in existing:
+                        continue
+                    state = {}
+                    if kind == "ammunition":
+                        state["quantity"] = max(1, ammo_quantities.get(template_id, 1))
+                    elif kind == "weapon":
+                        state["current_ammo"] = weapon_rounds.get(template_id, 0)
+                    instances.append(ItemInstance(inventory_id=inventory_id, **{f"{kind}_id": template_id}, **state))
+
+            ItemInstance.objects.bulk_create(instances, batch_size=500)
+            for kind, through in throughs.items():
+                link_ids = [link_id for link_id, _, _ in links[kind]]
+                for start in range(0, len(link_ids), 500):
+                    through.objects.filter(id__in=link_ids[start:start + 500]).delete()
+
+        created = _backfill_equipped()
+    return len(instances) + created
+
+
+def _backfill_equipped():
+    """
+    Equip the weapon and armor set in each sheet's old eqweapon/eqarmor
+    fields in that character's weapon and armor slots, using an unequipped
+    instance of it or a new one, unless the slot is already filled. The
+    sheet fields are cleared once copied, so later unequips stick.
+
+    Returns:
+        int: The number of instances created.
+    """
+    sheets = list(CharacterSheet.objects.filter(
+        Q(eqweapon__isnull=False) | Q(eqarmor__isnull=False)
+    ).values_list("id", "character_id", "eqweapon_id", "eqarmor_id"))
+    if not sheets:
+        return 0
+
+    by_sheet = {}
+    by_object = {}
+    for inventory_id, sheet_id, object_id in Inventory.objects.filter(
+        Q(character_id__in=[sheet[0] for sheet in sheets]) | Q(character_object_id__in=[sheet[1] for sheet in sheets])
+    ).values_list("id", "character_id", "character_object_id"):
+        if sheet_id:
+            by_sheet[sheet_id] = inventory_id
+        if object_id:
+            by_object[object_id] = inventory_id
+
+    # (inventory id, slot) -> template id; sheets without an inventory are
+    # left alone until they have one
+    wanted = {}
+    copied = []
+    for sheet_id, object_id, weapon_id, armor_id in sheets:
+        inventory_id = by_sheet.get(sheet_id) or by_object.get(object_id)
+        if inventory_id is None:
+            continue
+        copied.append(sheet_id)
+        for slot, template_id in ((SLOTS["weapon"], weapon_id), (SLOTS["armor"], armor_id)):
+            if template_id:
+                wanted[(inventory_id, slot)] = template_id
+
+    inventory_ids = {inventory_id for inventory_id, _ in wanted}
+    owned = list(ItemInstance.objects.filter(inventory_id__in=inventory_ids).filter(
+        Q(weapon__isnull=False) | Q(armor__isnull=False)
+    ).order_by("id").values_list("id", "inventory_id", "weapon_id", "armor_id", "slot"))
+    filled = {(inventory_id, slot) for _, inventory_id, _, _, slot in owned if slot}
+
+    equip_ids = {SLOTS["weapon"]: [], SLOTS["armor"]: []}
+    for item_id, inventory_id, weapon_id, armor_id, slot in owned:
+        kind = "weapon" if weapon_id else "armor"
+        key = (inventory_id, SLOTS[kind])
+        if not slot and key not in filled and wanted.get(key) == (weapon_id or armor_id):
+            equip_ids[SLOTS[kind]].append(item_id)
+            filled.add(key)
+
+    weapon_rounds = dict(Weapon.objects.filter(
+        id__in=[template_id for (_, slot), template_id in wanted.items() if slot == SLOTS["weapon"]]
+    ).values_list("id", "current_ammo"))
+    instances = []
+    for (inventory_id, slot), template_id in wanted.items():
+        if (inventory_id, slot) in filled:
+            continue
+        if slot == SLOTS["weapon"]:
+            instances.append(ItemInstance(
+                inventory_id=inventory_id, weapon_id=template_id, slot=slot,
+                current_ammo=weapon_rounds.get(template_id, 0)
+            ))
+        else:
+            instances.append(ItemInstance(inventory_id=inventory_id, armor_id=template_id, slot=slot))
+
+    for slot, item_ids in equip_ids.items():
+        ItemInstance.objects.filter(id__in=item_ids).update(slot=slot)
+        # Items already in memory would otherwise still show as unequipped
+        for item_id in item_ids:
+            item = ItemInstance.get_cached_instance(item_id)
+            if item:
+                item.slot = slot
+    ItemInstance.objects.bulk_create(instances, batch_size=500)
+    CharacterSheet.objects.filter(id__in=copied).update(eqweapon=None, eqarmor=None)
+    return len(instances)
@@ -1,4 +1,4 @@
-from django.db import models
+from django.db import models, transaction
 from evennia.utils.idmapper.models import SharedMemoryModel
 from world.cyberware.models import Cyberware
 from django.db.models import JSONField  # If using PostgreSQL
@@ -136,21 +136,11 @@ class Weapon(Item):
     concealable = models.BooleanField(default=False)
     category = models.CharField(max_length=50, default='handgun')
     ammo_type = models.CharField(max_length=20, choices=AmmoType.choices, default=AmmoType.BASIC)
-    current_ammo = models.PositiveIntegerField(default=0)
+    current_ammo = models.PositiveIntegerField(default=0)  # Rounds loaded in a new copy
     max_ammo = models.PositiveIntegerField(default=0)
     clip = models.PositiveIntegerField(default=0)  # New field for clip size
     range_dvs = JSONField(default=dict)  # This will store the DVs for each range bracket
 
-    def reload(self, ammunition):
-        if ammunition.ammo_type == self.ammo_type and ammunition.quantity > 0:
-            ammo_to_load = min(self.clip - self.current_ammo, ammunition.quantity)
-            self.current_ammo += ammo_to_load
-            ammunition.quantity -= ammo_to_load
-            ammunition.save()
-            self.save()
-            return ammo_to_load
-        return 0
-
     @property
     def is_ranged(self):
         return self.category in ['handgun', 'smg', 'shotgun', 'assault rifle', 'sniper rifle', 'heavy weapons']
@@ -200,6 +190,7 @@ class Inventory(SharedMemoryModel):
         null=True,
         blank=True
     )
+    # Legacy links to shared catalogue rows, kept to backfill ItemInstance
     weapons = models.ManyToManyField('Weapon', blank=True)
     armor = models.ManyToManyField('Armor', blank=True)
     gear = models.ManyToManyField('Gear', blank=True)
@@ -237,33 +228,97 @@ class Inventory(SharedMemoryModel):
     @classmethod
     def get_or_create_for_character(cls, character):
         """Get or create inventory for character"""
-        # Try direct link to character object
-        try:
-            inventory = cls.objects.get(character_object=character)
-            return inventory, False
-        except cls.DoesNotExist:
-            pass
-            
-        # Try link via character sheet
-        if hasattr(character, 'character_sheet'):
-            try:
-                inventory = cls.objects.get(character=character.character_sheet)
-                # Update with direct link for future
-                inventory.character_object = character
-                inventory.save()
-                return inventory, False
-            except cls.DoesNotExist:
-                pass
-        
-        # Create new inventory
-        inventory = cls.objects.create(character_object=character)
-        
-        # Also link to character sheet if available
-        if hasattr(character, 'character_sheet') and character.character_sheet:
-            inventory.character = character.character_sheet
-            inventory.save()
-            
-        return inventory, True
+        from world.inventory.items import get_inventory
+        created = get_inventory(character, create=False) is None
+        return get_inventory(character), created
+
+class ItemInstance(SharedMemoryModel):
+    """
+    One item (or stack of items) in an inventory. The catalogue row it was
+    made from is its template; anything that can differ between two copies
+    of the same item -- loaded ammo, mods, where it is equipped -- lives
+    here, so changing one character's gun never touches anyone else's.
+    Exactly one template field is set.
+    """
+    inventory = models.ForeignKey(Inventory, on_delete=models.CASCADE, related_name='items')
+    weapon = models.ForeignKey(Weapon, on_delete=models.CASCADE, null=True, blank=True, related_name='instances')
+    armor = models.ForeignKey(Armor, on_delete=models.CASCADE, null=True, blank=True, related_name='instances')
+    gear = models.ForeignKey(Gear, on_delete=models.CASCADE, null=True, blank=True, related_name='instances')
+    ammunition = models.ForeignKey(Ammunition, on_delete=models.CASCADE, null=True, blank=True, related_name='instances')
+    quantity = models.PositiveIntegerField(default=1)
+    current_ammo = models.PositiveIntegerField(default=0)
+    mods = JSONField(default=list, blank=True)
+    slot = models.CharField(max_length=20, blank=True, default='')
+
+    KINDS = ('weapon', 'armor', 'gear', 'ammunition')
+
+    class Meta:
+        indexes = [
+            models.Index(fields=['inventory', 'slot'], name='item_slot_idx'),
+        ]
+        constraints = [
+            models.CheckConstraint(
+                check=(
+                    models.Q(weapon__isnull=False, armor__isnull=True, gear__isnull=True, ammunition__isnull=True) |
+                    models.Q(weapon__isnull=True, armor__isnull=False, gear__isnull=True, ammunition__isnull=True) |
+                    models.Q(weapon__isnull=True, armor__isnull=True, gear__isnull=False, ammunition__isnull=True) |
+                    models.Q(weapon__isnull=True, armor__isnull=True, gear__isnull=True, ammunition__isnull=False)
+                ),
+                name='item_instance_one_template'
+            )
+        ]
+
+    def __str__(self):
+        if self.quantity > 1:
+            return f"{self.name} x{self.quantity}"
+        return self.name
+
+    @property
+    def kind(self):
+        for kind in self.KINDS:
+            if getattr(self, f"{kind}_id"):
+                return kind
+        return None
+
+    @property
+    def template(self):
+        kind = self.kind
+        return getattr(self, kind) if kind else None
+
+    @property
+    def name(self):
+        template = self.template
+        return template.name if template else "Unknown Item"
+
+    @property
+    def is_equipped(self):
+        return bool(self.slot)
+
+    def reload(self, ammo_stack):
+        """
+        Load this weapon from a stack of ammunition.
+
+        Args:
+            ammo_stack (ItemInstance): Ammunition of the weapon's ammo type.
+
+        Returns:
+            int: Rounds loaded.
+        """
+        weapon = self.weapon
+        if not weapon or not ammo_stack.ammunition or ammo_stack.ammunition.ammo_type != weapon.ammo_type:
+            return 0
+        ammo_to_load = min(weapon.clip - self.current_ammo, ammo_stack.quantity)
+        if ammo_to_load <= 0:
+            return 0
+        self.current_ammo += ammo_to_load
+        ammo_stack.quantity -= ammo_to_load
+        with transaction.atomic():
+            if ammo_stack.quantity:
+                ammo_stack.save(update_fields=['quantity'])
+            else:
+                ammo_stack.delete()
+            self.save(update_fields=['current_ammo'])
+        return ammo_to_load
 
 class Cyberdeck(SharedMemoryModel):
     name = models.CharField(max_length=255)
@@ -0,0 +1,73 @@
+"""
+Who understands what.
+
+Each character sheet's known languages are read once into a frozenset of
+casefolded names and kept until one of its CharacterLanguage rows changes
+(see world/languages/signals.py). For masked speech, each room keeps a
+comprehension matrix of language -> ids of the occupants who understand
+it, so deciding who hears what in a multilingual scene is a set lookup per
+receiver and no queries.
+"""
+
+from world.languages.models import CharacterLanguage
+
+# character sheet id -> frozenset of casefolded language names
+_KNOWN = {}
+# room id -> (ids of the room's contents, {language: frozenset of object ids})
+_MATRICES = {}
+
+
+def known_languages_for_sheet(sheet_id):
+    """Get the casefolded names of the languages a character sheet knows."""
+    if sheet_id is None:
+        return frozenset()
+    known = _KNOWN.get(sheet_id)
+    if known is None:
+        known = frozenset(
+            name.casefold() for name in CharacterLanguage.objects.filter(
+                character_sheet_id=sheet_id
+            ).values_list("language__name", flat=True)
+        )
+        _KNOWN[sheet_id] = known
+    return known
+
+
+def known_languages(character):
+    """Get the casefolded names of the languages a character knows."""
+    return known_languages_for_sheet(character.attributes.get("character_sheet_id"))
+
+
+def knows_language(character, language_name):
+    return language_name.casefold() in known_languages(character)
+
+
+def forget_sheet(sheet_id):
+    """Drop a sheet's cached languages and every matrix built from them."""
+    _KNOWN.pop(sheet_id, None)
+    _MATRICES.clear()
+
+
+def comprehension_matrix(room, languages):
+    """
+    Get, for each of `languages`, the ids of the objects in a room that
+    understand it. Rows are cached per room until its contents change or
+    any character's languages change.
+
+    Returns:
+        dict: {casefolded language: frozenset of object ids}
+    """
+    contents = room.contents
+    signature = tuple(obj.id for obj in contents)
+    cached = _MATRICES.get(room.id)
+    if not cached or cached[0] != signature:
+        cached = (signature, {})
+        _MATRICES[room.id] = cached
+    matrix = cached[1]
+
+    for language in languages:
+        language = language.casefold()
+        if language not in matrix:
+            matrix[language] = frozenset(
+                obj.id for obj in contents if language in known_languages(obj)
+            )
+    return {language.casefold(): matrix[language.casefold()] for language in languages}
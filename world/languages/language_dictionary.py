@@ -1,51 +1,209 @@
-from .models import Language
-
-LANGUAGES = [
-    Language(name="English", local=True, corporate=True),
-    Language(name="Streetslang", local=True, corporate=False),
-    Language(name="Spanish", local=True, corporate=False),
-    Language(name="Japanese", local=True, corporate=True),
-    Language(name="Mandarin", local=True, corporate=True),
-    Language(name="Italian", local=True, corporate=False),
-    Language(name="Russian", local=True, corporate=True),
-    Language(name="Amharic", local=False, corporate=True),
-    Language(name="Hindi", local=True, corporate=True),
-    Language(name="Cantonese", local=True, corporate=True),
-    Language(name="Vietnamese", local=True, corporate=False),
-    Language(name="Thai", local=True, corporate=False),
-    Language(name="Arabic", local=True, corporate=False),
-    Language(name="German", local=True, corporate=False),
-    Language(name="Turkish", local=True, corporate=False),
-    Language(name="French", local=True, corporate=False),
-    Language(name="Farsi", local=True, corporate=False),
-    Language(name="Portuguese", local=True, corporate=False),
-    Language(name="Hausa", local=True, corporate=True),
-    Language(name="Swahili", local=False, corporate=True),
-    Language(name="Navajo", local=True, corporate=False),
-    Language(name="Korean", local=True, corporate=True),
-    Language(name="Hebrew", local=False, corporate=True),
-    Language(name="Tagalog", local=False, corporate=False),
-    Language(name="Punjabi", local=False, corporate=False),
-    Language(name="Malay", local=True, corporate=False),
-    Language(name="Bengali", local=True, corporate=False),
-    Language(name="Pashto", local=True, corporate=False),
-    Language(name="Ukrainian", local=False, corporate=False),
-    Language(name="Polish", local=False, corporate=False),
-    Language(name="Bengali", local=True, corporate=False),
-    Language(name="Pashto", local=True, corporate=True),
-    Language(name="Ukrainian", local=True, corporate=False),
-    Language(name="Polish", local=True, corporate=False),
-    Language(name="Greek", local=False, corporate=True),
-    Language(name="Finnish", local=False, corporate=False),
-    Language(name="Norwegian", local=False, corporate=True),
-    Language(name="Dutch", local=False, corporate=False),
-    Language(name="Tamil", local=False, corporate=False),
-    Language(name="Telugu", local=False, corporate=True),
-    Language(name="Burmese", local=True, corporate=False),
-    Language(name="Lao", local=False, corporate=False),
-    Language(name="Khmer", local=False, corporate=False),
-    Language(name="Zulu", local=False, corporate=True),
-    Language(name="Yoruba", local=True, corporate=False),
-    Language(name="Inuktitut", local=False, corporate=True),
-    Language(name="Cherokee", local=False, corporate=False)
-]
+"""
+The canonical language catalogue.
+
+LANGUAGES maps each casefolded language name to its LanguageInfo and is
+built from plain tuples, so importing it costs nothing. sync_languages()
+runs once at server start, folds together languages whose names differ
+only by case and adds any missing catalogue languages to the Language
+table in one bulk insert; get_language() then serves Language rows from
+memory. Rows saved or deleted in this process update the cache by signal,
+and a miss falls back to the database for rows added by another process.
+"""
+
+from collections import namedtuple
+from types import MappingProxyType
+from django.db import transaction
+from world.utils.startup import require
+from .models import CharacterLanguage, Language
+
+LanguageInfo = namedtuple("LanguageInfo", ["name", "local", "corporate"])
+
+LANGUAGES = MappingProxyType({info.name.casefold(): info for info in (
+    LanguageInfo("English", local=True, corporate=True),
+    LanguageInfo("Streetslang", local=True, corporate=False),
+    LanguageInfo("Spanish", local=True, corporate=False),
+    LanguageInfo("Japanese", local=True, corporate=True),
+    LanguageInfo("Mandarin", local=True, corporate=True),
+    LanguageInfo("Italian", local=True, corporate=False),
+    LanguageInfo("Russian", local=True, corporate=True),
+    LanguageInfo("Amharic", local=False, corporate=True),
+    LanguageInfo("Hindi", local=True, corporate=True),
+    LanguageInfo("Cantonese", local=True, corporate=True),
+    LanguageInfo("Vietnamese", local=True, corporate=False),
+    LanguageInfo("Thai", local=True, corporate=False),
+    LanguageInfo("Arabic", local=True, corporate=False),
+    LanguageInfo("German", local=True, corporate=False),
+    LanguageInfo("Turkish", local=True, corporate=False),
+    LanguageInfo("French", local=True, corporate=False),
+    LanguageInfo("Farsi", local=True, corporate=False),
+    LanguageInfo("Portuguese", local=True, corporate=False),
+    LanguageInfo("Hausa", local=True, corporate=True),
+    LanguageInfo("Swahili", local=False, corporate=True),
+    LanguageInfo("Navajo", local=True, corporate=False),
+    LanguageInfo("Korean", local=True, corporate=True),
+    LanguageInfo("Hebrew", local=False, corporate=True),
+    LanguageInfo("Tagalog", local=False, corporate=False),
+    LanguageInfo("Punjabi", local=False, corporate=False),
+    LanguageInfo("Malay", local=True, corporate=False),
+    LanguageInfo("Bengali", local=True, corporate=False),
+    LanguageInfo("Pashto", local=True, corporate=False),
+    LanguageInfo("Ukrainian", local=False, corporate=False),
+    LanguageInfo("Polish", local=False, corporate=False),
+    LanguageInfo("Greek", local=False, corporate=True),
+    LanguageInfo("Finnish", local=False, corporate=False),
+    LanguageInfo("Norwegian", local=False, corporate=True),
+    LanguageInfo("Dutch", local=False, corporate=False),
+    LanguageInfo("Tamil", local=False, corporate=False),
+    LanguageInfo("Telugu", local=False, corporate=True),
+    LanguageInfo("Burmese", local=True, corporate=False),
+    LanguageInfo("Lao", local=False, corporate=False),
+    LanguageInfo("Khmer", local=False, corporate=False),
+    LanguageInfo("Zulu", local=False, corporate=True),
+    LanguageInfo("Yoruba", local=True, corporate=False),
+    LanguageInfo("Inuktitut", local=False, corporate=True),
+    LanguageInfo("Cherokee", local=False, corporate=False),
+)})
+
+# casefolded name -> Language row
+_ROWS = {}
+
+
+def get_language_info(name):
+    """Get the catalogue entry for a language name, case-insensitively."""
+    return LANGUAGES.get(name.strip().casefold())
+
+
+def _load_rows():
+    _ROWS.clear()
+    _ROWS.update((language.name.casefold(), language) for language in Language.objects.all())
+
+
+def cache_language(language):
+    """Bring the cached row for a saved Language up to date."""
+    if _ROWS:
+        forget_language(language.id)
+        _ROWS[language.name.casefold()] = language
+
+
+def forget_language(language_id):
+    """Drop a Language from the cache, under whatever name it was cached."""
+    for key, language in list(_ROWS.items()):
+        if language.id == language_id:
+            del _ROWS[key]
+
+
+def merge_duplicate_languages():
+    """
+    Fold languages whose names differ only by case into one row: the one
+    spelled as in the catalogue, or else the oldest. Characters who know
+    several spellings keep one CharacterLanguage at the highest level.
+    This has to run before the case-insensitive unique constraint on
+    Language.name can be added to an existing database.
+
+    Returns:
+        int: Number of Language rows removed.
+    """
+    groups = {}
+    for language in Language.objects.order_by('id'):
+        groups.setdefault(language.name.casefold(), []).append(language)
+
+    removed = 0
+    with transaction.atomic():
+        for key, languages in groups.items():
+            if len(languages) < 2:
+                continue
+            info = LANGUAGES.get(key)
+            keeper = next((language for language in languages if info and language.name == info.name), languages[0])
+            duplicate_ids = [language.id for language in languages if language is not keeper]
+
+            sheets, characters, stale, moved = set(), set(), [], []
+            rows = CharacterLanguage.objects.filter(
+                language_id__in=[keeper.id] + duplicate_ids
+            ).order_by('-level', 'id')
+            for row in rows:
+                if row.character_sheet_id in sheets or row.character_id in characters:
+                    stale.append(row.id)
+                    continue
+                if row.character_sheet_id is not None:
+                    sheets.add(row.character_sheet_id)
+                if row.character_id is not None:
+                    characters.add(row.character_id)
+                if row.language_id != keeper.id:
+                    row.language_id = keeper.id
+                    moved.append(row)
+
+            CharacterLanguage.objects.filter(id__in=stale).delete()
+            CharacterLanguage.objects.bulk_update(moved, ['language'])
+            Language.objects.filter(id__in=duplicate_ids).delete()
+            removed += len(duplicate_ids)
+    return removed
+
+
+def sync_languages(update_flags=False, prune=False):
+    """
+    Add every catalogue language missing from the Language table.
+
+    Args:
+        update_flags (bool): Also reset the local/corporate flags of
+            existing rows to the catalogue's.
+        prune (bool): Also delete languages that are not in the catalogue.
+
+    Returns:
+        tuple: (added, updated, removed)
+    """
+    with transaction.atomic():
+        merge_duplicate_languages()
+        existing = {language.name.casefold(): language for language in Language.objects.all()}
+        Language.objects.bulk_create(
+            [Language(name=info.name, local=info.local, corporate=info.corporate)
+             for key, info in LANGUAGES.items() if key not in existing],
+            ignore_conflicts=True
+        )
+        added = len(LANGUAGES.keys() - existing.keys())
+
+        updated = 0
+        if update_flags:
+            changed = []
+            for key, language in existing.items():
+                info = LANGUAGES.get(key)
+                if info and (language.local, language.corporate) != (info.local, info.corporate):
+                    language.local, language.corporate = info.local, info.corporate
+                    changed.append(language)
+            updated = Language.objects.bulk_update(changed, ["local", "corporate"])
+
+        removed = 0
+        if prune:
+            stale = [language.id for key, language in existing.items() if key not in LANGUAGES]
+            removed = Language.objects.filter(id__in=stale).delete()[0]
+
+    _load_rows()
+    return added, updated, removed
+
+
+def get_language(name, create=True):
+    """
+    Get the Language row for a name, case-insensitively. Languages outside
+    the catalogue are created on first use unless `create` is False.
+    """
+    require("languages")
+    key = name.strip().casefold()
+    if not _ROWS:
+        _load_rows()
+    language = _ROWS.get(key)
+    if language is None and not create:
+        # Added since the cache was loaded, possibly by another process
+        language = Language.objects.filter(name__iexact=name.strip()).first()
+        if language:
+            _ROWS[key] = language
+    elif language is None:
+        info = LANGUAGES.get(key)
+        language, _ = Language.objects.get_or_create(
+            name__iexact=name.strip(),
+            defaults={
+                'name': info.name if info else name.strip(),
+                'local': info.local if info else False,
+                'corporate': info.corporate if info else False
+            }
+        )
+        _ROWS[key] = language
+    return language
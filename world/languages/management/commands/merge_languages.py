@@ -0,0 +1,10 @@
+from django.core.management.base import BaseCommand
+from world.languages.language_dictionary import merge_duplicate_languages
+
+
+class Command(BaseCommand):
+    help = "Fold languages whose names differ only by case into one row."
+
+    def handle(self, *args, **options):
+        removed = merge_duplicate_languages()
+        self.stdout.write(f"Removed {removed} duplicate language(s).")
@@ -1,4 +1,5 @@
 from django.db import models
+from django.db.models.functions import Lower
 from django.apps import apps
 from evennia.utils.idmapper.models import SharedMemoryModel
 from evennia.objects.models import ObjectDB
@@ -8,6 +9,13 @@ class Language(models.Model):
     local = models.BooleanField(default=False)
     corporate = models.BooleanField(default=False)
 
+    class Meta:
+        # Existing databases may hold names that differ only by case; run
+        # `evennia merge_languages` before migrating this constraint in.
+        constraints = [
+            models.UniqueConstraint(Lower('name'), name='language_name_ci_unique')
+        ]
+
     def __str__(self):
         return self.name
 
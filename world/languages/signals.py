@@ -1,5 +1,23 @@
-from django.db.models.signals import post_save
+from django.db.models.signals import post_delete, post_save
 from django.dispatch import receiver
 from evennia.objects.models import ObjectDB
 from .models import Language, CharacterLanguage
+from .comprehension import forget_sheet
+from .language_dictionary import cache_language, forget_language
 
+
+@receiver(post_save, sender=CharacterLanguage)
+@receiver(post_delete, sender=CharacterLanguage)
+def character_language_changed(sender, instance, **kwargs):
+    if instance.character_sheet_id is not None:
+        forget_sheet(instance.character_sheet_id)
+
+
+@receiver(post_save, sender=Language)
+def language_saved(sender, instance, **kwargs):
+    cache_language(instance)
+
+
+@receiver(post_delete, sender=Language)
+def language_deleted(sender, instance, **kwargs):
+    forget_language(instance.id)
@@ -0,0 +1,120 @@
+from django.db import models, transaction
+from evennia.objects.models import ObjectDB
+from world.cyberpunk_sheets.services import CharacterMoneyService
+
+
+class MissionQuerySet(models.QuerySet):
+    def available(self):
+        return self.filter(status=Mission.AVAILABLE)
+
+    def active(self):
+        """Missions a deadline can still expire."""
+        return self.filter(status__in=Mission.ACTIVE)
+
+    def for_reputation(self, rep):
+        return self.filter(reputation_requirement__lte=rep)
+
+    def with_players(self):
+        return self.annotate(players=models.Count('assigned_to'))
+
+
+class Mission(models.Model):
+    """
+    A mission on the mission board. Deadlines are in game time; missions
+    still open when theirs passes are expired by the board's scheduler.
+    """
+    AVAILABLE = 'available'
+    IN_PROGRESS = 'in_progress'
+    COMPLETED = 'completed'
+    FAILED = 'failed'
+    EXPIRED = 'expired'
+    STATUS_CHOICES = [
+        (AVAILABLE, 'Available'),
+        (IN_PROGRESS, 'In progress'),
+        (COMPLETED, 'Completed'),
+        (FAILED, 'Failed'),
+        (EXPIRED, 'Expired'),
+    ]
+    ACTIVE = (AVAILABLE, IN_PROGRESS)
+
+    title = models.CharField(max_length=255)
+    description = models.TextField(blank=True)
+    difficulty = models.PositiveSmallIntegerField(default=1)
+    reward = models.PositiveIntegerField(default=0)
+    giver = models.ForeignKey(ObjectDB, on_delete=models.SET_NULL, null=True, blank=True, related_name='missions_given')
+    assigned_to = models.ManyToManyField(ObjectDB, blank=True, related_name='missions')
+    max_players = models.PositiveSmallIntegerField(default=1)
+    status = models.CharField(max_length=20, choices=STATUS_CHOICES, default=AVAILABLE)
+    deadline = models.DateTimeField(null=True, blank=True)
+    reputation_requirement = models.PositiveSmallIntegerField(default=0)
+    created_at = models.DateTimeField(auto_now_add=True)
+
+    objects = MissionQuerySet.as_manager()
+
+    class Meta:
+        indexes = [
+            models.Index(fields=['status', 'reputation_requirement', 'deadline'], name='mission_board_idx'),
+            models.Index(fields=['status', 'deadline'], name='mission_deadline_idx'),
+        ]
+
+    def __str__(self):
+        return self.title
+
+    def assign_to(self, character):
+        """
+        Assign the mission to a character.
+        """
+        with transaction.atomic():
+            assigned = self.assigned_to.count()
+            if assigned >= self.max_players:
+                character.msg("This mission is already full.")
+                return False
+            self.assigned_to.add(character)
+            if assigned + 1 == self.max_players:
+                self.status = self.IN_PROGRESS
+                self.save(update_fields=['status'])
+        character.msg(f"You have accepted the mission: {self.title}")
+        return True
+
+    def complete_mission(self):
+        """
+        Mark the mission as completed and give rewards.
+        """
+        self.status = self.COMPLETED
+        self.save(update_fields=['status'])
+        for character in self.assigned_to.all():
+            character.msg(f"You have completed the mission: {self.title}")
+
+            # Add money and reputation
+            CharacterMoneyService.add_money(character, self.reward)
+            self.add_character_reputation(character, self.difficulty * 10)
+
+    def add_character_reputation(self, character, rep_amount):
+        """Add reputation to a character, checking typeclass first then falling back to character sheet"""
+        if hasattr(character, 'db'):
+            # Add reputation points
+            character.db.reputation_points = (character.db.reputation_points or 0) + rep_amount
+
+            # Update rep level (every 100 points = 1 level, max 10)
+            new_rep = min(character.db.reputation_points // 100, 10)
+            if new_rep != character.db.rep:
+                character.db.rep = new_rep
+                character.msg(f"Your reputation has increased to {new_rep}!")
+
+            # Also update character sheet if it exists (for backwards compatibility)
+            if hasattr(character, 'character_sheet') and character.character_sheet:
+                character.character_sheet.reputation_points = character.db.reputation_points
+                character.character_sheet.rep = character.db.rep
+                character.character_sheet.save()
+        # Fall back to character sheet if db attributes not found
+        elif hasattr(character, 'character_sheet') and character.character_sheet:
+            character.character_sheet.add_reputation(rep_amount)
+
+    def fail_mission(self):
+        """
+        Mark the mission as failed.
+        """
+        self.status = self.FAILED
+        self.save(update_fields=['status'])
+        for character in self.assigned_to.all():
+            character.msg(f"You have failed the mission: {self.title}")
@@ -1,99 +1,179 @@
+"""
+Missions.
+
+Missions are rows in the Mission table (world.mission_board), so the board
+is a query: a character's available missions are one indexed query on
+status and reputation requirement, ordered by deadline.
+
+Deadlines are expired by a single scheduler instead of an hourly script per
+mission: a reactor call is set for the earliest open deadline and, when it
+fires, every mission that is due is closed and the next call is set. The
+MissionBoard script also sweeps hourly in case a call was lost to a reload.
+"""
+
+from datetime import datetime, timezone
+from django.db import transaction
+from django.db.models import F
 from evennia import DefaultScript
 from evennia.utils import gametime, create
 from evennia.scripts.models import ScriptDB
+from evennia.typeclasses.attributes import Attribute
 from evennia.utils import logger
-from world.cyberpunk_sheets.services import CharacterMoneyService
-import random
+from world.mission_board.models import Mission as MissionModel
 
-class Mission(DefaultScript):
+EXPIRY_SWEEP = 3600  # seconds between the board's safety sweeps
+LEGACY_MISSION_TYPECLASS = "world.missions.Mission"
+EVENT_TYPECLASS = "world.events.Event"
+LEGACY_ATTRIBUTES = (
+    "title", "description", "difficulty", "reward", "giver", "assigned_to",
+    "max_players", "status", "deadline", "reputation_requirement"
+)
+
+# The pending reactor call for the next deadline, if any
+_EXPIRY_CALL = None
+
+
+def game_now():
+    """Get the current game time as a datetime."""
+    return game_datetime(gametime.gametime(absolute=True))
+
+
+def game_datetime(seconds):
+    """Convert absolute game time in seconds to a datetime."""
+    return datetime.fromtimestamp(seconds, timezone.utc)
+
+
+def expire_missions(now=None):
     """
-    This script represents a mission in the game.
+    Close every open mission whose deadline has passed: missions in
+    progress fail, missions nobody took expire.
+
+    Returns:
+        int: The number of missions closed.
     """
-    def at_script_creation(self):
-        self.key = "Mission"
-        self.desc = "A mission script"
-        self.interval = 3600  # Check mission status every hour
-        self.persistent = True
+    now = now or game_now()
+    due = list(MissionModel.objects.active().filter(deadline__lte=now))
+    for mission in due:
+        if mission.status == MissionModel.IN_PROGRESS:
+            mission.fail_mission()
+    expired = [mission.id for mission in due if mission.status == MissionModel.AVAILABLE]
+    if expired:
+        MissionModel.objects.filter(id__in=expired).update(status=MissionModel.EXPIRED)
+    if due:
+        logger.log_info(f"Missions: closed {len(due)} missions past their deadline.")
+    return len(due)
 
-        # Mission properties
-        self.db.title = ""
-        self.db.description = ""
-        self.db.difficulty = 1
-        self.db.reward = 0
-        self.db.giver = None
-        self.db.assigned_to = []
-        self.db.max_players = 1
-        self.db.status = "available"  # available, in_progress, completed, failed
-        self.db.deadline = None
-        self.db.reputation_requirement = 0
-        self.db.associated_event = None
 
-    def at_repeat(self):
-        """
-        Called every self.interval seconds.
-        """
-        if self.db.status == "in_progress" and self.db.deadline:
-            if gametime.gametime(absolute=True) > self.db.deadline:
-                self.fail_mission()
+def schedule_expiry():
+    """
+    (Re)set the reactor call for the earliest open deadline.
 
-    def assign_to(self, character):
-        """
-        Assign the mission to a character.
-        """
-        if len(self.db.assigned_to) < self.db.max_players:
-            self.db.assigned_to.append(character)
-            if len(self.db.assigned_to) == self.db.max_players:
-                self.db.status = "in_progress"
-            character.msg(f"You have accepted the mission: {self.db.title}")
-        else:
-            character.msg("This mission is already full.")
+    Returns:
+        datetime or None: The deadline the call is set for.
+    """
+    global _EXPIRY_CALL
+    from twisted.internet import reactor
+
+    if _EXPIRY_CALL is not None and _EXPIRY_CALL.active():
+        _EXPIRY_CALL.cancel()
+    _EXPIRY_CALL = None
+
+    deadline = MissionModel.objects.active().filter(deadline__isnull=False).order_by(
+        "deadline"
+    ).values_list("deadline", flat=True).first()
+    if deadline is None:
+        return None
+    delay = max(0, (deadline - game_now()).total_seconds() / gametime.TIMEFACTOR)
+    _EXPIRY_CALL = reactor.callLater(delay, _run_expiry)
+    return deadline
+
+
+def _run_expiry():
+    global _EXPIRY_CALL
+    _EXPIRY_CALL = None
+    try:
+        expire_missions()
+    except Exception as e:
+        logger.log_trace(f"Error expiring missions: {e}")
+    schedule_expiry()
+
+
+def migrate_mission_scripts():
+    """
+    Move missions kept as one Mission script each (listed in the board's
+    db.missions) into the Mission table, repoint the events that referred
+    to those scripts at the new rows, then delete the scripts.
+
+    Returns:
+        int: The number of missions moved.
+    """
+    scripts = list(ScriptDB.objects.filter(db_typeclass_path=LEGACY_MISSION_TYPECLASS))
+    if not scripts:
+        return 0
+
+    values = {script.id: {} for script in scripts}
+    attributes = Attribute.objects.filter(
+        scriptdb__id__in=values, db_key__in=LEGACY_ATTRIBUTES, db_category__isnull=True
+    ).annotate(owner_id=F("scriptdb__id"))
+    for attribute in attributes:
+        values[attribute.owner_id][attribute.db_key] = attribute.value
+
+    statuses = dict(MissionModel.STATUS_CHOICES)
+    # legacy script id -> Mission id
+    mission_ids = {}
+    with transaction.atomic():
+        for script in scripts:
+            attrs = values[script.id]
+            deadline = attrs.get("deadline")
+            giver = attrs.get("giver")
+            status = attrs.get("status")
+            mission = MissionModel.objects.create(
+                title=attrs.get("title") or script.db_key,
+                description=attrs.get("description") or "",
+                difficulty=attrs.get("difficulty") or 1,
+                reward=attrs.get("reward") or 0,
+                giver_id=getattr(giver, "id", None),
+                max_players=attrs.get("max_players") or 1,
+                status=status if status in statuses else MissionModel.AVAILABLE,
+                deadline=game_datetime(deadline) if isinstance(deadline, (int, float)) else deadline,
+                reputation_requirement=attrs.get("reputation_requirement") or 0
+            )
+            assigned = [obj for obj in attrs.get("assigned_to") or [] if getattr(obj, "id", None)]
+            if assigned:
+                mission.assigned_to.add(*assigned)
+            mission_ids[script.id] = mission.id
+
+        # Events pointed at the scripts themselves; point them at the rows
+        # while the scripts still exist to be resolved
+        references = Attribute.objects.filter(
+            scriptdb__db_typeclass_path=EVENT_TYPECLASS, db_key="associated_mission", db_category__isnull=True
+        ).annotate(owner_id=F("scriptdb__id"))
+        for reference in references:
+            event = ScriptDB.objects.get(id=reference.owner_id)
+            mission_id = mission_ids.get(getattr(reference.value, "id", None))
+            if mission_id:
+                event.attributes.add("associated_mission_id", mission_id)
+            event.attributes.remove("associated_mission")
+
+        for script in scripts:
+            script.delete()
+
+        for board in ScriptDB.objects.filter(db_key="MissionBoard"):
+            board.attributes.remove("missions")
+
+    schedule_expiry()
+    return len(scripts)
+
+
+class Mission(DefaultScript):
+    """
+    The old one-script-per-mission storage. Kept only so existing scripts
+    still load until migrate_mission_scripts() moves them into the Mission
+    table; missions are MissionModel rows now.
+    """
+    def at_repeat(self):
+        pass
 
-    def complete_mission(self):
-        """
-        Mark the mission as completed and give rewards.
-        """
-        self.db.status = "completed"
-        for character in self.db.assigned_to:
-            character.msg(f"You have completed the mission: {self.db.title}")
-            
-            # Add money and reputation
-            CharacterMoneyService.add_money(character, self.db.reward)
-            self.add_character_reputation(character, self.db.difficulty * 10)
-
-    def add_character_reputation(self, character, rep_amount):
-        """Add reputation to a character, checking typeclass first then falling back to character sheet"""
-        if hasattr(character, 'db'):
-            # Check if reputation attributes exist, create if they don't
-            if not hasattr(character.db, 'reputation_points'):
-                character.db.reputation_points = 0
-            if not hasattr(character.db, 'rep'):
-                character.db.rep = 0
-                
-            # Add reputation points
-            character.db.reputation_points += rep_amount
-            
-            # Update rep level (every 100 points = 1 level, max 10)
-            new_rep = min(character.db.reputation_points // 100, 10)
-            if new_rep != character.db.rep:
-                character.db.rep = new_rep
-                character.msg(f"Your reputation has increased to {new_rep}!")
-                
-            # Also update character sheet if it exists (for backwards compatibility)
-            if hasattr(character, 'character_sheet') and character.character_sheet:
-                character.character_sheet.reputation_points = character.db.reputation_points
-                character.character_sheet.rep = character.db.rep
-                character.character_sheet.save()
-        # Fall back to character sheet if db attributes not found
-        elif hasattr(character, 'character_sheet') and character.character_sheet:
-            character.character_sheet.add_reputation(rep_amount)
-
-    def fail_mission(self):
-        """
-        Mark the mission as failed.
-        """
-        self.db.status = "failed"
-        for character in self.db.assigned_to:
-            character.msg(f"You have failed the mission: {self.db.title}")
 
 class MissionBoard(DefaultScript):
     """
@@ -102,39 +182,64 @@ class MissionBoard(DefaultScript):
     def at_script_creation(self):
         self.key = "MissionBoard"
         self.desc = "Manages all missions"
+        self.interval = EXPIRY_SWEEP
         self.persistent = True
-        self.db.missions = []
+
+    def at_start(self):
+        schedule_expiry()
+
+    def at_repeat(self):
+        if expire_missions():
+            schedule_expiry()
 
     def create_mission(self, title, description, difficulty, reward, max_players, deadline, reputation_requirement, giver):
         """
         Create a new mission with given properties.
+
+        Args:
+            deadline (datetime or float): When the mission must be done by,
+                as a datetime or absolute game time in seconds.
         """
-        mission = Mission()
-        mission.db.title = title
-        mission.db.description = description
-        mission.db.difficulty = difficulty
-        mission.db.reward = reward
-        mission.db.max_players = max_players
-        mission.db.deadline = deadline
-        mission.db.reputation_requirement = reputation_requirement
-        mission.db.giver = giver
-        self.db.missions.append(mission)
+        if isinstance(deadline, (int, float)):
+            deadline = game_datetime(deadline)
+        mission = MissionModel.objects.create(
+            title=title,
+            description=description,
+            difficulty=difficulty,
+            reward=reward,
+            max_players=max_players,
+            deadline=deadline,
+            reputation_requirement=reputation_requirement,
+            giver_id=getattr(giver, "id", None)
+        )
+        schedule_expiry()
         return mission
 
     def get_available_missions(self, character):
         """
-        Get all available missions for a character based on their reputation.
+        Get all available missions for a character based on their reputation,
+        soonest deadline first, with the number of players on each.
         """
         reputation = self.get_character_reputation(character)
-        return [m for m in self.db.missions if m.db.status == "available" and m.db.reputation_requirement <= reputation]
+        return MissionModel.objects.available().for_reputation(reputation).with_players().order_by(
+            F("deadline").asc(nulls_last=True), "id"
+        )
+
+    def get_character_missions(self, character):
+        """Get the missions a character has accepted, soonest deadline first."""
+        assigned = MissionModel.assigned_to.through.objects.filter(objectdb_id=character.id)
+        return MissionModel.objects.filter(id__in=assigned.values("mission_id")).with_players().order_by(
+            F("deadline").asc(nulls_last=True), "id"
+        )
 
     def get_character_reputation(self, character):
         """Get a character's reputation, checking typeclass first then character sheet"""
         # Check typeclass DB attributes
-        if hasattr(character, 'db') and hasattr(character.db, 'rep'):
-            return character.db.rep
+        rep = character.db.rep if hasattr(character, 'db') else None
+        if rep is not None:
+            return rep
         # Fall back to character sheet
-        elif hasattr(character, 'character_sheet') and character.character_sheet:
+        if hasattr(character, 'character_sheet') and character.character_sheet:
             return character.character_sheet.rep
         # Default value
         return 0
@@ -143,7 +248,7 @@ class MissionBoard(DefaultScript):
         """
         Get a mission by its ID.
         """
-        return next((m for m in self.db.missions if m.id == mission_id), None)
+        return MissionModel.objects.filter(id=mission_id).first()
 
 # Function to initialize the mission system
 def init_mission_system():
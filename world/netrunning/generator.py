@@ -0,0 +1,287 @@
+# world/netrunning/generator.py
+
+"""
+Procedural NET Architecture generator, following the Cyberpunk Red rules
+for shaping an architecture and filling its floors.
+
+This module is pure: generate_architecture() only rolls on the
+random.Random it is handed and returns plain data, so the same seed always
+produces the same architecture and nothing touches the database. Saving
+the result is done by world.netrunning.pool.save_architecture().
+"""
+
+import random
+import time
+
+DIFFICULTIES = ("basic", "standard", "uncommon", "advanced")
+
+DIFFICULTY_VALUES = {
+    "basic": 6,
+    "standard": 8,
+    "uncommon": 10,
+    "advanced": 12
+}
+
+# NetArchitecture.difficulty is stored as an integer
+DIFFICULTY_LEVELS = {
+    "basic": 1,
+    "standard": 2,
+    "uncommon": 3,
+    "advanced": 4
+}
+
+ICE_STRENGTH_RANGES = {
+    "basic": (3, 6),
+    "standard": (4, 7),
+    "uncommon": (5, 8),
+    "advanced": (6, 10)
+}
+
+# 1d6 table for the first two floors, indexed by roll - 1
+LOBBY_TABLE = (
+    {"type": "File", "dv": 6, "description": "Generic data file (DV6)"},
+    {"type": "Password", "dv": 6, "description": "Basic security password (DV6)"},
+    {"type": "Password", "dv": 8, "description": "Enhanced security password (DV8)"},
+    {"type": "BlackICE", "name": "Skunk", "description": "Anti-personnel program that does 3d6 damage directly to a Netrunner's brain"},
+    {"type": "BlackICE", "name": "Wisp", "description": "Tracer program that follows the datastream back to a runner's location"},
+    {"type": "BlackICE", "name": "Killer", "description": "Dangerous program that does 3d6 damage to a Netrunner's Cyberdeck"},
+)
+
+# 3d6 tables for floors 3 and deeper, indexed by roll - 3
+FLOOR_TABLES = {
+    "basic": (
+        {"type": "BlackICE", "name": "Hellhound", "description": "Vicious Black ICE that attacks for 4d6 damage"},
+        {"type": "BlackICE", "name": "Sabertooth", "description": "Dangerous Black ICE that does 4d6 damage and reduces REZ by 1d6"},
+        {"type": "BlackICE", "name": "Raven", "count": 2, "description": "Two Raven programs that work together, each dealing 2d6 damage"},
+        {"type": "BlackICE", "name": "Hellhound", "description": "Vicious Black ICE that attacks for 4d6 damage"},
+        {"type": "BlackICE", "name": "Wisp", "description": "Tracer program that follows the datastream back to a runner's location"},
+        {"type": "BlackICE", "name": "Raven", "description": "Black ICE that does 2d6 damage to a Netrunner's Cyberdeck"},
+        {"type": "Password", "dv": 6, "description": "Basic security password (DV6)"},
+        {"type": "File", "dv": 6, "description": "Important data file (DV6)"},
+        {"type": "Control Node", "dv": 6, "description": "System control node (DV6)"},
+        {"type": "Password", "dv": 6, "description": "Basic security password (DV6)"},
+        {"type": "BlackICE", "name": "Skunk", "description": "Anti-personnel program that does 3d6 damage directly to a Netrunner's brain"},
+        {"type": "BlackICE", "name": "Asp", "description": "Deadly Black ICE that does 3d6 damage and reduces REZ by 1d6"},
+        {"type": "BlackICE", "name": "Scorpion", "description": "Powerful Black ICE that does 3d6 damage"},
+        {"type": "BlackICE", "name": "Killer", "count": 1, "additional": "Skunk", "description": "Dangerous ICE combo: Killer and Skunk working together"},
+        {"type": "BlackICE", "name": "Wisp", "count": 3, "description": "Three Wisp programs working together"},
+        {"type": "BlackICE", "name": "Liche", "description": "Extremely dangerous Black ICE that does 5d6 damage"},
+    ),
+    "standard": (
+        {"type": "BlackICE", "name": "Hellhound", "count": 2, "description": "Two vicious Hellhound programs working together"},
+        {"type": "BlackICE", "name": "Hellhound", "additional": "Killer", "description": "Dangerous ICE combo: Hellhound and Killer working together"},
+        {"type": "BlackICE", "name": "Skunk", "count": 2, "description": "Two Skunk programs working together"},
+        {"type": "BlackICE", "name": "Sabertooth", "description": "Dangerous Black ICE that does 4d6 damage and reduces REZ by 1d6"},
+        {"type": "BlackICE", "name": "Scorpion", "description": "Powerful Black ICE that does 3d6 damage"},
+        {"type": "BlackICE", "name": "Hellhound", "description": "Vicious Black ICE that attacks for 4d6 damage"},
+        {"type": "Password", "dv": 8, "description": "Enhanced security password (DV8)"},
+        {"type": "File", "dv": 8, "description": "Valuable data file (DV8)"},
+        {"type": "Control Node", "dv": 8, "description": "Important system control node (DV8)"},
+        {"type": "Password", "dv": 8, "description": "Enhanced security password (DV8)"},
+        {"type": "BlackICE", "name": "Asp", "description": "Deadly Black ICE that does 3d6 damage and reduces REZ by 1d6"},
+        {"type": "BlackICE", "name": "Killer", "description": "Dangerous program that does 3d6 damage to a Netrunner's Cyberdeck"},
+        {"type": "BlackICE", "name": "Liche", "description": "Extremely dangerous Black ICE that does 5d6 damage"},
+        {"type": "BlackICE", "name": "Asp", "description": "Deadly Black ICE that does 3d6 damage and reduces REZ by 1d6"},
+        {"type": "BlackICE", "name": "Raven", "count": 3, "description": "Three Raven programs working together"},
+        {"type": "BlackICE", "name": "Liche", "additional": "Raven", "description": "Extremely dangerous ICE combo: Liche and Raven working together"},
+    ),
+    "uncommon": (
+        {"type": "BlackICE", "name": "Kraken", "description": "Extremely powerful Black ICE that does 6d6 damage"},
+        {"type": "BlackICE", "name": "Hellhound", "additional": "Scorpion", "description": "Dangerous ICE combo: Hellhound and Scorpion working together"},
+        {"type": "BlackICE", "name": "Hellhound", "additional": "Killer", "description": "Dangerous ICE combo: Hellhound and Killer working together"},
+        {"type": "BlackICE", "name": "Raven", "count": 2, "description": "Two Raven programs working together"},
+        {"type": "BlackICE", "name": "Sabertooth", "description": "Dangerous Black ICE that does 4d6 damage and reduces REZ by 1d6"},
+        {"type": "BlackICE", "name": "Hellhound", "description": "Vicious Black ICE that attacks for 4d6 damage"},
+        {"type": "Password", "dv": 10, "description": "Advanced security password (DV10)"},
+        {"type": "File", "dv": 10, "description": "High-value data file (DV10)"},
+        {"type": "Control Node", "dv": 10, "description": "Critical system control node (DV10)"},
+        {"type": "Password", "dv": 10, "description": "Advanced security password (DV10)"},
+        {"type": "BlackICE", "name": "Killer", "description": "Dangerous program that does 3d6 damage to a Netrunner's Cyberdeck"},
+        {"type": "BlackICE", "name": "Liche", "description": "Extremely dangerous Black ICE that does 5d6 damage"},
+        {"type": "BlackICE", "name": "Dragon", "description": "The most dangerous Black ICE, dealing 8d6 damage"},
+        {"type": "BlackICE", "name": "Asp", "additional": "Raven", "description": "Dangerous ICE combo: Asp and Raven working together"},
+        {"type": "BlackICE", "name": "Dragon", "additional": "Wisp", "description": "Lethal ICE combo: Dragon and Wisp working together"},
+        {"type": "BlackICE", "name": "Giant", "description": "Powerful Black ICE that does 6d6 damage"},
+    ),
+    "advanced": (
+        {"type": "BlackICE", "name": "Hellhound", "count": 3, "description": "Three vicious Hellhounds working together"},
+        {"type": "BlackICE", "name": "Asp", "count": 2, "description": "Two deadly Asp programs working together"},
+        {"type": "BlackICE", "name": "Hellhound", "additional": "Liche", "description": "Lethal ICE combo: Hellhound and Liche working together"},
+        {"type": "BlackICE", "name": "Wisp", "count": 3, "description": "Three Wisp programs working together"},
+        {"type": "BlackICE", "name": "Hellhound", "additional": "Sabertooth", "description": "Dangerous ICE combo: Hellhound and Sabertooth working together"},
+        {"type": "BlackICE", "name": "Kraken", "description": "Extremely powerful Black ICE that does 6d6 damage"},
+        {"type": "Password", "dv": 12, "description": "Military-grade security password (DV12)"},
+        {"type": "File", "dv": 12, "description": "Critical data file (DV12)"},
+        {"type": "Control Node", "dv": 12, "description": "Top-tier system control node (DV12)"},
+        {"type": "Password", "dv": 12, "description": "Military-grade security password (DV12)"},
+        {"type": "BlackICE", "name": "Giant", "description": "Powerful Black ICE that does 6d6 damage"},
+        {"type": "BlackICE", "name": "Dragon", "description": "The most dangerous Black ICE, dealing 8d6 damage"},
+        {"type": "BlackICE", "name": "Killer", "additional": "Scorpion", "description": "Dangerous ICE combo: Killer and Scorpion working together"},
+        {"type": "BlackICE", "name": "Kraken", "description": "Extremely powerful Black ICE that does 6d6 damage"},
+        {"type": "BlackICE", "name": "Raven", "additional": "Wisp", "count": 1, "count2": 1, "count3": 1, "description": "Multi-ICE combo: Raven, Wisp, and Hellhound"},
+        {"type": "BlackICE", "name": "Dragon", "count": 2, "description": "Two Dragon programs - a lethal combination"},
+    ),
+}
+
+
+def roll_3d6(rng):
+    return rng.randint(1, 6) + rng.randint(1, 6) + rng.randint(1, 6)
+
+
+def roll_branches(rng, floor_count):
+    """Roll for side branches and split the floors between them."""
+    branches = []
+    if rng.randint(1, 10) < 7:  # 40% chance of a branch
+        return branches
+
+    branch_count = 1
+    while branch_count < 3 and rng.randint(1, 10) >= 7:  # Up to 3 branches
+        branch_count += 1
+
+    # Half the floors stay on the main branch, the rest are shared out
+    remaining_floors = floor_count - floor_count // 2
+    for i in range(branch_count):
+        if i < branch_count - 1:
+            branch_floors = remaining_floors // (branch_count - i)
+            remaining_floors -= branch_floors
+        else:
+            branch_floors = remaining_floors
+
+        if branch_floors > 0:
+            branches.append({
+                "name": f"Branch {i+1}",
+                "floors": branch_floors
+            })
+    return branches
+
+
+def roll_node_content(rng, floor_num, difficulty):
+    """Roll what sits on a floor. Returns a new dict the caller may modify."""
+    if floor_num <= 2:
+        content = dict(LOBBY_TABLE[rng.randint(1, 6) - 1])
+    else:
+        content = dict(FLOOR_TABLES[difficulty][roll_3d6(rng) - 3])
+
+    if content["type"] == "BlackICE":
+        content["strength"] = rng.randint(*ICE_STRENGTH_RANGES[difficulty])
+    return content
+
+
+def roll_demon(rng, difficulty):
+    """Roll the demon that watches over an architecture of 6+ floors."""
+    demon_type = "Imp"
+    roll = rng.random()
+    if difficulty == "standard":
+        if roll > 0.7:
+            demon_type = "Efreet"
+    elif difficulty == "uncommon":
+        if roll > 0.8:
+            demon_type = "Balron"
+        elif roll > 0.4:
+            demon_type = "Efreet"
+    elif difficulty == "advanced":
+        if roll > 0.6:
+            demon_type = "Balron"
+        elif roll > 0.2:
+            demon_type = "Efreet"
+
+    return {
+        "type": demon_type,
+        "description": f"{demon_type} demon that monitors and defends the architecture"
+    }
+
+
+def describe(difficulty, location):
+    return f"NET Architecture at {location} - {difficulty.capitalize()} Difficulty"
+
+
+def generate_architecture(difficulty, name="", location="", seed=None, rng=None):
+    """
+    Generate a random NET Architecture.
+
+    Args:
+        difficulty (str): One of DIFFICULTIES.
+        name (str): Name of the architecture.
+        location (str): Where the architecture lives in the world.
+        seed (optional): Seed for a fresh random.Random. Ignored if rng is given.
+        rng (random.Random, optional): Generator to roll on.
+
+    Returns:
+        dict: The architecture, its branches, nodes and demon as plain data.
+    """
+    if difficulty not in DIFFICULTIES:
+        raise ValueError(f"Unknown difficulty '{difficulty}'.")
+    rng = rng or random.Random(seed)
+
+    # Step 1: Shape the architecture
+    floor_count = roll_3d6(rng)
+    branches = roll_branches(rng, floor_count)
+
+    architecture_data = {
+        "name": name,
+        "description": describe(difficulty, location),
+        "difficulty": difficulty,
+        "difficulty_value": DIFFICULTY_VALUES[difficulty],
+        "location": location,
+        "floor_count": floor_count,
+        "branches": branches,
+        "nodes": []
+    }
+
+    # Step 2: Fill in the architecture, main branch first
+    main_branch_floors = floor_count - sum(branch["floors"] for branch in branches)
+    for floor in range(1, main_branch_floors + 1):
+        architecture_data["nodes"].append({
+            "name": f"Floor {floor}",
+            "level": floor,
+            "branch": "Main",
+            "content": roll_node_content(rng, floor, difficulty)
+        })
+
+    # Branches come off the main branch after floor 2
+    branch_floor_offset = 2
+    for branch in branches:
+        for floor in range(1, branch["floors"] + 1):
+            branched_level = branch_floor_offset + floor
+            architecture_data["nodes"].append({
+                "name": f"{branch['name']} Floor {floor}",
+                "level": branched_level,
+                "branch": branch["name"],
+                "content": roll_node_content(rng, branched_level, difficulty)
+            })
+        branch_floor_offset += 1
+
+    # Step 3: Add a demon if the architecture is big enough
+    if floor_count >= 6:
+        architecture_data["demon"] = roll_demon(rng, difficulty)
+
+    return architecture_data
+
+
+def with_identity(data, name, location):
+    """Return a copy of generated architecture data under a new name and location."""
+    data = dict(data)
+    data["name"] = name
+    data["location"] = location
+    data["description"] = describe(data["difficulty"], location)
+    return data
+
+
+def benchmark(count=1000, seed=0):
+    """
+    Time architecture generation. Returns {difficulty: architectures per second}.
+    """
+    rng = random.Random(seed)
+    results = {}
+    for difficulty in DIFFICULTIES:
+        start = time.perf_counter()
+        for _ in range(count):
+            generate_architecture(difficulty, rng=rng)
+        elapsed = time.perf_counter() - start
+        results[difficulty] = count / elapsed if elapsed else float("inf")
+    return results
+
+
+if __name__ == "__main__":
+    for difficulty, rate in benchmark().items():
+        print(f"{difficulty:>10}: {rate:,.0f} architectures/sec")
@@ -5,6 +5,22 @@ from world.cyberpunk_sheets.models import CharacterSheet
 import random
 
 class NetrunnerActions:
+    @staticmethod
+    def interface_rank(caller):
+        # Use the rank loaded at jack-in rather than hitting the db on every roll
+        run = caller.ndb.netrun_session
+        if run:
+            return run.interface
+        return caller.db.interface or 0
+
+    @staticmethod
+    def active_program(caller):
+        # The program activated during the current run, if any
+        run = caller.ndb.netrun_session
+        if run:
+            return run.active_program
+        return None
+
     @staticmethod
     def roll_check(interface_skill, difficulty):
         return random.randint(1, 10) + interface_skill >= difficulty
@@ -12,7 +28,7 @@ class NetrunnerActions:
     @staticmethod
     def backdoor(caller, target):
         difficulty = target.password_strength  # You'll need to add this attribute to your Node model
-        if NetrunnerActions.roll_check(caller.db.interface, difficulty):
+        if NetrunnerActions.roll_check(NetrunnerActions.interface_rank(caller), difficulty):
             caller.msg("You successfully bypass the password!")
             # Logic to unlock the node
         else:
@@ -21,7 +37,7 @@ class NetrunnerActions:
     @staticmethod
     def cloak(caller):
         difficulty = 15  # Set an appropriate difficulty
-        if NetrunnerActions.roll_check(caller.db.interface, difficulty):
+        if NetrunnerActions.roll_check(NetrunnerActions.interface_rank(caller), difficulty):
             caller.ndb.netrun_session.is_cloaked = True
             caller.msg("You successfully cloak your actions.")
         else:
@@ -30,7 +46,7 @@ class NetrunnerActions:
     @staticmethod
     def control(caller, target):
         difficulty = target.control_difficulty  # Add this attribute to your Node model
-        if NetrunnerActions.roll_check(caller.db.interface, difficulty):
+        if NetrunnerActions.roll_check(NetrunnerActions.interface_rank(caller), difficulty):
             caller.msg(f"You take control of the {target.name} node!")
             # Logic to give control of the node to the netrunner
         else:
@@ -39,7 +55,7 @@ class NetrunnerActions:
     @staticmethod
     def eye_dee(caller, target):
         difficulty = target.eye_dee_difficulty  # Add this attribute to your Node model
-        if NetrunnerActions.roll_check(caller.db.interface, difficulty):
+        if NetrunnerActions.roll_check(NetrunnerActions.interface_rank(caller), difficulty):
             caller.msg(f"You identify the {target.name}: {target.description}")
             if hasattr(target, 'value'):
                 caller.msg(f"Estimated value: {target.value}")
@@ -49,12 +65,11 @@ class NetrunnerActions:
     @staticmethod
     def pathfinder(caller):
         netrun_session = caller.ndb.netrun_session
-        architecture = netrun_session.architecture
-        check_result = caller.db.interface + random.randint(1, 10)
-        revealed_floors = min(check_result, architecture.total_floors)
+        check_result = netrun_session.interface + random.randint(1, 10)
+        revealed_floors = min(check_result, netrun_session.total_floors)
         caller.msg(f"You reveal {revealed_floors} floors of the architecture:")
-        for floor in range(revealed_floors):
-            nodes = Node.objects.filter(architecture=architecture, level=floor)
+        for floor in range(1, revealed_floors + 1):
+            nodes = netrun_session.nodes_on_level(floor)
             caller.msg(f"Floor {floor}: {', '.join(node.name for node in nodes)}")
 
     @staticmethod
@@ -66,21 +81,20 @@ class NetrunnerActions:
     def slide(caller):
         netrun_session = caller.ndb.netrun_session
         current_node = netrun_session.current_node
-        if not current_node.ice:
+        ice = netrun_session.current_ice
+        if not ice:
             caller.msg("There's no ICE to slide away from.")
             return
-        
-        ice = current_node.ice
-        netrunner_roll = caller.db.interface + random.randint(1, 10)
+
+        netrunner_roll = netrun_session.interface + random.randint(1, 10)
         ice_roll = ice.perception + random.randint(1, 10)
         
         if netrunner_roll > ice_roll:
             # Move to an adjacent node
-            adjacent_nodes = Node.objects.filter(architecture=netrun_session.architecture, level=current_node.level)
-            if adjacent_nodes.exists():
+            adjacent_nodes = [node for node in netrun_session.nodes_on_level(current_node.level) if node != current_node]
+            if adjacent_nodes:
                 new_node = random.choice(adjacent_nodes)
-                netrun_session.current_node = new_node
-                netrun_session.save()
+                netrun_session.move_to(new_node)
                 caller.msg(f"You successfully slide away to {new_node.name}!")
             else:
                 caller.msg("You slide away, but there's nowhere to go on this level.")
@@ -90,7 +104,7 @@ class NetrunnerActions:
     @staticmethod
     def virus(caller, target):
         difficulty = 12  # Base difficulty, adjust as needed
-        if NetrunnerActions.roll_check(caller.db.interface, difficulty):
+        if NetrunnerActions.roll_check(NetrunnerActions.interface_rank(caller), difficulty):
             # Implement virus logic here
             caller.msg("You successfully plant a virus in the system!")
         else:
@@ -99,17 +113,20 @@ class NetrunnerActions:
 class NetCombat:
     @staticmethod
     def attack(attacker, defender):
-        attacker_roll = random.randint(1, 10) + attacker.db.interface
-        if hasattr(attacker, 'active_program') and attacker.active_program:
-            attacker_roll += attacker.active_program.atk
+        """
+        Roll a netrunner's attack against ICE. Returns (success, damage);
+        applying the damage is left to the caller's ActiveNetrun so it is
+        persisted at jack-out.
+        """
+        attacker_roll = random.randint(1, 10) + NetrunnerActions.interface_rank(attacker)
+        program = NetrunnerActions.active_program(attacker)
+        if program:
+            attacker_roll += program.atk
 
         defender_roll = random.randint(1, 10) + defender.dfv
 
         if attacker_roll > defender_roll:
             damage = random.randint(1, 6)  # Basic damage, can be modified based on programs
-            if hasattr(attacker, 'active_program') and attacker.active_program:
-                damage += attacker.active_program.dmg
-            defender.rez -= damage
             return True, damage
         return False, 0
     
@@ -1,5 +1,6 @@
 # world/netrunning/models.py
 
+import random
 from django.db import models
 from evennia.utils.idmapper.models import SharedMemoryModel
 from world.cyberpunk_sheets.models import CharacterSheet
@@ -15,6 +16,10 @@ class Cyberdeck(SharedMemoryModel):
     owner = models.ForeignKey(CharacterSheet, on_delete=models.SET_NULL, null=True, related_name='cyberdecks')
     cyberdeck_gear = models.OneToOneField(Cyberdeck, on_delete=models.SET_NULL, null=True, blank=True, related_name='cyberdeck')
     cyberware = models.OneToOneField(CyberwareInstance, on_delete=models.SET_NULL, null=True, blank=True, related_name='cyberdeck')
+    # The catalogue row the deck was made from, and the owner's own copy of it
+    gear = models.ForeignKey('inventory.Gear', on_delete=models.SET_NULL, null=True, blank=True, related_name='cyberdecks')
+    item = models.OneToOneField('inventory.ItemInstance', on_delete=models.SET_NULL, null=True, blank=True, related_name='cyberdeck')
+    programs = models.ManyToManyField('Program', blank=True, related_name='installed_on')
 
     def __str__(self):
         return self.name
@@ -23,6 +28,17 @@ class Cyberdeck(SharedMemoryModel):
     def is_cyberware(self):
         return self.cyberware is not None
 
+    @property
+    def installed_programs(self):
+        return self.programs
+
+    @property
+    def available_slots(self):
+        return self.program_slots + self.any_slots - self.programs.count()
+
+    def install_program(self, program):
+        self.programs.add(program)
+
     def save(self, *args, **kwargs):
         if self.gear and self.cyberware:
             raise ValueError("A Cyberdeck cannot be both gear and cyberware simultaneously.")
@@ -102,6 +118,12 @@ class NetrunSession(SharedMemoryModel):
     def __str__(self):
         return f"{self.netrunner.full_name} - {self.architecture.name}"
 
+# The named Black ICE programs (see deckoptions.black_ice), lowercased
+BLACK_ICE_NAMES = frozenset((
+    "asp", "dragon", "giant", "hellhound", "killer", "kraken",
+    "liche", "raven", "sabertooth", "scorpion", "skunk", "wisp",
+))
+
 class ICE:
     def __init__(self, name, rez, perception, attack, speed, defense):
         self.name = name
@@ -111,11 +133,40 @@ class ICE:
         self.spd = speed
         self.dfv = defense
 
+    @classmethod
+    def from_node(cls, node):
+        """Build the ICE guarding a Node from its ice_type and ice_strength."""
+        ice_type = (node.ice_type or "").lower()
+        ice_class = BlackICE if ice_type in BLACK_ICE_NAMES or 'black' in ice_type else ICE
+        strength = max(node.ice_strength, 1)
+        return ice_class(
+            name=node.ice_type or "ICE",
+            rez=strength * 5,
+            perception=strength,
+            attack=strength,
+            speed=strength,
+            defense=strength
+        )
+
+    def spots(self, netrunner):
+        """Check whether this ICE notices a (possibly cloaked) netrunner."""
+        if not netrunner.is_cloaked:
+            return True
+        return random.randint(1, 10) + self.perception > random.randint(1, 10) + netrunner.interface
+
     def react(self, netrunner):
-        # Implement ICE reaction logic here
-        pass
+        """
+        Take this ICE's turn against a netrunner. Returns the damage dealt.
+        """
+        if not self.spots(netrunner):
+            return 0
+        if random.randint(1, 10) + self.atk > random.randint(1, 10) + netrunner.interface:
+            return random.randint(1, 6)
+        return 0
 
 class BlackICE(ICE):
     def react(self, netrunner):
-        # Implement more aggressive behavior for Black ICE
-        pass
+        # Black ICE ignores cloaking and hits the runner's brain for 2d6
+        if random.randint(1, 10) + self.atk > random.randint(1, 10) + netrunner.interface:
+            return random.randint(1, 6) + random.randint(1, 6)
+        return 0
@@ -0,0 +1,91 @@
+# world/netrunning/pool.py
+
+"""
+Pool of pre-generated NET Architectures.
+
+A handful of architectures per difficulty are kept rolled and ready so that
+arch/generate only has to name one and write it out. ArchitecturePoolScript
+tops the pool back up in the background.
+"""
+
+from collections import deque
+from evennia.scripts.scripts import DefaultScript
+from evennia.utils import logger
+from world.netrunning.generator import DIFFICULTIES, DIFFICULTY_LEVELS, generate_architecture, with_identity
+from world.netrunning.models import NetArchitecture, Node
+
+POOL_SIZE = 5
+POOL_REFILL_INTERVAL = 300  # seconds
+
+# difficulty -> deque of generated architecture data
+_POOL = {difficulty: deque() for difficulty in DIFFICULTIES}
+
+
+def top_up_pool(size=POOL_SIZE):
+    """Generate architectures until every difficulty has `size` waiting."""
+    generated = 0
+    for difficulty, pool in _POOL.items():
+        while len(pool) < size:
+            pool.append(generate_architecture(difficulty))
+            generated += 1
+    return generated
+
+
+def pool_levels():
+    return {difficulty: len(pool) for difficulty, pool in _POOL.items()}
+
+
+def take_architecture(difficulty, name, location):
+    """
+    Take a ready-made architecture from the pool, generating one on the spot
+    if the pool for that difficulty has run dry.
+    """
+    pool = _POOL[difficulty]
+    data = pool.popleft() if pool else generate_architecture(difficulty)
+    return with_identity(data, name, location)
+
+
+def save_architecture(data):
+    """Write generated architecture data to the database."""
+    architecture = NetArchitecture.objects.create(
+        name=data["name"],
+        description=data["description"],
+        difficulty=DIFFICULTY_LEVELS[data["difficulty"]]
+    )
+
+    nodes = []
+    for node_data in data["nodes"]:
+        content = node_data["content"]
+        is_ice = content["type"] == "BlackICE"
+        nodes.append(Node(
+            architecture=architecture,
+            name=node_data["name"],
+            description=content["description"],
+            level=node_data["level"],
+            is_ice=is_ice,
+            ice_type=content.get("name", "Black ICE") if is_ice else None,
+            ice_strength=content.get("strength", 0) if is_ice else 0
+        ))
+    Node.objects.bulk_create(nodes)
+
+    return architecture
+
+
+class ArchitecturePoolScript(DefaultScript):
+    """
+    Keeps the architecture pool topped up.
+    """
+    def at_script_creation(self):
+        self.key = "ArchitecturePool"
+        self.desc = "Pre-generates NET Architectures"
+        self.interval = POOL_REFILL_INTERVAL
+        self.persistent = True
+
+    def at_start(self):
+        self.at_repeat()
+
+    def at_repeat(self):
+        try:
+            top_up_pool()
+        except Exception as e:
+            logger.log_err(f"Error topping up architecture pool: {e}")
@@ -0,0 +1,225 @@
+# world/netrunning/session.py
+
+"""
+Netrun session engine.
+
+Everything a run needs (deck, programs, interface rank, HP and the whole
+architecture) is loaded once at jack-in into an ActiveNetrun held on the
+caller's ndb. Actions work against that snapshot, ICE takes its turns on a
+single shared ticker for every active run, and the results are written back
+once at jack-out. ICE damaged or cracked during a run stays that way only
+for that run; the architecture itself is shared and never changed.
+
+Runs do not survive a reload, so close_stale_sessions() ends any session
+rows still marked active when the server starts.
+"""
+
+from django.utils import timezone
+from evennia import TICKER_HANDLER
+from evennia.utils import logger
+from world.inventory.models import ItemInstance
+from world.netrunning.models import Cyberdeck, NetrunSession, ICE
+
+ICE_TICK_INTERVAL = 6  # seconds, one NET round
+ICE_TICK_IDSTRING = "netrun_ice"
+DEFAULT_PROGRAM_SLOTS = 7
+
+# character id -> ActiveNetrun
+ACTIVE_RUNS = {}
+
+
+def get_cyberdeck(char_sheet, inventory):
+    """
+    Find the Cyberdeck a character runs with, checking carried gear in their
+    inventory first and installed cyberware second. Returns None if they
+    have neither.
+    """
+    # Each carried deck is its own ItemInstance, so two characters with the
+    # same model of deck never share programs
+    gear_cyberdeck = ItemInstance.objects.filter(
+        inventory_id=inventory.id, gear__name__icontains='cyberdeck'
+    ).select_related('gear').order_by('id').first()
+    if gear_cyberdeck:
+        cyberdeck, _ = Cyberdeck.objects.get_or_create(
+            item=gear_cyberdeck,
+            defaults={'name': gear_cyberdeck.gear.name, 'gear': gear_cyberdeck.gear,
+                      'owner': char_sheet, 'program_slots': DEFAULT_PROGRAM_SLOTS}
+        )
+        if cyberdeck.owner_id != char_sheet.id:
+            # The deck changed hands since it was last used
+            cyberdeck.owner = char_sheet
+            cyberdeck.save(update_fields=['owner'])
+        return cyberdeck
+
+    cyberware_cyberdeck = char_sheet.cyberware_instances.filter(
+        installed=True, cyberware__name__icontains='cyberdeck'
+    ).select_related('cyberware').first()
+    if cyberware_cyberdeck:
+        cyberdeck, _ = Cyberdeck.objects.get_or_create(
+            cyberware=cyberware_cyberdeck,
+            defaults={'name': cyberware_cyberdeck.cyberware.name, 'owner': char_sheet,
+                      'program_slots': DEFAULT_PROGRAM_SLOTS}
+        )
+        return cyberdeck
+
+    return None
+
+
+def get_active_run(caller):
+    """Return the caller's ActiveNetrun, or None if they are not jacked in."""
+    run = caller.ndb.netrun_session
+    if run and run.is_active:
+        return run
+    return None
+
+
+class ActiveNetrun:
+    """
+    A netrun in progress. Holds a snapshot of the runner and architecture so
+    that nothing during the run needs to go back to the database.
+    """
+    __slots__ = (
+        "caller", "sheet", "deck", "programs", "interface", "hp", "start_hp",
+        "record", "architecture", "nodes", "current_node", "ice", "cracked",
+        "is_cloaked", "is_active", "active_program",
+    )
+
+    def __init__(self, caller, sheet, deck, architecture):
+        self.caller = caller
+        self.sheet = sheet
+        self.deck = deck
+        self.programs = list(deck.programs.all())
+        self.interface = sheet.interface or caller.db.interface or 0
+        hp = caller.db.hp
+        self.hp = hp if hp is not None else sheet._current_hp
+        self.start_hp = self.hp
+        self.architecture = architecture
+        self.nodes = list(architecture.nodes.order_by('level', 'id'))
+        self.current_node = self.nodes[0] if self.nodes else None
+        # node id -> ICE still rezzed on that node
+        self.ice = {node.id: ICE.from_node(node) for node in self.nodes if node.is_ice}
+        self.cracked = set()
+        self.is_cloaked = False
+        self.is_active = True
+        self.active_program = None
+        self.record = None
+
+    @classmethod
+    def jack_in(cls, caller, sheet, deck, architecture):
+        """Start a run and register it with the shared ICE ticker."""
+        run = cls(caller, sheet, deck, architecture)
+        run.record = NetrunSession.objects.create(
+            netrunner=sheet,
+            architecture=architecture,
+            current_node=run.current_node,
+            is_active=True
+        )
+        caller.ndb.netrun_session = run
+        ACTIVE_RUNS[caller.id] = run
+        if len(ACTIVE_RUNS) == 1:
+            TICKER_HANDLER.add(ICE_TICK_INTERVAL, ice_tick, idstring=ICE_TICK_IDSTRING, persistent=False)
+        return run
+
+    @property
+    def total_floors(self):
+        return max((node.level for node in self.nodes), default=0)
+
+    def nodes_on_level(self, level):
+        return [node for node in self.nodes if node.level == level]
+
+    def get_node(self, node_id):
+        return next((node for node in self.nodes if node.id == node_id), None)
+
+    def move_to(self, node):
+        self.current_node = node
+
+    @property
+    def current_ice(self):
+        if not self.current_node:
+            return None
+        return self.ice.get(self.current_node.id)
+
+    def damage_ice(self, damage):
+        """
+        Apply damage to the ICE on the current node. Returns the ICE, which is
+        removed from the node once its REZ reaches zero.
+        """
+        ice = self.current_ice
+        if not ice:
+            return None
+        ice.rez -= damage
+        if ice.rez <= 0:
+            del self.ice[self.current_node.id]
+            self.cracked.add(self.current_node.id)
+        return ice
+
+    def take_damage(self, amount):
+        self.hp -= amount
+        return self.hp
+
+    def at_ice_turn(self):
+        """Called from the shared ticker: let the ICE on this node act."""
+        ice = self.current_ice
+        if not ice:
+            return
+        damage = ice.react(self)
+        if not damage:
+            return
+        self.take_damage(damage)
+        self.caller.msg(f"|r{ice.name} strikes at you for {damage} damage!|n")
+        if self.hp <= 0:
+            self.caller.msg("You've taken too much damage. Emergency jack-out initiated.")
+            self.jack_out()
+            self.close_menu()
+
+    def activate(self, program):
+        """Make one of the deck's programs the one used in attacks."""
+        self.active_program = program
+
+    def close_menu(self):
+        """Close the caller's netrun menu, which has nothing left to act on."""
+        menu = self.caller.ndb._evmenu
+        if menu:
+            menu.close_menu()
+
+    def jack_out(self):
+        """End the run and persist everything that changed during it."""
+        if not self.is_active:
+            return
+        self.is_active = False
+        ACTIVE_RUNS.pop(self.caller.id, None)
+        if not ACTIVE_RUNS:
+            TICKER_HANDLER.remove(ICE_TICK_INTERVAL, ice_tick, idstring=ICE_TICK_IDSTRING, persistent=False)
+
+        if self.record:
+            self.record.current_node = self.current_node
+            self.record.is_active = False
+            self.record.end_time = timezone.now()
+            self.record.save(update_fields=['current_node', 'is_active', 'end_time'])
+
+        if self.hp != self.start_hp:
+            self.caller.db.hp = self.hp
+
+        self.caller.ndb.netrun_session = None
+
+
+def close_stale_sessions():
+    """
+    End the NetrunSession rows of runs lost to a reload or shutdown.
+
+    Returns:
+        int: The number of sessions closed.
+    """
+    live_ids = [run.record.id for run in ACTIVE_RUNS.values() if run.record]
+    return NetrunSession.objects.filter(is_active=True).exclude(id__in=live_ids).update(
+        is_active=False, end_time=timezone.now()
+    )
+
+
+def ice_tick(*args, **kwargs):
+    """Shared ticker callback giving every rezzed ICE its turn."""
+    for run in list(ACTIVE_RUNS.values()):
+        try:
+            run.at_ice_turn()
+        except Exception:
+            logger.log_trace(f"Error during ICE turn for {run.caller}")
@@ -0,0 +1,168 @@
+import random
+import unittest
+from unittest.mock import Mock, patch
+from world.netrunning.models import BlackICE, ICE, Node
+from world.netrunning.session import ACTIVE_RUNS, ActiveNetrun
+from world.netrunning.generator import (
+    DIFFICULTIES,
+    ICE_STRENGTH_RANGES,
+    generate_architecture,
+    roll_node_content,
+    with_identity
+)
+
+
+class TestArchitectureGenerator(unittest.TestCase):
+
+    def test_same_seed_same_architecture(self):
+        for difficulty in DIFFICULTIES:
+            first = generate_architecture(difficulty, "Test", "Night City", seed=42)
+            second = generate_architecture(difficulty, "Test", "Night City", seed=42)
+            self.assertEqual(first, second)
+
+    def test_floor_count_matches_nodes(self):
+        for seed in range(200):
+            data = generate_architecture("standard", seed=seed)
+            self.assertTrue(3 <= data["floor_count"] <= 18)
+            self.assertEqual(len(data["nodes"]), data["floor_count"])
+            main_floors = [node for node in data["nodes"] if node["branch"] == "Main"]
+            self.assertEqual([node["level"] for node in main_floors], list(range(1, len(main_floors) + 1)))
+
+    def test_demon_only_on_large_architectures(self):
+        for seed in range(200):
+            data = generate_architecture("advanced", seed=seed)
+            self.assertEqual("demon" in data, data["floor_count"] >= 6)
+
+    def test_ice_strength_in_range(self):
+        rng = random.Random(7)
+        for difficulty in DIFFICULTIES:
+            low, high = ICE_STRENGTH_RANGES[difficulty]
+            for floor in range(1, 19):
+                content = roll_node_content(rng, floor, difficulty)
+                if content["type"] == "BlackICE":
+                    self.assertTrue(low <= content["strength"] <= high)
+                else:
+                    self.assertNotIn("strength", content)
+
+    def test_rolled_content_does_not_touch_tables(self):
+        rng = random.Random(1)
+        content = roll_node_content(rng, 1, "basic")
+        content["description"] = "changed"
+        for _ in range(50):
+            self.assertNotEqual(roll_node_content(rng, 1, "basic")["description"], "changed")
+
+    def test_unknown_difficulty(self):
+        with self.assertRaises(ValueError):
+            generate_architecture("impossible")
+
+    def test_with_identity(self):
+        data = generate_architecture("basic", seed=3)
+        named = with_identity(data, "Arasaka Tower", "Watson")
+        self.assertEqual(named["name"], "Arasaka Tower")
+        self.assertIn("Watson", named["description"])
+        self.assertEqual(data["name"], "")
+        self.assertEqual(named["nodes"], data["nodes"])
+
+
+class TestICEFromNode(unittest.TestCase):
+
+    def test_named_black_ice(self):
+        ice = ICE.from_node(Node(name="Gate", ice_type="Hellhound", ice_strength=3))
+        self.assertIsInstance(ice, BlackICE)
+        self.assertEqual(ice.name, "Hellhound")
+
+    def test_plain_ice(self):
+        ice = ICE.from_node(Node(name="Gate", ice_type="White", ice_strength=3))
+        self.assertNotIsInstance(ice, BlackICE)
+        self.assertEqual(ice.rez, 15)
+
+
+class TestActiveNetrun(unittest.TestCase):
+
+    def setUp(self):
+        self.caller = Mock()
+        self.caller.id = 1
+        self.caller.db.hp = 10
+        self.caller.db.interface = 0
+        self.caller.ndb.netrun_session = None
+        self.sheet = Mock(interface=4)
+        self.deck = Mock()
+        self.deck.programs.all.return_value = []
+        self.nodes = [
+            Node(id=1, name="Entry Point", level=1),
+            Node(id=2, name="Password", level=2, is_ice=True, ice_type="White", ice_strength=2),
+            Node(id=3, name="File", level=2),
+        ]
+        self.architecture = Mock()
+        self.architecture.nodes.order_by.return_value = self.nodes
+
+        patchers = [
+            patch("world.netrunning.session.TICKER_HANDLER"),
+            patch("world.netrunning.session.NetrunSession.objects.create"),
+        ]
+        self.ticker, self.create_record = [patcher.start() for patcher in patchers]
+        for patcher in patchers:
+            self.addCleanup(patcher.stop)
+        self.addCleanup(ACTIVE_RUNS.clear)
+        self.addCleanup(Node.flush_instance_cache)
+
+        self.run = ActiveNetrun.jack_in(self.caller, self.sheet, self.deck, self.architecture)
+
+    def test_jack_in(self):
+        self.assertIs(self.caller.ndb.netrun_session, self.run)
+        self.assertIs(ACTIVE_RUNS[self.caller.id], self.run)
+        self.assertEqual(self.ticker.add.call_count, 1)
+        self.assertEqual(self.run.interface, 4)
+        self.assertEqual(self.run.current_node, self.nodes[0])
+        self.assertEqual(self.run.total_floors, 2)
+
+    def test_move_between_nodes(self):
+        self.assertIsNone(self.run.current_ice)
+        self.assertEqual(self.run.nodes_on_level(2), self.nodes[1:])
+
+        self.run.move_to(self.run.get_node(2))
+        self.assertEqual(self.run.current_node, self.nodes[1])
+        self.assertEqual(self.run.current_ice.name, "White")
+        self.assertEqual(self.run.current_ice.rez, 10)
+
+        self.run.move_to(self.run.get_node(3))
+        self.assertIsNone(self.run.current_ice)
+
+    def test_ice_only_acts_on_its_node(self):
+        with patch.object(ICE, "react", return_value=3) as react:
+            self.run.at_ice_turn()
+            react.assert_not_called()
+
+            self.run.move_to(self.run.get_node(2))
+            self.run.at_ice_turn()
+            react.assert_called_once_with(self.run)
+        self.assertEqual(self.run.hp, 7)
+        self.assertTrue(self.run.is_active)
+
+    def test_cracked_ice_stays_with_the_run(self):
+        self.run.move_to(self.run.get_node(2))
+        self.run.damage_ice(10)
+        self.assertIsNone(self.run.current_ice)
+
+        self.run.jack_out()
+        self.assertTrue(self.nodes[1].is_ice)
+        self.assertEqual(self.nodes[1].ice_strength, 2)
+
+        # The next runner meets the ICE at full strength
+        other = ActiveNetrun(self.caller, self.sheet, self.deck, self.architecture)
+        other.move_to(other.get_node(2))
+        self.assertEqual(other.current_ice.rez, 10)
+
+    def test_forced_jack_out(self):
+        self.run.move_to(self.run.get_node(2))
+        menu = self.caller.ndb._evmenu
+        with patch.object(ICE, "react", return_value=12):
+            self.run.at_ice_turn()
+
+        self.assertFalse(self.run.is_active)
+        self.assertNotIn(self.caller.id, ACTIVE_RUNS)
+        self.assertIsNone(self.caller.ndb.netrun_session)
+        self.assertEqual(self.caller.db.hp, -2)
+        self.assertFalse(self.create_record.return_value.is_active)
+        self.ticker.remove.assert_called_once()
+        menu.close_menu.assert_called_once_with()
@@ -0,0 +1,83 @@
+from django.db import connection, models
+from django.db.models import Q
+from evennia.accounts.models import AccountDB
+from evennia.objects.models import ObjectDB
+
+# Full-text search needs a backend-specific index; other backends fall back
+# to substring matching.
+FULL_TEXT = connection.vendor == 'postgresql'
+if FULL_TEXT:
+    from django.contrib.postgres.indexes import GinIndex
+    from django.contrib.postgres.search import SearchQuery, SearchVector
+
+
+class NoteQuerySet(models.QuerySet):
+    def pending(self):
+        return self.filter(status=Note.PENDING)
+
+    def approved(self):
+        return self.filter(status=Note.APPROVED)
+
+    def public(self):
+        return self.filter(is_public=True)
+
+    def in_category(self, category):
+        return self.filter(category__iexact=category)
+
+    def search(self, term):
+        """Notes whose name or text match a search term."""
+        if FULL_TEXT:
+            return self.annotate(
+                search_vector=SearchVector('name', 'text', config='english')
+            ).filter(search_vector=SearchQuery(term, config='english'))
+        return self.filter(Q(name__icontains=term) | Q(text__icontains=term))
+
+
+class Note(models.Model):
+    """
+    A character's note. Notes are numbered per character, in the order the
+    lowest free number was available when they were made.
+    """
+    PENDING = 'pending'
+    APPROVED = 'approved'
+    STATUS_CHOICES = [
+        (PENDING, 'Pending'),
+        (APPROVED, 'Approved'),
+    ]
+
+    character = models.ForeignKey(ObjectDB, on_delete=models.CASCADE, related_name='notes')
+    number = models.PositiveIntegerField()
+    name = models.CharField(max_length=255)
+    text = models.TextField()
+    category = models.CharField(max_length=100, default='General')
+    is_public = models.BooleanField(default=False)
+    status = models.CharField(max_length=20, choices=STATUS_CHOICES, default=PENDING)
+    approved_by = models.ForeignKey(AccountDB, on_delete=models.SET_NULL, null=True, blank=True, related_name='approved_notes')
+    approved_at = models.DateTimeField(null=True, blank=True)
+    created_at = models.DateTimeField(auto_now_add=True)
+    updated_at = models.DateTimeField(auto_now=True)
+
+    objects = NoteQuerySet.as_manager()
+
+    class Meta:
+        unique_together = ('character', 'number')
+        ordering = ['number']
+        indexes = [
+            models.Index(fields=['character', 'status', 'category'], name='note_status_idx'),
+            models.Index(fields=['status', 'created_at'], name='note_queue_idx'),
+        ]
+        if FULL_TEXT:
+            indexes.append(
+                GinIndex(SearchVector('name', 'text', config='english'), name='note_search_idx')
+            )
+
+    def __str__(self):
+        return f"#{self.number} {self.name}"
+
+    @property
+    def is_approved(self):
+        return self.status == self.APPROVED
+
+    @is_approved.setter
+    def is_approved(self, value):
+        self.status = self.APPROVED if value else self.PENDING
@@ -0,0 +1,192 @@
+"""
+Note storage.
+
+Notes are rows in the Note table, indexed by (character, status, category),
+so listing, filtering and searching one character's notes are single
+queries and the staff approval queue is one query across the whole game.
+
+Notes used to live in a "notes" Attribute on each character, a dict of
+{number: note data}, or a list of note dicts in the oldest +note code.
+migrate_note_attributes() moves those into the table.
+"""
+
+from collections.abc import Mapping, Sequence
+from datetime import datetime
+from django.db import transaction
+from django.db.models import F
+from django.utils import timezone
+from evennia.accounts.models import AccountDB
+from evennia.objects.models import ObjectDB
+from evennia.typeclasses.attributes import Attribute
+from evennia.utils import logger
+from world.notes.models import Note
+
+NOTES_ATTRIBUTE = "notes"
+
+
+def next_number(character):
+    """Get the lowest note number a character isn't using."""
+    used = set(Note.objects.filter(character_id=character.id).values_list("number", flat=True))
+    number = 1
+    while number in used:
+        number += 1
+    return number
+
+
+def find_note(character, identifier, category=None):
+    """
+    Find one of a character's notes by number or name.
+
+    Args:
+        character (Object): The note owner.
+        identifier (str or int): A note number or (case-insensitive) name.
+        category (str, optional): Only look in this category.
+
+    Returns:
+        Note or None
+    """
+    notes = Note.objects.filter(character_id=character.id)
+    if category:
+        notes = notes.in_category(category)
+    identifier = str(identifier).strip().lstrip("#")
+    if identifier.isdigit():
+        return notes.filter(number=int(identifier)).first()
+    return notes.filter(name__iexact=identifier).first()
+
+
+def pending_notes():
+    """
+    Get every note waiting for approval, oldest first, in one query.
+
+    Returns:
+        QuerySet: Notes with their characters loaded.
+    """
+    return Note.objects.pending().select_related("character").order_by("created_at")
+
+
+def _parse_time(value):
+    if isinstance(value, str):
+        try:
+            value = datetime.fromisoformat(value)
+        except ValueError:
+            return None
+    if not isinstance(value, datetime):
+        return None
+    if timezone.is_naive(value):
+        value = timezone.make_aware(value)
+    return value
+
+
+def _account_id(value):
+    if isinstance(value, AccountDB):
+        return value.id
+    if isinstance(value, int):
+        return value
+    if isinstance(value, str) and value:
+        return AccountDB.objects.filter(username__iexact=value).values_list("id", flat=True).first()
+    return None
+
+
+def _legacy_notes(attribute):
+    """
+    Get (number, note data) pairs from an old "notes" Attribute. List-shaped
+    notes are numbered in order and renamed to the dict-shaped keys.
+    Returns None for values in neither shape.
+    """
+    value = attribute.value or {}
+    if isinstance(value, Mapping):
+        return list(value.items())
+    if isinstance(value, Sequence) and not isinstance(value, str):
+        return [
+            (number, {
+                "name": data.get("title"),
+                "text": data.get("text"),
+                "category": data.get("category"),
+                "is_approved": data.get("approved"),
+                "approved_by": data.get("approved_by"),
+                "approved_at": data.get("approved_date"),
+                "created_at": data.get("created"),
+                "updated_at": data.get("modified"),
+            })
+            for number, data in enumerate(value, start=1)
+            if isinstance(data, Mapping)
+        ]
+    logger.log_warn(f"Skipping notes Attribute #{attribute.id} on object #{attribute.owner_id}: "
+                    f"unexpected {type(value).__name__} value.")
+    return None
+
+
+def migrate_note_attributes():
+    """
+    Move notes out of the old per-character "notes" Attributes into the Note
+    table and delete the Attributes. Notes keep their numbers, so running
+    this more than once never duplicates anything.
+
+    Returns:
+        int: The number of notes migrated.
+    """
+    attributes = list(Attribute.objects.filter(
+        db_key=NOTES_ATTRIBUTE,
+        db_category__isnull=True,
+        objectdb__isnull=False
+    ).annotate(owner_id=F("objectdb__id")))
+    if not attributes:
+        return 0
+
+    now = timezone.now()
+    notes = []
+    timestamps = {}
+    readable = []
+    for attribute in attributes:
+        legacy = _legacy_notes(attribute)
+        if legacy is None:
+            continue
+        readable.append(attribute)
+        for number, data in legacy:
+            try:
+                number = int(number)
+            except (TypeError, ValueError):
+                continue
+            key = (attribute.owner_id, number)
+            approved = bool(data.get("is_approved"))
+            notes.append(Note(
+                character_id=attribute.owner_id,
+                number=number,
+                name=data.get("name") or f"Note {number}",
+                text=data.get("text") or "",
+                category=data.get("category") or "General",
+                is_public=bool(data.get("is_public")),
+                status=Note.APPROVED if approved else Note.PENDING,
+                approved_by_id=_account_id(data.get("approved_by")) if approved else None,
+                approved_at=_parse_time(data.get("approved_at")) if approved else None,
+            ))
+            timestamps[key] = (
+                _parse_time(data.get("created_at")) or now,
+                _parse_time(data.get("updated_at")) or now
+            )
+
+    with transaction.atomic():
+        before = Note.objects.count()
+        Note.objects.bulk_create(notes, ignore_conflicts=True)
+        migrated = Note.objects.count() - before
+
+        # bulk_create stamps created_at/updated_at with now; put the originals back
+        stored = Note.objects.filter(character_id__in={a.owner_id for a in attributes})
+        restored = []
+        for note in stored:
+            times = timestamps.get((note.character_id, note.number))
+            if times:
+                note.created_at, note.updated_at = times
+                restored.append(note)
+        Note.objects.bulk_update(restored, ["created_at", "updated_at"], batch_size=500)
+
+        # Values that couldn't be read are left in place for staff to look at
+        Attribute.objects.filter(id__in=[a.id for a in readable]).delete()
+
+    # Characters already in memory still have the Attributes cached
+    for owner_id in {a.owner_id for a in attributes}:
+        obj = ObjectDB.get_cached_instance(owner_id)
+        if obj:
+            obj.attributes.reset_cache()
+
+    return migrated
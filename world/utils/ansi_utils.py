@@ -1,78 +1,170 @@
-import textwrap
-from evennia.utils.ansi import strip_raw_ansi, ANSIString
+"""
+ANSI-aware text wrapping and measuring.
 
-def wrap_ansi(text, width, left_padding=0, right_padding=0):
+wrap_ansi() wraps text containing Evennia |-markup and/or raw ANSI escape
+sequences in a single pass. Markup is left in place and only counted for
+the width it takes up on screen, so no ANSIString has to be built to wrap.
+"""
+
+import re
+import time
+
+# Markup and escapes, longest and escaped forms first so that "||r" is read
+# as an escaped pipe followed by "r" rather than as a colour code.
+_MARKUP_RE = re.compile(
+    r"\|\|"                          # escaped pipe
+    r"|\x1b\[[0-9;]*m"               # raw ANSI escape
+    r"|\|\[?#[0-9a-fA-F]{6}"         # truecolor |#ff0000, |[#ff0000
+    r"|\|\[?[0-5]{3}"                # xterm256 |500, |[500
+    r"|\|\[?=[a-z]"                  # greyscale |=a, |[=a
+    r"|\|\[[rgybmcwxRGYBMCWX]"       # backgrounds |[R, |[r
+    r"|\|!?[rgybmcwxRGYBMCWX]"       # foregrounds |r, |!R
+    r"|\|[nhHuUiIsS*^_>-]"           # formatting, |_ space, |> indent, |- tab
+    r"|%[tT]"                        # MUX tab, see MUX_COLOR_ANSI_EXTRA_MAP
+)
+
+# Visible width of the markup that takes up space; everything else is zero.
+# Tabs are counted as a four-column indent, the same as |>.
+_MARKUP_WIDTHS = {"||": 1, "|_": 1, "|>": 4, "|-": 4, "%t": 4, "%T": 4}
+
+# Whitespace runs, hard line breaks (newline or |/) and words
+_TOKEN_RE = re.compile(r"(?P<space> +)|(?P<newline>\n|\|/)|(?P<word>(?:\|\||[^ \n|]|\|(?!/))+)")
+
+
+def visible_width(text):
+    """
+    Get the number of columns a string takes up on screen, ignoring
+    Evennia markup and raw ANSI escapes.
+    """
+    if "|" not in text and "\x1b" not in text and "%" not in text:
+        return len(text)
+    width = len(text)
+    for match in _MARKUP_RE.finditer(text):
+        markup = match.group()
+        width -= len(markup) - _MARKUP_WIDTHS.get(markup, 0)
+    return width
+
+
+def crop_ansi(text, width, suffix="..."):
+    """
+    Crop a string to `width` visible columns, keeping its markup intact.
+    Cropped text ends with `suffix`, plus a colour reset if it had markup.
+    """
+    if visible_width(text) <= width:
+        return text
+    keep = max(width - len(suffix), 0)
+    suffix = suffix[:width]
+
+    parts = []
+    used = 0
+    position = 0
+    for match in _MARKUP_RE.finditer(text):
+        plain = text[position:match.start()]
+        markup = match.group()
+        markup_width = _MARKUP_WIDTHS.get(markup, 0)
+        if used + len(plain) >= keep or used + len(plain) + markup_width > keep:
+            parts.append(plain[:keep - used])
+            return "".join(parts) + suffix + "|n"
+        parts.append(plain)
+        parts.append(markup)
+        used += len(plain) + markup_width
+        position = match.end()
+
+    parts.append(text[position:position + keep - used])
+    return "".join(parts) + suffix + ("|n" if position else "")
+
+
+def wrap_ansi(text, width, left_padding=0, right_padding=0, hanging_indent=0):
     """
     Wraps a string to the specified width, preserving ANSI codes, with optional left and right padding.
 
+    Newlines and |/ start a new line. Runs of spaces between words and at the
+    start of a paragraph are kept; words longer than the width are not split.
+
     Args:
         text (str): The text to wrap.
         width (int): The width to wrap the text to, including padding.
         left_padding (int): The amount of padding to add to the left side.
         right_padding (int): The amount of padding to add to the right side.
+        hanging_indent (int): Extra indent for the continuation lines of
+            each paragraph.
 
     Returns:
         str: The wrapped text with padding.
     """
-    if left_padding + right_padding >= width:
+    if left_padding + right_padding + hanging_indent >= width:
         raise ValueError("Combined padding is too large for the given width.")
 
-    # Convert to ANSIString to handle color codes
-    ansi_text = ANSIString(text)
-    
-    # Get clean text for wrapping calculations
-    clean_text = ansi_text.clean()
-    
-    # Calculate actual display width
     wrap_width = width - left_padding - right_padding
+    left = " " * left_padding
+    right = " " * right_padding
+    hanging = " " * hanging_indent
+
+    lines = []
+    line = []
+    line_width = 0
+    pending_space = ""
+    paragraph_start = True
+    has_words = False
 
-    # Split into words while preserving color codes
-    words = []
-    current_word = ""
-    current_codes = ""
-    
-    for i, char in enumerate(str(ansi_text)):
-        if char == '|' and i + 1 < len(str(ansi_text)):
-            current_codes += char + str(ansi_text)[i + 1]
+    for match in _TOKEN_RE.finditer(text):
+        kind = match.lastgroup
+        token = match.group()
+
+        if kind == "space":
+            if line or paragraph_start:
+                pending_space += token
             continue
-        elif char == ' ':
-            if current_word:
-                words.append(current_codes + current_word)
-                current_word = ""
-                current_codes = ""
-            else:
-                words.append(' ')
-        else:
-            current_word += char
-    
-    if current_word:
-        words.append(current_codes + current_word)
 
-    # Build wrapped lines
-    lines = []
-    current_line = []
-    current_length = 0
-
-    for word in words:
-        word_clean = ANSIString(word).clean()
-        word_length = len(word_clean)
-        
-        if current_length + word_length <= wrap_width:
-            current_line.append(word)
-            current_length += word_length + (1 if current_length > 0 else 0)
+        if kind == "newline":
+            lines.append(left + "".join(line) + right)
+            line = []
+            line_width = 0
+            pending_space = ""
+            paragraph_start = True
+            continue
+
+        has_words = True
+        word_width = visible_width(token)
+        if line and line_width + len(pending_space) + word_width > wrap_width:
+            lines.append(left + "".join(line) + right)
+            line = [hanging, token]
+            line_width = hanging_indent + word_width
         else:
-            if current_line:
-                lines.append(" ".join(current_line))
-            current_line = [word]
-            current_length = word_length
+            line.append(pending_space)
+            line.append(token)
+            line_width += len(pending_space) + word_width
+        pending_space = ""
+        paragraph_start = False
+
+    if line:
+        lines.append(left + "".join(line) + right)
+
+    if not has_words:
+        return ""
+    return "\n".join(lines)
+
+
+def benchmark(size=10_000, repeat=20):
+    """
+    Time wrap_ansi on a ~size-character room description and on a
+    multidesc-style text made of short coloured paragraphs.
+    Returns {name: milliseconds per wrap}.
+    """
+    sentence = "The |rneon|n signs |[B|wflicker|n over a |500rain-slick|n street,  and ||pipes|| hiss. "
+    description = (sentence * (size // len(sentence) + 1))[:size]
+    paragraph = "|c%s|n wears a \x1b[1m\x1b[33mbattered\x1b[0m synthleather jacket.|/" % "Someone"
+    multidesc = (paragraph * (size // len(paragraph) + 1))[:size]
 
-    if current_line:
-        lines.append(" ".join(current_line))
+    results = {}
+    for name, text in (("description", description), ("multidesc", multidesc)):
+        start = time.perf_counter()
+        for _ in range(repeat):
+            wrap_ansi(text, width=78, left_padding=2, hanging_indent=4)
+        results[name] = (time.perf_counter() - start) * 1000 / repeat
+    return results
 
-    # Add padding
-    padded_lines = [
-        " " * left_padding + line + " " * right_padding
-        for line in lines
-    ]
 
-    return "\n".join(padded_lines)
+if __name__ == "__main__":
+    for name, elapsed in benchmark().items():
+        print(f"{name:>12}: {elapsed:.2f} ms per 10 KB wrap")
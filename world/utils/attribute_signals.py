@@ -0,0 +1,67 @@
+"""
+Receivers for changes to plain (uncategorized) Attributes.
+
+Modules that cache values read from Attributes register with
+watch_attributes() instead of each connecting post_save, pre_delete and
+m2m_changed themselves.
+"""
+
+from django.db.models.signals import m2m_changed, post_save, pre_delete
+from evennia.objects.models import ObjectDB
+from evennia.typeclasses.attributes import Attribute
+
+
+def watch_attributes(keys, uid, tracked=None):
+    """
+    Call the decorated func(obj_id, key, value) when an uncategorized
+    Attribute named in `keys` is saved or deleted; `value` is None once it
+    is deleted.
+
+        @watch_attributes(("cool", "skills"), "catalogue", tracked=_HAGGLE)
+        def _attribute_changed(obj_id, key, value):
+            forget(obj_id)
+
+    `tracked` is the caller's cache, keyed by object id: only changes on
+    objects in it are reported, and nothing is looked up while it is empty.
+    Without it, func is called with obj_id None and the Attribute's owner
+    is never looked up, for caches that can't map Attributes to owners
+    (such as Attributes on accounts).
+
+    Args:
+        keys (tuple): Attribute keys to watch.
+        uid (str): Prefix for the receivers' dispatch_uids.
+        tracked (dict or set, optional): Object ids the caller caches.
+    """
+    keys = frozenset(keys)
+
+    def decorator(func):
+        def changed(sender, instance, created=False, **kwargs):
+            if instance.db_key not in keys or instance.db_category:
+                return
+            value = None if kwargs["signal"] is pre_delete else instance.value
+            if tracked is None:
+                func(None, instance.db_key, value)
+                return
+            # New Attributes are reported by added() once linked to their object
+            if created or not tracked:
+                return
+            for obj_id in ObjectDB.objects.filter(db_attributes=instance).values_list("id", flat=True):
+                if obj_id in tracked:
+                    func(obj_id, instance.db_key, value)
+
+        def added(sender, instance, action, reverse, pk_set, **kwargs):
+            if action != "post_add" or reverse or not tracked or instance.id not in tracked:
+                return
+            attributes = Attribute.objects.filter(id__in=pk_set, db_key__in=keys, db_category__isnull=True)
+            for attribute in attributes:
+                func(instance.id, attribute.db_key, attribute.value)
+
+        post_save.connect(changed, sender=Attribute, weak=False, dispatch_uid=f"{uid}_attribute_saved")
+        pre_delete.connect(changed, sender=Attribute, weak=False, dispatch_uid=f"{uid}_attribute_deleted")
+        if tracked is not None:
+            m2m_changed.connect(
+                added, sender=ObjectDB.db_attributes.through, weak=False, dispatch_uid=f"{uid}_attributes_added"
+            )
+        return func
+
+    return decorator
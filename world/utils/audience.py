@@ -0,0 +1,151 @@
+"""
+Reality-layer audiences for poses, says and emits.
+
+Characters in the Umbra, the Material or the Dreaming only hear others in
+the same layer, and characters with no layer tag share the normal one. The
+layers of everything in a room are read with a single query and cached per
+room until its contents change or one of its occupants gains or loses a
+layer tag, so a line of RP costs no tag lookups at all in a settled scene.
+"""
+
+from django.db.models.signals import m2m_changed
+from django.dispatch import receiver
+from evennia.objects.models import ObjectDB
+from evennia.typeclasses.tags import Tag
+
+REALITY_LAYERS = ("in_umbra", "in_material", "in_dreaming")
+LAYER_CATEGORY = "state"
+
+# room id -> (ids of the room's contents, {layer or None: [object, ...]},
+#             {object id: frozenset of layers})
+_PARTITIONS = {}
+
+
+def _build_partitions(room, contents):
+    layers = {obj.id: set() for obj in contents}
+    tags = Tag.objects.filter(
+        objectdb__db_location=room,
+        db_key__in=REALITY_LAYERS,
+        db_category=LAYER_CATEGORY,
+        db_tagtype__isnull=True
+    ).values_list("objectdb__id", "db_key")
+    for obj_id, layer in tags:
+        if obj_id in layers:
+            layers[obj_id].add(layer)
+
+    partitions = {layer: [] for layer in REALITY_LAYERS + (None,)}
+    for obj in contents:
+        for layer in layers[obj.id] or (None,):
+            partitions[layer].append(obj)
+    return partitions, {obj_id: frozenset(obj_layers) for obj_id, obj_layers in layers.items()}
+
+
+def _room_cache(room):
+    contents = room.contents
+    signature = tuple(obj.id for obj in contents)
+    cached = _PARTITIONS.get(room.id)
+    if not cached or cached[0] != signature:
+        cached = (signature,) + _build_partitions(room, contents)
+        _PARTITIONS[room.id] = cached
+    return cached
+
+
+def get_partitions(room):
+    """
+    Get a room's contents split by reality layer.
+
+    Returns:
+        dict: {layer or None: [object, ...]}, in the room's contents order.
+            Objects in several layers appear in each of them.
+    """
+    return _room_cache(room)[1]
+
+
+def get_layers(obj):
+    """Get the reality layers an object in a room is in; empty for the normal layer."""
+    if not obj.location:
+        return frozenset()
+    return _room_cache(obj.location)[2].get(obj.id, frozenset())
+
+
+def get_audience(speaker):
+    """
+    Get the connected characters in the speaker's location who share a
+    reality layer with the speaker, in the room's contents order.
+    """
+    location = speaker.location
+    if not location:
+        return []
+    _, partitions, layers_by_id = _room_cache(location)
+    layers = layers_by_id.get(speaker.id)
+    if not layers:
+        return [obj for obj in partitions[None] if obj.has_account]
+    if len(layers) == 1:
+        return [obj for obj in partitions[next(iter(layers))] if obj.has_account]
+    # In more than one layer: everyone sharing any of them, each once
+    return [
+        obj for obj in location.contents
+        if obj.has_account and layers & layers_by_id.get(obj.id, frozenset())
+    ]
+
+
+def fan_out(speaker, message, pose_break=None, exclude=None, audience=None):
+    """
+    Send a line of RP to everyone who can hear the speaker, in one pass.
+
+    Args:
+        speaker (Object): The character posing or speaking.
+        message (str or callable): The text to send, or a function taking
+            the receiver and returning the text they should see (used for
+            language variants).
+        pose_break (str, optional): Sent before the message. The speaker
+            always gets it; excluded receivers do not.
+        exclude (list, optional): Receivers who get no pose break.
+        audience (list, optional): Receivers, if already looked up with
+            get_audience().
+    """
+    audience = get_audience(speaker) if audience is None else audience
+    exclude = exclude or ()
+    if pose_break and speaker not in audience:
+        speaker.msg(pose_break)
+    for receiver in audience:
+        if pose_break and (receiver == speaker or receiver not in exclude):
+            receiver.msg(pose_break)
+        if message is not None:
+            receiver.msg(message(receiver) if callable(message) else message)
+
+
+def invalidate(room_id):
+    """
+    Drop a room's cached partitions. Tag adds and removes are picked up
+    by signal, but TagHandler.clear() deletes tag links without sending
+    any, so call this after clearing an occupant's tags.
+    """
+    _PARTITIONS.pop(room_id, None)
+
+
+def _invalidate_object(obj_id):
+    obj = ObjectDB.get_cached_instance(obj_id)
+    if obj is not None:
+        if obj.db_location_id:
+            invalidate(obj.db_location_id)
+        return
+    # Not loaded: only rooms whose cached partitions include it are affected
+    for room_id, cached in list(_PARTITIONS.items()):
+        if obj_id in cached[2]:
+            invalidate(room_id)
+
+
+@receiver(m2m_changed, sender=ObjectDB.db_tags.through, dispatch_uid="audience_tag_changed")
+def _tags_changed(sender, instance, action, reverse, pk_set, **kwargs):
+    if action not in ("post_add", "post_remove", "post_clear"):
+        return
+    if not reverse:
+        _invalidate_object(instance.id)
+    elif pk_set is None:
+        # A tag was taken off every object that had it
+        _PARTITIONS.clear()
+    else:
+        for obj_id in pk_set:
+            _invalidate_object(obj_id)
+
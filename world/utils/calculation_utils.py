@@ -1,5 +1,9 @@
 # /root/cyberpunk/cyberpunk/world/utils/calculation_utils.py
 
+from operator import attrgetter, mul
+from django.db.models.signals import post_delete, post_save
+from django.dispatch import receiver
+from world.languages.models import CharacterLanguage
 
 STAT_MAPPING = {
     'INT': 'intelligence',
@@ -103,32 +107,98 @@ SKILL_MAPPING = {
     'MOTO': 'moto'
 }
 
-def calculate_points_spent(character):
-    stat_points = sum(getattr(character, attr) for attr in STAT_MAPPING.values())
-    double_cost_skills = ['autofire', 'martial_arts', 'pilot_air', 'heavy_weapons', 'demolitions', 'electronics', 'paramedic']
-    skill_points = sum([
-        getattr(character, skill, 0) * (2 if skill in double_cost_skills else 1)
-        for skill in SKILL_MAPPING.values()
-    ])
-    
-    # Add points from languages
-    skill_points += sum(lang.level for lang in character.character_languages.all())
-    
+STAT_POINTS = 62
+SKILL_POINTS = 86
+
+DOUBLE_COST_SKILLS = frozenset([
+    'autofire', 'martial_arts', 'pilot_air', 'heavy_weapons', 'demolitions', 'electronics', 'paramedic'
+])
+
+# The compiled cost table. Every stat and skill has a fixed slot; reading a
+# sheet is one attrgetter call giving its values in slot order, and the
+# points spent are dot products of those values with the weights below.
+STAT_SLOTS = tuple(STAT_MAPPING.values())
+SKILL_SLOTS = tuple(SKILL_MAPPING.values())
+SLOTS = STAT_SLOTS + SKILL_SLOTS
+STAT_WEIGHTS = (1,) * len(STAT_SLOTS) + (0,) * len(SKILL_SLOTS)
+SKILL_WEIGHTS = (0,) * len(STAT_SLOTS) + tuple(
+    2 if skill in DOUBLE_COST_SKILLS else 1 for skill in SKILL_SLOTS
+)
+_read_slots = attrgetter(*SLOTS)
+
+# sheet id -> (slot values, (stat points, skill points)) for the values the
+# points were last worked out from
+_SPENT = {}
+
+
+def skill_cost(skill):
+    """Get what one level of a skill costs."""
+    return 2 if skill in DOUBLE_COST_SKILLS else 1
+
+
+def points_for(values):
+    """Get (stat points, skill points) spent for slot values, not counting languages."""
+    return sum(map(mul, STAT_WEIGHTS, values)), sum(map(mul, SKILL_WEIGHTS, values))
+
+
+def calculate_points_spent(sheet):
+    """
+    Get the (stat points, skill points) a character sheet has spent,
+    languages included. Cached until the sheet's values or languages change.
+    """
+    values = tuple(value or 0 for value in _read_slots(sheet))
+    cached = _SPENT.get(sheet.id)
+    if cached and cached[0] == values:
+        return cached[1]
+
+    stat_points, skill_points = points_for(values)
+    skill_points += sum(sheet.character_languages.values_list('level', flat=True))
+    if sheet.id:
+        _SPENT[sheet.id] = (values, (stat_points, skill_points))
+    return stat_points, skill_points
+
+
+def calculate_character_points_spent(character):
+    """
+    Get the (stat points, skill points) a typeclass character has spent,
+    from its stat Attributes, skills, skill instances and languages.
+    """
+    stat_points = sum(getattr(character.db, stat) or 0 for stat in STAT_SLOTS)
+
+    skill_points = sum(
+        (value or 0) * skill_cost(skill) for skill, value in (character.db.skills or {}).items()
+    )
+    for instance, value in (character.db.skill_instances or {}).items():
+        # Instance keys look like "skill(instance)"
+        if "(" in instance:
+            skill_points += (value or 0) * skill_cost(instance.split("(")[0])
+
+    skill_points += sum((character.db.languages or {}).values())
     return stat_points, skill_points
 
+
+def remaining_points(stat_points_spent, skill_points_spent):
+    return max(0, STAT_POINTS - stat_points_spent), max(0, SKILL_POINTS - skill_points_spent)
+
+
 def get_remaining_points(character, is_edgerunner=False):
-    stat_points_spent, skill_points_spent = calculate_points_spent(character)
-    
-    stat_points_limit = 62
-    skill_points_limit = 86
-    
-    remaining_stat_points = max(0, stat_points_limit - stat_points_spent)
-    remaining_skill_points = max(0, skill_points_limit - skill_points_spent)
-    
+    remaining_stat_points, remaining_skill_points = remaining_points(*calculate_points_spent(character))
+
     if is_edgerunner:
         # For Edgerunners, add any unspent points to the remaining points
         total_remaining = (remaining_stat_points + remaining_skill_points)
         remaining_stat_points = total_remaining
         remaining_skill_points = total_remaining
-    
-    return remaining_stat_points, remaining_skill_points
\ No newline at end of file
+
+    return remaining_stat_points, remaining_skill_points
+
+
+@receiver(post_save, sender=CharacterLanguage, dispatch_uid="points_language_saved")
+@receiver(post_delete, sender=CharacterLanguage, dispatch_uid="points_language_deleted")
+def _language_changed(sender, instance, **kwargs):
+    _SPENT.pop(instance.character_sheet_id, None)
+
+
+@receiver(post_delete, sender="cyberpunk_sheets.CharacterSheet", dispatch_uid="points_sheet_deleted")
+def _sheet_deleted(sender, instance, **kwargs):
+    _SPENT.pop(instance.id, None)
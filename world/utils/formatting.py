@@ -1,5 +1,49 @@
 from evennia.utils.ansi import ANSIString
 from collections import defaultdict
+from functools import lru_cache, wraps
+from world.utils.ansi_utils import visible_width
+
+# header(), divider() and footer() are called with the same few titles and
+# widths on every screen, so their results are memoized.
+LAYOUT_CACHE_SIZE = 1024
+
+
+class _RawKey:
+    """
+    Cache key for an ANSIString argument. ANSIString hashes and compares by
+    its clean text, so '|rBar|n' and '|gBar|n' would share one cache entry;
+    this compares by the raw text, colour codes included.
+    """
+    __slots__ = ("value", "raw")
+
+    def __init__(self, value):
+        self.value = value
+        self.raw = str(value)
+
+    def __hash__(self):
+        return hash(self.raw)
+
+    def __eq__(self, other):
+        return isinstance(other, _RawKey) and self.raw == other.raw
+
+
+def _layout_cache(func):
+    """Memoize a layout helper, keying ANSIString arguments on their raw text."""
+    @lru_cache(maxsize=LAYOUT_CACHE_SIZE)
+    def cached(*args, **kwargs):
+        args = [arg.value if isinstance(arg, _RawKey) else arg for arg in args]
+        kwargs = {name: value.value if isinstance(value, _RawKey) else value for name, value in kwargs.items()}
+        return func(*args, **kwargs)
+
+    @wraps(func)
+    def wrapper(*args, **kwargs):
+        args = [_RawKey(arg) if isinstance(arg, ANSIString) else arg for arg in args]
+        kwargs = {name: _RawKey(value) if isinstance(value, ANSIString) else value for name, value in kwargs.items()}
+        return cached(*args, **kwargs)
+
+    wrapper.cache_info = cached.cache_info
+    wrapper.cache_clear = cached.cache_clear
+    return wrapper
 
 def format_stat(name: str, value: int, default: int = 0, tempvalue: int = None, width: int = 25, allow_zero: bool = False) -> str:
     """
@@ -37,18 +81,23 @@ def format_stat(name: str, value: int, default: int = 0, tempvalue: int = None,
     # Format the full string with padding
     return f" {name}{'.' * (width - len(name) - len(value_str) - 2)} {value_str}"
 
+@_layout_cache
 def header(title, width=78, color="|y", fillchar="-", bcolor="|b"):
     """Create a header with consistent width."""
     # Ensure the title has proper spacing
     title = f" {title} "
-    left_dashes = bcolor + fillchar * ((width - len(ANSIString(title).clean()) - 2) // 2) + "|n"
-    right_dashes = bcolor + fillchar * (width - len(ANSIString(title).clean()) - 2 - len(ANSIString(left_dashes).clean())) + "|n"
+    title_width = visible_width(title)
+    left_count = (width - title_width - 2) // 2
+    left_dashes = bcolor + fillchar * left_count + "|n"
+    right_dashes = bcolor + fillchar * (width - title_width - 2 - left_count * visible_width(str(fillchar))) + "|n"
     return f"{left_dashes}{color}{title}|n{right_dashes}\n"
 
+@_layout_cache
 def footer(width=78, fillchar="-"):
     """Create a footer with consistent width."""
     return "|b" + fillchar * width + "|n\n"
 
+@_layout_cache
 def divider(title, width=78, fillchar="-", color="|b", text_color="|y"):
     """Create a divider with consistent width."""
     if isinstance(fillchar, ANSIString):
@@ -58,7 +107,7 @@ def divider(title, width=78, fillchar="-", color="|b", text_color="|y"):
 
     if title:
         # Calculate the width of the title text without color codes
-        title_width = len(ANSIString(title).clean())
+        title_width = visible_width(str(title))
         
         # For column headers, center the title
         if width <= 25:  # Column headers
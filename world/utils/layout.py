@@ -0,0 +1,148 @@
+"""
+Column and table layout for fixed-width screens.
+
+Cells are measured once with visible_width() when they are added, so
+padding and cropping never have to build ANSIStrings. Markup in cells is
+left as written and rendered by msg() as usual.
+"""
+
+import time
+from world.utils.ansi_utils import crop_ansi, visible_width
+
+
+def pad(text, width, align="<", text_width=None):
+    """
+    Pad text to `width` visible columns. `align` is "<", ">" or "^".
+    Pass `text_width` if the visible width is already known.
+    """
+    text = str(text)
+    if text_width is None:
+        text_width = visible_width(text)
+    fill = width - text_width
+    if fill <= 0:
+        return text
+    if align == ">":
+        return " " * fill + text
+    if align == "^":
+        left = fill // 2
+        return " " * left + text + " " * (fill - left)
+    return text + " " * fill
+
+
+def columns(items, column_width, count=2, separator=" "):
+    """
+    Lay items out left to right in `count` columns of `column_width`.
+
+    Returns:
+        str: One line per row, each ending in a newline.
+    """
+    measured = [(str(item), visible_width(str(item))) for item in items]
+    output = []
+    for start in range(0, len(measured), count):
+        row = measured[start:start + count]
+        cells = [pad(text, column_width, text_width=text_width) for text, text_width in row[:-1]]
+        cells.append(row[-1][0])
+        output.append(separator.join(cells) + "\n")
+    return "".join(output)
+
+
+class Table:
+    """
+    A fixed-width table.
+
+    Usage:
+        table = Table(("ID", 5), ("Title", 30), ("Status", 8, ">"))
+        table.add_row(1, "|rBroken door|n", "open")
+        caller.msg(table.render())
+
+    Each column is (title, width) or (title, width, align). Cells wider than
+    their column are cropped with an ellipsis.
+    """
+
+    def __init__(self, *columns, separator=" ", header_color="|w"):
+        self.columns = [(column + ("<",))[:3] for column in columns]
+        self.separator = separator
+        self.header_color = header_color
+        self.rows = []
+
+    def add_row(self, *cells):
+        row = []
+        for (title, width, align), cell in zip(self.columns, cells):
+            text = "" if cell is None else str(cell)
+            text_width = visible_width(text)
+            if text_width > width:
+                text = crop_ansi(text, width)
+                text_width = width
+            row.append((text, text_width))
+        self.rows.append(row)
+
+    def header_line(self):
+        titles = [pad(crop_ansi(title, width), width, align) for title, width, align in self.columns]
+        return f"{self.header_color}{self.separator.join(titles).rstrip()}|n"
+
+    def row_lines(self):
+        lines = []
+        for row in self.rows:
+            cells = [
+                pad(text, width, align, text_width)
+                for (text, text_width), (_, width, align) in zip(row, self.columns)
+            ]
+            lines.append(self.separator.join(cells).rstrip())
+        return lines
+
+    def render(self, show_header=True):
+        lines = [self.header_line()] if show_header else []
+        lines.extend(self.row_lines())
+        return "\n".join(lines)
+
+    def __str__(self):
+        return self.render()
+
+
+def benchmark(rows=50, repeat=50):
+    """
+    Time a job-list sized table built with Table, with EvTable and with
+    hand-formatted f-strings, and header/divider/footer calls.
+    Returns {name: milliseconds per render}.
+    """
+    from evennia.utils.evtable import EvTable
+    from world.utils.formatting import header, divider, footer
+
+    data = [
+        (index, "Build", f"|rBroken door|n in the Afterlife bar number {index}", "Player", "-----", "open")
+        for index in range(rows)
+    ]
+    results = {}
+
+    start = time.perf_counter()
+    for _ in range(repeat):
+        table = Table(("Job #", 5), ("Queue", 9), ("Job Title", 24), ("Originator", 11), ("Assignee", 11), ("Status", 8))
+        for row in data:
+            table.add_row(*row)
+        table.render()
+    results["Table"] = (time.perf_counter() - start) * 1000 / repeat
+
+    start = time.perf_counter()
+    for _ in range(repeat):
+        table = EvTable("Job #", "Queue", "Job Title", "Originator", "Assignee", "Status", border="header", width=78)
+        for row in data:
+            table.add_row(*row)
+        str(table)
+    results["EvTable"] = (time.perf_counter() - start) * 1000 / repeat
+
+    start = time.perf_counter()
+    for _ in range(repeat):
+        "\n".join(
+            f"{job_id:<5} {queue:<9} {title[:24]:<24} {originator:<11} {assignee:<11} {status}"
+            for job_id, queue, title, originator, assignee, status in data
+        )
+    results["f-strings"] = (time.perf_counter() - start) * 1000 / repeat
+
+    start = time.perf_counter()
+    for _ in range(repeat):
+        header("Night CityMUX Jobs", width=78, fillchar="|b-|n")
+        divider("Characters", width=78)
+        footer(width=78)
+    results["header/divider/footer"] = (time.perf_counter() - start) * 1000 / repeat
+
+    return results
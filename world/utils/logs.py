@@ -0,0 +1,177 @@
+"""
+Subsystem logging.
+
+Game code logs through stdlib loggers under "cyberpunk." (for example
+get_logger("time") is "cyberpunk.time"), so each subsystem's level can be
+set in settings.LOGGING or changed at runtime with the loglevel command.
+A debug call below its logger's level costs a level check and nothing
+else. Pass arguments %-style rather than pre-formatting with f-strings, so
+the message is only built for records that are kept:
+
+    log = get_logger("time")
+    log.debug("timezone player=%s tz=%s", player.key, tz)
+
+Records that pass the level check go through two more stages:
+
+    - DEBUG records are sampled (settings.LOG_SAMPLE_RATES, keep one in N
+      per subsystem) and rate limited per call site (at most
+      settings.LOG_RATE_LIMIT per settings.LOG_RATE_WINDOW seconds). The
+      next record let through from a throttled call site reports how many
+      were suppressed.
+    - Everything is handed to a bounded queue and written to the
+      configured handlers by a background thread, so file I/O never
+      happens on the reactor thread. If the queue is full, records are
+      dropped and counted rather than blocking the game.
+"""
+
+import logging
+import time
+from logging.handlers import QueueHandler, QueueListener
+from queue import Full, Queue
+from django.conf import settings
+
+ROOT = "cyberpunk"
+
+RATE_LIMIT = getattr(settings, "LOG_RATE_LIMIT", 20)
+RATE_WINDOW = getattr(settings, "LOG_RATE_WINDOW", 60)
+QUEUE_SIZE = getattr(settings, "LOG_QUEUE_SIZE", 10000)
+SAMPLE_RATES = getattr(settings, "LOG_SAMPLE_RATES", {})
+
+_LISTENER = None
+_HANDLER = None
+
+
+class DebugThrottle(logging.Filter):
+    """Samples and rate limits DEBUG records; other levels pass untouched."""
+
+    def __init__(self):
+        super().__init__()
+        # (logger name, path, line) -> [window start, emitted, suppressed]
+        self.sites = {}
+        # logger name -> records seen, for sampling
+        self.seen = {}
+
+    def sample_rate(self, name):
+        while name:
+            if name in SAMPLE_RATES:
+                return SAMPLE_RATES[name]
+            name = name.rpartition(".")[0]
+        return 1
+
+    def filter(self, record):
+        if record.levelno > logging.DEBUG:
+            return True
+
+        rate = self.sample_rate(record.name)
+        if rate > 1:
+            seen = self.seen.get(record.name, 0)
+            self.seen[record.name] = seen + 1
+            if seen % rate:
+                return False
+
+        key = (record.name, record.pathname, record.lineno)
+        now = time.monotonic()
+        site = self.sites.get(key)
+        if site is None or now - site[0] >= RATE_WINDOW:
+            suppressed = site[2] if site else 0
+            self.sites[key] = [now, 1, 0]
+        elif site[1] < RATE_LIMIT:
+            site[1] += 1
+            suppressed = 0
+        else:
+            site[2] += 1
+            return False
+
+        if suppressed:
+            record.msg = f"{record.msg} [{suppressed} similar suppressed]"
+        return True
+
+
+class BoundedQueueHandler(QueueHandler):
+    """A QueueHandler that drops records instead of blocking when full."""
+
+    def __init__(self, queue):
+        super().__init__(queue)
+        self.dropped = 0
+
+    def enqueue(self, record):
+        try:
+            self.queue.put_nowait(record)
+        except Full:
+            self.dropped += 1
+            return
+        if self.dropped:
+            dropped, self.dropped = self.dropped, 0
+            try:
+                self.queue.put_nowait(logging.makeLogRecord({
+                    "name": ROOT,
+                    "levelno": logging.WARNING,
+                    "levelname": "WARNING",
+                    "msg": f"log queue was full; dropped {dropped} records",
+                }))
+            except Full:
+                self.dropped += dropped
+
+
+def _install():
+    """Put the cyberpunk loggers' handlers behind the bounded queue."""
+    global _LISTENER, _HANDLER
+    root = logging.getLogger(ROOT)
+    targets = root.handlers[:] or logging.getLogger().handlers[:]
+
+    _HANDLER = BoundedQueueHandler(Queue(QUEUE_SIZE))
+    _HANDLER.addFilter(DebugThrottle())
+    root.handlers = [_HANDLER]
+    root.propagate = False
+
+    _LISTENER = QueueListener(_HANDLER.queue, *targets, respect_handler_level=True)
+    _LISTENER.start()
+
+
+def get_logger(subsystem):
+    """
+    Get the logger for a subsystem.
+
+    Args:
+        subsystem (str): Short name, such as "time" or "cyberware".
+
+    Returns:
+        logging.Logger: The "cyberpunk.<subsystem>" logger.
+    """
+    if _HANDLER is None:
+        _install()
+    return logging.getLogger(f"{ROOT}.{subsystem}")
+
+
+def set_level(subsystem, level):
+    """
+    Set a subsystem's level at runtime.
+
+    Args:
+        subsystem (str): Short name, or "" for every subsystem without its
+            own level.
+        level (str or int): A level name such as "DEBUG", or None/"" to
+            inherit from the parent logger again.
+    """
+    name = f"{ROOT}.{subsystem}" if subsystem else ROOT
+    if isinstance(level, str):
+        level = level.upper() or logging.NOTSET
+    logging.getLogger(name).setLevel(level or logging.NOTSET)
+
+
+def get_levels():
+    """{logger name: effective level name} for every cyberpunk logger in use."""
+    names = [ROOT] + sorted(
+        name for name in logging.root.manager.loggerDict if name.startswith(ROOT + ".")
+    )
+    return {
+        name: logging.getLevelName(logging.getLogger(name).getEffectiveLevel())
+        for name in names
+    }
+
+
+def flush():
+    """Write out everything queued so far, waiting until it is written."""
+    if _LISTENER is not None:
+        _LISTENER.stop()
+        _LISTENER.start()
@@ -0,0 +1,73 @@
+"""
+Idempotent seeding of static catalogue tables.
+
+Each catalogue (weapons, armor, cyberware, ...) is a list of row dicts in
+code. seed_catalogue() hashes the rows and stores the hash in ServerConfig,
+so a server start or reload with unchanged data costs one query per
+catalogue. When the data has changed, the table is reconciled by name with
+one SELECT, one bulk_create and one bulk_update in a single transaction.
+"""
+
+import hashlib
+import json
+from django.db import transaction
+from evennia.server.models import ServerConfig
+from evennia.utils import logger
+
+
+def catalogue_hash(rows):
+    """Get a stable hash of a catalogue's rows."""
+    data = json.dumps(rows, sort_keys=True, default=str)
+    return hashlib.sha256(data.encode("utf-8")).hexdigest()
+
+
+def seed_catalogue(key, model, rows, force=False):
+    """
+    Bring a catalogue table in line with its rows, matching on name.
+
+    Rows in the table but not in the catalogue are left alone, as are fields
+    the rows don't mention.
+
+    Args:
+        key (str): Name the catalogue's hash is stored under.
+        model (Model): The catalogue's model.
+        rows (list): Dicts of field values, each with a "name".
+        force (bool): Reconcile even if the hash is unchanged.
+
+    Returns:
+        tuple or None: (created, updated), or None if the catalogue was
+            unchanged and skipped.
+    """
+    config_key = f"catalogue_hash_{key}"
+    digest = catalogue_hash(rows)
+    if not force and ServerConfig.objects.conf(config_key) == digest:
+        return None
+
+    fields = sorted({field for row in rows for field in row} - {"name"})
+    with transaction.atomic():
+        existing = {
+            obj.name: obj
+            for obj in model.objects.filter(name__in=[row["name"] for row in rows])
+        }
+        to_create = []
+        to_update = []
+        for row in rows:
+            obj = existing.get(row["name"])
+            if obj is None:
+                to_create.append(model(**row))
+                continue
+            changed = False
+            for field, value in row.items():
+                if getattr(obj, field) != value:
+                    setattr(obj, field, value)
+                    changed = True
+            if changed:
+                to_update.append(obj)
+
+        model.objects.bulk_create(to_create)
+        if to_update and fields:
+            model.objects.bulk_update(to_update, fields)
+        ServerConfig.objects.conf(config_key, digest)
+
+    logger.log_info(f"Seeded {key}: {len(to_create)} created, {len(to_update)} updated.")
+    return len(to_create), len(to_update)
@@ -0,0 +1,123 @@
+"""
+Timed, staged server startup.
+
+Startup work is split into named steps, each declared with a mode:
+
+    EAGER       run in at_server_start, before anyone can log in
+    BACKGROUND  run one at a time from the reactor just after startup, so
+                logins are served in between
+    LAZY        run the first time something calls require() for it, or
+                after the background steps if nothing has by then
+
+Every step is timed and its query count recorded; each run is logged as a
+single key=value line (grep for "startup step=") and kept in
+get_timings() for comparison between reloads.
+"""
+
+import time
+from django.db import connection
+from evennia.utils import logger
+
+EAGER = "eager"
+BACKGROUND = "background"
+LAZY = "lazy"
+
+BACKGROUND_DELAY = 0.5  # seconds between background steps
+
+# name -> (func, mode), in declaration order
+_STEPS = {}
+# names of the steps that have run (or are running)
+_DONE = set()
+# name -> {"mode", "ms", "queries", "ok"}
+_TIMINGS = {}
+
+
+def startup_step(name, mode=EAGER):
+    """
+    Declare a function as a startup step.
+
+        @startup_step("catalogues", BACKGROUND)
+        def seed_catalogues():
+            ...
+    """
+    def decorator(func):
+        _STEPS[name] = (func, mode)
+        return func
+    return decorator
+
+
+class _QueryCounter:
+    def __init__(self):
+        self.count = 0
+
+    def __call__(self, execute, sql, params, many, context):
+        self.count += 1
+        return execute(sql, params, many, context)
+
+
+def run_step(name):
+    """Run a step now, once, timing it. Errors are logged, not raised."""
+    if name in _DONE or name not in _STEPS:
+        return
+    _DONE.add(name)
+    func, mode = _STEPS[name]
+
+    counter = _QueryCounter()
+    ok = True
+    start = time.perf_counter()
+    try:
+        with connection.execute_wrapper(counter):
+            func()
+    except Exception as e:
+        ok = False
+        logger.log_trace(f"Startup step {name} failed: {e}")
+    elapsed = (time.perf_counter() - start) * 1000
+
+    _TIMINGS[name] = {"mode": mode, "ms": elapsed, "queries": counter.count, "ok": ok}
+    logger.log_info(
+        f"startup step={name!r} mode={mode} ms={elapsed:.1f} queries={counter.count} "
+        f"status={'ok' if ok else 'failed'}"
+    )
+
+
+def require(name):
+    """Make sure a lazy step has run before using what it sets up."""
+    if name not in _DONE:
+        run_step(name)
+
+
+def _steps(mode):
+    return [name for name, (_, step_mode) in _STEPS.items() if step_mode == mode]
+
+
+def run_startup():
+    """
+    Run the eager steps now and queue the background steps, followed by any
+    lazy steps nothing has needed yet.
+    """
+    start = time.perf_counter()
+    for name in _steps(EAGER):
+        run_step(name)
+    logger.log_info(f"startup phase=eager ms={(time.perf_counter() - start) * 1000:.1f}")
+
+    queued = _steps(BACKGROUND) + _steps(LAZY)
+    if queued:
+        from twisted.internet import reactor
+        reactor.callLater(BACKGROUND_DELAY, _run_queued, queued)
+
+
+def _run_queued(queued):
+    while queued and queued[0] in _DONE:
+        queued.pop(0)
+    if not queued:
+        return
+    run_step(queued.pop(0))
+    if queued:
+        from twisted.internet import reactor
+        reactor.callLater(BACKGROUND_DELAY, _run_queued, queued)
+
+
+def get_timings():
+    """{step name: {"mode", "ms", "queries", "ok"}} for every step run so far."""
+    return dict(_TIMINGS)
+
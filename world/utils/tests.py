@@ -0,0 +1,98 @@
+from django.test import SimpleTestCase
+from evennia.utils.ansi import ANSIString
+from world.utils.ansi_utils import crop_ansi, visible_width, wrap_ansi
+from world.utils.formatting import divider, footer, header
+
+
+class TestVisibleWidth(SimpleTestCase):
+
+    def test_plain_text(self):
+        self.assertEqual(visible_width("hello"), 5)
+
+    def test_colour_markup_has_no_width(self):
+        self.assertEqual(visible_width("|rred|n"), 3)
+        self.assertEqual(visible_width("|[B|wblue|n"), 4)
+        self.assertEqual(visible_width("|500x|[#ff0000y|=az"), 3)
+        self.assertEqual(visible_width("\x1b[1mbold\x1b[0m"), 4)
+
+    def test_escaped_pipe_is_one_column(self):
+        self.assertEqual(visible_width("a||b"), 3)
+        self.assertEqual(visible_width("||r"), 2)
+
+    def test_tabs_and_indents_are_four_columns(self):
+        self.assertEqual(visible_width("|-x"), 5)
+        self.assertEqual(visible_width("%tx"), 5)
+        self.assertEqual(visible_width("|>x"), 5)
+        self.assertEqual(visible_width("|_x"), 2)
+
+
+class TestCropAnsi(SimpleTestCase):
+
+    def test_short_text_is_unchanged(self):
+        self.assertEqual(crop_ansi("short", 8), "short")
+        self.assertEqual(crop_ansi("|rshort|n", 8), "|rshort|n")
+
+    def test_plain_text_is_cropped_with_suffix(self):
+        self.assertEqual(crop_ansi("hello world", 8), "hello...")
+
+    def test_markup_is_kept_and_reset(self):
+        self.assertEqual(crop_ansi("|rhello world|n", 8), "|rhello...|n")
+
+    def test_suffix_wider_than_width(self):
+        self.assertEqual(crop_ansi("hello world", 2), "..")
+
+
+class TestWrapAnsi(SimpleTestCase):
+
+    def test_wraps_on_visible_width(self):
+        self.assertEqual(wrap_ansi("|rone|n two three", 9), "|rone|n two\nthree")
+
+    def test_hard_breaks(self):
+        self.assertEqual(wrap_ansi("one|/two\nthree", 20), "one\ntwo\nthree")
+
+    def test_padding(self):
+        self.assertEqual(wrap_ansi("one two", 10, left_padding=2, right_padding=1), "  one two ")
+        self.assertEqual(wrap_ansi("one two", 8, left_padding=2), "  one\n  two")
+
+    def test_hanging_indent(self):
+        self.assertEqual(wrap_ansi("a b c d e", 5, hanging_indent=2), "a b c\n  d e")
+
+    def test_tab_indent_counts_four_columns(self):
+        self.assertEqual(wrap_ansi("|-abc def", 11), "|-abc def")
+        self.assertEqual(wrap_ansi("|-abc def", 10), "|-abc\ndef")
+        self.assertEqual(wrap_ansi("%tabc def", 10), "%tabc\ndef")
+
+    def test_escaped_pipe_counts_one_column(self):
+        self.assertEqual(wrap_ansi("||a b", 4), "||a b")
+        self.assertEqual(wrap_ansi("||a b", 3), "||a\nb")
+
+    def test_long_words_are_not_split(self):
+        self.assertEqual(wrap_ansi("averylongword x", 5), "averylongword\nx")
+
+    def test_padding_too_large(self):
+        with self.assertRaises(ValueError):
+            wrap_ansi("text", 4, left_padding=2, right_padding=2)
+
+    def test_empty_text(self):
+        self.assertEqual(wrap_ansi("   ", 10), "")
+
+
+class TestLayoutCache(SimpleTestCase):
+
+    def test_ansistring_titles_differing_in_colour(self):
+        red = header(ANSIString("|rBar|n"))
+        green = header(ANSIString("|gBar|n"))
+        self.assertNotEqual(red, green)
+        self.assertEqual(green, header.__wrapped__(ANSIString("|gBar|n")))
+
+    def test_ansistring_fillchars_differing_in_colour(self):
+        magenta = divider("Exits", fillchar=ANSIString("|m-|n"))
+        cyan = divider("Exits", fillchar=ANSIString("|c-|n"))
+        self.assertNotEqual(magenta, cyan)
+        self.assertEqual(cyan, divider.__wrapped__("Exits", fillchar=ANSIString("|c-|n")))
+
+    def test_repeated_calls_are_cached(self):
+        footer.cache_clear()
+        footer(width=40, fillchar=ANSIString("|m-|n"))
+        footer(width=40, fillchar=ANSIString("|m-|n"))
+        self.assertEqual(footer.cache_info().hits, 1)
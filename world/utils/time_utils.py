@@ -4,7 +4,16 @@ Time and timezone utilities for WoD20th.
 from datetime import datetime
 import pytz
 from evennia.utils.utils import lazy_property
-from evennia.utils.logger import log_info
+from world.utils.attribute_signals import watch_attributes
+from world.utils.logs import get_logger
+
+log = get_logger("time")
+
+# How the BBS and other Attribute-backed stores save datetimes
+STORED_FORMAT = "%Y-%m-%d %H:%M:%S"
+
+# (player model, player id) -> resolved pytz timezone
+_PLAYER_TIMEZONES = {}
 
 class TimeManager:
     """
@@ -102,6 +111,9 @@ class TimeManager:
         """
         Get a player's timezone. First checks for an explicit timezone setting,
         then falls back to location-based timezone, then UTC.
+
+        The result is cached per player until a timezone or location
+        Attribute changes.
         
         Args:
             player (Character or Account): The player whose timezone to get
@@ -109,13 +121,21 @@ class TimeManager:
         Returns:
             pytz.timezone: The timezone object for the player
         """
+        key = (player._meta.concrete_model, player.id)
+        tz = _PLAYER_TIMEZONES.get(key)
+        if tz is None:
+            tz = self._resolve_timezone(player)
+            _PLAYER_TIMEZONES[key] = tz
+        return tz
+
+    def _resolve_timezone(self, player):
         # First check for explicit timezone setting
         tz_name = player.attributes.get('timezone', None)
-        log_info(f"Player {player.key} timezone attribute: {tz_name}")
+        log.debug("timezone attribute player=%s tz=%s", player.key, tz_name)
         
         if tz_name:
             normalized_tz = self.normalize_timezone_name(tz_name)
-            log_info(f"Normalized timezone: {normalized_tz}")
+            log.debug("normalized timezone tz=%s", normalized_tz)
             if normalized_tz:
                 try:
                     return pytz.timezone(normalized_tz)
@@ -124,7 +144,7 @@ class TimeManager:
                     
         # Then check for location-based timezone
         location = player.attributes.get('location', None)
-        log_info(f"Player {player.key} location attribute: {location}")
+        log.debug("location attribute player=%s location=%s", player.key, location)
         
         if location:
             normalized_tz = self.normalize_timezone_name(location)
@@ -135,8 +155,17 @@ class TimeManager:
                     pass
                     
         # Fall back to UTC
-        log_info(f"Falling back to UTC for player {player.key}")
+        log.debug("falling back to UTC player=%s", player.key)
         return self.default_timezone
+
+    def forget_player_timezone(self, player=None):
+        """
+        Drop a player's cached timezone, or every player's if none is given.
+        """
+        if player is None:
+            _PLAYER_TIMEZONES.clear()
+        else:
+            _PLAYER_TIMEZONES.pop((player._meta.concrete_model, player.id), None)
         
     def convert_to_player_time(self, timestamp, player):
         """
@@ -154,15 +183,15 @@ class TimeManager:
             
         # Convert timestamp to datetime with explicit UTC timezone
         dt = datetime.fromtimestamp(timestamp).replace(tzinfo=pytz.UTC)
-        log_info(f"Original UTC time: {dt}")
+        log.debug("original UTC time=%s", dt)
         
         # Get player's timezone
         player_tz = self.get_player_timezone(player)
-        log_info(f"Player timezone: {player_tz}")
+        log.debug("player timezone tz=%s", player_tz)
         
         # Convert to player's timezone
         local_time = dt.astimezone(player_tz)
-        log_info(f"Converted local time: {local_time}")
+        log.debug("converted local time=%s", local_time)
         
         return local_time
         
@@ -187,5 +216,46 @@ class TimeManager:
             return local_time.strftime("%Y-%m-%d %H:%M %Z")
         return local_time.strftime("%Y-%m-%d %H:%M")
 
+    def format_times(self, values, player, fmt="%Y-%m-%d %H:%M"):
+        """
+        Format a batch of UTC times in a player's local time, resolving the
+        player's timezone once for the whole batch.
+
+        Args:
+            values (iterable): Unix timestamps, datetimes (naive ones are
+                taken as UTC) or "YYYY-MM-DD HH:MM:SS" strings as stored by
+                the BBS. None stays None; strings that don't parse are
+                returned unchanged.
+            player (Character or Account): The player whose timezone to use
+            fmt (str, optional): strftime format
+
+        Returns:
+            list: The formatted strings, in the order given
+        """
+        player_tz = self.get_player_timezone(player)
+        formatted = []
+        for value in values:
+            if value is None:
+                formatted.append(None)
+                continue
+            if isinstance(value, str):
+                try:
+                    value = datetime.strptime(value, STORED_FORMAT)
+                except ValueError:
+                    formatted.append(value)
+                    continue
+            if isinstance(value, datetime):
+                dt = value if value.tzinfo else value.replace(tzinfo=pytz.UTC)
+            else:
+                dt = datetime.fromtimestamp(value, pytz.UTC)
+            formatted.append(dt.astimezone(player_tz).strftime(fmt))
+        return formatted
+
 # Create a global instance
-TIME_MANAGER = TimeManager() 
\ No newline at end of file
+TIME_MANAGER = TimeManager()
+
+
+# Cached by account or character, and timezones change rarely
+@watch_attributes(("timezone", "location"), "time_utils_timezone")
+def _timezone_attribute_changed(obj_id, key, value):
+    _PLAYER_TIMEZONES.clear()